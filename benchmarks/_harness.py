@@ -0,0 +1,87 @@
+"""Shared scaffolding for the local benchmark scripts.
+
+Every benchmark runs against a throwaway XDG tree so it never reads or
+writes the developer's real ``puppy.cfg``, sessions or caches, and talks to
+in-process stub models only -- no network, no API keys.
+
+Import this module *before* anything from ``code_puppy``: config paths are
+resolved at import time.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+BENCH_MODEL = "bench-model"
+
+_XDG_ROOT = tempfile.TemporaryDirectory(prefix="code_puppy_bench_")
+for _name in ("XDG_CONFIG_HOME", "XDG_DATA_HOME", "XDG_CACHE_HOME", "XDG_STATE_HOME"):
+    os.environ[_name] = os.path.join(_XDG_ROOT.name, _name.lower())
+
+# Make ``python benchmarks/bench_x.py`` work from a source checkout.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def bootstrap_config(**settings: str) -> None:
+    """Write a minimal puppy.cfg + extra_models.json for :data:`BENCH_MODEL`."""
+    from code_puppy import config as cp_config
+
+    for directory in (cp_config.CONFIG_DIR, cp_config.DATA_DIR):
+        os.makedirs(directory, exist_ok=True)
+    values = {
+        "puppy_name": "bench",
+        "owner_name": "bench",
+        "model": BENCH_MODEL,
+        "auto_save_session": "false",
+        "disable_mcp_servers": "true",
+        **settings,
+    }
+    with open(cp_config.CONFIG_FILE, "w", encoding="utf-8") as fh:
+        fh.write("[puppy]\n")
+        for key, value in values.items():
+            fh.write(f"{key} = {value}\n")
+    with open(cp_config.EXTRA_MODELS_FILE, "w", encoding="utf-8") as fh:
+        json.dump(
+            {
+                BENCH_MODEL: {
+                    "type": "openai",
+                    "name": BENCH_MODEL,
+                    "context_length": 200000,
+                }
+            },
+            fh,
+        )
+
+
+def summarize(samples_s: list[float]) -> dict:
+    """Milliseconds summary of a list of second-valued samples."""
+    ordered = sorted(samples_s)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "total_ms": round(sum(ordered) * 1000, 3),
+    }
+
+
+def time_calls(fn: Callable[[], object], repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def emit(name: str, results: dict) -> None:
+    """Print one machine-readable JSON result line."""
+    print(json.dumps({"benchmark": name, **results}, sort_keys=True))
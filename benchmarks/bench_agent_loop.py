@@ -0,0 +1,364 @@
+"""End-to-end agent-loop overhead against a deterministic local model.
+
+Drives the real stack -- ``build_pydantic_agent``, history processing, the
+event stream handler (rendering into a throwaway console), tool
+registration and execution, callbacks and session autosave -- with a stub
+model that streams scripted text and tool calls at ``--tokens-per-s``.
+Every turn is recorded with ``turn_trace``, so the output is per-phase
+wall time (and, with ``--allocations``, net allocations) per scenario:
+
+* ``baseline``     -- one streamed text reply, empty history;
+* ``tool_loop``    -- list_files + read_file + grep, then a reply;
+* ``long_history`` -- a reply on top of ``--history`` preseeded exchanges;
+* ``large_output`` -- ``--chunks`` parallel ~35k-char read_file results;
+* ``many_tools``   -- ``--extra-tools`` plugin tools registered on the agent;
+* ``fan_out``      -- invoke_agents_parallel over ``--fan-out`` sub-agents.
+
+    python benchmarks/bench_agent_loop.py --turns 5 --tokens-per-s 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from unittest.mock import patch
+
+from _harness import BENCH_MODEL, bootstrap_config, emit, summarize
+
+SCENARIOS = (
+    "baseline",
+    "tool_loop",
+    "long_history",
+    "large_output",
+    "many_tools",
+    "fan_out",
+)
+REPLY = (
+    "Done. I looked at the files you mentioned and everything is in order; "
+    "no changes were needed and the tests should keep passing as they are."
+)
+
+
+def _make_fixture(root: str, chunks: int) -> None:
+    os.makedirs(os.path.join(root, "pkg", "sub"), exist_ok=True)
+    for i in range(40):
+        with open(os.path.join(root, "pkg", f"mod_{i}.py"), "w") as fh:
+            fh.write(f"def handler_{i}(value):\n    return value + {i}\n")
+    line = "x = 'payload line for the large tool output scenario' # marker\n"
+    with open(os.path.join(root, "pkg", "sub", "big.py"), "w") as fh:
+        fh.write(line * (500 * chunks))
+
+
+def _script(scenario: str, root: str, args: argparse.Namespace) -> list:
+    """Tool-call rounds the model emits before its final text reply."""
+    pkg = os.path.join(root, "pkg")
+    big = os.path.join(pkg, "sub", "big.py")
+    if scenario == "tool_loop":
+        return [
+            [
+                ("list_files", {"directory": pkg, "recursive": True}),
+                ("read_file", {"file_path": os.path.join(pkg, "mod_1.py")}),
+            ],
+            [("grep", {"search_string": "def handler_", "directory": pkg})],
+        ]
+    if scenario == "large_output":
+        return [
+            [
+                (
+                    "read_file",
+                    {"file_path": big, "start_line": i * 500 + 1, "num_lines": 500},
+                )
+                for i in range(args.chunks)
+            ]
+        ]
+    if scenario == "many_tools":
+        return [[("bench_tool_0", {"value": "ping"})]]
+    if scenario == "fan_out":
+        tasks = [
+            {"agent_name": "code-puppy", "prompt": f"subtask {i}"}
+            for i in range(args.fan_out)
+        ]
+        return [[("invoke_agents_parallel", {"tasks": tasks})]]
+    return []
+
+
+def _stub_model(scripts: dict, tokens_per_s: float):
+    """FunctionModel replaying ``scripts[prompt]``; other prompts get text."""
+    from pydantic_ai.messages import (
+        ModelRequest,
+        ModelResponse,
+        TextPart,
+        ToolCallPart,
+        UserPromptPart,
+    )
+    from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+    delay = 1.0 / tokens_per_s if tokens_per_s > 0 else 0.0
+
+    def next_round(messages):
+        # Rounds already answered in this run = responses since the prompt.
+        done = 0
+        for message in reversed(messages):
+            if isinstance(message, ModelResponse):
+                done += 1
+                continue
+            for part in message.parts if isinstance(message, ModelRequest) else ():
+                if isinstance(part, UserPromptPart):
+                    rounds = scripts.get(str(part.content), [])
+                    return rounds[done] if done < len(rounds) else None
+        return None
+
+    async def respond(messages, _info):
+        calls = next_round(messages)
+        if calls:
+            return ModelResponse(
+                parts=[ToolCallPart(name, json.dumps(args)) for name, args in calls]
+            )
+        return ModelResponse(parts=[TextPart(REPLY)])
+
+    async def respond_stream(messages, _info):
+        calls = next_round(messages)
+        if calls:
+            for index, (name, args) in enumerate(calls):
+                await asyncio.sleep(delay)
+                yield {
+                    index: DeltaToolCall(
+                        name=name,
+                        json_args=json.dumps(args),
+                        tool_call_id=f"call_{index}",
+                    )
+                }
+            return
+        for word in REPLY.split(" "):
+            await asyncio.sleep(delay)
+            yield word + " "
+
+    return FunctionModel(
+        respond, stream_function=respond_stream, model_name=BENCH_MODEL
+    )
+
+
+def _seed_history(exchanges: int) -> list:
+    from pydantic_ai.messages import (
+        ModelRequest,
+        ModelResponse,
+        TextPart,
+        UserPromptPart,
+    )
+
+    history = []
+    for i in range(exchanges):
+        history.append(
+            ModelRequest(parts=[UserPromptPart(f"question {i}: " + "context " * 40)])
+        )
+        history.append(ModelResponse(parts=[TextPart(f"answer {i}: " + "ok " * 60)]))
+    return history
+
+
+def _register_extra_tools(count: int, builtin: tuple = ()) -> list:
+    """Advertise ``count`` plugin tools (plus ``builtin`` ones) via callbacks."""
+    from code_puppy.callbacks import register_callback
+
+    def make(name):
+        def register(agent):
+            async def tool(context, value: str) -> str:
+                return value
+
+            tool.__name__ = name
+            tool.__doc__ = f"Echo ``value`` back ({name})."
+            agent.tool(tool)
+
+        return register
+
+    names = [f"bench_tool_{i}" for i in range(count)]
+    defs = [{"name": name, "register_func": make(name)} for name in names]
+
+    def tools():
+        return defs
+
+    def agent_tools(_agent_name=None):
+        return [*names, *builtin]
+
+    register_callback("register_tools", tools)
+    register_callback("register_agent_tools", agent_tools)
+    return [("register_tools", tools), ("register_agent_tools", agent_tools)]
+
+
+def _track_span_allocations(stack: ExitStack) -> None:
+    """Store net traced bytes in each span's attrs while it was open."""
+    from code_puppy.turn_trace import Span
+
+    enter, leave = Span.__enter__, Span.__exit__
+
+    def traced_enter(self):
+        self.attrs["_alloc0"] = tracemalloc.get_traced_memory()[0]
+        return enter(self)
+
+    def traced_exit(self, *exc):
+        start = self.attrs.pop("_alloc0", None)
+        if start is not None:
+            self.attrs["alloc_bytes"] = tracemalloc.get_traced_memory()[0] - start
+        return leave(self, *exc)
+
+    stack.enter_context(patch.object(Span, "__enter__", traced_enter))
+    stack.enter_context(patch.object(Span, "__exit__", traced_exit))
+
+
+def _aggregate(phases: dict, turn) -> None:
+    known = {s.span_id for s in turn.spans}
+    child_ns: dict = {}
+    for s in turn.spans:
+        if s.parent_id in known:
+            child_ns[s.parent_id] = child_ns.get(s.parent_id, 0) + (s.end - s.start)
+    for s in turn.spans:
+        duration = s.end - s.start
+        entry = phases.setdefault(
+            s.name, {"count": 0, "total_ms": 0.0, "self_ms": 0.0, "alloc_kb": 0.0}
+        )
+        entry["count"] += 1
+        entry["total_ms"] += duration / 1e6
+        entry["self_ms"] += max(0, duration - child_ns.get(s.span_id, 0)) / 1e6
+        entry["alloc_kb"] += s.attrs.get("alloc_bytes", 0) / 1024
+
+
+async def _run_scenario(
+    scenario: str, prompt: str, args: argparse.Namespace, allocations: bool
+) -> dict:
+    from code_puppy import turn_trace
+    from code_puppy.agents.agent_manager import get_current_agent
+    from code_puppy.config import auto_save_session_if_enabled
+
+    agent = get_current_agent()
+    samples, peaks, phases = [], [], {}
+    for _ in range(args.turns):
+        agent.clear_message_history()
+        # Rebuilt inside the turn so agent.build / prompt.assemble are timed.
+        agent._code_generation_agent = None
+        if scenario == "long_history":
+            agent.set_message_history(_seed_history(args.history))
+        if allocations:
+            tracemalloc.reset_peak()
+        turn_trace.begin_turn(scenario, force=True)
+        turn = turn_trace._turn
+        started = time.perf_counter()
+        result = await agent.run_with_mcp(prompt)
+        if result is None:
+            raise SystemExit(f"{scenario}: agent run failed")
+        agent.set_message_history(list(result.all_messages()))
+        auto_save_session_if_enabled()
+        samples.append(time.perf_counter() - started)
+        turn_trace.end_turn(emit=False)
+        _aggregate(phases, turn)
+        if allocations:
+            peaks.append(tracemalloc.get_traced_memory()[1])
+
+    out = {"scenario": scenario, "turns": summarize(samples), "phases": {}}
+    for name, entry in sorted(phases.items(), key=lambda kv: -kv[1]["self_ms"]):
+        phase = {
+            "count": entry["count"] // args.turns,
+            "total_ms": round(entry["total_ms"] / args.turns, 3),
+            "self_ms": round(entry["self_ms"] / args.turns, 3),
+        }
+        if allocations:
+            phase["alloc_kb"] = round(entry["alloc_kb"] / args.turns, 1)
+        out["phases"][name] = phase
+    if allocations:
+        out["peak_traced_kb"] = round(max(peaks) / 1024, 1)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--tokens-per-s", type=float, default=2000.0)
+    parser.add_argument("--history", type=int, default=300)
+    parser.add_argument("--chunks", type=int, default=8)
+    parser.add_argument("--extra-tools", type=int, default=150)
+    parser.add_argument("--fan-out", type=int, default=4)
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    parser.add_argument(
+        "--smooth",
+        action="store_true",
+        help="keep the paced typewriter rendering (adds fixed drain time)",
+    )
+    parser.add_argument(
+        "--allocations",
+        action="store_true",
+        help="trace allocations per phase with tracemalloc (slows every run)",
+    )
+    args = parser.parse_args()
+
+    smooth = "true" if args.smooth else "false"
+    bootstrap_config(
+        auto_save_session="true",
+        enable_streaming="true",
+        smooth_response_stream=smooth,
+        smooth_thinking_stream=smooth,
+    )
+    from rich.console import Console
+
+    from code_puppy import turn_trace
+    from code_puppy.agents.event_stream_handler import set_streaming_console
+    from code_puppy.callbacks import unregister_callback
+    from code_puppy.model_factory import ModelFactory
+    from code_puppy.pydantic_patches import apply_all_patches
+
+    root = tempfile.mkdtemp(prefix="code_puppy_bench_loop_")
+    _make_fixture(root, args.chunks)
+    scenarios = args.scenario or list(SCENARIOS)
+    prompts = {name: f"bench {name}: please take a look" for name in scenarios}
+    scripts = {prompts[name]: _script(name, root, args) for name in scenarios}
+    stub = _stub_model(scripts, args.tokens_per_s)
+
+    apply_all_patches()
+    turn_trace.set_trace_dir(os.path.join(root, "traces"))
+    set_streaming_console(Console(file=io.StringIO(), force_terminal=True))
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(ModelFactory, "get_model", return_value=stub))
+        for target in (
+            "code_puppy.messaging.emit_info",
+            "code_puppy.messaging.emit_success",
+            "code_puppy.messaging.emit_warning",
+            "code_puppy.tools.subagent_invocation.get_message_bus",
+        ):
+            stack.enter_context(patch(target))
+        if args.allocations:
+            tracemalloc.start()
+            stack.callback(tracemalloc.stop)
+            _track_span_allocations(stack)
+        cwd = os.getcwd()
+        os.chdir(root)
+        stack.callback(os.chdir, cwd)
+
+        for scenario in scenarios:
+            registered = []
+            if scenario == "many_tools":
+                registered = _register_extra_tools(args.extra_tools)
+            elif scenario == "fan_out":
+                registered = _register_extra_tools(0, ("invoke_agents_parallel",))
+            try:
+                results = asyncio.run(
+                    _run_scenario(scenario, prompts[scenario], args, args.allocations)
+                )
+            finally:
+                for phase, callback in registered:
+                    unregister_callback(phase, callback)
+            emit(
+                "agent_loop",
+                {
+                    "tokens_per_s": args.tokens_per_s,
+                    "allocations": args.allocations,
+                    **results,
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
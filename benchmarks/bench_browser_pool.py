@@ -0,0 +1,95 @@
+"""Time-to-first-page for concurrent browser sessions, per-session vs shared pool.
+
+Opens ``--sessions`` browser sessions at once, the way parallel QA
+sub-agents do, and times each from ``get_browser_manager`` to a loaded
+local ``file://`` page. Per-session mode launches one persistent-profile
+Chromium per session; shared mode (``browser_shared_pool = true``) hands out
+contexts from one pre-warmed Chromium. Round 1 is the cold start; later
+rounds reuse whatever each mode keeps alive (sessions are released between
+rounds, as a finished sub-agent does). Needs ``playwright install chromium``.
+
+    python benchmarks/bench_browser_pool.py --sessions 8 --rounds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from _harness import bootstrap_config, emit, summarize
+
+
+def _write_pages(count: int) -> list[str]:
+    workdir = Path(tempfile.mkdtemp(prefix="code_puppy_bench_pages_"))
+    urls = []
+    for i in range(count):
+        rows = "".join(f"<li>item {i}.{n}</li>" for n in range(500))
+        page = workdir / f"page_{i}.html"
+        page.write_text(f"<html><body><h1>Page {i}</h1><ul>{rows}</ul></body></html>")
+        urls.append(page.as_uri())
+    return urls
+
+
+async def _open(session_id: str, url: str) -> float:
+    from code_puppy.tools.browser.browser_manager import get_browser_manager
+
+    started = time.perf_counter()
+    page = await get_browser_manager(session_id).get_current_page()
+    await page.goto(url, wait_until="load")
+    return time.perf_counter() - started
+
+
+async def _run_mode(shared: bool, urls: list[str], rounds: int) -> dict:
+    from code_puppy import config as cp_config
+    from code_puppy.tools.browser import browser_manager as bm
+
+    cp_config.set_config_value("browser_shared_pool", "true" if shared else "false")
+    cp_config.set_config_value("browser_pool_size", str(len(urls)))
+    cp_config.set_config_value("browser_pool_max_contexts", str(len(urls)))
+    bm._cleanup_done = False
+
+    result = {}
+    try:
+        for round_no in range(1, rounds + 1):
+            started = time.perf_counter()
+            samples = await asyncio.gather(
+                *(_open(f"bench-{i}", url) for i, url in enumerate(urls))
+            )
+            wall = time.perf_counter() - started
+            result[f"round_{round_no}"] = {
+                **summarize(list(samples)),
+                "wall_ms": round(wall * 1000, 1),
+            }
+            # Release like a finished sub-agent: pooled sessions hand their
+            # context back, per-session browsers stay up for reuse.
+            for i in range(len(urls)):
+                await bm.release_pooled_browser(f"bench-{i}")
+    finally:
+        await bm.cleanup_all_browsers()
+    return result
+
+
+async def _bench(args) -> dict:
+    urls = _write_pages(args.sessions)
+    return {
+        "sessions": args.sessions,
+        "per_session": await _run_mode(False, urls, args.rounds),
+        "shared_pool": await _run_mode(True, urls, args.rounds),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    emit("browser_pool", asyncio.run(_bench(args)))
+
+
+if __name__ == "__main__":
+    main()
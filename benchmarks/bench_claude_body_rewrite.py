@@ -0,0 +1,146 @@
+"""Cost of rewriting large ``/v1/messages`` bodies in ClaudeCacheAsyncClient.
+
+Builds request bodies of ``--sizes`` megabytes (long tool-heavy history,
+30 tools, adaptive thinking) and times the single-pass rewriter pipeline
+against the previous two round trips (prefix tool names, then enforce the
+summarized-thinking display), for three client/model mixes:
+
+- ``prefix_and_summary``: Claude Code OAuth client, summary model (both apply)
+- ``prefix_only``: Claude Code OAuth client, classic model
+- ``no_rewrite``: custom Anthropic client, classic model (precheck skips parse)
+
+    python benchmarks/bench_claude_body_rewrite.py --sizes 1 5 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from _harness import emit, summarize, time_calls
+
+SCENARIOS = {
+    "prefix_and_summary": (True, "claude-opus-4-7"),
+    "prefix_only": (True, "claude-sonnet-4-5"),
+    "no_rewrite": (False, "claude-sonnet-4-5"),
+}
+
+
+def _body(model: str, target_bytes: int) -> bytes:
+    tools = [
+        {
+            "name": f"tool_{i}",
+            "description": "Does a thing. " * 20,
+            "input_schema": {
+                "type": "object",
+                "properties": {"path": {"type": "string"}},
+            },
+        }
+        for i in range(30)
+    ]
+    turn = [
+        {
+            "role": "assistant",
+            "content": [
+                {
+                    "type": "thinking",
+                    "thinking": "Let me look. " * 40,
+                    "signature": "s",
+                },
+                {
+                    "type": "tool_use",
+                    "id": "toolu_1",
+                    "name": "tool_1",
+                    "input": {"path": "src/app.py"},
+                },
+            ],
+        },
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": "toolu_1",
+                    "content": "def handler(event):\n    return event\n" * 60,
+                }
+            ],
+        },
+    ]
+    turn_bytes = len(json.dumps(turn))
+    messages = turn * max(1, target_bytes // turn_bytes)
+    payload = {
+        "max_tokens": 32000,
+        "messages": messages,
+        "model": model,
+        "thinking": {"type": "adaptive"},
+        "tools": tools,
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def _old_prefix_tool_names(body: bytes) -> bytes | None:
+    data = json.loads(body.decode("utf-8"))
+    modified = False
+    for tool in data.get("tools") or []:
+        name = tool.get("name")
+        if name and not name.startswith("cp_"):
+            tool["name"] = f"cp_{name}"
+            modified = True
+    return json.dumps(data).encode("utf-8") if modified else None
+
+
+def _old_summary_body(body: bytes) -> bytes | None:
+    from code_puppy.claude_cache_client import _enforce_thinking_display_summary
+
+    payload = json.loads(body.decode("utf-8"))
+    if not _enforce_thinking_display_summary(payload):
+        return None
+    return json.dumps(payload).encode("utf-8")
+
+
+def _two_pass(body: bytes, prefix: bool) -> bytes:
+    """The previous send() path: one unconditional round trip per rewriter."""
+    if prefix:
+        prefixed = _old_prefix_tool_names(body)
+        if prefixed is not None:
+            body = prefixed
+    summarized = _old_summary_body(body)
+    return summarized if summarized is not None else body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from code_puppy.claude_cache_client import ClaudeCacheAsyncClient
+
+    for size_mb in args.sizes:
+        for scenario, (prefix, model) in SCENARIOS.items():
+            body = _body(model, int(size_mb * 1024 * 1024))
+            client = ClaudeCacheAsyncClient(apply_claude_code_prefix=prefix)
+
+            def single(client=client, body=body):
+                return client._rewrite_body(body) or body
+
+            if single() != _two_pass(body, prefix):
+                raise SystemExit(f"rewrite mismatch for {scenario}")
+            emit(
+                "claude_body_rewrite",
+                {
+                    "scenario": scenario,
+                    "body_mb": round(len(body) / 1024 / 1024, 2),
+                    "single_pass": summarize(time_calls(single, args.repeat)),
+                    "two_pass": summarize(
+                        time_calls(
+                            lambda body=body, prefix=prefix: _two_pass(body, prefix),
+                            args.repeat,
+                        )
+                    ),
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Forced-stream Codex responses: streamed assembly vs buffering the SSE body.
+
+Replays SSE recordings from local files through ``httpx.MockTransport`` in
+``--chunk-kb`` chunks. Pass ``--fixtures DIR`` with ``*.sse`` captures, or
+let the benchmark write synthetic ones (one message of ``--sizes-kb`` text
+streamed as ~4-char deltas, plus reasoning deltas, the completed item and
+the ``response.completed`` envelope, as the Codex backend sends them).
+
+``buffered`` reads the whole body before converting it, which is what
+happened when httpx served the SDK's ``stream=False`` request; ``streamed``
+is the client's own path. Reported: wall time, first-byte time and peak
+traced memory (the replayed recording itself is allocated up front and
+not counted).
+
+    python benchmarks/bench_codex_stream.py --sizes-kb 8 128 1024 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from _harness import bootstrap_config, emit, summarize
+
+
+def _write_fixture(path: Path, text_kb: int) -> None:
+    text = ("lorem ipsum dolor sit amet " * (text_kb * 40))[: text_kb * 1024]
+    item = {
+        "id": "msg_1",
+        "type": "message",
+        "role": "assistant",
+        "content": [{"type": "output_text", "text": text}],
+    }
+
+    def event(payload: dict) -> str:
+        return f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write(event({"type": "response.created", "response": {"id": "r"}}))
+        for i in range(0, min(len(text), 4096), 4):
+            fh.write(
+                event({"type": "response.reasoning_summary_text.delta", "delta": "hm"})
+            )
+        for i in range(0, len(text), 4):
+            fh.write(
+                event(
+                    {
+                        "type": "response.output_text.delta",
+                        "item_id": "msg_1",
+                        "output_index": 0,
+                        "delta": text[i : i + 4],
+                    }
+                )
+            )
+        fh.write(
+            event(
+                {"type": "response.output_item.done", "output_index": 0, "item": item}
+            )
+        )
+        fh.write(
+            event(
+                {
+                    "type": "response.completed",
+                    "response": {
+                        "id": "r",
+                        "object": "response",
+                        "output": [],
+                        "usage": {"input_tokens": 10, "output_tokens": len(text) // 4},
+                    },
+                }
+            )
+        )
+        fh.write("data: [DONE]\n\n")
+
+
+def _transport(payload: bytes, chunk: int, delay_s: float):
+    import httpx
+
+    async def body():
+        for offset in range(0, len(payload), chunk):
+            if delay_s:
+                await asyncio.sleep(delay_s)
+            yield payload[offset : offset + chunk]
+
+    def handler(request):
+        return httpx.Response(
+            200, headers={"content-type": "text/event-stream"}, content=body()
+        )
+
+    return httpx.MockTransport(handler)
+
+
+async def _replay(
+    payload: bytes, mode: str, chunk: int, delay_s: float, trace_memory: bool
+) -> dict:
+    import httpx
+
+    from code_puppy.chatgpt_codex_client import ChatGPTCodexAsyncClient
+
+    transport = _transport(payload, chunk, delay_s)
+    body = json.dumps({"model": "gpt-5", "stream": False, "input": []}).encode()
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    async with ChatGPTCodexAsyncClient(transport=transport) as client:
+        request = client.build_request(
+            "POST", "https://codex.invalid/responses", content=body
+        )
+        started = time.perf_counter()
+        if mode == "streamed":
+            response = await client.send(request, stream=False)
+            first_byte_s = response.extensions["codex_stream"]["first_byte_s"]
+        else:
+            async with httpx.AsyncClient(transport=transport) as plain:
+                raw = await plain.post("https://codex.invalid/responses", content=body)
+                first_byte_s = time.perf_counter() - started
+                response = await client._convert_stream_to_response(raw, started)
+        elapsed = time.perf_counter() - started
+    peak_kb = None
+    if trace_memory:
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    output = response.json()["output"]
+    if not output or not output[0]["content"][0]["text"]:
+        raise SystemExit(f"{mode}: conversion produced no output")
+    return {"elapsed_s": elapsed, "first_byte_s": first_byte_s, "peak_kb": peak_kb}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, help="directory of *.sse captures")
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=[8, 128, 1024])
+    parser.add_argument("--chunk-kb", type=int, default=16)
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    fixtures_dir = args.fixtures
+    if fixtures_dir is None:
+        fixtures_dir = Path(tempfile.mkdtemp(prefix="code_puppy_bench_sse_"))
+        for size in args.sizes_kb:
+            _write_fixture(fixtures_dir / f"message_{size}kb.sse", size)
+
+    for path in sorted(fixtures_dir.glob("*.sse"), key=os.path.getsize):
+        payload = path.read_bytes()
+        results = {}
+        for mode in ("buffered", "streamed"):
+            chunk, delay_s = args.chunk_kb * 1024, args.chunk_delay_ms / 1000.0
+            runs = [
+                asyncio.run(_replay(payload, mode, chunk, delay_s, False))
+                for _ in range(args.repeat)
+            ]
+            # Memory is measured on a separate run: tracing skews the timings.
+            traced = asyncio.run(_replay(payload, mode, chunk, delay_s, True))
+            results[mode] = {
+                **summarize([r["elapsed_s"] for r in runs]),
+                "first_byte_ms": round(min(r["first_byte_s"] for r in runs) * 1000, 3),
+                "peak_kb": round(traced["peak_kb"], 1),
+            }
+        emit(
+            "codex_stream",
+            {
+                "fixture": path.name,
+                "sse_kb": round(len(payload) / 1024, 1),
+                **results,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
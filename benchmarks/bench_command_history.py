@@ -0,0 +1,107 @@
+"""Command-history latency: first Up, Ctrl+R start and per-keystroke search.
+
+Writes a prompt_toolkit-format history file of ``--entries`` entries (every
+``--multiline-every``-th spans several lines) and compares the old reads
+(``FileHistory.load_history_strings`` on every Up/Ctrl+R, then a linear
+substring scan per keystroke) with the shared, incrementally parsed store.
+
+    python benchmarks/bench_command_history.py --entries 10000 100000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+
+from _harness import bootstrap_config, emit, summarize, time_calls
+
+_WORDS = "git status push pull make test run deploy fix the build agent model".split()
+
+
+def _write_history(path: str, entries: int, multiline_every: int) -> None:
+    rng = random.Random(7)
+    with open(path, "w", encoding="utf-8") as fh:
+        for i in range(entries):
+            lines = 4 if multiline_every and i % multiline_every == 0 else 1
+            fh.write(f"\n# 2026-01-01 00:00:{i % 60:02d}.000000\n")
+            for _ in range(lines):
+                fh.write("+" + " ".join(rng.choices(_WORDS, k=8)) + f" #{i}\n")
+
+
+def _old_load(path: str) -> list:
+    from prompt_toolkit.history import FileHistory
+
+    return list(reversed(list(FileHistory(path).load_history_strings())))
+
+
+def _old_search(entries: list, query: str) -> int:
+    for i in range(len(entries) - 1, -1, -1):
+        if query in entries[i]:
+            return i
+    return -1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--multiline-every", type=int, default=10)
+    parser.add_argument(
+        "--queries", nargs="+", default=["deploy agent #1", "kubectl rollout"]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    from code_puppy.messaging import editor_history
+    from code_puppy.messaging.editor_history import HistoryNavigator, ReverseSearch
+
+    for entries in args.entries:
+        path = os.path.join(tempfile.mkdtemp(prefix="code_puppy_bench_hist_"), "h")
+        _write_history(path, entries, args.multiline_every)
+        old_entries = _old_load(path)
+        old_up = time_calls(lambda: _old_load(path), args.repeat)
+
+        editor_history._shared.clear()
+        store = editor_history.HistoryStore(path)
+        cold = time_calls(store.load, 1)
+        new_up = time_calls(lambda: HistoryNavigator(store).up(""), args.repeat)
+        store.append("freshly submitted command")
+        old_entries.append("freshly submitted command")
+        after_append = time_calls(lambda: HistoryNavigator(store).up(""), 1)
+        result = {
+            "entries": entries,
+            "file_kb": round(os.path.getsize(path) / 1024, 1),
+            "old_first_up": summarize(old_up),
+            "cold_load_ms": round(cold[0] * 1000, 3),
+            "first_up": summarize(new_up),
+            "first_up_after_append_ms": round(after_append[0] * 1000, 3),
+        }
+
+        for query in args.queries:
+            prefixes = [query[:n] for n in range(1, len(query) + 1)]
+
+            def ctrl_r_and_type():
+                rs = ReverseSearch(store)
+                rs.start()
+                for ch in query:
+                    rs.feed_char(ch)
+                return rs.current_match()
+
+            hit = _old_search(old_entries, query)
+            assert ctrl_r_and_type() == (old_entries[hit] if hit >= 0 else None)
+            old_keys = time_calls(
+                lambda: [_old_search(old_entries, q) for q in prefixes], args.repeat
+            )
+            new_keys = time_calls(ctrl_r_and_type, args.repeat)
+            result[query] = {
+                "matches": hit >= 0,
+                "old_keystrokes": summarize(old_keys),
+                "ctrl_r_and_keystrokes": summarize(new_keys),
+            }
+        emit("command_history", result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Render cost of ``RichConsoleRenderer._render_file_listing`` vs listing size.
+
+Builds a synthetic recursive ``FileListingMessage`` (a balanced tree of
+``--fanout`` directories per level, ``--files-per-dir`` files in each) until
+``--entries`` is reached, and renders it into an in-memory console. A flat
+shape (every directory directly under the root) exercises the wide-directory
+collapse instead.
+
+    python benchmarks/bench_file_listing.py --entries 1000 10000 100000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+from io import StringIO
+from unittest.mock import patch
+
+from _harness import bootstrap_config, emit, summarize, time_calls
+
+
+def _listing(entries: int, fanout: int, files_per_dir: int, flat: bool):
+    from code_puppy.messaging.messages import FileEntry, FileListingMessage
+
+    files: list = []
+    total_size = dir_count = 0
+    frontier = [""]
+    while len(files) < entries:
+        parent = frontier.pop(0)
+        for i in range(fanout):
+            path = f"{parent}/d{len(files)}_{i}".lstrip("/")
+            files.append(FileEntry(path=path, type="dir", size=0, depth=0))
+            dir_count += 1
+            for j in range(files_per_dir):
+                size = 100 + j
+                total_size += size
+                files.append(
+                    FileEntry(path=f"{path}/f{j}.py", type="file", size=size, depth=0)
+                )
+            frontier.append("" if flat else path)
+    files = files[:entries]
+    return FileListingMessage(
+        directory="/bench",
+        files=files,
+        recursive=True,
+        dir_count=dir_count,
+        file_count=len(files) - dir_count,
+        total_size=total_size,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--files-per-dir", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    from rich.console import Console
+
+    from code_puppy.messaging import rich_renderer
+    from code_puppy.messaging.bus import MessageBus
+
+    for shape in ("tree", "flat"):
+        for entries in args.entries:
+            msg = _listing(entries, args.fanout, args.files_per_dir, shape == "flat")
+            console = Console(file=StringIO(), width=120, force_terminal=True)
+            renderer = rich_renderer.RichConsoleRenderer(MessageBus(), console=console)
+            prints = []
+            original_print = console.print
+
+            def counting_print(*a, **kw):
+                prints.append(1)
+                return original_print(*a, **kw)
+
+            with (
+                patch.object(rich_renderer, "is_subagent", return_value=False),
+                patch.object(
+                    rich_renderer, "get_suppress_directory_listing", return_value=False
+                ),
+                patch.object(console, "print", counting_print),
+            ):
+                timings = time_calls(
+                    lambda: renderer._render_file_listing(msg), args.repeat
+                )
+            emit(
+                "file_listing",
+                {
+                    "shape": shape,
+                    "entries": entries,
+                    "directories": msg.dir_count,
+                    "render": summarize(timings),
+                    "console_prints": len(prints) // args.repeat,
+                    "output_lines": console.file.getvalue().count("\n") // args.repeat,
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Keystroke latency of fuzzy ``@`` completion over a 200k-path index.
+
+Publishes a synthetic index, then "types" several queries one character at a
+time, timing each ``_fuzzy_completions`` call against the previous linear
+scan over every path.
+
+    python benchmarks/bench_fuzzy_completion.py --paths 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from unittest.mock import patch
+
+from _harness import emit, summarize
+
+_WORDS = [
+    "src", "lib", "core", "utils", "models", "views", "tests", "api", "net",
+    "service", "handler", "config", "db", "schema", "client", "server", "io",
+    "parser", "render", "widget", "auth", "user", "session", "cache", "queue",
+]  # fmt: skip
+_EXTS = [".py", ".ts", ".tsx", ".md", ".json", ".go", ".rs", ".yaml"]
+
+
+def _paths(count: int) -> list[str]:
+    rng = random.Random(42)
+    out = set()
+    while len(out) < count:
+        depth = rng.randint(1, 6)
+        parts = [rng.choice(_WORDS) for _ in range(depth)]
+        name = f"{rng.choice(_WORDS)}_{rng.choice(_WORDS)}{rng.randint(0, 999)}"
+        out.add("/".join(parts) + "/" + name + rng.choice(_EXTS))
+    return list(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=200_000)
+    args = parser.parse_args()
+
+    from code_puppy.command_line import file_index
+    from code_puppy.command_line.file_path_completion import (
+        _fuzzy_completions,
+        _scan_completions,
+    )
+
+    paths = _paths(args.paths)
+    started = time.perf_counter()
+    snap = file_index._make_index("/bench", paths)
+    build_s = time.perf_counter() - started
+
+    queries = ["session_cache", "render", "widget_auth12", "apiz", "s/c", "x"]
+    indexed, linear = [], []
+    with (
+        patch.object(file_index, "get_index", return_value=snap),
+        patch("code_puppy.command_line.file_path_completion._ensure_index_for_cwd"),
+    ):
+        for query in queries:
+            for end in range(1, len(query) + 1):
+                typed = query[:end]
+                began = time.perf_counter()
+                fast = _fuzzy_completions(typed, 0)
+                indexed.append(time.perf_counter() - began)
+
+                began = time.perf_counter()
+                slow = _scan_completions(snap, typed.lower())
+                linear.append(time.perf_counter() - began)
+                if [c.text for c in fast] != [path for _s, path, _b in slow]:
+                    raise SystemExit(f"ranking mismatch for {typed!r}")
+
+    emit(
+        "fuzzy_completion",
+        {
+            "paths": len(paths),
+            "index_build_ms": round(build_s * 1000, 3),
+            "keystrokes": len(indexed),
+            "indexed": summarize(indexed),
+            "linear_scan": summarize(linear),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
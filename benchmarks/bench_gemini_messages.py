@@ -0,0 +1,116 @@
+"""Gemini request preparation (``_map_messages``) vs history length.
+
+Compares a fresh ``GeminiModel`` per request (every message and attachment
+mapped and base64-encoded again, the old behavior) with a long-lived one
+that has already mapped all but the last exchange, which is what every
+step of a real session looks like.
+
+    python benchmarks/bench_gemini_messages.py --exchanges 50 200 800 --attachments 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+from _harness import bootstrap_config, emit, summarize
+
+
+def _history(exchanges: int, attachments: int, attachment_kb: int) -> list:
+    from pydantic_ai.messages import (
+        BinaryContent,
+        ModelRequest,
+        ModelResponse,
+        TextPart,
+        ToolCallPart,
+        ToolReturnPart,
+        UserPromptPart,
+    )
+
+    every = max(1, exchanges // attachments) if attachments else 0
+    history = []
+    for i in range(exchanges):
+        content: list = [f"step {i}: " + "please look at this " * 20]
+        if every and i % every == 0 and i // every < attachments:
+            content.append(
+                BinaryContent(
+                    data=os.urandom(attachment_kb * 1024), media_type="image/png"
+                )
+            )
+        history.append(ModelRequest(parts=[UserPromptPart(content=content)]))
+        history.append(
+            ModelResponse(
+                parts=[
+                    TextPart("Reading the file. " * 10),
+                    ToolCallPart("read_file", {"file_path": f"src/mod_{i}.py"}),
+                ]
+            )
+        )
+        history.append(
+            ModelRequest(
+                parts=[
+                    ToolReturnPart(
+                        "read_file", "def handler():\n    pass\n" * 40, f"call_{i}"
+                    )
+                ]
+            )
+        )
+        history.append(ModelResponse(parts=[TextPart("Done. " * 30)]))
+    return history
+
+
+async def _measure(history: list, repeat: int) -> tuple[list, list]:
+    from pydantic_ai.models import ModelRequestParameters
+
+    from code_puppy import gemini_model
+    from code_puppy.gemini_model import GeminiModel
+
+    params = ModelRequestParameters(function_tools=[], allow_text_output=True)
+    full, incremental = [], []
+    for _ in range(repeat):
+        gemini_model._encoded_attachments = gemini_model._IdentityCache()
+        started = time.perf_counter()
+        await GeminiModel("gemini-bench", "bench")._map_messages(history, params)
+        full.append(time.perf_counter() - started)
+
+        model = GeminiModel("gemini-bench", "bench")
+        await model._map_messages(history[:-4], params)
+        started = time.perf_counter()
+        await model._map_messages(history, params)
+        incremental.append(time.perf_counter() - started)
+    return full, incremental
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--exchanges", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--attachments", type=int, default=4)
+    parser.add_argument("--attachment-kb", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    for exchanges in args.exchanges:
+        for attachments in sorted({0, args.attachments}):
+            history = _history(exchanges, attachments, args.attachment_kb)
+            full, incremental = asyncio.run(_measure(history, args.repeat))
+            full_s, incremental_s = summarize(full), summarize(incremental)
+            emit(
+                "gemini_map_messages",
+                {
+                    "messages": len(history),
+                    "attachments": attachments,
+                    "attachment_kb": args.attachment_kb,
+                    "full_remap": full_s,
+                    "incremental": incremental_s,
+                    "speedup": round(
+                        full_s["median_ms"] / incremental_s["median_ms"], 1
+                    ),
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Per-request ``GeminiModel._build_tools`` cost, memoized vs re-sanitized.
+
+Uses the real Code Puppy tool schemas (every registered built-in tool),
+cloned with distinct names and an extra property until ``--tools`` is
+reached, to stand in for a large agent plus MCP servers.
+
+    python benchmarks/bench_gemini_tools.py --tools 40 80 160 --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+
+from _harness import BENCH_MODEL, bootstrap_config, emit, summarize, time_calls
+
+
+def _real_tool_definitions() -> list:
+    from pydantic_ai import Agent
+    from pydantic_ai.models.test import TestModel
+
+    from code_puppy.tools import TOOL_REGISTRY, register_tools_for_agent
+
+    agent = Agent(TestModel())
+    register_tools_for_agent(agent, list(TOOL_REGISTRY), model_name=BENCH_MODEL)
+    return [tool.tool_def for tool in agent._function_toolset.tools.values()]
+
+
+def _tool_set(real: list, count: int) -> list:
+    from pydantic_ai.tools import ToolDefinition
+
+    tools = []
+    for i in range(count):
+        base = real[i % len(real)]
+        schema = copy.deepcopy(base.parameters_json_schema)
+        if i >= len(real):
+            schema.setdefault("properties", {})[f"clone_{i}"] = {
+                "type": "string",
+                "description": f"Clone marker {i}.",
+            }
+        tools.append(
+            ToolDefinition(
+                name=f"{base.name}_{i}",
+                description=base.description,
+                parameters_json_schema=schema,
+            )
+        )
+    return tools
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tools", type=int, nargs="+", default=[40, 80, 160])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    from unittest.mock import patch
+
+    from code_puppy import gemini_model
+    from code_puppy.gemini_model import GeminiModel
+
+    model = GeminiModel(model_name="gemini-bench", api_key="bench")
+    real = _real_tool_definitions()
+    for count in args.tools:
+        tools = _tool_set(real, count)
+        schema_kb = sum(len(json.dumps(t.parameters_json_schema)) for t in tools) / 1024
+
+        with patch.object(
+            gemini_model,
+            "_cached_sanitized_schema",
+            gemini_model._sanitize_schema_for_gemini,
+        ):
+            uncached = time_calls(lambda: model._build_tools(tools), args.repeat)
+        gemini_model.clear_schema_cache()
+        cold = time_calls(lambda: model._build_tools(tools), 1)
+        warm = time_calls(lambda: model._build_tools(tools), args.repeat)
+
+        emit(
+            "gemini_build_tools",
+            {
+                "tools": count,
+                "schema_kb": round(schema_kb, 1),
+                "uncached": summarize(uncached),
+                "cold_ms": round(cold[0] * 1000, 3),
+                "memoized": summarize(warm),
+                "speedup": round(
+                    sum(uncached) / len(uncached) / (sum(warm) / len(warm)), 1
+                ),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
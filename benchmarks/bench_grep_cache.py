@@ -0,0 +1,81 @@
+"""Repeated ``grep`` latency on a synthetic tree, cold vs. cached.
+
+Runs the real ``_grep`` (ripgrep subprocess + JSON parsing) over a generated
+source tree, then repeats the same search to measure the validated-cache path,
+and finally interleaves agent writes to show the cost when every repeat is
+invalidated.
+
+    python benchmarks/bench_grep_cache.py --files 5000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from unittest.mock import patch
+
+from _harness import bootstrap_config, emit, summarize, time_calls
+
+
+def _make_tree(root: str, files: int) -> None:
+    for i in range(files):
+        sub = os.path.join(root, f"pkg{i % 50}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"mod{i}.py"), "w", encoding="utf-8") as fh:
+            for j in range(40):
+                fh.write(f"def func_{i}_{j}(value):\n    return value + {j}\n")
+            if i % 97 == 0:
+                fh.write("TARGET_SYMBOL = 1\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    from code_puppy.tools.common import write_project_file
+    from code_puppy.tools.file_operations import _grep
+    from code_puppy.tools.grep_cache import grep_cache_stats, invalidate_grep_cache
+
+    # Not under /tmp: grep's ignore list skips any ``tmp/`` path component.
+    with (
+        tempfile.TemporaryDirectory(
+            prefix="grep_bench_", dir=os.path.dirname(os.path.abspath(__file__))
+        ) as root,
+        patch("code_puppy.tools.file_operations.get_message_bus"),
+    ):
+        _make_tree(root, args.files)
+        scratch = os.path.join(root, "scratch.txt")
+
+        def search():
+            out = _grep(None, "TARGET_SYMBOL", root)
+            if out.error or not out.matches:
+                raise SystemExit(f"grep failed: {out.error}")
+
+        invalidate_grep_cache()
+        cold = time_calls(search, 1)
+        warm = time_calls(search, args.repeat)
+
+        def search_after_write():
+            write_project_file(scratch, "x\n")
+            search()
+
+        invalidated = time_calls(search_after_write, args.repeat)
+
+        emit(
+            "grep_cache",
+            {
+                "files": args.files,
+                "cold_ms": round(cold[0] * 1000, 3),
+                "cached": summarize(warm),
+                "after_agent_write": summarize(invalidated),
+                "stats": grep_cache_stats(),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Request image payload over a screenshot-heavy session, with and without aging.
+
+Scripts a QA-style session: every step is a browser screenshot tool call
+whose return carries a ``--width`` x ``--height`` PNG, and every step is one
+model request carrying the whole history. For each request the benchmark
+sums the base64 size of the images it would ship, once with the history left
+alone and once after the image-aging processor (which persists its output,
+as it does in a real run). Also reports the processor's time per step.
+
+    python benchmarks/bench_image_history.py --steps 40 --keep-recent 3 --budget-kb 8192
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import io
+import time
+
+from _harness import bootstrap_config, emit, summarize
+
+
+def _screenshot(width: int, height: int, step: int) -> bytes:
+    from PIL import Image, ImageDraw
+
+    # Page-like: flat background, some blocks of "text" and a noisy image.
+    image = Image.new("RGB", (width, height), (248, 248, 250))
+    draw = ImageDraw.Draw(image)
+    for row in range(40, height - 40, 28):
+        draw.rectangle((40, row, 40 + (row * 37 + step * 11) % (width - 80), row + 12))
+    noise = Image.effect_noise((width // 3, height // 3), 60).convert("RGB")
+    image.paste(noise, (width // 2, height // 4))
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _payload_bytes(messages: list) -> int:
+    from pydantic_ai.messages import BinaryContent, ModelRequest
+
+    total = 0
+    for msg in messages:
+        if not isinstance(msg, ModelRequest):
+            continue
+        for part in msg.parts:
+            content = getattr(part, "content", None)
+            for item in content if isinstance(content, list) else [content]:
+                if isinstance(item, BinaryContent):
+                    total += len(base64.b64encode(item.data))
+    return total
+
+
+async def _session(args) -> dict:
+    from pydantic_ai.messages import (
+        BinaryContent,
+        ModelRequest,
+        ModelResponse,
+        ToolCallPart,
+        ToolReturnPart,
+        UserPromptPart,
+    )
+
+    from code_puppy.agents._image_aging import age_history_images
+
+    plain: list = [ModelRequest(parts=[UserPromptPart(content="QA the checkout")])]
+    aged: list = list(plain)
+    sent_plain, sent_aged, step_times = [], [], []
+    for step in range(args.steps):
+        call = ModelResponse(parts=[ToolCallPart("browser_screenshot", {}, f"c{step}")])
+        ret = ModelRequest(
+            parts=[
+                ToolReturnPart("browser_screenshot", "captured", f"c{step}"),
+                UserPromptPart(
+                    content=[
+                        "Here's the browser screenshot (viewport):",
+                        BinaryContent(
+                            data=_screenshot(args.width, args.height, step),
+                            media_type="image/png",
+                        ),
+                    ]
+                ),
+            ]
+        )
+        plain += [call, ret]
+        aged += [call, ret]
+        started = time.perf_counter()
+        aged = await age_history_images(aged, args.keep_recent, args.budget_kb * 1024)
+        step_times.append(time.perf_counter() - started)
+        sent_plain.append(_payload_bytes(plain))
+        sent_aged.append(_payload_bytes(aged))
+
+    checkpoints = sorted({min(n, args.steps) for n in (5, 10, 20, args.steps)})
+    return {
+        "steps": args.steps,
+        "keep_recent": args.keep_recent,
+        "budget_kb": args.budget_kb,
+        "per_request_kb": {
+            str(n): {
+                "plain": round(sent_plain[n - 1] / 1024),
+                "aged": round(sent_aged[n - 1] / 1024),
+            }
+            for n in checkpoints
+        },
+        "session_total_mb": {
+            "plain": round(sum(sent_plain) / 1024 / 1024, 1),
+            "aged": round(sum(sent_aged) / 1024 / 1024, 1),
+        },
+        "processor": summarize(step_times),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=40)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=800)
+    parser.add_argument("--keep-recent", type=int, default=3)
+    parser.add_argument("--budget-kb", type=int, default=8192)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    emit("image_history", asyncio.run(_session(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""``load_image`` preparation cost and event-loop stall, cold vs cached.
+
+Generates large PNG and JPEG inputs (photo-like gradients plus noise, so
+encoders get realistic work) and measures, per input: the old inline path
+(``_validate_and_prepare_image`` called on the loop), a cold
+``prepare_image_file`` (worker pool, cache miss) and a warm one (cache
+hit). ``max_stall_ms`` is the worst lateness seen by a 5 ms ticker running
+on the same loop -- what every other concurrent agent would feel.
+
+    python benchmarks/bench_image_prep.py --sizes 2048x1536 4096x3072 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from _harness import bootstrap_config, emit, summarize
+
+
+def _make_image(path: str, width: int, height: int, fmt: str) -> None:
+    from PIL import Image
+
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    Image.merge("RGB", (gradient, noise, gradient.rotate(90))).save(
+        path, format=fmt, quality=90
+    )
+
+
+async def _with_ticker(work) -> tuple[float, float]:
+    """Run ``work()`` while a 5 ms ticker measures loop lateness."""
+    stall = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal stall
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - before - 0.005)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done = True
+    await task
+    return elapsed, stall
+
+
+async def _measure(path: str, repeat: int) -> dict:
+    from pathlib import Path
+
+    from code_puppy.tools import image_tools
+
+    async def inline():
+        image_tools._validate_and_prepare_image(
+            Path(path).read_bytes(), path, image_tools.MAX_IMAGE_EDGE
+        )
+
+    async def pooled():
+        await image_tools.prepare_image_file(path)
+
+    results = {}
+    for name, work, clear in (
+        ("inline_old", inline, False),
+        ("pool_cold", pooled, True),
+        ("pool_cached", pooled, False),
+    ):
+        samples, stalls = [], []
+        for _ in range(repeat):
+            if clear:
+                for entry in image_tools._image_cache_dir().glob("*"):
+                    entry.unlink()
+            elapsed, stall = await _with_ticker(work)
+            samples.append(elapsed)
+            stalls.append(stall)
+        results[name] = {
+            **summarize(samples),
+            "max_stall_ms": round(max(stalls) * 1000, 1),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["2048x1536", "4096x3072"])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    workdir = tempfile.mkdtemp(prefix="code_puppy_bench_img_")
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        for fmt in ("PNG", "JPEG"):
+            path = os.path.join(workdir, f"{size}.{fmt.lower()}")
+            _make_image(path, width, height, fmt)
+            emit(
+                "image_prep",
+                {
+                    "format": fmt,
+                    "size": size,
+                    "input_kb": round(os.path.getsize(path) / 1024, 1),
+                    **asyncio.run(_measure(path, args.repeat)),
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Throughput of MCP server log writes and latency of ``read_logs`` tails.
+
+Writes ``--lines`` log lines through ``write_log`` (buffered, one handle)
+and through the old per-line path (rotation check + open/append/close), then
+times ``read_logs(lines=N)`` against a full read of the resulting logs.
+
+    python benchmarks/bench_mcp_logs.py --lines 100000 --tail 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime
+
+from _harness import emit, summarize, time_calls
+
+
+def _unbuffered_write(mcp_logs, server_name: str, message: str) -> None:
+    """The previous write_log: stat + rotate check, then open/append/close."""
+    log_path = mcp_logs.get_log_file_path(server_name)
+    if log_path.exists() and log_path.stat().st_size >= mcp_logs.MAX_LOG_SIZE:
+        mcp_logs._rotate_files(server_name, log_path)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(f"[{timestamp}] [INFO] {message}\n")
+
+
+def _full_read(mcp_logs, server_name: str, count: int) -> list[str]:
+    log_path = mcp_logs.get_log_file_path(server_name)
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read().splitlines()[-count:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--tail", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from code_puppy.mcp_ import mcp_logs
+
+    message = "stderr: processing request id=%d with a typical payload summary"
+
+    started = time.perf_counter()
+    for i in range(args.lines):
+        mcp_logs.write_log("buffered", message % i)
+    mcp_logs.flush_logs("buffered")
+    buffered_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(args.lines):
+        _unbuffered_write(mcp_logs, "unbuffered", message % i)
+    unbuffered_s = time.perf_counter() - started
+
+    tail = time_calls(
+        lambda: mcp_logs.read_logs("buffered", lines=args.tail), args.repeat
+    )
+    full = time_calls(lambda: _full_read(mcp_logs, "buffered", args.tail), args.repeat)
+    if mcp_logs.read_logs("buffered", lines=args.tail) != _full_read(
+        mcp_logs, "buffered", args.tail
+    ):
+        raise SystemExit("tail mismatch")
+
+    emit(
+        "mcp_logs",
+        {
+            "lines": args.lines,
+            "buffered_write_total_ms": round(buffered_s * 1000, 3),
+            "unbuffered_write_total_ms": round(unbuffered_s * 1000, 3),
+            "buffered_us_per_line": round(buffered_s / args.lines * 1e6, 3),
+            "unbuffered_us_per_line": round(unbuffered_s / args.lines * 1e6, 3),
+            "log_bytes": mcp_logs.get_log_stats("buffered")["size_bytes"],
+            "tail_lines": args.tail,
+            "read_logs_tail": summarize(tail),
+            "full_read": summarize(full),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""``browser_page_snapshot`` cost and payload on large local HTML pages.
+
+Generates pages with ``--rows`` rows (each a link, a button, an input and
+some text) and times, per page: a whole-DOM visibility scan (what
+the snapshot used to pay before stopping at ``limit``), a ``full=True``
+snapshot, a repeat snapshot of an unchanged page, and one after a single
+button label changes. ``payload_bytes`` is the JSON size the model would
+receive. Needs ``playwright install chromium``.
+
+    python benchmarks/bench_page_snapshot.py --rows 1000 10000 --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from _harness import bootstrap_config, emit, summarize
+
+# Every match is checked for visibility before ``limit`` is applied.
+_WHOLE_DOM_SCAN_JS = """
+() => {
+  const sel = 'h1,h2,h3,h4,h5,h6,button,[role="button"],a[href],input,textarea,'
+    + 'select,[role],nav,main,header,footer,aside,form';
+  let visible = 0;
+  for (const el of document.querySelectorAll(sel)) {
+    const style = window.getComputedStyle(el);
+    const rect = el.getBoundingClientRect();
+    if (style.display !== 'none' && rect.width > 0 && rect.height > 0) visible++;
+  }
+  return visible;
+}
+"""
+
+_MUTATE_JS = """
+(n) => { document.querySelector('button').textContent = 'Pay ' + n; }
+"""
+
+
+def _write_page(directory: Path, rows: int) -> str:
+    body = "".join(
+        f"<div class='row'><a href='/item/{i}'>Item {i}</a>"
+        f"<button>Add {i}</button><input name='qty{i}' value='1'>"
+        f"<span>description for row {i}</span></div>"
+        for i in range(rows)
+    )
+    path = directory / f"rows_{rows}.html"
+    path.write_text(
+        f"<html><head><title>{rows} rows</title></head><body><main>"
+        f"<h1>Catalog</h1><nav><a href='/'>Home</a></nav>{body}</main></body></html>"
+    )
+    return path.as_uri()
+
+
+async def _timed(repeat: int, call, before=None) -> tuple[dict, int]:
+    samples, payload = [], 0
+    for n in range(repeat):
+        if before is not None:
+            await before(n)
+        started = time.perf_counter()
+        result = await call()
+        samples.append(time.perf_counter() - started)
+        payload = len(json.dumps(result))
+    return summarize(samples), payload
+
+
+async def _measure(url: str, repeat: int, limit: int) -> dict:
+    from pydantic_ai.messages import ModelRequest, ToolReturnPart
+
+    from code_puppy.tools.browser.browser_manager import get_session_browser_manager
+    from code_puppy.tools.browser.browser_page_snapshot import get_page_snapshot
+
+    page = await get_session_browser_manager().get_current_page()
+    await page.goto(url, wait_until="load")
+
+    # Deltas only go to a conversation holding the previous result, so the
+    # snapshots run in one, the way the tool call does.
+    history: list = []
+
+    async def snapshot(full: bool = False) -> dict:
+        call_id = f"call-{len(history)}"
+        result = await get_page_snapshot(
+            limit, full=full, history=history, tool_call_id=call_id
+        )
+        part = ToolReturnPart("browser_page_snapshot", result, call_id)
+        history.append(ModelRequest(parts=[part]))
+        return result
+
+    results = {}
+    for name, call, before in (
+        ("whole_dom_scan", lambda: page.evaluate(_WHOLE_DOM_SCAN_JS), None),
+        ("full", lambda: snapshot(full=True), None),
+        ("unchanged", snapshot, None),
+        ("one_change", snapshot, lambda n: page.evaluate(_MUTATE_JS, n)),
+    ):
+        timing, payload = await _timed(repeat, call, before)
+        results[name] = {**timing, "payload_bytes": payload}
+    return results
+
+
+async def _bench(args) -> None:
+    from code_puppy.tools.browser.browser_manager import cleanup_all_browsers
+
+    workdir = Path(tempfile.mkdtemp(prefix="code_puppy_bench_snapshot_"))
+    try:
+        for rows in args.rows:
+            url = _write_page(workdir, rows)
+            emit(
+                "page_snapshot",
+                {"rows": rows, **await _measure(url, args.repeat, args.limit)},
+            )
+    finally:
+        await cleanup_all_browsers()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=25)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    asyncio.run(_bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Paging through a large synthetic log with ranged ``read_file`` calls.
+
+Generates a ``--size-mb`` log (default 2 GiB), then reads ``--pages`` pages of
+``--page-lines`` lines spread evenly from the top to the bottom of the file,
+once through the indexed path and once through the old sequential
+``islice`` walk. The sequential walk re-scans everything before each page, so
+its per-page cost grows with depth. The indexed path scans each byte once
+(extending the index as pages go deeper) and then serves any page revisit
+with a seek.
+
+    python benchmarks/bench_read_file_paging.py --size-mb 2048 --pages 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from _harness import bootstrap_config, emit, summarize
+
+_LINE = b"2026-01-01T00:00:00Z INFO worker-%06d processed request id=%012d ok\n"
+
+
+def _make_log(path: str, size_bytes: int) -> int:
+    lines = 0
+    block = 10_000
+    with open(path, "wb") as fh:
+        while fh.tell() < size_bytes:
+            fh.write(
+                b"".join(_LINE % (i % 1000, i) for i in range(lines, lines + block))
+            )
+            lines += block
+    return lines
+
+
+def _sequential_read(path: str, start_line: int, num_lines: int) -> str:
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        start = start_line - 1
+        return "".join(itertools.islice(f, start, start + num_lines))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-lines", type=int, default=500)
+    args = parser.parse_args()
+
+    bootstrap_config()
+    from code_puppy.tools.file_operations import _read_file
+
+    with tempfile.TemporaryDirectory(prefix="read_bench_") as root:
+        path = os.path.join(root, "big.log")
+        total_lines = _make_log(path, args.size_mb * 1024 * 1024)
+        last_start = max(1, total_lines - args.page_lines + 1)
+        starts = [
+            1 + (last_start - 1) * i // max(1, args.pages - 1)
+            for i in range(args.pages)
+        ]
+
+        indexed, sequential = [], []
+        reported_total = None
+        with patch("code_puppy.tools.file_operations.get_message_bus"):
+            for start in starts:
+                began = time.perf_counter()
+                out = _read_file(
+                    None, path, start_line=start, num_lines=args.page_lines
+                )
+                indexed.append(time.perf_counter() - began)
+                if out.error:
+                    raise SystemExit(out.error)
+                reported_total = out.total_lines or reported_total
+
+                began = time.perf_counter()
+                expected = _sequential_read(path, start, args.page_lines)
+                sequential.append(time.perf_counter() - began)
+                if expected != out.content:
+                    raise SystemExit(f"content mismatch at line {start}")
+
+            # Second pass, bottom-up: every page is now served from the index.
+            revisit = []
+            for start in reversed(starts):
+                began = time.perf_counter()
+                _read_file(None, path, start_line=start, num_lines=args.page_lines)
+                revisit.append(time.perf_counter() - began)
+
+        emit(
+            "read_file_paging",
+            {
+                "size_mb": args.size_mb,
+                "lines": total_lines,
+                "pages": args.pages,
+                "page_lines": args.page_lines,
+                "reported_total_lines": reported_total,
+                "indexed_first_page_ms": round(indexed[0] * 1000, 3),
+                "indexed_deepest_page_ms": round(indexed[-1] * 1000, 3),
+                "indexed_first_pass": summarize(indexed),
+                "indexed_revisit": summarize(revisit),
+                "sequential": summarize(sequential),
+                "sequential_deepest_page_ms": round(sequential[-1] * 1000, 3),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
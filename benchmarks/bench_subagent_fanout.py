@@ -0,0 +1,116 @@
+"""Sub-agent fan-out throughput vs sequential ``invoke_agent`` calls.
+
+The stub model sleeps ``--latency-ms`` per request to stand in for provider
+latency, so the comparison shows how much wall-clock the batch saves and how
+much Code Puppy overhead remains per task.
+
+    python benchmarks/bench_subagent_fanout.py --tasks 16 --concurrency 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+from _harness import BENCH_MODEL, bootstrap_config, emit
+
+
+def _stub_model(latency_s: float):
+    from pydantic_ai.messages import ModelResponse, TextPart
+    from pydantic_ai.models.function import FunctionModel
+
+    async def respond(_messages, _info):
+        await asyncio.sleep(latency_s)
+        return ModelResponse(parts=[TextPart("done")])
+
+    async def respond_stream(_messages, _info):
+        await asyncio.sleep(latency_s)
+        yield "done"
+
+    return FunctionModel(
+        respond, stream_function=respond_stream, model_name=BENCH_MODEL
+    )
+
+
+async def _sequential(agent_name: str, tasks: int) -> float:
+    from code_puppy.tools.subagent_invocation import _invoke_agent_impl
+
+    started = time.perf_counter()
+    for i in range(tasks):
+        out = await _invoke_agent_impl(MagicMock(), agent_name, f"task {i}")
+        if out.error:
+            raise SystemExit(f"invocation failed: {out.error}")
+    return time.perf_counter() - started
+
+
+async def _fan_out(agent_name: str, tasks: int, concurrency: int) -> float:
+    from code_puppy.tools.subagent_fanout import (
+        ParallelAgentTask,
+        _invoke_agents_parallel_impl,
+    )
+
+    batch = [
+        ParallelAgentTask(agent_name=agent_name, prompt=f"task {i}")
+        for i in range(tasks)
+    ]
+    started = time.perf_counter()
+    out = await _invoke_agents_parallel_impl(
+        MagicMock(), batch, max_concurrency=concurrency
+    )
+    if out.completed != tasks:
+        raise SystemExit(f"fan-out incomplete: {out}")
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--agent", default="code-puppy")
+    args = parser.parse_args()
+
+    bootstrap_config()
+    from code_puppy.model_factory import ModelFactory
+
+    stub = _stub_model(args.latency_ms / 1000.0)
+    quiet = [
+        patch(f"code_puppy.tools.{module}.{name}")
+        for module, names in (
+            ("subagent_invocation", ("emit_success", "get_message_bus")),
+            ("subagent_fanout", ("emit_info", "emit_success", "emit_warning")),
+        )
+        for name in names
+    ]
+    with patch.object(ModelFactory, "get_model", return_value=stub) as get_model:
+        for p in quiet:
+            p.start()
+        try:
+            sequential_s = asyncio.run(_sequential(args.agent, args.tasks))
+            get_model.reset_mock()
+            fan_out_s = asyncio.run(_fan_out(args.agent, args.tasks, args.concurrency))
+        finally:
+            for p in quiet:
+                p.stop()
+        fan_out_model_builds = get_model.call_count
+
+    emit(
+        "subagent_fanout",
+        {
+            "tasks": args.tasks,
+            "concurrency": args.concurrency,
+            "model_latency_ms": args.latency_ms,
+            "sequential_s": round(sequential_s, 3),
+            "fan_out_s": round(fan_out_s, 3),
+            "speedup": round(sequential_s / fan_out_s, 2),
+            "sequential_tasks_per_s": round(args.tasks / sequential_s, 2),
+            "fan_out_tasks_per_s": round(args.tasks / fan_out_s, 2),
+            "fan_out_model_builds": fan_out_model_builds,
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
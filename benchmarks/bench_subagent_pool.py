@@ -0,0 +1,80 @@
+"""Repeated sub-agent invocation latency, with and without the warm pool.
+
+Drives the real ``_invoke_agent_impl`` (agent discovery, model resolution,
+``Agent`` construction, tool registration, run, session save) against an
+in-process stub model that answers instantly, so the numbers are pure
+Code Puppy overhead.
+
+    python benchmarks/bench_subagent_pool.py --calls 30 --agent code-puppy
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+from _harness import BENCH_MODEL, bootstrap_config, emit, summarize
+
+
+def _stub_model():
+    from pydantic_ai.messages import ModelResponse, TextPart
+    from pydantic_ai.models.function import FunctionModel
+
+    def respond(_messages, _info):
+        return ModelResponse(parts=[TextPart("done")])
+
+    async def respond_stream(_messages, _info):
+        yield "done"
+
+    return FunctionModel(
+        respond, stream_function=respond_stream, model_name=BENCH_MODEL
+    )
+
+
+async def _run(agent_name: str, calls: int) -> list[float]:
+    from code_puppy.tools.subagent_invocation import _invoke_agent_impl
+
+    samples = []
+    for i in range(calls):
+        started = time.perf_counter()
+        out = await _invoke_agent_impl(MagicMock(), agent_name, f"review #{i}")
+        samples.append(time.perf_counter() - started)
+        if out.error:
+            raise SystemExit(f"invocation failed: {out.error}")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--agent", default="code-puppy")
+    args = parser.parse_args()
+
+    from code_puppy.model_factory import ModelFactory
+    from code_puppy.tools.subagent_pool import invalidate_subagent_pool
+
+    stub = _stub_model()
+    with (
+        patch.object(ModelFactory, "get_model", return_value=stub),
+        patch("code_puppy.tools.subagent_invocation.emit_success"),
+        patch("code_puppy.tools.subagent_invocation.get_message_bus"),
+    ):
+        for pool_size in (0, 8):
+            bootstrap_config(subagent_pool_size=str(pool_size))
+            invalidate_subagent_pool()
+            samples = asyncio.run(_run(args.agent, args.calls))
+            emit(
+                "subagent_pool",
+                {
+                    "agent": args.agent,
+                    "pool_size": pool_size,
+                    "first_call_ms": round(samples[0] * 1000, 3),
+                    "repeat_calls": summarize(samples[1:] or samples),
+                },
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,19 +11,25 @@ hook; see :func:`code_puppy.callbacks.on_wrap_pydantic_agent`.
 
 from __future__ import annotations
 
+import os
+import threading
 import uuid
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from pydantic_ai import Agent as PydanticAgent
 from pydantic_ai.capabilities import ProcessHistory
 
+from code_puppy import turn_trace
 from code_puppy.agents._compaction import make_history_processor
+from code_puppy.agents._image_aging import make_image_aging_history_processor
 from code_puppy.agents._model_message_transform import build_model_message_transform
 from code_puppy.agents._output_limits import (
     build_response_clamp,
     build_tool_output_limits,
 )
+from code_puppy.agents._prompt_cache import build_prompt_cache_tracker
 from code_puppy.agents._steer_processor import make_steer_history_processor
 from code_puppy.agents.event_stream_handler import event_stream_handler
 from code_puppy.callbacks import (
@@ -45,6 +51,10 @@ from code_puppy.model_factory import ModelFactory, make_model_settings
 _AGENT_RULE_FILES = ("AGENTS.md", "AGENT.md", "agents.md", "agent.md")
 _CODE_PUPPY_DIR = ".code_puppy"
 
+# Assembled system prompts kept by ``_assemble_instructions``. Sub-agents have
+# their own identities, so a session builds a handful of distinct prompts.
+PROMPT_CACHE_MAX_ENTRIES = 64
+
 # Re-export the default so existing importers keep working. The *effective*
 # cap is ``get_agents_md_max_chars()`` (user override via /set); this constant
 # is just the fallback used by tests and the warning notice.
@@ -133,6 +143,39 @@ def _truncate_agents_md(content: str, source: str, max_chars: int) -> str:
     return content[:max_chars] + notice
 
 
+def _rule_candidates() -> List[Path]:
+    """Every AGENTS.md location ``load_puppy_rules`` may read, in priority order."""
+    return [
+        *(Path(CONFIG_DIR) / name for name in _AGENT_RULE_FILES),
+        *(Path(_CODE_PUPPY_DIR) / name for name in _AGENT_RULE_FILES),
+        *(Path(name) for name in _AGENT_RULE_FILES),
+    ]
+
+
+def _rules_signature(max_chars: int) -> Tuple[Any, ...]:
+    """Everything ``load_puppy_rules`` output depends on, minus file contents.
+
+    Each candidate contributes ``(mtime_ns, ctime_ns, size)`` (``None`` when
+    missing), so creating, deleting, editing or chmod-ing a rules file changes
+    the signature. The
+    working directory, config dir and home dir (used in truncation notices)
+    pin down which files the relative candidates are.
+    """
+    stats = []
+    for candidate in _rule_candidates():
+        try:
+            st = os.stat(candidate)
+        except OSError:
+            stats.append(None)
+        else:
+            stats.append((st.st_mtime_ns, st.st_ctime_ns, st.st_size))
+    return (os.getcwd(), CONFIG_DIR, str(Path.home()), max_chars, tuple(stats))
+
+
+# (signature, rules) of the last load_puppy_rules() call.
+_rules_cache: Optional[Tuple[Tuple[Any, ...], Optional[str]]] = None
+
+
 def load_puppy_rules() -> Optional[str]:
     """Load AGENT(S).md from global config dir and/or the current project dir.
 
@@ -149,10 +192,26 @@ def load_puppy_rules() -> Optional[str]:
     resolved once per call via :func:`get_agents_md_max_chars` so a user
     can raise (or lower) it with ``/set agents_md_max_chars=<int>``.
 
+    Files are only re-read when a candidate's stat signature, the working
+    directory or the cap changes; otherwise the previous result is returned.
+
     Returns ``None`` if neither exists.
     """
+    global _rules_cache
     max_chars = get_agents_md_max_chars()
-
+    signature = _rules_signature(max_chars)
+    cached = _rules_cache
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    # A file edited between the stat and the read is cached under its old
+    # signature, so the next call sees the new stat and reloads.
+    rules = _read_puppy_rules(max_chars)
+    _rules_cache = (signature, rules)
+    return rules
+
+
+def _read_puppy_rules(max_chars: int) -> Optional[str]:
+    """Uncached body of :func:`load_puppy_rules`."""
     global_rules: Optional[str] = None
     for name in _AGENT_RULE_FILES:
         candidate = Path(CONFIG_DIR) / name
@@ -563,38 +622,85 @@ def _is_gpt_5_6_family(model_name: Optional[str]) -> bool:
     return bool(model_name and "gpt-5.6" in model_name.lower())
 
 
-def _agent_exposes_tool(agent: Any, tool_name: str) -> bool:
+def _available_tools(agent: Any) -> Tuple[str, ...]:
     try:
-        return tool_name in (agent.get_available_tools() or ())
+        return tuple(agent.get_available_tools() or ())
     except Exception:
-        return False
+        return ()
+
+
+_prompt_cache: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+
+def invalidate_prompt_cache() -> None:
+    """Forget assembled prompts and loaded rules (tests, plugin reloads)."""
+    global _rules_cache
+    with _prompt_cache_lock:
+        _prompt_cache.clear()
+    _rules_cache = None
 
 
 def _assemble_instructions(agent: Any, resolved_model_name: str) -> str:
-    """Compose full system prompt + puppy rules + extended-thinking note."""
+    """Compose full system prompt + puppy rules + extended-thinking note.
+
+    Memoized on agent identity, model, tool set, the (stat-cached) AGENTS.md
+    rules and the runtime prompt itself, since ``load_prompt`` fragments may
+    change between runs. A repeated build returns the same
+    string without touching the rules files or re-running
+    ``prepare_prompt_for_model``, keeping the prompt prefix byte-stable for
+    provider-side prompt caching.
+    """
     from code_puppy.model_utils import prepare_prompt_for_model
     from code_puppy.tools import (
         EXTENDED_THINKING_PROMPT_NOTE,
         has_extended_thinking_active,
     )
 
-    instructions = agent.get_full_system_prompt()
+    system_prompt = agent.get_full_system_prompt()
     puppy_rules = load_puppy_rules()
+    tools = _available_tools(agent)
+    extended_thinking = has_extended_thinking_active(resolved_model_name)
+    gpt_5_6_guard = (
+        _build_gpt_5_6_invoke_agent_guard_text()
+        if _is_gpt_5_6_family(resolved_model_name) and "invoke_agent" in tools
+        else ""
+    )
+    key = (
+        agent.get_identity(),
+        agent.get_model_name(),
+        resolved_model_name,
+        tools,
+        puppy_rules,
+        extended_thinking,
+        gpt_5_6_guard,
+        system_prompt,
+    )
+    with _prompt_cache_lock:
+        cached = _prompt_cache.get(key)
+        if cached is not None:
+            _prompt_cache.move_to_end(key)
+            return cached
+
+    instructions = system_prompt
     if puppy_rules:
         instructions += f"\n{puppy_rules}"
 
-    if has_extended_thinking_active(resolved_model_name):
+    if extended_thinking:
         instructions += EXTENDED_THINKING_PROMPT_NOTE
 
     if _is_gpt_5_6_family(resolved_model_name):
-        if _agent_exposes_tool(agent, "invoke_agent"):
-            instructions += _build_gpt_5_6_invoke_agent_guard_text()
-        if _agent_exposes_tool(agent, "agent_run_shell_command"):
+        instructions += gpt_5_6_guard
+        if "agent_run_shell_command" in tools:
             instructions += _GPT_5_6_RUN_SHELL_COMMAND_GUARD_TEXT
 
     prepared = prepare_prompt_for_model(
         agent.get_model_name(), instructions, "", prepend_system_to_user=False
     )
+    with _prompt_cache_lock:
+        _prompt_cache[key] = prepared.instructions
+        while len(_prompt_cache) > PROMPT_CACHE_MAX_ENTRIES:
+            _prompt_cache.popitem(last=False)
     return prepared.instructions
 
 
@@ -626,18 +732,21 @@ def build_pydantic_agent(
     agent._puppy_rules = None
     message_group = message_group or str(uuid.uuid4())
 
-    models_config = ModelFactory.load_config()
-    model, resolved_model_name = load_model_with_fallback(
-        agent.get_model_name(),
-        models_config,
-        message_group,
-        agent_name=getattr(agent, "name", None),
-    )
-    instructions = _assemble_instructions(agent, resolved_model_name)
+    with turn_trace.span("agent.load_model"):
+        models_config = ModelFactory.load_config()
+        model, resolved_model_name = load_model_with_fallback(
+            agent.get_model_name(),
+            models_config,
+            message_group,
+            agent_name=getattr(agent, "name", None),
+        )
+    with turn_trace.span("prompt.assemble"):
+        instructions = _assemble_instructions(agent, resolved_model_name)
     mcp_servers = load_mcp_servers(agent_name=getattr(agent, "name", None))
     model_settings = make_model_settings(resolved_model_name)
     history_processor = make_history_processor(agent)
     steer_processor = make_steer_history_processor(agent)
+    image_aging_processor = make_image_aging_history_processor(agent)
     logical_agent_name = getattr(agent, "name", None) or agent.__class__.__name__
 
     def _new_pydantic_agent(toolsets: List[Any]) -> PydanticAgent:
@@ -653,19 +762,24 @@ def build_pydantic_agent(
             toolsets=toolsets,
             # Order matters: compaction first (may trim history to fit
             # context), THEN steer injection (a fresh steer must not be
-            # compacted away). ProcessHistory capabilities apply in
-            # registration order (replaces the deprecated
-            # `history_processors=` kwarg, removed in pydantic-ai v2).
+            # compacted away), then image aging (sees everything about to be
+            # sent, steered attachments included). ProcessHistory
+            # capabilities apply in registration order (replaces the
+            # deprecated `history_processors=` kwarg, removed in pydantic-ai
+            # v2).
             # ToolOutputLimits reduces oversized tool returns on a different
             # hook (after_tool_execute), so its position is inert; the
-            # response clamp runs before_model_request after both history
-            # processors. The plugin transform wraps the final model request.
+            # response clamp runs before_model_request after the history
+            # processors. The plugin transform wraps the final model request;
+            # the prompt-cache tracker only reads it after the response.
             capabilities=[
                 *build_tool_output_limits(),
                 ProcessHistory(history_processor),
                 ProcessHistory(steer_processor),
+                ProcessHistory(image_aging_processor),
                 build_response_clamp(),
                 build_model_message_transform(logical_agent_name),
+                build_prompt_cache_tracker(logical_agent_name),
             ],
             model_settings=model_settings,
         )
@@ -674,12 +788,13 @@ def build_pydantic_agent(
     # tool registry actually produced, and filter MCP to avoid name clashes.
     probe_agent = _new_pydantic_agent(toolsets=[])
     agent_tools = agent.get_available_tools()
-    register_tools_for_agent(
-        probe_agent,
-        agent_tools,
-        model_name=resolved_model_name,
-        agent_name=logical_agent_name,
-    )
+    with turn_trace.span("agent.register_tools", tools=len(agent_tools)):
+        register_tools_for_agent(
+            probe_agent,
+            agent_tools,
+            model_name=resolved_model_name,
+            agent_name=logical_agent_name,
+        )
 
     existing_tool_names: Set[str] = set(getattr(probe_agent, "_tools", {}) or {})
     filtered_mcp_servers = filter_conflicting_mcp_tools(
@@ -689,12 +804,13 @@ def build_pydantic_agent(
     # Pass 2: real build. MCP servers always go in the constructor; plugins
     # (e.g. DBOS) may swap them at run time via ``agent_run_context``.
     final_pydantic = _new_pydantic_agent(toolsets=filtered_mcp_servers)
-    register_tools_for_agent(
-        final_pydantic,
-        agent_tools,
-        model_name=resolved_model_name,
-        agent_name=logical_agent_name,
-    )
+    with turn_trace.span("agent.register_tools", tools=len(agent_tools)):
+        register_tools_for_agent(
+            final_pydantic,
+            agent_tools,
+            model_name=resolved_model_name,
+            agent_name=logical_agent_name,
+        )
 
     agent.cur_model = model
     agent._last_model_name = resolved_model_name
@@ -35,6 +35,7 @@ from pydantic_ai_harness.compaction import (
     compact_now,
 )
 
+from code_puppy import turn_trace
 from code_puppy.agents._history import (
     estimate_tokens_for_message,
     hash_message,
@@ -217,7 +218,8 @@ async def compact(
     # both wired as pure capabilities in _builder.py.
     try:
         strategy = build_compaction_strategy()
-        result = await strategy.compact(list(messages), ctx)
+        with turn_trace.span("history.compact", messages=len(messages)):
+            result = await strategy.compact(list(messages), ctx)
     except Exception as e:
         emit_error(f"Compaction failed: [{type(e).__name__}] {e}")
         return messages, []
@@ -295,6 +297,12 @@ def make_history_processor(agent: Any) -> Callable[..., Any]:
 
     async def history_processor(
         ctx: RunContext[Any], messages: List[ModelMessage]
+    ) -> List[ModelMessage]:
+        with turn_trace.span("history.process", messages=len(messages)):
+            return await _process(ctx, messages)
+
+    async def _process(
+        ctx: RunContext[Any], messages: List[ModelMessage]
     ) -> List[ModelMessage]:
         # The RunContext-annotated first parameter opts us into pydantic-ai's
         # 2-arg processor calling convention; the live ctx is handed straight
@@ -0,0 +1,204 @@
+"""History processor that ages old images out of the request payload.
+
+Screenshots and ``load_image_for_analysis`` results live in the history as
+``BinaryContent`` (inside the ``UserPromptPart`` that follows a tool return,
+or pasted by the user) and are re-sent on every model call until compaction
+drops them. This processor — wired into the agent's ``history_processors``
+AFTER compaction and steer injection — walks the images newest first:
+
+- images in the request being sent, plus the ``image_history_keep_recent``
+  newest overall, are left alone;
+- older ones become a low-resolution JPEG thumbnail, captioned with the
+  original size;
+- once the images counted so far exceed ``image_history_budget_kb``, older
+  ones are replaced by the caption alone.
+
+Only part *contents* change — no part or message is added or removed — so
+tool call / return pairing is untouched. Rewritten messages are new objects
+(the originals are never mutated) and are mirrored into
+``agent._message_history`` so each image is shrunk once, not on every call.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import io
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic_ai.messages import (
+    BinaryContent,
+    ModelMessage,
+    ModelRequest,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from code_puppy import turn_trace
+
+logger = logging.getLogger(__name__)
+
+# Longest edge of the thumbnails that stand in for older images.
+THUMBNAIL_EDGE = 256
+
+_THUMB_CAPTION = "[Earlier image ({}) shown as a {}x{} thumbnail to save context]"
+_STUB_CAPTION = "[Earlier image ({}) removed to save context]"
+_THUMB_CAPTION_RE = re.compile(
+    r"^\[Earlier image \((.*)\) shown as a \d+x\d+ thumbnail to save context\]$"
+)
+
+_ImageRef = Tuple[int, int, int]  # (message index, part index, item index)
+
+
+def _items(part: Any) -> Optional[List[Any]]:
+    """Content items of a part that can carry images, else None."""
+    if not isinstance(part, (UserPromptPart, ToolReturnPart)):
+        return None
+    content = part.content
+    if isinstance(content, (list, tuple)):
+        return list(content)
+    if isinstance(content, BinaryContent):
+        return [content]
+    return None
+
+
+def _dimensions(item: BinaryContent) -> Optional[Tuple[int, int]]:
+    """Image size from the header only (no pixel decode); None if unreadable."""
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(item.data)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def _describe(item: BinaryContent, size: Optional[Tuple[int, int]]) -> str:
+    return f"{item.media_type}, {size[0]}x{size[1]}" if size else item.media_type
+
+
+async def age_history_images(
+    messages: List[ModelMessage], keep_recent: int, budget_bytes: int
+) -> List[ModelMessage]:
+    """Return ``messages`` with older images thumbnailed or stubbed.
+
+    Returns the very same list when nothing needed to change.
+    """
+    from code_puppy.tools.image_tools import make_thumbnail
+
+    refs: List[_ImageRef] = []
+    last_request = -1
+    for mi, msg in enumerate(messages):
+        if not isinstance(msg, ModelRequest):
+            continue
+        last_request = mi
+        for pi, part in enumerate(msg.parts):
+            for ii, item in enumerate(_items(part) or ()):
+                if isinstance(item, BinaryContent) and item.is_image:
+                    refs.append((mi, pi, ii))
+    if not refs:
+        return messages
+
+    # Replacement items per image, decided newest first.
+    replacements: Dict[_ImageRef, List[Any]] = {}
+    total = 0
+    kept = 0
+    for ref in reversed(refs):
+        mi, pi, ii = ref
+        item = _items(messages[mi].parts[pi])[ii]
+        if mi == last_request or kept < keep_recent:
+            kept += 1
+            total += len(item.data)
+            continue
+        over_budget = bool(budget_bytes) and total + len(item.data) > budget_bytes
+        size = _dimensions(item)
+        if not over_budget and size and max(size) > THUMBNAIL_EDGE:
+            try:
+                thumb = await make_thumbnail(item.data, THUMBNAIL_EDGE)
+            except Exception:
+                logger.debug("Could not thumbnail history image", exc_info=True)
+            else:
+                thumb_bytes = thumb["image_bytes"]
+                if not budget_bytes or total + len(thumb_bytes) <= budget_bytes:
+                    total += len(thumb_bytes)
+                    replacements[ref] = [
+                        _THUMB_CAPTION.format(
+                            _describe(item, size),
+                            thumb["output_width"],
+                            thumb["output_height"],
+                        ),
+                        BinaryContent(data=thumb_bytes, media_type=thumb["media_type"]),
+                    ]
+                    continue
+                over_budget = True
+        if over_budget:
+            replacements[ref] = [_STUB_CAPTION.format(_describe(item, size))]
+        else:
+            total += len(item.data)  # already thumbnail-sized
+    if not replacements:
+        return messages
+
+    by_part: Dict[Tuple[int, int], Dict[int, List[Any]]] = {}
+    for (mi, pi, ii), new_items in replacements.items():
+        by_part.setdefault((mi, pi), {})[ii] = new_items
+
+    aged = list(messages)
+    for (mi, pi), changes in sorted(by_part.items()):
+        msg = aged[mi]
+        part = msg.parts[pi]
+        content: List[Any] = []
+        for ii, item in enumerate(_items(part)):
+            new_items = changes.get(ii)
+            if new_items is None:
+                content.append(item)
+                continue
+            if len(new_items) == 1 and content and isinstance(content[-1], str):
+                # Stubbing a thumbnail: fold its caption into the stub.
+                match = _THUMB_CAPTION_RE.match(content[-1])
+                if match:
+                    content[-1] = _STUB_CAPTION.format(match.group(1))
+                    continue
+            content.extend(new_items)
+        parts = list(msg.parts)
+        parts[pi] = dataclasses.replace(part, content=content)
+        aged[mi] = dataclasses.replace(msg, parts=parts)
+    return aged
+
+
+def make_image_aging_history_processor(agent: Any) -> Callable[..., Any]:
+    """Build a history processor that shrinks older images (see module doc).
+
+    Returns a closure suitable for pydantic-ai's ``history_processors`` list.
+    """
+
+    async def image_aging_history_processor(
+        messages: List[ModelMessage],
+    ) -> List[ModelMessage]:
+        from code_puppy.config import (
+            get_image_history_budget_kb,
+            get_image_history_keep_recent,
+        )
+
+        with turn_trace.span("history.age_images"):
+            aged = await age_history_images(
+                messages,
+                get_image_history_keep_recent(),
+                get_image_history_budget_kb() * 1024,
+            )
+        if aged is messages:
+            return messages
+
+        # Mirror into agent._message_history so the shrunk images persist
+        # across the turn boundary (same as the steer processor).
+        replaced = {id(old): new for old, new in zip(messages, aged) if old is not new}
+        if hasattr(agent, "_message_history"):
+            agent._message_history = [
+                replaced.get(id(m), m) for m in agent._message_history
+            ]
+        return aged
+
+    return image_aging_history_processor
+
+
+__all__ = ["age_history_images", "make_image_aging_history_processor"]
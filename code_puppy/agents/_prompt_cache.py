@@ -0,0 +1,372 @@
+"""Prompt-cache efficiency tracking and prefix-stability detection.
+
+Provider prompt caching (``anthropic_cache_*`` in ``model_factory``) only
+pays off while the request prefix -- system prompt, tool definitions, then
+the leading messages -- stays byte-identical between requests. Nothing made
+hits or misses visible, so a reordered tool list or a mutated prompt silently
+turned every request into a full-price cache write.
+
+``build_prompt_cache_tracker`` returns an ``after_model_request`` capability
+that records, per model request, the billed input / cache-read / cache-write
+tokens together with a fingerprint of the prefix segments. Consecutive
+requests of the same agent (of the same session, for sub-agents, which run
+side by side) are compared; when a segment that should only ever grow
+changed, the record names it:
+
+* ``model`` -- a different model (caches are per model);
+* ``system_prompt`` -- the instructions text changed;
+* ``tool_order`` / ``tool_set`` / ``tool_definitions`` -- the same tools
+  reordered, tools added or removed, or a description/schema changed;
+* ``history_compacted`` / ``history_rewritten`` -- an earlier message was
+  dropped or edited instead of new ones being appended;
+* ``cache_expired`` -- nothing changed, yet the provider read no cache.
+
+``/cache`` renders :func:`format_prompt_cache_report` for the session.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pydantic_ai import RunContext
+from pydantic_ai.capabilities import Hooks
+from pydantic_ai.messages import ModelRequest, ModelResponse
+from pydantic_ai.models import ModelRequestContext
+
+from code_puppy.agents._history import stringify_part
+from code_puppy.i18n import t
+
+# Per-request records kept for the report; totals cover the whole session.
+MAX_RECORDS = 500
+# Prefix chains remembered for comparison; the least recently used goes first.
+MAX_CHAINS = 64
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _instructions_text(request_context: ModelRequestContext) -> str:
+    parts = request_context.model_request_parameters.instruction_parts
+    if parts:
+        return "\n\n".join(part.content for part in parts)
+    for message in reversed(request_context.messages):
+        if isinstance(message, ModelRequest) and message.instructions:
+            return message.instructions
+    return ""
+
+
+def _tool_digests(request_context: ModelRequestContext) -> Tuple[Tuple[str, str], ...]:
+    params = request_context.model_request_parameters
+    return tuple(
+        (
+            tool.name,
+            _digest(
+                json.dumps(
+                    [tool.description, tool.parameters_json_schema],
+                    sort_keys=True,
+                    default=str,
+                )
+            ),
+        )
+        for tool in [*params.function_tools, *params.output_tools]
+    )
+
+
+def _message_digest(message: Any) -> str:
+    # Unlike ``hash_message`` this leaves out ``instructions``: those are
+    # their own segment, and a prompt change must not look like a rewrite of
+    # every message.
+    kind = getattr(message, "kind", "")
+    return _digest("||".join([kind, *map(stringify_part, message.parts)]))
+
+
+@dataclass(frozen=True)
+class PrefixFingerprint:
+    """Digests of the cacheable request prefix, segment by segment."""
+
+    model: str
+    system_prompt: str
+    tools: Tuple[Tuple[str, str], ...]
+    messages: Tuple[str, ...]
+
+
+def prefix_changes(
+    previous: PrefixFingerprint, current: PrefixFingerprint
+) -> List[str]:
+    """Describe every prefix segment of ``current`` that broke ``previous``.
+
+    Appending messages is expected and not reported.
+    """
+    changes: List[str] = []
+    if previous.model != current.model:
+        changes.append(f"model: {previous.model} -> {current.model}")
+    if previous.system_prompt != current.system_prompt:
+        changes.append("system_prompt: instructions changed")
+    if previous.tools != current.tools:
+        old_names = [name for name, _ in previous.tools]
+        new_names = [name for name, _ in current.tools]
+        if old_names != new_names and sorted(old_names) == sorted(new_names):
+            changes.append("tool_order: same tools, different order")
+        elif set(old_names) != set(new_names):
+            added = sorted(set(new_names) - set(old_names))
+            removed = sorted(set(old_names) - set(new_names))
+            detail = ", ".join(
+                [f"+{name}" for name in added] + [f"-{name}" for name in removed]
+            )
+            changes.append(f"tool_set: {detail}")
+        else:
+            old_defs = dict(previous.tools)
+            edited = [
+                name for name, digest in current.tools if old_defs[name] != digest
+            ]
+            changes.append(f"tool_definitions: {', '.join(edited)}")
+    old_messages, new_messages = previous.messages, current.messages
+    for index, digest in enumerate(old_messages):
+        if index >= len(new_messages) or new_messages[index] != digest:
+            kind = (
+                "history_compacted"
+                if len(new_messages) < len(old_messages)
+                else "history_rewritten"
+            )
+            changes.append(
+                f"{kind}: message {index} of {len(old_messages)} no longer matches"
+            )
+            break
+    return changes
+
+
+@dataclass
+class CacheRequestRecord:
+    """Token usage and prefix diagnosis for one model request."""
+
+    agent: str
+    model: str
+    at: float
+    input_tokens: int
+    cache_read_tokens: int
+    cache_write_tokens: int
+    changes: List[str] = field(default_factory=list)
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.cache_read_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+@dataclass
+class _AgentTotals:
+    requests: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    prefix_breaks: int = 0
+
+
+class PromptCacheTracker:
+    """Session-wide prompt-cache accounting, one prefix chain per agent."""
+
+    def __init__(self, max_records: int = MAX_RECORDS, max_chains: int = MAX_CHAINS):
+        self._lock = threading.Lock()
+        self.records: Deque[CacheRequestRecord] = deque(maxlen=max_records)
+        self.totals: Dict[str, _AgentTotals] = {}
+        self.max_chains = max_chains
+        # chain -> (fingerprint, weakrefs to the messages it was computed
+        # from, cache was warm). Weak so a finished conversation's history
+        # (screenshots included) isn't kept alive by the diagnostics.
+        self._last: OrderedDict[
+            str, Tuple[PrefixFingerprint, Tuple[weakref.ref, ...], bool]
+        ] = OrderedDict()
+
+    def _fingerprint(
+        self, chain: str, model: str, request_context: ModelRequestContext
+    ) -> PrefixFingerprint:
+        messages = list(request_context.messages)
+        previous = self._last.get(chain)
+        reusable = previous[1] if previous else ()
+        old_digests = previous[0].messages if previous else ()
+        digests = []
+        for index, message in enumerate(messages):
+            # History is append-only and pydantic-ai messages are replaced,
+            # not mutated, so an identical object still has its old digest.
+            if index < len(reusable) and reusable[index]() is message:
+                digests.append(old_digests[index])
+            else:
+                digests.append(_message_digest(message))
+        return PrefixFingerprint(
+            model=model,
+            system_prompt=_digest(_instructions_text(request_context)),
+            tools=_tool_digests(request_context),
+            messages=tuple(digests),
+        )
+
+    def record(
+        self,
+        agent: str,
+        request_context: ModelRequestContext,
+        response: ModelResponse,
+        chain: Optional[str] = None,
+    ) -> CacheRequestRecord:
+        """Account one request to ``agent``.
+
+        Its prefix is compared with the previous request on the same
+        ``chain`` (default: the agent name), so concurrent conversations of
+        one agent don't read as breaking each other's prefix.
+        """
+        usage = response.usage
+        model = response.model_name or getattr(request_context.model, "model_name", "")
+        chain = chain or agent
+        with self._lock:
+            fingerprint = self._fingerprint(chain, model, request_context)
+            previous = self._last.get(chain)
+            changes = prefix_changes(previous[0], fingerprint) if previous else []
+            cache_read = usage.cache_read_tokens or 0
+            cache_write = usage.cache_write_tokens or 0
+            if previous and previous[2] and not changes and not cache_read:
+                changes.append("cache_expired: prefix unchanged but nothing was read")
+            record = CacheRequestRecord(
+                agent=agent,
+                model=model,
+                at=time.time(),
+                input_tokens=usage.input_tokens or 0,
+                cache_read_tokens=cache_read,
+                cache_write_tokens=cache_write,
+                changes=changes,
+            )
+            self.records.append(record)
+            totals = self.totals.setdefault(agent, _AgentTotals())
+            totals.requests += 1
+            totals.input_tokens += record.input_tokens
+            totals.cache_read_tokens += cache_read
+            totals.cache_write_tokens += cache_write
+            totals.prefix_breaks += bool(changes)
+            self._last[chain] = (
+                fingerprint,
+                tuple(weakref.ref(message) for message in request_context.messages),
+                bool(cache_read or cache_write),
+            )
+            self._last.move_to_end(chain)
+            while len(self._last) > self.max_chains:
+                self._last.popitem(last=False)
+        return record
+
+    def forget(self, chain: str) -> None:
+        """Drop ``chain``'s prefix state once its conversation has ended."""
+        with self._lock:
+            self._last.pop(chain, None)
+
+    def report(self) -> Dict[str, Any]:
+        """Per-agent totals plus every request that broke its prefix."""
+        with self._lock:
+            agents = {
+                name: {
+                    "requests": t.requests,
+                    "input_tokens": t.input_tokens,
+                    "cache_read_tokens": t.cache_read_tokens,
+                    "cache_write_tokens": t.cache_write_tokens,
+                    "hit_ratio": (
+                        t.cache_read_tokens / t.input_tokens if t.input_tokens else 0.0
+                    ),
+                    "prefix_breaks": t.prefix_breaks,
+                }
+                for name, t in self.totals.items()
+            }
+            breaks = [
+                {
+                    "agent": r.agent,
+                    "model": r.model,
+                    "at": r.at,
+                    "cache_read_tokens": r.cache_read_tokens,
+                    "cache_write_tokens": r.cache_write_tokens,
+                    "changes": list(r.changes),
+                }
+                for r in self.records
+                if r.changes
+            ]
+        return {"agents": agents, "breaks": breaks}
+
+
+_tracker = PromptCacheTracker()
+
+
+def get_prompt_cache_tracker() -> PromptCacheTracker:
+    return _tracker
+
+
+def reset_prompt_cache_tracker() -> None:
+    """Start a fresh session report."""
+    global _tracker
+    _tracker = PromptCacheTracker()
+
+
+def _session_chain(agent_name: Optional[str], session_id: Optional[str]) -> str:
+    return f"{agent_name or 'agent'}@{session_id}"
+
+
+def forget_prompt_cache_session(agent_name: Optional[str], session_id: str) -> None:
+    """Release the prefix chain of a finished sub-agent session."""
+    _tracker.forget(_session_chain(agent_name, session_id))
+
+
+def build_prompt_cache_tracker(
+    agent_name: Optional[str], per_session: bool = False
+) -> Hooks:
+    """Build the ``after_model_request`` hook that feeds the session tracker.
+
+    ``per_session`` keeps one prefix chain per message-bus session (set for
+    each sub-agent invocation) while still totalling under ``agent_name``.
+    """
+    name = agent_name or "agent"
+
+    async def after_model_request(
+        _ctx: RunContext[Any],
+        *,
+        request_context: ModelRequestContext,
+        response: ModelResponse,
+    ) -> ModelResponse:
+        try:
+            chain = None
+            if per_session:
+                from code_puppy.messaging.bus import get_session_context
+
+                chain = _session_chain(name, get_session_context())
+            _tracker.record(name, request_context, response, chain=chain)
+        except Exception:
+            pass  # diagnostics must never fail a model request
+        return response
+
+    return Hooks(after_model_request=after_model_request)
+
+
+def format_prompt_cache_report(max_breaks: int = 10) -> str:
+    """Human-readable session report for ``/cache``."""
+    report = _tracker.report()
+    if not report["agents"]:
+        return t("cmd.cache.empty")
+    lines = [t("cmd.cache.header")]
+    for name, stats in report["agents"].items():
+        lines.append(
+            t(
+                "cmd.cache.agent_line",
+                agent=name,
+                requests=stats["requests"],
+                ratio=f"{stats['hit_ratio']:.0%}",
+                input_tokens=f"{stats['input_tokens']:,}",
+                written=f"{stats['cache_write_tokens']:,}",
+                breaks=stats["prefix_breaks"],
+            )
+        )
+    breaks = report["breaks"][-max_breaks:]
+    if breaks:
+        lines.append(t("cmd.cache.breaks_header"))
+        for entry in breaks:
+            stamp = time.strftime("%H:%M:%S", time.localtime(entry["at"]))
+            for change in entry["changes"]:
+                lines.append(f"  {stamp} {entry['agent']}: {change}")
+    return "\n".join(lines)
@@ -67,6 +67,7 @@ try:
 except ImportError:  # pragma: no cover - 3.10 only
     BaseExceptionGroup = Exception  # type: ignore[misc,assignment]
 
+from code_puppy import turn_trace
 from code_puppy.agent_execution_context import executing_agent_context
 from code_puppy.agents import _history, _key_listeners
 from code_puppy.agents._builder import build_pydantic_agent
@@ -708,11 +709,13 @@ async def _run_with_mcp_impl(
         pass
 
     if agent._code_generation_agent is None:
-        build_pydantic_agent(agent)
+        with turn_trace.span("agent.build", agent=agent.name):
+            build_pydantic_agent(agent)
     pydantic_agent = agent._code_generation_agent
 
     if output_type is not None:
-        pydantic_agent = build_pydantic_agent(agent, output_type=output_type)
+        with turn_trace.span("agent.build", agent=agent.name):
+            pydantic_agent = build_pydantic_agent(agent, output_type=output_type)
 
     prompt = _should_prepend_system_prompt(agent, prompt)
     prompt_payload = _build_prompt_payload(prompt, attachments, link_attachments)
@@ -755,13 +758,16 @@ async def _run_with_mcp_impl(
 
         @_main_retry
         async def _call() -> Any:
-            return await pydantic_agent.run(
-                prompt_to_use,
-                message_history=agent._message_history,
-                usage_limits=usage_limits,
-                event_stream_handler=stream_handler,
-                **kwargs,
-            )
+            # Self time of this span is model latency plus framework overhead:
+            # tools, rendering, history processing and callbacks have their own.
+            with turn_trace.span("agent.run", agent=agent.name):
+                return await pydantic_agent.run(
+                    prompt_to_use,
+                    message_history=agent._message_history,
+                    usage_limits=usage_limits,
+                    event_stream_handler=stream_handler,
+                    **kwargs,
+                )
 
         async def _call_with_exception_recovery() -> Any:
             """Run ``_call`` and let plugins request one exception retry."""
@@ -794,13 +800,14 @@ async def _run_with_mcp_impl(
         async def _follow_up_run(follow_up_prompt: Any) -> Any:
             @_main_retry
             async def _call_follow_up() -> Any:
-                return await pydantic_agent.run(
-                    follow_up_prompt,
-                    message_history=agent._message_history,
-                    usage_limits=usage_limits,
-                    event_stream_handler=stream_handler,
-                    **kwargs,
-                )
+                with turn_trace.span("agent.run", agent=agent.name, follow_up=True):
+                    return await pydantic_agent.run(
+                        follow_up_prompt,
+                        message_history=agent._message_history,
+                        usage_limits=usage_limits,
+                        event_stream_handler=stream_handler,
+                        **kwargs,
+                    )
 
             return await _call_follow_up()
 
@@ -960,7 +967,8 @@ async def _run_with_mcp_impl(
         # Peek at the singleton rather than construct a manager just to ask.
         _existing_manager = _mcp_manager_module._manager_instance
         if _existing_manager is not None:
-            await _existing_manager.wait_for_pending_starts()
+            with turn_trace.span("mcp.pending_starts"):
+                await _existing_manager.wait_for_pending_starts()
     except Exception:
         # MCP trouble must never block the agent run itself.
         pass
@@ -283,6 +283,12 @@ Invoke a sub-agent with an explicit one-call model override. `model_name` is req
 Returns: `{{response, agent_name, session_id, model_name, error}}`
 - **session_id in the response is the FULL ID** - use this to continue the conversation!
 
+#### `invoke_agents_parallel(tasks: list[{{agent_name, prompt, session_id?}}], max_concurrency: int | None = None, timeout_seconds: float | None = None)`
+Run independent sub-agent tasks concurrently under a concurrency cap and one wall-clock budget. Only for orchestrator agents that fan work out.
+
+Returns: `{{results: [{{index, agent_name, status, response, partial_response, session_id, model_name, error, duration_ms}}], completed, failed, timed_out, elapsed_ms}}`
+- `status` is `completed`, `failed` or `timed_out`; timed-out tasks keep the text of their last finished turn in `partial_response`
+
 Example usage:
 ```python
 # Common case: one-off invocation (no memory needed)
@@ -361,6 +367,7 @@ Available templates for tools:
 - `list_agents`: Standard agent listing operations
 - `invoke_agent`: Standard agent invocation operations
 - `invoke_agent_with_model`: Explicit model-override agent invocation for power-user orchestrators
+- `invoke_agents_parallel`: Concurrent fan-out of independent sub-agent tasks for orchestrator agents
 - `list_available_models`: Safe model alias discovery for model-override workflows
 
 Each agent you create should only include templates for tools it actually uses. The `replace_in_file` tool template
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import math
+import time
 from collections.abc import AsyncIterable
 from typing import Any, Optional
 
@@ -19,6 +20,7 @@ from rich.console import Console
 from rich.markup import escape
 from rich.text import Text
 
+from code_puppy import turn_trace
 from code_puppy.agents.smooth_stream import (
     SmoothTermflowWriter,
     ThinkingStreamSmoother,
@@ -60,6 +62,18 @@ def _fire_stream_event(event_type: str, event_data: Any) -> None:
         logger.debug(f"Error firing stream event callback: {e}")
 
 
+async def _traced_events(events: AsyncIterable[Any]) -> AsyncIterable[Any]:
+    """Record the time the handler spends on each event (turn tracing only).
+
+    The gap between handing out an event and being asked for the next one
+    is exactly the rendering cost, without re-indenting the handler body.
+    """
+    async for event in events:
+        started = time.perf_counter()
+        yield event
+        turn_trace.record("render.stream_event", started, event=type(event).__name__)
+
+
 # Module-level console for streaming output
 # Set via set_streaming_console() so every stream shares one console
 _streaming_console: Optional[Console] = None
@@ -145,6 +159,9 @@ async def event_stream_handler(
             pass  # Just consume events without rendering
         return
 
+    if turn_trace.is_recording():
+        events = _traced_events(events)
+
     # NOTE: TTFT/gen-speed timing lives in callback hooks (agent_run_start +
     # stream_event + agent_run_end); this handler only renders.
 
@@ -1,10 +1,13 @@
 import asyncio
 import logging
+import time
 import traceback
 from typing import Any, Callable, Dict, List, Literal, Optional, Set, Tuple
 
 from pydantic_ai.messages import ModelMessage
 
+from code_puppy import turn_trace
+
 PhaseType = Literal[
     "startup",
     "shutdown",
@@ -185,6 +188,49 @@ BLOCKING_PHASES: frozenset = frozenset({"pre_tool_call", "run_shell_command"})
 # different policies, and one phase's choice must not leak into another.
 _fail_closed_callbacks: Set[Tuple[PhaseType, CallbackFunc]] = set()
 
+# (phase, callback) pairs registered with concurrent=True. The async trigger
+# starts these together and waits for them at most the phase timeout, while
+# the remaining callbacks keep running one after another in registration
+# order. Keyed by pair for the same reason as the fail-closed set.
+_concurrent_callbacks: Set[Tuple[PhaseType, CallbackFunc]] = set()
+
+# How long the async trigger waits for a phase's concurrent callbacks before
+# cancelling the stragglers. Sequential callbacks are never timed out.
+DEFAULT_CONCURRENT_TIMEOUT = 5.0
+_phase_timeouts: Dict[PhaseType, float] = {}
+
+
+class CallbackTiming:
+    """Accumulated wall time of one callback on one phase."""
+
+    __slots__ = ("calls", "total", "max", "timeouts")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+_callback_timings: Dict[Tuple[PhaseType, CallbackFunc], CallbackTiming] = {}
+
+
+def _record_timing(
+    phase: PhaseType, callback: CallbackFunc, seconds: float, timed_out: bool = False
+) -> None:
+    timing = _callback_timings.get((phase, callback))
+    if timing is None:
+        timing = _callback_timings[(phase, callback)] = CallbackTiming()
+    timing.add(seconds)
+    if timed_out:
+        timing.timeouts += 1
+
 
 def _failure_result(
     callback: CallbackFunc, phase: PhaseType, error: Exception
@@ -254,7 +300,10 @@ def _get_disabled_plugins() -> Set[str]:
 
 
 def register_callback(
-    phase: PhaseType, func: CallbackFunc, fail_closed: bool = False
+    phase: PhaseType,
+    func: CallbackFunc,
+    fail_closed: bool = False,
+    concurrent: bool = False,
 ) -> None:
     """Register ``func`` for ``phase``.
 
@@ -267,6 +316,12 @@ def register_callback(
             with this set, a raised exception is reported as a block instead.
             Defaults to ``False``, so every existing callback keeps its current
             behavior.
+        concurrent: Declare that ``func`` does not depend on the other
+            callbacks of ``phase`` running before or after it (telemetry
+            flushes, notifications). The async trigger then runs it
+            alongside the rest and stops waiting for it after the phase
+            timeout (see :func:`set_phase_timeout`). The sync trigger still
+            calls it in order. Defaults to ``False``: sequential, untimed.
 
     Raises:
         ValueError: unknown phase, or ``fail_closed`` on a phase whose
@@ -295,6 +350,8 @@ def register_callback(
         # rather than silently keeping the weaker fail-open behavior.
         if fail_closed:
             _fail_closed_callbacks.add((phase, func))
+        if concurrent:
+            _concurrent_callbacks.add((phase, func))
         logger.debug(
             f"Callback {func.__name__} already registered for phase '{phase}', skipping"
         )
@@ -304,6 +361,8 @@ def register_callback(
 
     if fail_closed:
         _fail_closed_callbacks.add((phase, func))
+    if concurrent:
+        _concurrent_callbacks.add((phase, func))
 
     # Record ownership if we know which plugin is loading.
     if _current_loading_plugin is not None:
@@ -319,6 +378,7 @@ def unregister_callback(phase: PhaseType, func: CallbackFunc) -> bool:
     try:
         _callbacks[phase].remove(func)
         _fail_closed_callbacks.discard((phase, func))
+        _concurrent_callbacks.discard((phase, func))
         logger.debug(
             f"Unregistered async callback {func.__name__} from phase '{phase}'"
         )
@@ -332,12 +392,15 @@ def clear_callbacks(phase: Optional[PhaseType] = None) -> None:
         for p in _callbacks:
             _callbacks[p].clear()
         _fail_closed_callbacks.clear()
+        _concurrent_callbacks.clear()
         logger.debug("Cleared all async callbacks")
     else:
         if phase in _callbacks:
             _callbacks[phase].clear()
             for entry in [e for e in _fail_closed_callbacks if e[0] == phase]:
                 _fail_closed_callbacks.discard(entry)
+            for entry in [e for e in _concurrent_callbacks if e[0] == phase]:
+                _concurrent_callbacks.discard(entry)
             logger.debug(f"Cleared async callbacks for phase '{phase}'")
 
 
@@ -384,6 +447,63 @@ def count_callbacks(phase: Optional[PhaseType] = None) -> int:
     return len(_callbacks.get(phase, []))
 
 
+def set_phase_timeout(phase: PhaseType, seconds: Optional[float]) -> None:
+    """Bound how long *phase* waits for its concurrent callbacks.
+
+    ``None`` restores :data:`DEFAULT_CONCURRENT_TIMEOUT`.
+    """
+    if phase not in _callbacks:
+        raise ValueError(f"Unsupported phase: {phase}")
+    if seconds is None:
+        _phase_timeouts.pop(phase, None)
+    elif seconds <= 0:
+        raise ValueError(f"Phase timeout must be positive, got {seconds}")
+    else:
+        _phase_timeouts[phase] = float(seconds)
+
+
+def get_phase_timeout(phase: PhaseType) -> float:
+    return _phase_timeouts.get(phase, DEFAULT_CONCURRENT_TIMEOUT)
+
+
+def get_slowest_callbacks(
+    phase: Optional[PhaseType] = None, limit: int = 5
+) -> List[Dict[str, Any]]:
+    """Return the callbacks that cost the most wall time, per phase.
+
+    Up to *limit* entries per phase (only *phase* when given), ordered by
+    phase and then by total time, slowest first. Durations are in
+    milliseconds; ``plugin`` is the owning plugin, or ``None`` for core
+    registrations.
+    """
+    by_phase: Dict[PhaseType, List[Dict[str, Any]]] = {}
+    for (cb_phase, callback), timing in list(_callback_timings.items()):
+        if phase is not None and cb_phase != phase:
+            continue
+        by_phase.setdefault(cb_phase, []).append(
+            {
+                "phase": cb_phase,
+                "callback": getattr(callback, "__qualname__", repr(callback)),
+                "plugin": _callback_owners.get(callback),
+                "concurrent": (cb_phase, callback) in _concurrent_callbacks,
+                "calls": timing.calls,
+                "total_ms": timing.total * 1000,
+                "mean_ms": timing.total / timing.calls * 1000,
+                "max_ms": timing.max * 1000,
+                "timeouts": timing.timeouts,
+            }
+        )
+    slowest: List[Dict[str, Any]] = []
+    for cb_phase in sorted(by_phase):
+        entries = sorted(by_phase[cb_phase], key=lambda e: e["total_ms"], reverse=True)
+        slowest.extend(entries[:limit])
+    return slowest
+
+
+def reset_callback_timings() -> None:
+    _callback_timings.clear()
+
+
 def get_feature_capability(name: str) -> bool:
     """Return the last plugin-provided state for *name*, or safely default false."""
     results = _trigger_callbacks_sync("feature_capability", name)
@@ -411,6 +531,7 @@ def _trigger_callbacks_sync(
 
     results = []
     for callback in callbacks:
+        started = time.perf_counter()
         try:
             result = callback(*args, **kwargs)
             # Handle async callbacks - if we get a coroutine, run it
@@ -443,9 +564,15 @@ def _trigger_callbacks_sync(
                 except RuntimeError:
                     # No running loop — isolated thread, so asyncio.run() is safe.
                     result = asyncio.run(result)
+            _record_timing(phase, callback, time.perf_counter() - started)
+            turn_trace.record(f"callback.{phase}", started, callback=callback.__name__)
             results.append(result)
             logger.debug(f"Successfully executed callback {callback.__name__}")
         except Exception as e:
+            _record_timing(phase, callback, time.perf_counter() - started)
+            turn_trace.record(
+                f"callback.{phase}", started, callback=callback.__name__, error=True
+            )
             logger.error(
                 f"Callback {callback.__name__} failed in phase '{phase}': {e}\n"
                 f"{traceback.format_exc()}"
@@ -460,7 +587,39 @@ def _trigger_callbacks_sync(
     return results
 
 
+async def _run_callback(
+    phase: PhaseType, callback: CallbackFunc, args: tuple, kwargs: dict
+) -> Any:
+    """Run one callback with error isolation, recording its duration."""
+    started = time.perf_counter()
+    try:
+        with turn_trace.span(f"callback.{phase}", callback=callback.__name__):
+            result = callback(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = await result
+    except Exception as e:
+        _record_timing(phase, callback, time.perf_counter() - started)
+        logger.error(
+            f"Async callback {callback.__name__} failed in phase '{phase}': {e}\n"
+            f"{traceback.format_exc()}"
+        )
+        if (phase, callback) in _fail_closed_callbacks:
+            return _failure_result(callback, phase, e)
+        return None
+    _record_timing(phase, callback, time.perf_counter() - started)
+    logger.debug(f"Successfully executed async callback {callback.__name__}")
+    return result
+
+
 async def _trigger_callbacks(phase: PhaseType, *args, **kwargs) -> List[Any]:
+    """Run the callbacks for ``phase`` and return their results in order.
+
+    Callbacks registered with ``concurrent=True`` are started first as
+    tasks; the others then run one at a time in registration order, exactly
+    as before. Concurrent callbacks still running when the phase timeout
+    expires (counted from when the sequential ones finish) are cancelled
+    and contribute ``None`` -- or a block result if fail-closed.
+    """
     callbacks = get_callbacks(phase)
 
     if not callbacks:
@@ -469,23 +628,46 @@ async def _trigger_callbacks(phase: PhaseType, *args, **kwargs) -> List[Any]:
 
     logger.debug(f"Triggering {len(callbacks)} async callbacks for phase '{phase}'")
 
-    results = []
-    for callback in callbacks:
-        try:
-            result = callback(*args, **kwargs)
-            if asyncio.iscoroutine(result):
-                result = await result
-            results.append(result)
-            logger.debug(f"Successfully executed async callback {callback.__name__}")
-        except Exception as e:
-            logger.error(
-                f"Async callback {callback.__name__} failed in phase '{phase}': {e}\n"
-                f"{traceback.format_exc()}"
-            )
-            if (phase, callback) in _fail_closed_callbacks:
-                results.append(_failure_result(callback, phase, e))
-            else:
-                results.append(None)
+    results: List[Any] = [None] * len(callbacks)
+    pending: Dict[asyncio.Task, int] = {}
+    launched = time.perf_counter()
+    if _concurrent_callbacks:
+        for index, callback in enumerate(callbacks):
+            if (phase, callback) in _concurrent_callbacks:
+                task = asyncio.ensure_future(
+                    _run_callback(phase, callback, args, kwargs)
+                )
+                pending[task] = index
+
+    try:
+        for index, callback in enumerate(callbacks):
+            if pending and index in pending.values():
+                continue
+            results[index] = await _run_callback(phase, callback, args, kwargs)
+
+        if pending:
+            timeout = get_phase_timeout(phase)
+            done, late = await asyncio.wait(pending, timeout=timeout)
+            for task in done:
+                results[pending[task]] = task.result()
+            for task in late:
+                task.cancel()
+                callback = callbacks[pending[task]]
+                _record_timing(
+                    phase, callback, time.perf_counter() - launched, timed_out=True
+                )
+                logger.warning(
+                    f"Concurrent callback {callback.__name__} exceeded the "
+                    f"{timeout:g}s timeout for phase '{phase}'; cancelled"
+                )
+                if (phase, callback) in _fail_closed_callbacks:
+                    results[pending[task]] = _failure_result(
+                        callback, phase, TimeoutError(f"exceeded {timeout:g}s")
+                    )
+    finally:
+        for task in pending:
+            if not task.done():
+                task.cancel()
 
     return results
 
@@ -12,18 +12,44 @@ Removes unsupported parameters:
 - "max_output_tokens" - Not supported by Codex API
 - "max_tokens" - Not supported by Codex API
 - "verbosity" - Not supported by Codex API
+
+When streaming was forced on a non-streaming request, the SSE body is read
+as it arrives (never buffered whole) and folded into a Responses API body by
+:class:`CodexStreamAssembler`.
 """
 
 from __future__ import annotations
 
+import io
 import json
 import logging
+import re
+import time
 from typing import Any
 
 import httpx
 
+from code_puppy import turn_trace
+
 logger = logging.getLogger(__name__)
 
+# Text deltas are only needed when the stream never delivers a completed
+# output item; they are dropped as soon as one arrives, and never buffered
+# beyond this many characters.
+MAX_BUFFERED_DELTA_CHARS = 8 * 1024 * 1024
+
+# Event types the assembler acts on; everything else (reasoning deltas,
+# argument deltas, content_part events, ...) is counted but never parsed.
+_HANDLED_EVENTS = frozenset(
+    {
+        "response.output_text.delta",
+        "response.output_item.done",
+        "response.completed",
+        "response.function_call_arguments.done",
+    }
+)
+_EVENT_TYPE_RE = re.compile(r'\{\s*"type"\s*:\s*"([^"]+)"')
+
 
 def _is_reasoning_model(model_name: str) -> bool:
     """Check if a model supports reasoning parameters."""
@@ -46,6 +72,10 @@ class ChatGPTCodexAsyncClient(httpx.AsyncClient):
     3. Converts streaming responses to non-streaming format
     """
 
+    # Progress of the most recent forced-stream conversion (see
+    # CodexStreamAssembler.progress); updated live while the stream is read.
+    stream_progress: dict[str, Any] | None = None
+
     async def send(
         self, request: httpx.Request, *args: Any, **kwargs: Any
     ) -> httpx.Response:
@@ -93,16 +123,34 @@ class ChatGPTCodexAsyncClient(httpx.AsyncClient):
         if configured_user_agent:
             request.headers["User-Agent"] = configured_user_agent
 
-        response = await super().send(request, *args, **kwargs)
-
-        # If we forced streaming, convert the SSE stream to a regular response
-        if force_stream_conversion and response.status_code == 200:
-            try:
-                response = await self._convert_stream_to_response(response)
-            except Exception as e:
-                logger.warning(f"Failed to convert stream response: {e}")
-
-        return response
+        if not force_stream_conversion:
+            return await super().send(request, *args, **kwargs)
+
+        # We forced streaming: read the SSE body as it arrives instead of
+        # letting httpx buffer all of it first (the caller asked for a
+        # non-streaming response, so it would otherwise pass stream=False).
+        caller_streams = kwargs.pop("stream", False)
+        started = time.perf_counter()
+        response = await super().send(request, *args, stream=True, **kwargs)
+        if response.status_code != 200:
+            if not caller_streams:
+                await response.aread()
+            return response
+        try:
+            return await self._convert_stream_to_response(response, started)
+        except (httpx.TransportError, httpx.StreamError):
+            # A dropped or timed-out stream is a network failure: let it
+            # reach the SDK's retry logic, as it did with a buffered body.
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to convert stream response: {e}")
+            # The SSE lines already consumed can't be replayed, so there is
+            # no body to hand back; fail clearly rather than with an empty one.
+            raise httpx.DecodingError(
+                f"Failed to convert Codex stream response: {e}", request=request
+            ) from e
+        finally:
+            await response.aclose()
 
     @staticmethod
     def _extract_body_bytes(request: httpx.Request) -> bytes | None:
@@ -227,136 +275,39 @@ class ChatGPTCodexAsyncClient(httpx.AsyncClient):
         return json.dumps(data).encode("utf-8"), forced_stream
 
     async def _convert_stream_to_response(
-        self, response: httpx.Response
+        self, response: httpx.Response, started: float | None = None
     ) -> httpx.Response:
         """Convert an SSE streaming response to a complete response.
 
-        Consumes the SSE stream and reconstructs the final response object.
+        Events are folded in as the lines arrive. ``started`` (a
+        ``time.perf_counter()`` value taken before sending) anchors the
+        first-byte timing; the live progress is ``self.stream_progress``.
         """
         logger.debug("Converting SSE stream to non-streaming response")
-        final_response_data = None
-        collected_text: list[str] = []
-        collected_tool_calls: list[dict] = []
-        # Capture output_item.done events: with store=false, response.completed's
-        # output is empty — these are the only source of model output.
-        completed_output_items: list[dict] = []
+        assembler = CodexStreamAssembler(started)
+        self.stream_progress = assembler.progress
 
         async for line in response.aiter_lines():
-            if not line or not line.startswith("data:"):
-                continue
-
-            data_str = line[5:].strip()  # Remove "data:" prefix
-            if data_str == "[DONE]":
+            if not assembler.feed_line(line):
                 break
 
-            try:
-                event = json.loads(data_str)
-                event_type = event.get("type", "")
-
-                if event_type == "response.output_text.delta":
-                    # Collect text deltas (used only for last-resort fallback)
-                    delta = event.get("delta", "")
-                    if delta:
-                        collected_text.append(delta)
-
-                elif event_type == "response.output_item.done":
-                    # Complete item (message/reasoning/function_call) with full
-                    # content — only reliable output source when store=false.
-                    item = event.get("item")
-                    if isinstance(item, dict):
-                        completed_output_items.append(item)
-
-                elif event_type == "response.completed":
-                    # Holds the final response envelope (id, usage, etc.) —
-                    # but its `output` is empty when store=false.
-                    final_response_data = event.get("response", {})
-
-                elif event_type == "response.function_call_arguments.done":
-                    # Legacy fallback collection for tool calls
-                    tool_call = {
-                        "name": event.get("name", ""),
-                        "arguments": event.get("arguments", ""),
-                        "call_id": event.get("call_id", ""),
-                    }
-                    collected_tool_calls.append(tool_call)
-
-            except json.JSONDecodeError:
-                continue
-
+        response_body = assembler.build()
+        progress = assembler.finish()
         logger.debug(
-            "Collected %d text chunks, %d tool calls, %d output items",
-            len(collected_text),
-            len(collected_tool_calls),
-            len(completed_output_items),
+            "Codex stream: %d events, %d output items, first byte %.0f ms, "
+            "total %.0f ms",
+            progress["events"],
+            progress["output_items"],
+            (progress["first_byte_s"] or 0) * 1000,
+            progress["elapsed_s"] * 1000,
+        )
+        turn_trace.record(
+            "codex.stream",
+            assembler.started,
+            events=progress["events"],
+            output_items=progress["output_items"],
+            first_byte_ms=round((progress["first_byte_s"] or 0) * 1000, 1),
         )
-        if final_response_data:
-            logger.debug(
-                f"Got final response data with keys: {list(final_response_data.keys())}"
-            )
-
-        # Build the body: take the response.completed envelope and overwrite its
-        # (empty when store=false) output with the collected output_item.done items.
-        if final_response_data:
-            response_body = dict(final_response_data)
-            existing_output = response_body.get("output") or []
-            if not existing_output and completed_output_items:
-                response_body["output"] = completed_output_items
-            elif not existing_output:
-                # No items captured either — fall back to text/tool deltas.
-                rebuilt: list[dict] = []
-                if collected_text:
-                    rebuilt.append(
-                        {
-                            "type": "message",
-                            "role": "assistant",
-                            "content": [
-                                {
-                                    "type": "output_text",
-                                    "text": "".join(collected_text),
-                                }
-                            ],
-                        }
-                    )
-                for tool_call in collected_tool_calls:
-                    rebuilt.append(
-                        {
-                            "type": "function_call",
-                            "name": tool_call["name"],
-                            "arguments": tool_call["arguments"],
-                            "call_id": tool_call["call_id"],
-                        }
-                    )
-                response_body["output"] = rebuilt
-        else:
-            # No `response.completed` envelope at all — build from scratch.
-            response_body = {
-                "id": "reconstructed",
-                "object": "response",
-                "output": list(completed_output_items),
-            }
-            if not response_body["output"]:
-                if collected_text:
-                    response_body["output"].append(
-                        {
-                            "type": "message",
-                            "role": "assistant",
-                            "content": [
-                                {
-                                    "type": "output_text",
-                                    "text": "".join(collected_text),
-                                }
-                            ],
-                        }
-                    )
-                for tool_call in collected_tool_calls:
-                    response_body["output"].append(
-                        {
-                            "type": "function_call",
-                            "name": tool_call["name"],
-                            "arguments": tool_call["arguments"],
-                            "call_id": tool_call["call_id"],
-                        }
-                    )
 
         # Create a new response with the complete body
         body_bytes = json.dumps(response_body).encode("utf-8")
@@ -367,10 +318,157 @@ class ChatGPTCodexAsyncClient(httpx.AsyncClient):
             headers=response.headers,
             content=body_bytes,
             request=response.request,
+            extensions={"codex_stream": progress},
         )
         return new_response
 
 
+class CodexStreamAssembler:
+    """Incrementally assemble a Responses API body from Codex SSE lines.
+
+    Feed every line with :meth:`feed_line` as it arrives, then call
+    :meth:`build`. Only the events that shape the body are parsed. With
+    ``store=false`` the ``response.completed`` envelope carries an empty
+    ``output``, so the ``response.output_item.done`` items are the real
+    output; text deltas and ``function_call_arguments.done`` events are a
+    last-resort fallback for streams that never complete an item.
+    """
+
+    def __init__(self, started: float | None = None):
+        self.started = time.perf_counter() if started is None else started
+        self.final_response: dict | None = None
+        self.output_items: list[dict] = []
+        # One growing buffer rather than a list of tiny delta strings, whose
+        # per-object overhead is many times the text itself.
+        self._text = io.StringIO()
+        self._text_chars = 0
+        self._tool_calls: list[dict] = []
+        self.progress: dict[str, Any] = {
+            "events": 0,
+            "received_chars": 0,
+            "output_items": 0,
+            "text_chars": 0,
+            "first_byte_s": None,
+            "elapsed_s": 0.0,
+            "done": False,
+            "text_truncated": False,
+        }
+        self._text_truncated = False
+
+    def feed_line(self, line: str) -> bool:
+        """Consume one SSE line; returns ``False`` once ``[DONE]`` arrives."""
+        progress = self.progress
+        if progress["first_byte_s"] is None:
+            progress["first_byte_s"] = time.perf_counter() - self.started
+        progress["received_chars"] += len(line)
+        if not line or not line.startswith("data:"):
+            return True
+
+        data_str = line[5:].strip()  # Remove "data:" prefix
+        if data_str == "[DONE]":
+            return False
+        progress["events"] += 1
+
+        match = _EVENT_TYPE_RE.match(data_str)
+        if match is not None and match.group(1) not in _HANDLED_EVENTS:
+            return True
+        try:
+            event = json.loads(data_str)
+        except json.JSONDecodeError:
+            return True
+        if isinstance(event, dict):
+            self._handle(event)
+        return True
+
+    def _handle(self, event: dict) -> None:
+        event_type = event.get("type", "")
+        if event_type == "response.output_text.delta":
+            delta = event.get("delta", "")
+            if delta:
+                self.progress["text_chars"] += len(delta)
+                # Only the fallback needs deltas, and only until an item lands.
+                if not self.output_items:
+                    if self._text_chars + len(delta) <= MAX_BUFFERED_DELTA_CHARS:
+                        self._text.write(delta)
+                        self._text_chars += len(delta)
+                    else:
+                        self._text_truncated = True
+
+        elif event_type == "response.output_item.done":
+            # Complete item (message/reasoning/function_call) with full
+            # content — only reliable output source when store=false.
+            item = event.get("item")
+            if isinstance(item, dict):
+                self.output_items.append(item)
+                self.progress["output_items"] += 1
+                self._text = io.StringIO()
+                self._text_chars = 0
+                self._text_truncated = False
+                self._tool_calls.clear()
+
+        elif event_type == "response.completed":
+            # Holds the final response envelope (id, usage, etc.) —
+            # but its `output` is empty when store=false.
+            final = event.get("response", {})
+            self.final_response = final if isinstance(final, dict) else {}
+
+        elif event_type == "response.function_call_arguments.done":
+            # Legacy fallback collection for tool calls
+            if not self.output_items:
+                self._tool_calls.append(
+                    {
+                        "name": event.get("name", ""),
+                        "arguments": event.get("arguments", ""),
+                        "call_id": event.get("call_id", ""),
+                    }
+                )
+
+    def _fallback_output(self) -> list[dict]:
+        rebuilt: list[dict] = []
+        if self._text_truncated:
+            # A cut-off reply must not pass for a complete one.
+            logger.warning(
+                "Codex stream never completed an output item; reply text "
+                "truncated to %d of %d characters",
+                self._text_chars,
+                self.progress["text_chars"],
+            )
+            self.progress["text_truncated"] = True
+        if self._text_chars:
+            rebuilt.append(
+                {
+                    "type": "message",
+                    "role": "assistant",
+                    "content": [{"type": "output_text", "text": self._text.getvalue()}],
+                }
+            )
+        for tool_call in self._tool_calls:
+            rebuilt.append({"type": "function_call", **tool_call})
+        return rebuilt
+
+    def build(self) -> dict:
+        """The response body: the completed envelope plus collected output."""
+        if self.final_response:
+            response_body = dict(self.final_response)
+            if not response_body.get("output"):
+                response_body["output"] = (
+                    list(self.output_items) or self._fallback_output()
+                )
+            return response_body
+        # No `response.completed` envelope at all — build from scratch.
+        return {
+            "id": "reconstructed",
+            "object": "response",
+            "output": list(self.output_items) or self._fallback_output(),
+        }
+
+    def finish(self) -> dict[str, Any]:
+        """Mark the stream finished and return the final progress snapshot."""
+        self.progress["elapsed_s"] = time.perf_counter() - self.started
+        self.progress["done"] = True
+        return dict(self.progress)
+
+
 def create_codex_async_client(
     headers: dict[str, str] | None = None,
     verify: str | bool = True,
@@ -13,8 +13,9 @@ import asyncio
 import base64
 import json
 import logging
+import re
 import time
-from typing import Any, Callable, MutableMapping
+from typing import Any, Callable, MutableMapping, NamedTuple
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 import httpx
@@ -56,6 +57,87 @@ def _enforce_thinking_display_summary(payload):
     return True
 
 
+def _prefix_payload_tool_names(payload):
+    tools = payload.get("tools")
+    if not isinstance(tools, list) or not tools:
+        return False
+    modified = False
+    for tool in tools:
+        if isinstance(tool, dict) and "name" in tool:
+            name = tool["name"]
+            if name and not name.startswith(TOOL_PREFIX):
+                tool["name"] = f"{TOOL_PREFIX}{name}"
+                modified = True
+    return modified
+
+
+# Byte-level prechecks. Quotes inside JSON strings are always escaped, so an
+# unescaped ``"key":`` is a real object key (possibly a nested one, which only
+# costs a parse that finds nothing to do).
+_THINKING_CONFIG_RE = re.compile(rb'"thinking"\s*:\s*\{')
+_MODEL_VALUE_RE = re.compile(rb'"model"\s*:\s*"([^"\\]*)"')
+
+
+def _may_have_tools(body: bytes) -> bool:
+    return b'"tools"' in body
+
+
+def _may_need_thinking_summary(body: bytes) -> bool:
+    if _THINKING_CONFIG_RE.search(body) is None:
+        return False
+    models = {m.group(1) for m in _MODEL_VALUE_RE.finditer(body)}
+    return any(
+        _model_requires_thinking_summary(model.decode("utf-8", "replace"))
+        for model in models
+    )
+
+
+class BodyRewriter(NamedTuple):
+    """One in-place edit of a decoded ``/v1/messages`` request body.
+
+    ``precheck`` scans the raw bytes and returns False only when ``apply``
+    cannot change anything, letting the client skip the JSON round trip.
+    ``apply`` mutates the payload dict and returns True when it changed it.
+    """
+
+    name: str
+    precheck: Callable[[bytes], bool]
+    apply: Callable[[dict], bool]
+
+
+TOOL_PREFIX_REWRITER = BodyRewriter(
+    "tool_prefix", _may_have_tools, _prefix_payload_tool_names
+)
+THINKING_SUMMARY_REWRITER = BodyRewriter(
+    "thinking_summary", _may_need_thinking_summary, _enforce_thinking_display_summary
+)
+
+
+def rewrite_json_body(body: bytes, rewriters) -> bytes | None:
+    """Apply ``rewriters`` with at most one parse and one serialization.
+
+    Returns the new body, or None when no rewriter changed anything (including
+    when every precheck ruled its rewriter out, or the body is not a JSON
+    object).
+    """
+    applicable = [r for r in rewriters if r.precheck(body)]
+    if not applicable:
+        return None
+    try:
+        payload = json.loads(body.decode("utf-8"))
+    except Exception:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    modified = False
+    for rewriter in applicable:
+        if rewriter.apply(payload):
+            modified = True
+    if not modified:
+        return None
+    return json.dumps(payload).encode("utf-8")
+
+
 class ClaudeCacheAsyncClient(httpx.AsyncClient):
     """Async HTTP client with Claude Code OAuth transformations.
 
@@ -79,6 +161,9 @@ class ClaudeCacheAsyncClient(httpx.AsyncClient):
         self._oauth_reauthentication_callback = oauth_reauthentication_callback
         self._token_update_callback = token_update_callback
         self._apply_claude_code_prefix = apply_claude_code_prefix
+        self._body_rewriters: tuple[BodyRewriter, ...] = (
+            (TOOL_PREFIX_REWRITER,) if apply_claude_code_prefix else ()
+        ) + (THINKING_SUMMARY_REWRITER,)
 
     def set_token_update_callback(self, callback: Callable[[str], None] | None) -> None:
         self._token_update_callback = callback
@@ -211,38 +296,16 @@ class ClaudeCacheAsyncClient(httpx.AsyncClient):
         This is required for Claude Code OAuth compatibility - tools must be
         prefixed on outgoing requests and unprefixed on incoming responses.
         """
-        try:
-            data = json.loads(body.decode("utf-8"))
-        except Exception:
-            return None
-        if not isinstance(data, dict):
-            return None
-        tools = data.get("tools")
-        if not isinstance(tools, list) or not tools:
-            return None
-        modified = False
-        for tool in tools:
-            if isinstance(tool, dict) and "name" in tool:
-                name = tool["name"]
-                if name and not name.startswith(TOOL_PREFIX):
-                    tool["name"] = f"{TOOL_PREFIX}{name}"
-                    modified = True
-        if not modified:
-            return None
-        return json.dumps(data).encode("utf-8")
+        return rewrite_json_body(body, (TOOL_PREFIX_REWRITER,))
 
     @staticmethod
     def _enforce_thinking_display_summary_body(body: bytes) -> bytes | None:
         """Return a rewritten body when summarized thinking is required."""
-        try:
-            payload = json.loads(body.decode("utf-8"))
-        except Exception:
-            return None
-        if not isinstance(payload, dict) or not _enforce_thinking_display_summary(
-            payload
-        ):
-            return None
-        return json.dumps(payload).encode("utf-8")
+        return rewrite_json_body(body, (THINKING_SUMMARY_REWRITER,))
+
+    def _rewrite_body(self, body: bytes) -> bytes | None:
+        """Run this client's body rewriters in a single parse/serialize pass."""
+        return rewrite_json_body(body, self._body_rewriters)
 
     @staticmethod
     def _transform_headers_for_claude_code(
@@ -318,17 +381,10 @@ class ClaudeCacheAsyncClient(httpx.AsyncClient):
                 self._transform_headers_for_claude_code(headers)
                 headers_modified = True
                 url = self._add_beta_query_param(url)
-                if body_bytes and self._apply_claude_code_prefix:
-                    prefixed_body = self._prefix_tool_names(body_bytes)
-                    if prefixed_body is not None:
-                        body_bytes = prefixed_body
-                        body_modified = True
                 if body_bytes:
-                    summarized_body = self._enforce_thinking_display_summary_body(
-                        body_bytes
-                    )
-                    if summarized_body is not None:
-                        body_bytes = summarized_body
+                    rewritten_body = self._rewrite_body(body_bytes)
+                    if rewritten_body is not None:
+                        body_bytes = rewritten_body
                         body_modified = True
                 if body_modified or headers_modified or url != request.url:
                     try:
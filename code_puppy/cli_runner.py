@@ -20,7 +20,13 @@ from pathlib import Path
 
 from rich.console import Console
 
-from code_puppy import __version__, callbacks, get_core_plugins_version, plugins
+from code_puppy import (
+    __version__,
+    callbacks,
+    get_core_plugins_version,
+    plugins,
+    turn_trace,
+)
 from code_puppy.agents import get_current_agent
 from code_puppy.i18n import t
 from code_puppy.command_line.attachments import (
@@ -1150,6 +1156,8 @@ async def interactive_mode(message_renderer, initial_command: str = None) -> Non
         if task.strip():
             # Write to the secret file for permanent history with timestamp
             save_command_to_history(task)
+            # Opt-in latency tracing (enable_turn_trace); no-op otherwise.
+            turn_trace.begin_turn(task)
 
             turn_result = None
             turn_success = False
@@ -1179,6 +1187,7 @@ async def interactive_mode(message_renderer, initial_command: str = None) -> Non
                     from code_puppy.callbacks import on_interactive_turn_cancel
 
                     await on_interactive_turn_cancel(task, reason="cancellation")
+                    turn_trace.end_turn()
                     continue
                 # Get the structured response
                 agent_response = result.output
@@ -1201,13 +1210,14 @@ async def interactive_mode(message_renderer, initial_command: str = None) -> Non
                 turn_result = result
                 turn_success = True
 
-                # Flush so the next prompt isn't swallowed behind the agent response.
-                if hasattr(display_console.file, "flush"):
-                    display_console.file.flush()
+                with turn_trace.span("render.response"):
+                    # Flush so the next prompt isn't swallowed behind the agent response.
+                    if hasattr(display_console.file, "flush"):
+                        display_console.file.flush()
 
-                await asyncio.sleep(
-                    0.1
-                )  # Brief pause to ensure all messages are rendered
+                    await asyncio.sleep(
+                        0.1
+                    )  # Brief pause to ensure all messages are rendered
 
             except KeyboardInterrupt:
                 # Defense-in-depth: a bare KeyboardInterrupt mid-unwind must not
@@ -1219,6 +1229,7 @@ async def interactive_mode(message_renderer, initial_command: str = None) -> Non
 
                 await on_interactive_turn_cancel(task, reason="Ctrl+C")
                 emit_warning("\n" + t("cli.turn.cancelled"))
+                turn_trace.end_turn()
                 continue
             except Exception as e:
                 turn_error = e
@@ -1317,6 +1328,9 @@ async def interactive_mode(message_renderer, initial_command: str = None) -> Non
                     _render_turn_exception(e)
                     auto_save_session_if_enabled()
 
+            # Continuations and turn-end hooks count toward the same turn.
+            turn_trace.end_turn()
+
             # Windows: re-clamp raw-Ctrl+C mode after each iteration, as
             # various operations may restore console mode
             try:
@@ -1503,6 +1517,7 @@ async def execute_single_prompt(
     effective_session_name = session_name or get_current_session_name()
     agent = None
     emit_info(t("cli.headless.executing", prompt=prompt))
+    turn_trace.begin_turn(prompt)
 
     try:
         agent = get_current_agent()
@@ -1537,12 +1552,13 @@ async def execute_single_prompt(
     finally:
         try:
             session_agent = agent or get_current_agent()
-            persist_named_session(
-                session_agent,
-                effective_session_name,
-                base_dir=Path(AUTOSAVE_DIR),
-                auto_saved=True,
-            )
+            with turn_trace.span("session.autosave"):
+                persist_named_session(
+                    session_agent,
+                    effective_session_name,
+                    base_dir=Path(AUTOSAVE_DIR),
+                    auto_saved=True,
+                )
             # Point quick-resume at this session (auto and -r NAME saves). Only
             # on success — persist_named_session exceptions skip this block.
             record_quick_resume_sessions(effective_session_name)
@@ -1556,6 +1572,7 @@ async def execute_single_prompt(
                     error=save_error,
                 )
             )
+        turn_trace.end_turn()
 
 
 def _force_utf8_stdio():
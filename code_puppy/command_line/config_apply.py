@@ -72,6 +72,11 @@ def invalidate_post_write_caches(key: str) -> None:
         reset_session_model()
         clear_model_cache()
 
+    # Built sub-agents bake in the model, settings and tool set.
+    from code_puppy.tools.subagent_pool import invalidate_subagent_pool
+
+    invalidate_subagent_pool()
+
 
 def apply_setting(
     key: str,
@@ -707,3 +707,67 @@ def handle_undo_command(command: str) -> bool:
         emit_info(f" {result}")
 
     return True
+
+
+@register_command(
+    name="plugin_timings",
+    description="List the slowest plugin callbacks per phase",
+    usage="/plugin_timings [phase|reset]",
+    category="core",
+    detailed_help="""
+    Show where plugin callbacks spend time this session.
+
+    Commands:
+      /plugin_timings           Slowest callbacks for every phase
+      /plugin_timings <phase>   Only that phase (e.g. post_tool_call)
+      /plugin_timings reset     Clear the collected timings
+
+    Callbacks registered with concurrent=True run alongside each other and
+    are cancelled once the phase timeout expires; those show a timeout count.
+    """,
+)
+def handle_plugin_timings_command(command: str) -> bool:
+    """Report per-callback wall time collected by the callback dispatcher."""
+    from typing import get_args
+
+    from code_puppy.callbacks import (
+        PhaseType,
+        get_slowest_callbacks,
+        reset_callback_timings,
+    )
+    from code_puppy.messaging import emit_success, emit_warning
+
+    tokens = command.split()
+    choices = (*get_args(PhaseType), "reset")
+    if len(tokens) > 2 or (len(tokens) == 2 and tokens[1] not in choices):
+        emit_warning(t("cmd.plugin_timings.usage"))
+        return True
+    if len(tokens) == 2 and tokens[1] == "reset":
+        reset_callback_timings()
+        emit_success(t("cmd.plugin_timings.reset"))
+        return True
+
+    entries = get_slowest_callbacks(tokens[1] if len(tokens) == 2 else None)
+    if not entries:
+        emit_info(t("cmd.plugin_timings.empty"))
+        return True
+    lines = [t("cmd.plugin_timings.header")]
+    phase = None
+    for entry in entries:
+        if entry["phase"] != phase:
+            phase = entry["phase"]
+            lines.append(f"  {phase}")
+        lines.append(
+            t(
+                "cmd.plugin_timings.line",
+                callback=entry["callback"],
+                plugin=entry["plugin"] or "core",
+                calls=entry["calls"],
+                total=f"{entry['total_ms']:.1f}",
+                mean=f"{entry['mean_ms']:.2f}",
+                max=f"{entry['max_ms']:.1f}",
+                timeouts=entry["timeouts"],
+            )
+        )
+    emit_info("\n".join(lines))
+    return True
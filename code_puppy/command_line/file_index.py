@@ -10,6 +10,8 @@ Design notes
 * Builds run on a background ``threading.Thread`` so the prompt never blocks.
 * Reads are lock-free snapshots — completers grab the current ``Index``
   and iterate without coordinating with the builder.
+* The fuzzy-completion structures (``fuzzy_path_index``) are built on the
+  same background thread, before the snapshot is published.
 * If ``rg`` isn't on PATH for some reason, we degrade to an empty index
   rather than crashing the prompt.
 """
@@ -23,6 +25,8 @@ import threading
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+from code_puppy.command_line.fuzzy_path_index import FuzzyPathIndex
+
 # Cap so we don't blow up RAM on absurdly huge repos. 200k paths is plenty
 # for fuzzy ranking; anything beyond that is almost certainly noise.
 MAX_INDEXED_PATHS = 200_000
@@ -37,6 +41,8 @@ class Index:
     paths: tuple[str, ...] = field(default_factory=tuple)
     lowered: tuple[str, ...] = field(default_factory=tuple)
     basenames_lower: tuple[str, ...] = field(default_factory=tuple)
+    # Query structures for fuzzy completion, built alongside the snapshot.
+    search: Optional[FuzzyPathIndex] = field(default=None, compare=False, repr=False)
 
 
 _EMPTY_INDEX = Index(root="")
@@ -146,6 +152,7 @@ def _make_index(root: str, paths: List[str]) -> Index:
         paths=normalized,
         lowered=lowered,
         basenames_lower=basenames,
+        search=FuzzyPathIndex(normalized, lowered, basenames),
     )
 
 
@@ -76,22 +76,16 @@ def _fuzzy_completions(query: str, start_position: int) -> List[Completion]:
         return []
 
     q_lower = query.lower()
-    scored: List[Tuple[int, str, str]] = []  # (-score, path, basename)
-    for path, path_lower, basename_lower in zip(
-        snap.paths, snap.lowered, snap.basenames_lower
-    ):
-        s = _score(basename_lower, path_lower, q_lower)
-        if s > 0:
-            # Negate score so a normal ascending sort gives us best-first.
-            scored.append((-s, path, os.path.basename(path)))
-
-    if not scored:
+    if snap.search is not None:
+        top = [
+            (-score, snap.paths[path_id], os.path.basename(snap.paths[path_id]))
+            for score, path_id in snap.search.search(q_lower, MAX_FUZZY_RESULTS)
+        ]
+    else:
+        top = _scan_completions(snap, q_lower)
+    if not top:
         return []
 
-    # Stable secondary sort on path keeps deterministic ordering for ties.
-    scored.sort()
-    top = scored[:MAX_FUZZY_RESULTS]
-
     return [
         Completion(
             path,
@@ -103,6 +97,22 @@ def _fuzzy_completions(query: str, start_position: int) -> List[Completion]:
     ]
 
 
+def _scan_completions(snap, q_lower: str) -> List[Tuple[int, str, str]]:
+    """Linear scan for snapshots published without a search index."""
+    scored: List[Tuple[int, str, str]] = []  # (-score, path, basename)
+    for path, path_lower, basename_lower in zip(
+        snap.paths, snap.lowered, snap.basenames_lower
+    ):
+        s = _score(basename_lower, path_lower, q_lower)
+        if s > 0:
+            # Negate score so a normal ascending sort gives us best-first.
+            scored.append((-s, path, os.path.basename(path)))
+
+    # Stable secondary sort on path keeps deterministic ordering for ties.
+    scored.sort()
+    return scored[:MAX_FUZZY_RESULTS]
+
+
 # --------------------------------------------------------- glob (legacy path)
 
 
@@ -0,0 +1,246 @@
+"""Precomputed search structures behind fuzzy ``@`` path completion.
+
+Built once per published :class:`~code_puppy.command_line.file_index.Index`
+(on the index's background build thread), so a keystroke only ranks a
+handful of candidates instead of scoring and sorting every indexed path.
+
+Ranking is identical to the original linear scan: tier score first (exact
+basename 100, basename prefix 80, basename substring 50, path substring 30),
+then path. Tiers are produced best-first and each stops as soon as the
+top-``k`` is full:
+
+* **prefix tiers** -- basenames sorted once; ``bisect`` finds the block of
+  basenames starting with the query (a flat, array-backed prefix trie);
+* **basename substring** -- a trigram index over distinct basenames; the
+  rarest trigram of the query yields the candidates, each verified with a
+  real ``in`` check;
+* **path substring** (and 1-2 character basename queries, which have no
+  trigram) -- one ``\\n``-joined string of all lowercased paths in path
+  order, scanned with ``str.find`` so matches arrive already ranked.
+
+Candidates within a tier are reduced with a ``heapq`` top-``k``. Results are
+cached per query, and when the previous query's result was exhaustive (fewer
+than ``k`` matches) a longer query narrows those results instead of touching
+the index -- typing ``abc`` then ``abcd`` filters a few rows.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+TOP_K_DEFAULT = 20
+_QUERY_CACHE_SIZE = 64
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class _JoinedScan:
+    """All rows of one column joined by ``\\n``, in path-rank order."""
+
+    def __init__(self, rows: Sequence[str]) -> None:
+        self.text = "\n".join(rows)
+        starts = array("I")
+        offset = 0
+        for row in rows:
+            starts.append(offset)
+            offset += len(row) + 1
+        self.starts = starts
+
+    def iter_ranks(self, needle: str):
+        """Yield the rank of every row containing ``needle``, best rank first."""
+        text, starts = self.text, self.starts
+        find = text.find
+        pos = find(needle)
+        while pos >= 0:
+            rank = bisect_right(starts, pos) - 1
+            yield rank
+            if rank + 1 >= len(starts):
+                return
+            pos = find(needle, starts[rank + 1])
+
+
+class FuzzyPathIndex:
+    """Query engine over one immutable list of paths."""
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        lowered: Sequence[str],
+        basenames_lower: Sequence[str],
+    ) -> None:
+        self._lowered = lowered
+        self._basenames = basenames_lower
+        count = len(paths)
+        # Path rank: position in the final tie-break order (by path).
+        self._by_rank = array("I", sorted(range(count), key=paths.__getitem__))
+        rank = array("I", [0]) * count
+        for position, path_id in enumerate(self._by_rank):
+            rank[path_id] = position
+        self._rank = rank
+
+        self._sorted_basename_ids = array(
+            "I", sorted(range(count), key=basenames_lower.__getitem__)
+        )
+        self._sorted_basenames = [basenames_lower[i] for i in self._sorted_basename_ids]
+
+        # Trigrams are indexed per *distinct* basename (``__init__.py`` and
+        # friends repeat a lot): a posting is a run of equal basenames in the
+        # sorted order, expanded to path ids only when a query hits it.
+        postings: Dict[str, List[int]] = defaultdict(list)
+        run_starts = array("I")
+        previous = None
+        for position, basename in enumerate(self._sorted_basenames):
+            if basename == previous:
+                continue
+            previous = basename
+            run = len(run_starts)
+            run_starts.append(position)
+            for gram in {basename[i : i + 3] for i in range(len(basename) - 2)}:
+                postings[gram].append(run)
+        run_starts.append(count)
+        self._run_starts = run_starts
+        self._trigrams = {gram: array("I", runs) for gram, runs in postings.items()}
+
+        ranked_paths = [lowered[i] for i in self._by_rank]
+        self._path_scan = _JoinedScan(ranked_paths)
+        self._basename_scan = _JoinedScan([basenames_lower[i] for i in self._by_rank])
+
+        # (query, limit) -> (results, exhaustive)
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[List[Tuple[int, int]], bool]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    # ----------------------------------------------------------------- public
+
+    def search(
+        self, query_lower: str, limit: int = TOP_K_DEFAULT
+    ) -> List[Tuple[int, int]]:
+        """Return up to ``limit`` ``(score, path_id)`` pairs, best first."""
+        if limit <= 0 or "\n" in query_lower:
+            return []
+        cached = self._cached(query_lower, limit)
+        if cached is not None:
+            return cached
+        results = self._rank_query(query_lower, limit)
+        self._remember(query_lower, limit, results)
+        return results
+
+    # ---------------------------------------------------------------- caching
+
+    def _cached(self, query: str, limit: int):
+        with self._cache_lock:
+            hit = self._cache.get((query, limit))
+            if hit is not None:
+                self._cache.move_to_end((query, limit))
+                return list(hit[0])
+            # Narrow an exhaustive result of a shorter query: every match of
+            # ``query`` also matched its prefix, so nothing can be missing.
+            for length in range(len(query) - 1, 0, -1):
+                prev = self._cache.get((query[:length], limit))
+                if prev is not None:
+                    results, exhaustive = prev
+                    if not exhaustive:
+                        return None
+                    break
+            else:
+                return None
+        narrowed = []
+        for _score, path_id in results:
+            score = self._score(path_id, query)
+            if score:
+                narrowed.append((score, path_id))
+        narrowed.sort(key=lambda item: (-item[0], self._rank[item[1]]))
+        self._remember(query, limit, narrowed)
+        return narrowed
+
+    def _remember(self, query: str, limit: int, results) -> None:
+        with self._cache_lock:
+            self._cache[(query, limit)] = (results, len(results) < limit)
+            self._cache.move_to_end((query, limit))
+            while len(self._cache) > _QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    # ---------------------------------------------------------------- ranking
+
+    def _score(self, path_id: int, query: str) -> int:
+        basename = self._basenames[path_id]
+        if basename == query:
+            return 100
+        if basename.startswith(query):
+            return 80
+        if query in basename:
+            return 50
+        if query in self._lowered[path_id]:
+            return 30
+        return 0
+
+    def _trigram_candidates(self, query: str, runs):
+        """Path ids whose basename contains ``query`` but does not start with it."""
+        starts, names, ids = (
+            self._run_starts,
+            self._sorted_basenames,
+            self._sorted_basename_ids,
+        )
+        for run in runs:
+            begin = starts[run]
+            basename = names[begin]
+            if query in basename and not basename.startswith(query):
+                yield from ids[begin : starts[run + 1]]
+
+    def _rank_query(self, query: str, limit: int) -> List[Tuple[int, int]]:
+        if not query:
+            return [(1, path_id) for path_id in self._by_rank[:limit]]
+
+        rank = self._rank
+        results: List[Tuple[int, int]] = []
+        taken: set[int] = set()
+
+        def add_best(score: int, ids) -> None:
+            need = limit - len(results)
+            for path_id in heapq.nsmallest(need, ids, key=rank.__getitem__):
+                results.append((score, path_id))
+                taken.add(path_id)
+
+        # Tiers 100 + 80: basenames starting with the query.
+        lo = bisect_left(self._sorted_basenames, query)
+        hi = bisect_right(self._sorted_basenames, query + "\U0010ffff")
+        prefix_ids = self._sorted_basename_ids[lo:hi]
+        exact_hi = bisect_right(self._sorted_basenames, query, lo, hi)
+        add_best(100, prefix_ids[: exact_hi - lo])
+        if len(results) < limit:
+            add_best(80, prefix_ids[exact_hi - lo :])
+
+        # Tier 50: query inside the basename (but not a prefix).
+        if len(results) < limit:
+            if len(query) >= 3:
+                grams = [self._trigrams.get(g) for g in _trigrams(query)]
+                if all(grams):
+                    add_best(50, self._trigram_candidates(query, min(grams, key=len)))
+            else:
+                by_rank = self._by_rank
+                for hit_rank in self._basename_scan.iter_ranks(query):
+                    path_id = by_rank[hit_rank]
+                    if path_id not in taken:
+                        results.append((50, path_id))
+                        taken.add(path_id)
+                        if len(results) >= limit:
+                            break
+
+        # Tier 30: query only in the directory part of the path.
+        if len(results) < limit:
+            by_rank = self._by_rank
+            basenames = self._basenames
+            for hit_rank in self._path_scan.iter_ranks(query):
+                path_id = by_rank[hit_rank]
+                if path_id in taken or query in basenames[path_id]:
+                    continue
+                results.append((30, path_id))
+                if len(results) >= limit:
+                    break
+        return results
@@ -500,3 +500,39 @@ def handle_load_context_command(command: str) -> bool:
     display_resumed_history(history)
 
     return True
+
+
+@register_command(
+    name="cache",
+    description="Show prompt-cache hit ratios and prefix breaks",
+    usage="/cache [reset]",
+    category="session",
+    detailed_help="""
+    Report how well provider prompt caching is working this session.
+
+    Commands:
+      /cache          Per-agent cache-read ratio and recent prefix breaks
+      /cache reset    Clear the collected statistics
+
+    A prefix break names what invalidated the cached prefix: a model
+    switch, a changed system prompt, reordered/added/edited tools, or
+    compacted/rewritten history.
+    """,
+)
+def handle_cache_command(command: str) -> bool:
+    """Show or reset the session prompt-cache report."""
+    from code_puppy.agents._prompt_cache import (
+        format_prompt_cache_report,
+        reset_prompt_cache_tracker,
+    )
+    from code_puppy.messaging import emit_info, emit_success, emit_warning
+
+    tokens = command.split()
+    if len(tokens) == 1:
+        emit_info(format_prompt_cache_report())
+    elif len(tokens) == 2 and tokens[1] == "reset":
+        reset_prompt_cache_tracker()
+        emit_success(t("cmd.cache.reset"))
+    else:
+        emit_warning(t("cmd.cache.usage"))
+    return True
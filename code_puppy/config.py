@@ -13,6 +13,15 @@ from code_puppy.session_storage import compute_scope_key, save_session
 logger = logging.getLogger(__name__)
 
 DEFAULT_SUBAGENT_RECURSION_LIMIT = 4
+DEFAULT_SUBAGENT_POOL_SIZE = 8
+DEFAULT_SUBAGENT_PARALLEL_LIMIT = 4
+DEFAULT_SUBAGENT_PARALLEL_TIMEOUT_SECONDS = 900
+DEFAULT_GREP_CACHE_SIZE = 32
+DEFAULT_IMAGE_HISTORY_KEEP_RECENT = 3
+DEFAULT_IMAGE_HISTORY_BUDGET_KB = 8192
+DEFAULT_BROWSER_POOL_SIZE = 2
+DEFAULT_BROWSER_POOL_MAX_CONTEXTS = 8
+DEFAULT_MCP_HTTP_POOL_MAX_CONNECTIONS = 64
 
 # GPT-5.6 runaway-delegation guard: overlay cap on ``subagent_recursion_limit``
 # when the immediate caller is GPT-5.6. Default 2 (main→L1→L2) keeps two-hop
@@ -117,6 +126,50 @@ def get_subagent_recursion_limit_gpt_5_6() -> int:
     return limit if limit >= 0 else DEFAULT_SUBAGENT_RECURSION_LIMIT_GPT_5_6
 
 
+def get_subagent_pool_size() -> int:
+    """Return how many idle constructed sub-agents to keep warm (default 8).
+
+    ``0`` disables the warm pool so every invocation rebuilds its agent.
+    Invalid or negative values fall back to the default.
+    """
+    cfg_val = get_value("subagent_pool_size")
+    if cfg_val is None:
+        return DEFAULT_SUBAGENT_POOL_SIZE
+
+    try:
+        size = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_SUBAGENT_POOL_SIZE
+
+    return size if size >= 0 else DEFAULT_SUBAGENT_POOL_SIZE
+
+
+def get_subagent_parallel_limit() -> int:
+    """Return the default concurrency for ``invoke_agents_parallel`` (default 4).
+
+    Invalid or non-positive values fall back to the default.
+    """
+    cfg_val = get_value("subagent_parallel_limit")
+    try:
+        limit = int(str(cfg_val).strip()) if cfg_val is not None else 0
+    except (TypeError, ValueError):
+        limit = 0
+    return limit if limit > 0 else DEFAULT_SUBAGENT_PARALLEL_LIMIT
+
+
+def get_subagent_parallel_timeout_seconds() -> float:
+    """Return the default wall-clock budget for one parallel fan-out batch.
+
+    Defaults to 900 seconds; invalid or non-positive values fall back to it.
+    """
+    cfg_val = get_value("subagent_parallel_timeout_seconds")
+    try:
+        seconds = float(str(cfg_val).strip()) if cfg_val is not None else 0.0
+    except (TypeError, ValueError):
+        seconds = 0.0
+    return seconds if seconds > 0 else float(DEFAULT_SUBAGENT_PARALLEL_TIMEOUT_SECONDS)
+
+
 # Pack agents - the specialized sub-agents coordinated by Pack Leader
 PACK_AGENT_NAMES = frozenset(
     [
@@ -228,6 +281,15 @@ def get_enable_logfire() -> bool:
     return str(val).lower() in ("1", "true", "yes", "on")
 
 
+def get_enable_turn_trace() -> bool:
+    """
+    Get the enable_turn_trace configuration value.
+    Controls per-turn latency tracing (see code_puppy/turn_trace.py).
+    Opt-in: defaults to False.
+    """
+    return get_truthy_bool_value("enable_turn_trace", False)
+
+
 def get_retry_main_strategy() -> str:
     """Effective backoff strategy for the main agent loop.
 
@@ -392,7 +454,7 @@ def get_falsy_bool_value(key: str, default_val: bool) -> bool:
     if val is None:
         return default_val
 
-    return str(val).strip().lower() in {"0", "false", "no", "off"}
+    return str(val).strip().lower() not in {"0", "false", "no", "off"}
 
 
 def get_puppy_name():
@@ -470,10 +532,21 @@ def get_config_keys():
         "allow_recursion",
         "subagent_recursion_limit",
         "subagent_recursion_limit_gpt_5_6",
+        "subagent_pool_size",
+        "subagent_parallel_limit",
+        "subagent_parallel_timeout_seconds",
         "auto_save_session",
         "max_saved_sessions",
         "http2",
         "diff_context_lines",
+        "grep_cache_size",
+        "command_history_max_entries",
+        "image_history_keep_recent",
+        "image_history_budget_kb",
+        "browser_shared_pool",
+        "browser_pool_size",
+        "browser_pool_max_contexts",
+        "mcp_http_pool_max_connections",
         "default_agent",
         "temperature",
         "frontend_emitter_enabled",
@@ -493,6 +566,8 @@ def get_config_keys():
     default_keys.append("enable_streaming")
     # Opt-in Logfire observability (see code_puppy/observability.py)
     default_keys.append("enable_logfire")
+    # Opt-in local per-turn latency traces (see code_puppy/turn_trace.py)
+    default_keys.append("enable_turn_trace")
     # Add suppress directory listing key
     default_keys.append("suppress_directory_listing")
     # Add cancel agent key configuration
@@ -1461,6 +1536,26 @@ def get_mcp_disabled():
     return get_truthy_bool_value("disable_mcp", False)
 
 
+def get_mcp_http_pool_max_connections() -> int:
+    """Return the per-origin connection cap of the shared MCP HTTP pool.
+
+    SSE and streamable-HTTP MCP servers pointing at the same origin share one
+    connection pool bounded by this value (default 64). ``0`` disables
+    pooling so every server session gets its own client. Invalid or negative
+    values fall back to the default.
+    """
+    cfg_val = get_value("mcp_http_pool_max_connections")
+    if cfg_val is None:
+        return DEFAULT_MCP_HTTP_POOL_MAX_CONNECTIONS
+
+    try:
+        size = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_MCP_HTTP_POOL_MAX_CONNECTIONS
+
+    return size if size >= 0 else DEFAULT_MCP_HTTP_POOL_MAX_CONNECTIONS
+
+
 def get_grep_output_verbose():
     """
     Checks puppy.cfg for 'grep_output_verbose' (case-insensitive in value only).
@@ -1473,6 +1568,127 @@ def get_grep_output_verbose():
     return get_truthy_bool_value("grep_output_verbose", False)
 
 
+def get_grep_cache_size() -> int:
+    """Return how many grep results to keep in the in-process cache (default 32).
+
+    ``0`` disables the cache so every search runs ripgrep. Invalid or negative
+    values fall back to the default.
+    """
+    cfg_val = get_value("grep_cache_size")
+    if cfg_val is None:
+        return DEFAULT_GREP_CACHE_SIZE
+
+    try:
+        size = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_GREP_CACHE_SIZE
+
+    return size if size >= 0 else DEFAULT_GREP_CACHE_SIZE
+
+
+def get_command_history_max_entries() -> int:
+    """Return how many command-history entries to keep on disk (default 0).
+
+    ``0`` keeps everything. Above the limit the history file is compacted:
+    repeated entries collapse into their newest occurrence and the oldest
+    entries are dropped. Invalid or negative values mean "keep everything".
+    """
+    cfg_val = get_value("command_history_max_entries")
+    if cfg_val is None:
+        return 0
+
+    try:
+        size = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return 0
+
+    return max(size, 0)
+
+
+def get_image_history_keep_recent() -> int:
+    """Return how many of the newest history images stay full size (default 3).
+
+    Older images are sent as low-resolution thumbnails (see
+    ``code_puppy/agents/_image_aging.py``). Invalid or negative values fall
+    back to the default.
+    """
+    cfg_val = get_value("image_history_keep_recent")
+    if cfg_val is None:
+        return DEFAULT_IMAGE_HISTORY_KEEP_RECENT
+
+    try:
+        count = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_IMAGE_HISTORY_KEEP_RECENT
+
+    return count if count >= 0 else DEFAULT_IMAGE_HISTORY_KEEP_RECENT
+
+
+def get_image_history_budget_kb() -> int:
+    """Return the image payload budget for one model request, in KB (default 8192).
+
+    Once the history's images (newest first) exceed it, older images are
+    replaced by a text stub. ``0`` disables the budget. Invalid or negative
+    values fall back to the default.
+    """
+    cfg_val = get_value("image_history_budget_kb")
+    if cfg_val is None:
+        return DEFAULT_IMAGE_HISTORY_BUDGET_KB
+
+    try:
+        budget = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_IMAGE_HISTORY_BUDGET_KB
+
+    return budget if budget >= 0 else DEFAULT_IMAGE_HISTORY_BUDGET_KB
+
+
+def get_browser_shared_pool() -> bool:
+    """Return whether browser sessions share one Chromium process (default False).
+
+    When on, every browser session except ``default`` gets an isolated
+    ``BrowserContext`` from a pre-warmed pool instead of launching its own
+    persistent-profile browser (see ``tools/browser/browser_manager.py``).
+    """
+    return get_truthy_bool_value("browser_shared_pool", False)
+
+
+def get_browser_pool_size() -> int:
+    """Return how many idle browser contexts the shared pool keeps warm (default 2).
+
+    Invalid or negative values fall back to the default; ``0`` disables
+    pre-warming.
+    """
+    cfg_val = get_value("browser_pool_size")
+    if cfg_val is None:
+        return DEFAULT_BROWSER_POOL_SIZE
+
+    try:
+        size = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_BROWSER_POOL_SIZE
+
+    return size if size >= 0 else DEFAULT_BROWSER_POOL_SIZE
+
+
+def get_browser_pool_max_contexts() -> int:
+    """Return how many pooled browser sessions may be open at once (default 8).
+
+    Further sessions wait for one to be released. Invalid or non-positive
+    values fall back to the default.
+    """
+    cfg_val = get_value("browser_pool_max_contexts")
+    if cfg_val is None:
+        return DEFAULT_BROWSER_POOL_MAX_CONTEXTS
+
+    try:
+        limit = int(str(cfg_val).strip())
+    except (TypeError, ValueError):
+        return DEFAULT_BROWSER_POOL_MAX_CONTEXTS
+
+    return limit if limit > 0 else DEFAULT_BROWSER_POOL_MAX_CONTEXTS
+
+
 def get_disable_dangerous_command_guard() -> bool:
     """
     Checks puppy.cfg for 'disable_dangerous_command_guard' (case-insensitive in value only).
@@ -2267,6 +2483,7 @@ def auto_save_session_if_enabled() -> bool:
     try:
         import pathlib
 
+        from code_puppy import turn_trace
         from code_puppy.agents.agent_manager import get_current_agent
         from code_puppy.messaging import emit_info
 
@@ -2279,15 +2496,16 @@ def auto_save_session_if_enabled() -> bool:
         session_name = get_current_session_name()
         autosave_dir = pathlib.Path(AUTOSAVE_DIR)
 
-        metadata = save_session(
-            history=history,
-            session_name=session_name,
-            base_dir=autosave_dir,
-            timestamp=now.isoformat(),
-            token_estimator=current_agent.estimate_tokens_for_message,
-            auto_saved=True,
-            scope_key=compute_scope_key(pathlib.Path.cwd()),
-        )
+        with turn_trace.span("session.autosave", messages=len(history)):
+            metadata = save_session(
+                history=history,
+                session_name=session_name,
+                base_dir=autosave_dir,
+                timestamp=now.isoformat(),
+                token_estimator=current_agent.estimate_tokens_for_message,
+                auto_saved=True,
+                scope_key=compute_scope_key(pathlib.Path.cwd()),
+            )
 
         # Point quick-resume at this save; every turn/exit/finalize routes through
         # this chokepoint. Best-effort, never blocks the autosave.
@@ -8,9 +8,14 @@ SDK dependency.
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import logging
+import marshal
+import threading
 import uuid
+import weakref
+from collections import OrderedDict
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
@@ -232,6 +237,168 @@ def _sanitize_schema_for_gemini(schema: dict) -> dict:
     return resolve_refs(schema)
 
 
+class _FrozenDict(dict):
+    """Read-only ``dict`` for cached schemas; still serializes as JSON."""
+
+    __slots__ = ()
+
+    def _readonly(self, *_args: Any, **_kwargs: Any) -> Any:
+        raise TypeError("cached Gemini tool schemas are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return _thaw(self)
+
+    def __reduce__(self) -> Any:
+        return (dict, (dict(self),))
+
+
+class _FrozenList(list):
+    """Read-only ``list`` counterpart of :class:`_FrozenDict`."""
+
+    __slots__ = ()
+
+    def _readonly(self, *_args: Any, **_kwargs: Any) -> Any:
+        raise TypeError("cached Gemini tool schemas are read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return _thaw(self)
+
+    def __reduce__(self) -> Any:
+        return (list, (list(self),))
+
+
+def _freeze(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return _FrozenDict({key: _freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return _FrozenList(_freeze(item) for item in obj)
+    return obj
+
+
+def _thaw(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {key: _thaw(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_thaw(item) for item in obj]
+    return obj
+
+
+# Sanitized schemas keyed by a fingerprint of the input schema. Tool
+# definitions rarely change within a session, but ``_build_tools`` runs on
+# every model request and sanitizing deep-copies and walks every schema.
+SCHEMA_CACHE_SIZE = 512
+_schema_cache: OrderedDict[bytes, dict] = OrderedDict()
+_schema_cache_lock = threading.Lock()
+
+
+def _schema_fingerprint(schema: dict) -> bytes:
+    """Content digest of a JSON schema.
+
+    ``marshal`` (format 2, which writes no back-references) serializes the
+    plain dict/list/str trees JSON schemas are made of several times faster
+    than ``json.dumps``; anything it cannot encode falls back to JSON. Key
+    order is part of the digest, which at worst costs a cache miss.
+    """
+    try:
+        payload = b"m" + marshal.dumps(schema, 2)
+    except ValueError:
+        payload = b"j" + json.dumps(schema, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _cached_sanitized_schema(schema: dict) -> dict:
+    """Memoized, read-only :func:`_sanitize_schema_for_gemini`.
+
+    The result is shared between requests, so it is frozen: mutating it
+    raises ``TypeError`` (``copy.deepcopy`` returns a mutable copy).
+    """
+    if not isinstance(schema, dict):
+        return schema
+    key = _schema_fingerprint(schema)
+    with _schema_cache_lock:
+        cached = _schema_cache.get(key)
+        if cached is not None:
+            _schema_cache.move_to_end(key)
+            return cached
+    sanitized = _freeze(_sanitize_schema_for_gemini(schema))
+    with _schema_cache_lock:
+        _schema_cache[key] = sanitized
+        while len(_schema_cache) > SCHEMA_CACHE_SIZE:
+            _schema_cache.popitem(last=False)
+    return sanitized
+
+
+def clear_schema_cache() -> None:
+    """Drop every memoized sanitized schema."""
+    with _schema_cache_lock:
+        _schema_cache.clear()
+
+
+class _IdentityCache:
+    """Values keyed by object identity, dropped once the object is collected.
+
+    Used for pydantic-ai messages and attachments, which are replaced rather
+    than mutated once they are part of the history (the same assumption the
+    prompt-cache tracker makes), so identity is enough to reuse work.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, obj: Any) -> Any:
+        entry = self._entries.get(id(obj))
+        if entry is not None and entry[0]() is obj:
+            return entry[1]
+        return None
+
+    def put(self, obj: Any, value: Any) -> None:
+        key = id(obj)
+        entries = self._entries
+
+        def _drop(ref: weakref.ref) -> None:
+            current = entries.get(key)
+            if current is not None and current[0] is ref:
+                del entries[key]
+
+        try:
+            ref = weakref.ref(obj, _drop)
+        except TypeError:
+            return  # not weak-referenceable: just don't cache it
+        entries[key] = (ref, value)
+
+
+# base64 of attachment payloads, so an image in the history is encoded once
+# rather than on every request of the session.
+_encoded_attachments = _IdentityCache()
+
+
+def _encode_attachment(item: Any) -> Any:
+    data = item.data
+    if not isinstance(data, bytes):
+        return data
+    cached = _encoded_attachments.get(item)
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    encoded = base64.b64encode(data).decode("utf-8")
+    _encoded_attachments.put(item, (data, encoded))
+    return encoded
+
+
 class GeminiModel(Model):
     """Standalone Model implementation for Google's Generative Language API.
 
@@ -252,6 +419,8 @@ class GeminiModel(Model):
         self._base_url = base_url.rstrip("/")
         self._http_client = http_client
         self._owns_client = http_client is None
+        # Mapped form of each history message; see _map_message.
+        self._mapped_messages = _IdentityCache()
 
     @property
     def model_name(self) -> str:
@@ -312,14 +481,11 @@ class GeminiModel(Model):
                     parts.append({"text": item})
                 elif hasattr(item, "media_type") and hasattr(item, "data"):
                     # Handle file/image content
-                    data = item.data
-                    if isinstance(data, bytes):
-                        data = base64.b64encode(data).decode("utf-8")
                     parts.append(
                         {
                             "inline_data": {
                                 "mime_type": item.media_type,
-                                "data": data,
+                                "data": _encode_attachment(item),
                             }
                         }
                     )
@@ -330,64 +496,83 @@ class GeminiModel(Model):
 
         return parts
 
-    async def _map_messages(
-        self,
-        messages: list[ModelMessage],
-        model_request_parameters: ModelRequestParameters,
-    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
-        """Map pydantic-ai messages to Gemini API format."""
-        contents: list[dict[str, Any]] = []
-        system_parts: list[dict[str, Any]] = []
+    async def _map_message(
+        self, m: ModelMessage
+    ) -> tuple[list[dict[str, Any]], str | None, list[dict[str, Any]]]:
+        """Map one message to ``(system_parts, role, parts)``, memoized.
 
-        for m in messages:
-            if isinstance(m, ModelRequest):
-                message_parts: list[dict[str, Any]] = []
-
-                for part in m.parts:
-                    if isinstance(part, SystemPromptPart):
-                        system_parts.append({"text": part.content})
-                    elif isinstance(part, UserPromptPart):
-                        mapped_parts = await self._map_user_prompt(part)
-                        message_parts.extend(mapped_parts)
-                    elif isinstance(part, ToolReturnPart):
+        History only ever grows by appending, so after the first request
+        each call maps just the newly added messages. The cached lists are
+        shared between requests and must be treated as read-only.
+        """
+        cached = self._mapped_messages.get(m)
+        if cached is not None:
+            return cached
+
+        system_parts: list[dict[str, Any]] = []
+        role: str | None = None
+        message_parts: list[dict[str, Any]] = []
+        if isinstance(m, ModelRequest):
+            role = "user"
+            for part in m.parts:
+                if isinstance(part, SystemPromptPart):
+                    system_parts.append({"text": part.content})
+                elif isinstance(part, UserPromptPart):
+                    mapped_parts = await self._map_user_prompt(part)
+                    message_parts.extend(mapped_parts)
+                elif isinstance(part, ToolReturnPart):
+                    message_parts.append(
+                        {
+                            "function_response": {
+                                "name": part.tool_name,
+                                "response": part.model_response_object(),
+                                "id": part.tool_call_id,
+                            }
+                        }
+                    )
+                elif isinstance(part, RetryPromptPart):
+                    if part.tool_name is None:
+                        message_parts.append({"text": part.model_response()})
+                    else:
                         message_parts.append(
                             {
                                 "function_response": {
                                     "name": part.tool_name,
-                                    "response": part.model_response_object(),
+                                    "response": {"error": part.model_response()},
                                     "id": part.tool_call_id,
                                 }
                             }
                         )
-                    elif isinstance(part, RetryPromptPart):
-                        if part.tool_name is None:
-                            message_parts.append({"text": part.model_response()})
-                        else:
-                            message_parts.append(
-                                {
-                                    "function_response": {
-                                        "name": part.tool_name,
-                                        "response": {"error": part.model_response()},
-                                        "id": part.tool_call_id,
-                                    }
-                                }
-                            )
+        elif isinstance(m, ModelResponse):
+            role = "model"
+            model_parts = self._map_model_response(m)
+            if model_parts:
+                message_parts = model_parts["parts"]
 
-                if message_parts:
-                    # Merge with previous user message if exists
-                    if contents and contents[-1].get("role") == "user":
-                        contents[-1]["parts"].extend(message_parts)
-                    else:
-                        contents.append({"role": "user", "parts": message_parts})
-
-            elif isinstance(m, ModelResponse):
-                model_parts = self._map_model_response(m)
-                if model_parts:
-                    # Merge with previous model message if exists
-                    if contents and contents[-1].get("role") == "model":
-                        contents[-1]["parts"].extend(model_parts["parts"])
-                    else:
-                        contents.append(model_parts)
+        mapped = (system_parts, role, message_parts)
+        self._mapped_messages.put(m, mapped)
+        return mapped
+
+    async def _map_messages(
+        self,
+        messages: list[ModelMessage],
+        model_request_parameters: ModelRequestParameters,
+    ) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+        """Map pydantic-ai messages to Gemini API format."""
+        contents: list[dict[str, Any]] = []
+        system_parts: list[dict[str, Any]] = []
+
+        for m in messages:
+            message_system, role, message_parts = await self._map_message(m)
+            system_parts.extend(message_system)
+            if not message_parts:
+                continue
+            # Merge consecutive messages of the same role. The merged parts
+            # list is always a fresh one: the per-message lists are cached.
+            if contents and contents[-1].get("role") == role:
+                contents[-1]["parts"].extend(message_parts)
+            else:
+                contents.append({"role": role, "parts": list(message_parts)})
 
         # Ensure at least one content
         if not contents:
@@ -464,8 +649,8 @@ class GeminiModel(Model):
                 "description": tool.description or "",
             }
             if tool.parameters_json_schema:
-                # Sanitize schema for Gemini compatibility
-                func_decl["parameters"] = _sanitize_schema_for_gemini(
+                # Sanitize schema for Gemini compatibility (memoized)
+                func_decl["parameters"] = _cached_sanitized_schema(
                     tool.parameters_json_schema
                 )
             function_declarations.append(func_decl)
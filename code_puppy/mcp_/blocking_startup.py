@@ -1,36 +1,162 @@
 """Stdio MCP toolset with blocking startup and stderr capture.
 
 This module provides an ``MCPToolset`` subclass for stdio servers that:
-1. Captures subprocess stderr to persistent log files
-   (``~/.code_puppy/mcp_logs/<server_name>.log``) via the *public*
-   ``fastmcp`` ``StdioTransport(log_file=...)`` seam — no stream overrides
+1. Captures subprocess stderr through an OS pipe handed to the *public*
+   ``fastmcp`` ``StdioTransport(log_file=...)`` seam — no stream overrides.
+   One shared selector thread reads every server's pipe, so quiet servers
+   cost nothing; lines land in an in-memory ring buffer and the buffered
+   persistent log (``~/.code_puppy/mcp_logs/<server_name>.log``)
 2. Blocks until fully initialized before allowing operations
    (``wait_until_ready`` / ``ensure_ready``)
 3. Optionally emits stderr to users (disabled by default to reduce noise)
 """
 
 import asyncio
+import logging
 import os
+import selectors
+import sys
 import threading
 import uuid
 from collections import deque
-from pathlib import Path
-from typing import Any, List, Optional, Sequence
+from typing import Any, List, Optional, Sequence, TextIO
 
 from fastmcp.client.transports import StdioTransport
-from pydantic_ai.mcp import MCPToolset
 
 from code_puppy.mcp_.mcp_logs import get_log_file_path, rotate_log_if_needed, write_log
+from code_puppy.mcp_.tool_cache import CachingMCPToolset
 from code_puppy.messaging import emit_info
 
+logger = logging.getLogger(__name__)
 
-class StderrFileCapture:
-    """Monitors a server's persistent stderr log file and buffers new lines.
+# How long stop() waits for a server's pipe to reach EOF before detaching it.
+STOP_DRAIN_SECONDS = 1.0
 
-    The stderr *writing* is handled by fastmcp's ``StdioTransport`` (we hand
-    it the log path via ``log_file=``); this class rotates the log, writes
-    session start/stop markers, and tails the file so captured lines can be
-    surfaced in-memory (and optionally echoed to the user).
+_READ_CHUNK_BYTES = 64 * 1024
+
+# select()/poll() only accept sockets on Windows; pipes there get a blocking
+# reader thread each instead of a slot in the shared selector.
+_SELECTABLE_PIPES = sys.platform != "win32"
+
+
+class _StderrPump:
+    """One daemon thread that reads every registered stderr pipe.
+
+    Only the pump thread touches the selector; other threads queue
+    ``add``/``remove`` requests and wake it through a self-pipe. The thread
+    blocks in ``select()`` until a pipe has data, so nothing polls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, fd: int, capture: "StderrPipeCapture") -> None:
+        if not _SELECTABLE_PIPES:
+            threading.Thread(
+                target=self._read_blocking, args=(fd, capture), daemon=True
+            ).start()
+            return
+        self._submit(("add", fd, capture))
+
+    def remove(self, fd: int, capture: "StderrPipeCapture") -> None:
+        """Stop reading ``fd`` (closing it); a no-op once it hit EOF."""
+        if _SELECTABLE_PIPES:
+            self._submit(("remove", fd, capture))
+
+    def _submit(self, request: tuple) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._start_locked()
+            self._pending.append(request)
+            os.write(self._wake_w, b"\0")
+
+    def _start_locked(self) -> None:
+        wake_r, self._wake_w = os.pipe()
+        os.set_blocking(wake_r, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(wake_r, selectors.EVENT_READ)
+        self._thread = threading.Thread(
+            target=self._run, args=(self._selector, wake_r), daemon=True
+        )
+        self._thread.name = "mcp-stderr-pump"
+        self._thread.start()
+
+    def _run(self, selector: selectors.BaseSelector, wake_r: int) -> None:
+        while True:
+            for key, _events in selector.select():
+                if key.fd == wake_r:
+                    self._apply_pending(selector, wake_r)
+                else:
+                    self._read(selector, key.fd, key.data)
+
+    def _apply_pending(self, selector: selectors.BaseSelector, wake_r: int) -> None:
+        try:
+            while os.read(wake_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for op, fd, capture in pending:
+            if op == "add":
+                selector.register(fd, selectors.EVENT_READ, capture)
+                continue
+            try:
+                key = selector.get_key(fd)
+            except KeyError:
+                continue  # already closed at EOF
+            if key.data is capture:  # not a reused fd number
+                self._close(selector, fd, capture)
+
+    def _read(
+        self, selector: selectors.BaseSelector, fd: int, capture: "StderrPipeCapture"
+    ) -> None:
+        try:
+            data = os.read(fd, _READ_CHUNK_BYTES)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if data:
+            capture._feed(data)
+        else:
+            self._close(selector, fd, capture)
+
+    @staticmethod
+    def _close(
+        selector: selectors.BaseSelector, fd: int, capture: "StderrPipeCapture"
+    ) -> None:
+        selector.unregister(fd)
+        os.close(fd)
+        capture._finish()
+
+    @staticmethod
+    def _read_blocking(fd: int, capture: "StderrPipeCapture") -> None:
+        try:
+            while data := os.read(fd, _READ_CHUNK_BYTES):
+                capture._feed(data)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+            capture._finish()
+
+
+_pump = _StderrPump()
+
+
+class StderrPipeCapture:
+    """Reads a server's stderr from an OS pipe into memory and its log file.
+
+    ``start()`` returns the pipe's write end, which the stdio transport hands
+    to the subprocess as its stderr. The shared pump thread splits what
+    arrives into lines, appends each to the persistent log through the
+    buffered ``write_log`` and keeps the most recent distinct lines in a
+    ring buffer (optionally echoing them to the user).
 
     Logs live at ``~/.code_puppy/mcp_logs/<server_name>.log``.
     """
@@ -40,104 +166,105 @@ class StderrFileCapture:
         server_name: str,
         emit_to_user: bool = False,  # Disabled by default to reduce console noise
         message_group: Optional[uuid.UUID] = None,
+        max_lines: int = 1000,
     ):
         self.server_name = server_name
         self.emit_to_user = emit_to_user
         self.message_group = message_group or uuid.uuid4()
         self.log_path = None
-        self.monitor_thread = None
-        self.stop_monitoring = threading.Event()
-        self.captured_lines: deque = deque(maxlen=1000)
-        self._last_read_pos = 0
+        self.captured_lines: deque = deque(maxlen=max_lines)
+        self._partial = b""
+        self._read_fd: Optional[int] = None
+        self._writer: Optional[TextIO] = None
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
 
-    def start(self) -> Path:
-        """Rotate the log, write a start marker, and begin tailing.
+    def start(self) -> TextIO:
+        """Rotate the log, write a start marker, and open the stderr pipe.
 
-        Returns the log path that the stdio transport should append stderr to.
+        Returns the pipe's write end for the stdio transport's ``log_file``.
         """
-        # Rotate log if needed
         rotate_log_if_needed(self.server_name)
-
-        # Get persistent log path
         self.log_path = get_log_file_path(self.server_name)
-
-        # Write startup marker
         write_log(self.server_name, "--- Server starting ---", "INFO")
 
-        self.stop_monitoring.clear()
-        self.monitor_thread = threading.Thread(target=self._monitor_file)
-        self.monitor_thread.daemon = True
-        self.monitor_thread.start()
-
-        return Path(self.log_path)
-
-    def _monitor_file(self):
-        """Monitor the log file for new content."""
-        if not self.log_path:
-            return
-
-        # Start reading from current position (end of file before we started)
-        try:
-            self._last_read_pos = os.path.getsize(self.log_path)
-        except OSError:
-            self._last_read_pos = 0
+        read_fd, write_fd = os.pipe()
+        if _SELECTABLE_PIPES:
+            os.set_blocking(read_fd, False)
+        self._read_fd = read_fd
+        self._writer = os.fdopen(write_fd, "w", encoding="utf-8")
+        self._finished.clear()
+        _pump.add(read_fd, self)
+        return self._writer
 
-        while not self.stop_monitoring.is_set():
-            self._drain_new_lines()
-            self.stop_monitoring.wait(0.1)  # Check every 100ms
+    def release_writer(self) -> None:
+        """Close our copy of the write end once the subprocess holds its own.
 
-    def _drain_new_lines(self, dedupe: bool = False) -> None:
-        """Read any unseen content from the log file into the buffer."""
-        if not self.log_path:
+        After this the pipe reaches EOF as soon as the server exits.
+        """
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            try:
+                writer.close()
+            except OSError:
+                pass
+
+    def _feed(self, data: bytes) -> None:
+        """Split pump data into lines (called on the pump thread)."""
+        with self._lock:
+            *complete, self._partial = (self._partial + data).split(b"\n")
+        for raw in complete:
+            self._add_line(raw)
+
+    def _finish(self) -> None:
+        """The pipe closed: keep any unterminated last line and signal stop()."""
+        with self._lock:
+            tail, self._partial = self._partial, b""
+        if tail:
+            self._add_line(tail)
+        self._finished.set()
+
+    def _add_line(self, raw: bytes) -> None:
+        line = raw.decode("utf-8", errors="replace").rstrip("\r")
+        if not line.strip():
             return
-        try:
-            with open(self.log_path, "r", encoding="utf-8", errors="replace") as f:
-                f.seek(self._last_read_pos)
-                new_content = f.read()
-                if not new_content:
-                    return
-                self._last_read_pos = f.tell()
-                for line in new_content.splitlines():
-                    if not line.strip():
-                        continue
-                    if dedupe and line in self.captured_lines:
-                        continue
-                    self.captured_lines.append(line)
-                    if self.emit_to_user:
-                        emit_info(
-                            f"MCP {self.server_name}: {line}",
-                            message_group=self.message_group,
-                        )
-        except Exception:
-            pass  # File might not exist yet or be deleted
+        write_log(self.server_name, line, "STDERR")
+        with self._lock:
+            self.captured_lines.append(line)
+        if self.emit_to_user:
+            emit_info(
+                f"MCP {self.server_name}: {line}",
+                message_group=self.message_group,
+            )
 
     def stop(self):
-        """Stop monitoring, flush remaining lines, and write a stop marker."""
-        self.stop_monitoring.set()
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=1)
+        """Drain the pipe to EOF, stop reading it, and write a stop marker."""
+        if self._read_fd is None:
+            return
+        self.release_writer()
+        if not self._finished.wait(STOP_DRAIN_SECONDS):
+            # Something (an orphaned grandchild?) still holds the write end.
+            logger.debug("Detaching stderr pipe of %s before EOF", self.server_name)
+            _pump.remove(self._read_fd, self)
+            self._finished.wait(STOP_DRAIN_SECONDS)
+        self._read_fd = None
 
-        # Write shutdown marker
         write_log(self.server_name, "--- Server stopped ---", "INFO")
-
-        # Read any remaining content for in-memory capture
-        if self.log_path and os.path.exists(self.log_path):
-            self._drain_new_lines(dedupe=True)
-
         # Note: We do NOT delete the log file - it's persistent!
 
     def get_captured_lines(self) -> List[str]:
         """Get all captured lines from this session."""
-        return list(self.captured_lines)
+        with self._lock:
+            return list(self.captured_lines)
 
 
-class BlockingStdioToolset(MCPToolset):
+class BlockingStdioToolset(CachingMCPToolset):
     """Stdio ``MCPToolset`` that captures stderr and tracks readiness.
 
     Replaces the deprecated ``MCPServerStdio`` subclasses
     (``SimpleCapturedMCPServerStdio`` / ``BlockingMCPServerStdio``): stderr
-    goes to a persistent log file through fastmcp's public
-    ``StdioTransport(log_file=...)`` hook, and ``wait_until_ready`` /
+    goes through a pipe (fastmcp's public ``StdioTransport(log_file=...)``
+    hook) to a persistent log file and an in-memory buffer, and ``wait_until_ready`` /
     ``ensure_ready`` let other tasks block until the server's ``initialize``
     handshake has completed (or failed).
     """
@@ -165,8 +292,8 @@ class BlockingStdioToolset(MCPToolset):
                 messages. Defaults to ``command``.
             emit_stderr: Echo captured stderr lines to the user.
             message_group: Message group for user-facing output.
-            **toolset_kwargs: Forwarded to ``MCPToolset`` (``init_timeout``,
-                ``read_timeout``, ``process_tool_call``, ...).
+            **toolset_kwargs: Forwarded to ``CachingMCPToolset`` (``init_timeout``,
+                ``read_timeout``, ``process_tool_call``, ``tool_cache_key``, ...).
         """
         self.command = command
         self.args = list(args)
@@ -175,31 +302,31 @@ class BlockingStdioToolset(MCPToolset):
         self.server_name = server_name or command
         self.emit_stderr = emit_stderr
         self.message_group = message_group or uuid.uuid4()
-        self._stderr_capture: Optional[StderrFileCapture] = None
+        self._stderr_capture: Optional[StderrPipeCapture] = None
         self._ready_event = asyncio.Event()
         self._init_error: Optional[BaseException] = None
 
         # keep_alive=False so stopping the toolset actually terminates the
         # subprocess (parity with the old MCPServerStdio semantics) instead
         # of fastmcp's default of keeping it warm across connections.
-        transport = StdioTransport(
+        # ``log_file`` is pointed at a fresh stderr pipe on every start.
+        self._transport = StdioTransport(
             command=command,
             args=self.args,
             env=env,
             cwd=cwd,
             keep_alive=False,
-            log_file=Path(get_log_file_path(self.server_name)),
         )
-        super().__init__(transport, **toolset_kwargs)
+        super().__init__(self._transport, **toolset_kwargs)
 
     async def __aenter__(self):
         """Enter the toolset context, tracking readiness and stderr."""
         starting = not self.is_running
         if starting:
-            self._stderr_capture = StderrFileCapture(
+            self._stderr_capture = StderrPipeCapture(
                 self.server_name, self.emit_stderr, self.message_group
             )
-            self._stderr_capture.start()
+            self._transport.log_file = self._stderr_capture.start()
 
         try:
             result = await super().__aenter__()
@@ -214,7 +341,7 @@ class BlockingStdioToolset(MCPToolset):
 
             self._ready_event.set()
             if starting and self._stderr_capture is not None:
-                self._stderr_capture.stop()
+                await asyncio.to_thread(self._stderr_capture.stop)
 
             # Point the user to /mcp logs; error_details stay out of the prompt
             # (already in the log file — no stack-trace spam on every run).
@@ -232,6 +359,9 @@ class BlockingStdioToolset(MCPToolset):
             )
             raise
 
+        if starting and self._stderr_capture is not None:
+            # The subprocess has its own copy of the pipe's write end now.
+            self._stderr_capture.release_writer()
         self._init_error = None
         self._ready_event.set()
         return result
@@ -239,7 +369,7 @@ class BlockingStdioToolset(MCPToolset):
     async def __aexit__(self, *args: Any):
         result = await super().__aexit__(*args)
         if not self.is_running and self._stderr_capture is not None:
-            self._stderr_capture.stop()
+            await asyncio.to_thread(self._stderr_capture.stop)
         return result
 
     def get_captured_stderr(self) -> List[str]:
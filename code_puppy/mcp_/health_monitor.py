@@ -3,6 +3,11 @@ Health monitoring system for MCP servers.
 
 This module provides continuous health monitoring for MCP servers with
 automatic recovery actions when consecutive failures are detected.
+
+Servers with an open session are probed with a real MCP ``ping`` (tight
+timeout, true round-trip latency). Probes are skipped while the server's own
+tool calls keep succeeding, and the check interval adapts per server: it
+backs off while a server is healthy and idle and tightens after failures.
 """
 
 import asyncio
@@ -19,6 +24,12 @@ from .managed_server import ManagedMCPServer
 
 logger = logging.getLogger(__name__)
 
+PING_TIMEOUT_SECONDS = 5.0
+# Healthy idle servers are probed up to this many times less often.
+MAX_IDLE_BACKOFF = 8
+# Failing servers are re-probed no more often than this.
+MIN_CHECK_INTERVAL_SECONDS = 5.0
+
 
 @dataclass
 class HealthStatus:
@@ -50,7 +61,8 @@ class HealthMonitor:
     - Health history tracking with configurable limit
     - Custom health check registration
     - Automatic recovery triggering on consecutive failures
-    - Configurable check intervals
+    - Adaptive per-server check intervals (idle back-off, failure tightening)
+    - MCP ping over the live session, with passive tool-call signals
 
     Example usage:
         monitor = HealthMonitor(check_interval=30)
@@ -63,14 +75,23 @@ class HealthMonitor:
         history = monitor.get_health_history("server-1", limit=50)
     """
 
-    def __init__(self, check_interval: int = 30):
+    def __init__(
+        self,
+        check_interval: int = 30,
+        ping_timeout: float = PING_TIMEOUT_SECONDS,
+    ):
         """
         Initialize the health monitor.
 
         Args:
-            check_interval: Interval between health checks in seconds
+            check_interval: Base interval between health checks in seconds
+            ping_timeout: Seconds to wait for an MCP ping reply
         """
         self.check_interval = check_interval
+        self.ping_timeout = ping_timeout
+        self.check_intervals: Dict[str, float] = {}
+        self._last_signal_at: Dict[str, float] = {}
+        self._probe_client: Optional[httpx.AsyncClient] = None
         self.monitoring_tasks: Dict[str, asyncio.Task] = {}
         self.health_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
         self.custom_health_checks: Dict[str, Callable] = {}
@@ -144,6 +165,8 @@ class HealthMonitor:
             async with self._lock:
                 self.consecutive_failures.pop(server_id, None)
             self.last_check_time.pop(server_id, None)
+            self.check_intervals.pop(server_id, None)
+            self._last_signal_at.pop(server_id, None)
         else:
             logger.warning(f"No monitoring task found for server {server_id}")
 
@@ -302,15 +325,20 @@ class HealthMonitor:
 
         while True:
             try:
-                # Wait for check interval
-                await asyncio.sleep(self.check_interval)
+                # Wait for this server's current check interval
+                await asyncio.sleep(self.get_check_interval(server_id))
 
                 # Skip if server is not enabled
                 if not server.is_enabled():
                     continue
 
-                # Perform health check
-                health_status = await self.check_health(server)
+                # Recent successful tool calls stand in for a probe
+                active = False
+                health_status = self._passive_health_status(server_id, server)
+                if health_status is not None:
+                    active = True
+                else:
+                    health_status = await self.check_health(server)
                 await self._record_health_status(server_id, health_status)
 
                 # Handle consecutive failures
@@ -333,6 +361,9 @@ class HealthMonitor:
                 if not health_status.is_healthy:
                     await self._handle_consecutive_failures(server_id, server)
 
+                self._adapt_check_interval(
+                    server_id, health_status.is_healthy, active=active
+                )
                 self.last_check_time[server_id] = datetime.now()
 
             except asyncio.CancelledError:
@@ -343,6 +374,70 @@ class HealthMonitor:
                 # Continue monitoring despite errors
                 await asyncio.sleep(5)  # Brief delay before retrying
 
+    def get_check_interval(self, server_id: str) -> float:
+        """
+        Get the current (adapted) check interval for a server.
+
+        Args:
+            server_id: Unique identifier for the server
+
+        Returns:
+            Seconds until the server's next health check
+        """
+        return self.check_intervals.get(server_id, self.check_interval)
+
+    def _adapt_check_interval(
+        self, server_id: str, healthy: bool, active: bool
+    ) -> None:
+        """
+        Back off while a server is healthy and idle; tighten after failures.
+
+        Args:
+            server_id: Unique identifier for the server
+            healthy: Result of the latest check
+            active: Whether the server handled tool calls since the last check
+        """
+        base = self.check_interval
+        if not healthy:
+            failures = self.consecutive_failures.get(server_id, 1)
+            floor = min(MIN_CHECK_INTERVAL_SECONDS, base)
+            interval = max(floor, base / (2 ** max(failures, 1)))
+        elif active:
+            interval = base
+        else:
+            current = self.check_intervals.get(server_id, base)
+            interval = min(base * MAX_IDLE_BACKOFF, max(current, base) * 2)
+        self.check_intervals[server_id] = interval
+
+    def _passive_health_status(
+        self, server_id: str, server: ManagedMCPServer
+    ) -> Optional[HealthStatus]:
+        """
+        Turn a successful tool call since the last check into a health status.
+
+        Failed tool calls return None so an active probe confirms them.
+
+        Args:
+            server_id: Unique identifier for the server
+            server: The managed MCP server
+
+        Returns:
+            A passive HealthStatus, or None if a probe is needed
+        """
+        signal = server.last_tool_call()
+        if signal is None or signal.at <= self._last_signal_at.get(server_id, 0.0):
+            return None
+        self._last_signal_at[server_id] = signal.at
+        if not signal.success:
+            return None
+        return HealthStatus(
+            timestamp=datetime.now(),
+            is_healthy=True,
+            latency_ms=signal.latency_ms,
+            error=None,
+            check_type="passive",
+        )
+
     async def _record_health_status(self, server_id: str, status: HealthStatus) -> None:
         """
         Record a health status in the history.
@@ -429,9 +524,52 @@ class HealthMonitor:
             logger.error(f"Recovery action failed for server {server_id}: {e}")
             raise
 
+    async def _ping_session(
+        self, server: ManagedMCPServer
+    ) -> Optional[HealthCheckResult]:
+        """
+        Probe a server with an MCP ``ping`` over its open session.
+
+        Args:
+            server: The managed MCP server to check
+
+        Returns:
+            HealthCheckResult with the round-trip latency, or None if the
+            server has no open session to ping
+        """
+        try:
+            rtt_ms = await server.ping(self.ping_timeout)
+        except asyncio.TimeoutError:
+            return HealthCheckResult(
+                success=False,
+                latency_ms=self.ping_timeout * 1000,
+                error=f"MCP ping timed out after {self.ping_timeout}s",
+            )
+        except Exception as e:
+            return HealthCheckResult(
+                success=False, latency_ms=0.0, error=f"MCP ping failed: {e}"
+            )
+        if rtt_ms is None:
+            return None
+        return HealthCheckResult(success=True, latency_ms=rtt_ms, error=None)
+
+    def _get_probe_client(self) -> httpx.AsyncClient:
+        """Return the shared client for reachability probes, creating it once.
+
+        A plain client on purpose: the retrying transport from
+        ``create_async_client`` would sit through its whole backoff schedule
+        on a failing server, reporting one slow success instead of a failure.
+        """
+        if self._probe_client is None or self._probe_client.is_closed:
+            self._probe_client = httpx.AsyncClient(timeout=self.ping_timeout)
+        return self._probe_client
+
     async def _check_sse_health(self, server: ManagedMCPServer) -> HealthCheckResult:
         """
-        Health check for SSE servers using GET request.
+        Health check for SSE servers.
+
+        Pings over the open session; without one, falls back to an HTTP
+        reachability probe (``/health``, then the base URL).
 
         Args:
             server: The managed MCP server to check
@@ -449,37 +587,41 @@ class HealthMonitor:
                     error="No URL configured for SSE server",
                 )
 
+            pinged = await self._ping_session(server)
+            if pinged is not None:
+                return pinged
+
             # Add health endpoint if available, otherwise use base URL
             health_url = (
                 f"{url.rstrip('/')}/health" if not url.endswith("/health") else url
             )
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(health_url)
+            client = self._get_probe_client()
+            response = await client.get(health_url)
 
-                if response.status_code == 404:
-                    # Try base URL if health endpoint doesn't exist
-                    response = await client.get(url)
+            if response.status_code == 404:
+                # Try base URL if health endpoint doesn't exist
+                response = await client.get(url)
 
-                success = 200 <= response.status_code < 400
-                error = (
-                    None
-                    if success
-                    else f"HTTP {response.status_code}: {response.reason_phrase}"
-                )
+            success = 200 <= response.status_code < 400
+            error = (
+                None
+                if success
+                else f"HTTP {response.status_code}: {response.reason_phrase}"
+            )
 
-                return HealthCheckResult(
-                    success=success,
-                    latency_ms=0.0,  # Will be filled by perform_health_check
-                    error=error,
-                )
+            return HealthCheckResult(
+                success=success,
+                latency_ms=0.0,  # Will be filled by perform_health_check
+                error=error,
+            )
 
         except Exception as e:
             return HealthCheckResult(success=False, latency_ms=0.0, error=str(e))
 
     async def _check_http_health(self, server: ManagedMCPServer) -> HealthCheckResult:
         """
-        Health check for HTTP servers using GET request.
+        Health check for HTTP servers.
 
         Args:
             server: The managed MCP server to check
@@ -492,7 +634,11 @@ class HealthMonitor:
 
     async def _check_stdio_health(self, server: ManagedMCPServer) -> HealthCheckResult:
         """
-        Health check for stdio servers using ping command.
+        Health check for stdio servers.
+
+        Pings over the open session, so a hung server fails within
+        ``ping_timeout``. Without a session there is no process to probe;
+        only the configured command is validated.
 
         Args:
             server: The managed MCP server to check
@@ -503,39 +649,32 @@ class HealthMonitor:
         try:
             server.get_pydantic_server()
 
-            # NOTE: simplified health check — confirm the server responds and is
-            # configured; no real MCP message is sent.
-            try:
-                config = server.config.config
-                command = config.get("command")
-
-                if not command:
-                    return HealthCheckResult(
-                        success=False,
-                        latency_ms=0.0,
-                        error="No command configured for stdio server",
-                    )
+            pinged = await self._ping_session(server)
+            if pinged is not None:
+                return pinged
 
-                # Basic validation that command exists
-                import shutil
+            config = server.config.config
+            command = config.get("command")
 
-                if not shutil.which(command):
-                    return HealthCheckResult(
-                        success=False,
-                        latency_ms=0.0,
-                        error=f"Command '{command}' not found in PATH",
-                    )
+            if not command:
+                return HealthCheckResult(
+                    success=False,
+                    latency_ms=0.0,
+                    error="No command configured for stdio server",
+                )
 
-                # If we get here, basic checks passed
-                return HealthCheckResult(success=True, latency_ms=0.0, error=None)
+            # Basic validation that command exists
+            import shutil
 
-            except Exception as e:
+            if not shutil.which(command):
                 return HealthCheckResult(
                     success=False,
                     latency_ms=0.0,
-                    error=f"Server communication failed: {str(e)}",
+                    error=f"Command '{command}' not found in PATH",
                 )
 
+            return HealthCheckResult(success=True, latency_ms=0.0, error=None)
+
         except Exception as e:
             return HealthCheckResult(success=False, latency_ms=0.0, error=str(e))
 
@@ -578,5 +717,11 @@ class HealthMonitor:
         self.monitoring_tasks.clear()
         self.consecutive_failures.clear()
         self.last_check_time.clear()
+        self.check_intervals.clear()
+        self._last_signal_at.clear()
+
+        if self._probe_client is not None:
+            await self._probe_client.aclose()
+            self._probe_client = None
 
         logger.info("Health monitor shutdown complete")
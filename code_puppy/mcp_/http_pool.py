@@ -0,0 +1,305 @@
+"""Shared HTTP connection pool for SSE and streamable-HTTP MCP servers.
+
+Every MCP session used to get its own ``httpx.AsyncClient`` -- its own
+connection pool and its own TLS handshakes -- even when a dozen servers sit
+behind the same local gateway, and the client was rebuilt (or, for SSE
+servers with headers, reused after it had already been closed) on every
+health-monitor restart.
+
+Here one ``httpx.AsyncHTTPTransport`` (the actual connection pool) is shared
+per *origin + TLS/proxy configuration + event loop*. Each session still gets a
+cheap ``AsyncClient`` of its own, carrying that server's headers, auth and
+timeouts, but borrowing the shared transport:
+
+- connections per origin are bounded by ``mcp_http_pool_max_connections``;
+- idle keep-alive connections expire after ``KEEPALIVE_EXPIRY_SECONDS``;
+- a transport nobody has borrowed for ``POOL_IDLE_SECONDS`` is closed the next
+  time the pool is used;
+- closing a session's client only *returns* the transport, so a restarted
+  server picks its warm connections straight back up.
+
+Transports are keyed by event loop as well because httpcore connections are
+bound to the loop that opened them.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from code_puppy.http_utils import RetryingAsyncClient, _resolve_proxy_config
+
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+POOL_IDLE_SECONDS = 120.0
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+PoolKey = Tuple[Any, ...]
+
+
+def _origin(url: str) -> Tuple[str, str, int]:
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    return scheme, host, parts.port or _DEFAULT_PORTS.get(scheme, 0)
+
+
+@dataclass
+class _SharedTransport:
+    transport: httpx.AsyncHTTPTransport
+    loop_ref: Optional["weakref.ReferenceType[asyncio.AbstractEventLoop]"]
+    borrowers: int = 0
+    idle_since: Optional[float] = None
+    sessions: int = 0
+
+    def loop_alive(self) -> bool:
+        if self.loop_ref is None:
+            return True
+        loop = self.loop_ref()
+        return loop is not None and not loop.is_closed()
+
+
+class _BorrowedTransport(httpx.AsyncBaseTransport):
+    """A session's handle on a shared transport; closing it returns it."""
+
+    def __init__(self, pool: "MCPHttpPool", key: PoolKey, shared: _SharedTransport):
+        self._pool = pool
+        self._key = key
+        self._shared = shared
+        self._released = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._released:
+            raise RuntimeError("MCP HTTP transport used after its session closed")
+        return await self._shared.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        if not self._released:
+            self._released = True
+            self._pool._release(self._key, self._shared)
+
+
+class MCPHttpPool:
+    """Registry of shared transports, one per origin/TLS config/event loop."""
+
+    def __init__(self, max_connections: int) -> None:
+        self.max_connections = max_connections
+        self._shared: Dict[PoolKey, _SharedTransport] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    # ----------------------------------------------------------------- public
+
+    def client_factory(
+        self,
+        url: str,
+        *,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: Any = 30,
+    ) -> Callable[..., httpx.AsyncClient]:
+        """Return a fastmcp ``httpx_client_factory`` for one server.
+
+        ``headers`` and ``timeout`` are the server's own settings; headers and
+        timeouts passed by the transport at connect time take precedence.
+        """
+        base_headers = dict(headers or {})
+        default_timeout = timeout
+
+        def factory(
+            headers: Optional[Dict[str, str]] = None,
+            timeout: Any = None,
+            auth: Any = None,
+            **kwargs: Any,
+        ) -> httpx.AsyncClient:
+            merged = {**base_headers, **(headers or {})}
+            return self.new_client(
+                url,
+                headers=merged,
+                timeout=timeout if timeout is not None else default_timeout,
+                auth=auth,
+                follow_redirects=kwargs.get("follow_redirects", False),
+            )
+
+        return factory
+
+    def new_client(
+        self,
+        url: str,
+        *,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: Any = 30,
+        auth: Any = None,
+        follow_redirects: bool = False,
+    ) -> httpx.AsyncClient:
+        """Build a per-session client over the shared transport for ``url``."""
+        proxy_config = _resolve_proxy_config()
+        transport = self._borrow(url, proxy_config)
+        client_cls = (
+            httpx.AsyncClient if proxy_config.disable_retry else RetryingAsyncClient
+        )
+        return client_cls(
+            transport=transport,
+            headers=headers or {},
+            timeout=timeout,
+            auth=auth,
+            follow_redirects=follow_redirects,
+            # The shared transport already carries the resolved proxy.
+            trust_env=False,
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "transports": len(self._shared),
+                "borrowed": sum(s.borrowers for s in self._shared.values()),
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+            }
+
+    async def aclose(self) -> None:
+        """Close every transport: the running loop's here, others on their loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entries = list(self._shared.values())
+            self._shared.clear()
+        for entry in entries:
+            if entry.loop_ref is None or entry.loop_ref() is loop:
+                await entry.transport.aclose()
+            else:
+                _close_on_owner(entry, loop)
+
+    # ---------------------------------------------------------------- private
+
+    def _borrow(self, url: str, proxy_config) -> _BorrowedTransport:
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        key: PoolKey = (
+            id(loop) if loop is not None else None,
+            *_origin(url),
+            proxy_config.verify,
+            proxy_config.proxy_url,
+            proxy_config.http2_enabled,
+        )
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now, loop)
+            shared = self._shared.get(key)
+            if shared is not None and not self._same_loop(shared, loop):
+                # id() reuse after the old loop died: never share across loops.
+                del self._shared[key]
+                shared = None
+            if shared is None:
+                shared = _SharedTransport(
+                    transport=self._new_transport(proxy_config),
+                    loop_ref=weakref.ref(loop) if loop is not None else None,
+                )
+                self._shared[key] = shared
+                self.created += 1
+            elif shared.sessions:
+                self.reused += 1
+            shared.borrowers += 1
+            shared.sessions += 1
+            shared.idle_since = None
+        return _BorrowedTransport(self, key, shared)
+
+    def _new_transport(self, proxy_config) -> httpx.AsyncHTTPTransport:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        )
+        return httpx.AsyncHTTPTransport(
+            verify=proxy_config.verify,
+            http2=proxy_config.http2_enabled,
+            limits=limits,
+            proxy=proxy_config.proxy_url,
+        )
+
+    @staticmethod
+    def _same_loop(
+        shared: _SharedTransport, loop: Optional[asyncio.AbstractEventLoop]
+    ) -> bool:
+        if shared.loop_ref is None:
+            return loop is None
+        return shared.loop_ref() is loop
+
+    def _release(self, key: PoolKey, shared: _SharedTransport) -> None:
+        with self._lock:
+            shared.borrowers = max(0, shared.borrowers - 1)
+            if shared.borrowers == 0:
+                shared.idle_since = time.monotonic()
+
+    def _evict_idle(
+        self, now: float, loop: Optional[asyncio.AbstractEventLoop]
+    ) -> None:
+        """Drop idle or orphaned transports. Caller holds ``self._lock``."""
+        for key, shared in list(self._shared.items()):
+            orphaned = not shared.loop_alive()
+            idle = (
+                shared.borrowers == 0
+                and shared.idle_since is not None
+                and now - shared.idle_since >= POOL_IDLE_SECONDS
+            )
+            if not (orphaned or idle):
+                continue
+            del self._shared[key]
+            self.evicted += 1
+            if not orphaned:
+                _close_on_owner(shared, loop)
+
+
+def _close_on_owner(
+    shared: _SharedTransport, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Schedule ``shared``'s close on the loop that owns its connections.
+
+    Connections can only be closed on the loop that opened them, so another
+    live loop's transport is handed to that loop thread-safely; a closed
+    loop's sockets went with it.
+    """
+    owner = shared.loop_ref() if shared.loop_ref is not None else loop
+    if owner is None or owner.is_closed():
+        return
+    if owner is loop:
+        owner.create_task(shared.transport.aclose())
+    else:
+        transport = shared.transport
+        owner.call_soon_threadsafe(lambda: owner.create_task(transport.aclose()))
+
+
+_pool: Optional[MCPHttpPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_mcp_http_pool() -> Optional[MCPHttpPool]:
+    """Return the process-wide pool, or ``None`` when pooling is disabled."""
+    from code_puppy.config import get_mcp_http_pool_max_connections
+
+    global _pool
+    max_connections = get_mcp_http_pool_max_connections()
+    if max_connections <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = MCPHttpPool(max_connections)
+        else:
+            # Applies to transports created from now on.
+            _pool.max_connections = max_connections
+        return _pool
+
+
+def reset_mcp_http_pool() -> None:
+    """Forget every shared transport (tests / config reloads)."""
+    global _pool
+    with _pool_lock:
+        _pool = None
@@ -5,7 +5,9 @@ This module provides a managed wrapper around pydantic-ai MCP server classes
 that adds management capabilities while maintaining 100% compatibility.
 """
 
+import asyncio
 import os
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -14,13 +16,15 @@ from typing import Any, Callable, Dict, Optional
 
 import httpx
 from fastmcp.client.transports import SSETransport, StreamableHttpTransport
-from pydantic_ai import RunContext
+from pydantic_ai import ModelRetry, RunContext
 from pydantic_ai.mcp import CallToolFunc, MCPToolset, ToolResult
 from pydantic_ai.toolsets import AbstractToolset
 
 from code_puppy.http_utils import create_async_client, get_cert_bundle_path
 from code_puppy.mcp_.blocking_startup import BlockingStdioToolset
+from code_puppy.mcp_.http_pool import get_mcp_http_pool
 from code_puppy.mcp_.tool_arg_coercion import coerce_tool_args
+from code_puppy.mcp_.tool_cache import CachingMCPToolset, tool_cache_fingerprint
 
 
 def _expand_env_vars(value: Any) -> Any:
@@ -192,6 +196,16 @@ async def process_tool_call(
     return await call_tool(name, tool_args, metadata={"deps": ctx.deps})
 
 
+@dataclass
+class ToolCallSignal:
+    """Outcome of a server's most recent tool call (a passive health signal)."""
+
+    at: float  # time.monotonic() when the call finished
+    success: bool
+    latency_ms: float
+    error: Optional[str] = None
+
+
 class ManagedMCPServer:
     """
     Managed wrapper around pydantic-ai MCP toolsets.
@@ -227,6 +241,7 @@ class ManagedMCPServer:
         self._start_time: Optional[datetime] = None
         self._stop_time: Optional[datetime] = None
         self._error_message: Optional[str] = None
+        self._last_tool_call: Optional[ToolCallSignal] = None
 
         # Initialize the pydantic server
         try:
@@ -269,10 +284,14 @@ class ManagedMCPServer:
         'optional'. Pinned off to preserve the direct-call semantics our
         timeout/stderr-capture/blocking-startup plumbing was built against;
         servers that *require* tasks still get them regardless of this flag.
+
+        ``tool_cache_key`` lets the toolset persist its tool listing across
+        sessions (see ``mcp_.tool_cache``).
         """
         kwargs: Dict[str, Any] = {
-            "process_tool_call": process_tool_call,
+            "process_tool_call": self._observed_tool_call,
             "prefer_tasks": False,
+            "tool_cache_key": tool_cache_fingerprint(self.config.type, config),
         }
         if "timeout" in config:
             kwargs["init_timeout"] = config["timeout"]
@@ -280,6 +299,70 @@ class ManagedMCPServer:
             kwargs["read_timeout"] = config["read_timeout"]
         return kwargs
 
+    async def _observed_tool_call(
+        self,
+        ctx: RunContext[Any],
+        call_tool: CallToolFunc,
+        name: str,
+        tool_args: dict[str, Any],
+    ) -> ToolResult:
+        """Run :func:`process_tool_call`, recording the outcome for health checks.
+
+        A tool that reports an error (``ModelRetry``) still proves the server
+        answered; only transport-level failures count against its health.
+        """
+        started = time.monotonic()
+        try:
+            result = await process_tool_call(ctx, call_tool, name, tool_args)
+        except ModelRetry:
+            self._note_tool_call(started, True)
+            raise
+        except Exception as e:
+            self._note_tool_call(started, False, str(e) or type(e).__name__)
+            raise
+        self._note_tool_call(started, True)
+        return result
+
+    def _note_tool_call(
+        self, started: float, success: bool, error: Optional[str] = None
+    ) -> None:
+        now = time.monotonic()
+        self._last_tool_call = ToolCallSignal(
+            at=now, success=success, latency_ms=(now - started) * 1000, error=error
+        )
+
+    def last_tool_call(self) -> Optional[ToolCallSignal]:
+        """Outcome of the most recent tool call, or None if none has run."""
+        return self._last_tool_call
+
+    async def ping(self, timeout: float) -> Optional[float]:
+        """
+        Send an MCP ``ping`` over the server's open session.
+
+        Never opens a session (or spawns a stdio process) just to probe it.
+
+        Args:
+            timeout: Seconds to wait for the reply
+
+        Returns:
+            Round-trip time in milliseconds, or None if no session is open
+
+        Raises:
+            TimeoutError: If the server does not answer within ``timeout``
+            Exception: If the session fails while pinging
+        """
+        toolset = self._toolset
+        if toolset is None or not toolset.is_running:
+            return None
+        client = toolset.client
+        if not client.is_connected():
+            return None
+        started = time.perf_counter()
+        answered = await asyncio.wait_for(client.ping(), timeout)
+        if not answered:
+            raise RuntimeError("MCP ping returned an unexpected result")
+        return (time.perf_counter() - started) * 1000
+
     def _create_server(self) -> None:
         """
         Create the appropriate ``MCPToolset`` based on config type.
@@ -299,23 +382,24 @@ class ManagedMCPServer:
             # Build the SSE transport explicitly — fastmcp's URL inference
             # would pick streamable-HTTP for URLs not ending in /sse, but our
             # config declares the transport type authoritatively.
+            url = _expand_env_vars(config["url"])
             http_client = config.get("http_client")
-            if http_client is None and config.get("headers"):
-                # Create HTTP client if headers are provided but no client
-                # specified (preserves CA bundle / proxy / retry behavior).
-                http_client = self._get_http_client()
+            if http_client is not None:
+                client_factory = _httpx_client_factory(http_client)
+            else:
+                client_factory = self._pooled_client_factory(url)
+                if client_factory is None and config.get("headers"):
+                    # Pooling disabled: build a dedicated client so headers
+                    # keep the CA bundle / proxy / retry behavior.
+                    client_factory = _httpx_client_factory(self._get_http_client())
 
             read_timeout = config.get("read_timeout")
             transport = SSETransport(
-                url=_expand_env_vars(config["url"]),
+                url=url,
                 sse_read_timeout=read_timeout if read_timeout is not None else 300,
-                httpx_client_factory=(
-                    _httpx_client_factory(http_client)
-                    if http_client is not None
-                    else None
-                ),
+                httpx_client_factory=client_factory,
             )
-            self._toolset = MCPToolset(transport, **self._toolset_kwargs(config))
+            self._toolset = CachingMCPToolset(transport, **self._toolset_kwargs(config))
 
         elif server_type == "stdio":
             if "command" not in config:
@@ -359,11 +443,13 @@ class ManagedMCPServer:
             headers = (
                 _expand_env_vars(config["headers"]) if config.get("headers") else None
             )
+            url = _expand_env_vars(config["url"])
             transport = StreamableHttpTransport(
-                url=_expand_env_vars(config["url"]),
+                url=url,
                 headers=headers,
+                httpx_client_factory=self._pooled_client_factory(url),
             )
-            self._toolset = MCPToolset(transport, **self._toolset_kwargs(config))
+            self._toolset = CachingMCPToolset(transport, **self._toolset_kwargs(config))
 
         else:
             raise ValueError(f"Unsupported server type: {server_type}")
@@ -380,9 +466,13 @@ class ManagedMCPServer:
         Returns:
             Configured async HTTP client with custom headers
         """
-        headers = self.config.config.get("headers", {})
+        timeout = self.config.config.get("timeout", 30)
+        client = create_async_client(headers=self._resolved_headers(), timeout=timeout)
+        return client
 
-        # Expand environment variables in headers
+    def _resolved_headers(self) -> Dict[str, Any]:
+        """Config headers with environment variables expanded."""
+        headers = self.config.config.get("headers", {})
         resolved_headers = {}
         if isinstance(headers, dict):
             for k, v in headers.items():
@@ -390,10 +480,31 @@ class ManagedMCPServer:
                     resolved_headers[k] = os.path.expandvars(v)
                 else:
                     resolved_headers[k] = v
+        return resolved_headers
 
-        timeout = self.config.config.get("timeout", 30)
-        client = create_async_client(headers=resolved_headers, timeout=timeout)
-        return client
+    def _pooled_client_factory(
+        self, url: str
+    ) -> Optional[Callable[..., httpx.AsyncClient]]:
+        """
+        Client factory borrowing the shared MCP connection pool.
+
+        Each session gets a fresh client carrying this server's headers, so
+        restarts never reuse a closed client, while connections to the same
+        origin are shared across servers and sessions. Returns None when
+        pooling is disabled (``mcp_http_pool_max_connections = 0``).
+        """
+        pool = get_mcp_http_pool()
+        if pool is None:
+            return None
+        config = self.config.config
+        read_timeout = config.get("read_timeout")
+        timeout = httpx.Timeout(
+            config.get("timeout", 30),
+            read=read_timeout if read_timeout is not None else 300,
+        )
+        return pool.client_factory(
+            url, headers=self._resolved_headers(), timeout=timeout
+        )
 
     def enable(self) -> None:
         """Enable server availability."""
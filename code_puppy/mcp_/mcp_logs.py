@@ -3,11 +3,23 @@ MCP Server Log Management.
 
 This module provides persistent log file management for MCP servers.
 Logs are stored in STATE_DIR/mcp_logs/<server_name>.log
+
+Writes go through one buffered writer per server: lines are appended to an
+in-memory batch and flushed through a single long-lived file handle, either
+by a background flusher every FLUSH_INTERVAL_SECONDS or as soon as the batch
+reaches FLUSH_THRESHOLD_BYTES. The file size is tracked in memory (resynced
+with one ``fstat`` per flush, since a stdio server's stderr may append to
+the same file) and the log rotates only once it crosses MAX_LOG_SIZE.
+Readers flush the batch first, so they always see every written line.
 """
 
+import atexit
+import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Dict, List, Optional
 
 from code_puppy.config import STATE_DIR
 
@@ -17,6 +29,15 @@ MAX_LOG_SIZE = 5 * 1024 * 1024
 # Number of rotated logs to keep
 MAX_ROTATED_LOGS = 3
 
+# Buffered lines are written at least this often...
+FLUSH_INTERVAL_SECONDS = 0.5
+
+# ...or as soon as this many bytes are pending
+FLUSH_THRESHOLD_BYTES = 64 * 1024
+
+# Block size for reading log tails backwards
+_TAIL_BLOCK_BYTES = 64 * 1024
+
 
 def get_mcp_logs_dir() -> Path:
     """
@@ -54,6 +75,11 @@ def rotate_log_if_needed(server_name: str) -> None:
     Args:
         server_name: Name of the MCP server
     """
+    writer = _writers.get(server_name)
+    if writer is not None:
+        # Release the handle so new lines land in the fresh file.
+        writer.close()
+
     log_path = get_log_file_path(server_name)
 
     if not log_path.exists():
@@ -63,7 +89,12 @@ def rotate_log_if_needed(server_name: str) -> None:
     if log_path.stat().st_size < MAX_LOG_SIZE:
         return
 
-    logs_dir = get_mcp_logs_dir()
+    _rotate_files(server_name, log_path)
+
+
+def _rotate_files(server_name: str, log_path: Path) -> None:
+    """Shift ``<name>.log`` -> ``.log.1`` -> ... -> ``.log.MAX_ROTATED_LOGS``."""
+    logs_dir = log_path.parent
     safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in server_name)
 
     # Remove oldest rotated log if we're at the limit
@@ -83,22 +114,184 @@ def rotate_log_if_needed(server_name: str) -> None:
     log_path.rename(rotated_path)
 
 
+class _LogWriter:
+    """Buffered appender for one server's log file."""
+
+    def __init__(self, server_name: str, log_path: Path):
+        self.server_name = server_name
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._file: Optional[BinaryIO] = None
+        self._size = 0  # bytes in the file, as of the last flush
+
+    def write(self, line: str) -> None:
+        with self._lock:
+            was_clean = not self._pending
+            self._pending.append(line)
+            self._pending_chars += len(line)
+            if self._pending_chars >= FLUSH_THRESHOLD_BYTES:
+                self._flush_locked()
+                return
+        if was_clean:
+            _flusher.schedule(self)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush pending lines and release the file handle."""
+        with self._lock:
+            self._flush_locked()
+            self._close_locked()
+
+    def discard(self) -> None:
+        """Drop pending lines and release the file handle (log is cleared)."""
+        with self._lock:
+            self._pending.clear()
+            self._pending_chars = 0
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        data = "".join(self._pending).encode("utf-8", errors="replace")
+        self._pending.clear()
+        self._pending_chars = 0
+        if self._file is None:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.log_path, "ab")
+        # A stdio server's stderr appends to this file too: resync the
+        # tracked size once per batch rather than trusting our own count.
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        if self._size >= MAX_LOG_SIZE:
+            self._close_locked()
+            _rotate_files(self.server_name, self.log_path)
+            self._size = 0
+
+
+class _Flusher:
+    """One daemon thread that flushes dirty writers on a timer."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._dirty: List[_LogWriter] = []
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, writer: _LogWriter) -> None:
+        with self._cond:
+            self._dirty.append(writer)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="mcp-log-flusher", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+            time.sleep(FLUSH_INTERVAL_SECONDS)
+            with self._cond:
+                batch, self._dirty = self._dirty, []
+            for writer in batch:
+                try:
+                    writer.flush()
+                except OSError:
+                    pass
+
+
+_flusher = _Flusher()
+_writers: Dict[str, _LogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(server_name: str) -> _LogWriter:
+    writer = _writers.get(server_name)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(server_name)
+            if writer is None:
+                writer = _LogWriter(server_name, get_log_file_path(server_name))
+                _writers[server_name] = writer
+    return writer
+
+
+def flush_logs(server_name: Optional[str] = None) -> None:
+    """
+    Write buffered log lines to disk.
+
+    Args:
+        server_name: Only flush this server's log; None flushes all
+    """
+    if server_name is not None:
+        writer = _writers.get(server_name)
+        writers = [writer] if writer is not None else []
+    else:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+def close_log_writers() -> None:
+    """Flush and close every buffered writer (shutdown / tests)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.close()
+        except OSError:
+            pass
+
+
+atexit.register(close_log_writers)
+
+
 def write_log(server_name: str, message: str, level: str = "INFO") -> None:
     """
     Write a log message for a server.
 
+    The line is buffered; it reaches disk within FLUSH_INTERVAL_SECONDS (or
+    immediately for readers of this module).
+
     Args:
         server_name: Name of the MCP server
         message: Log message to write
         level: Log level (INFO, ERROR, WARN, DEBUG)
     """
-    rotate_log_if_needed(server_name)
-
-    log_path = get_log_file_path(server_name)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] [{level}] {message}\n")
+    _get_writer(server_name).write(f"[{timestamp}] [{level}] {message}\n")
+
+
+def _tail_lines(path: Path, count: int) -> List[str]:
+    """Return the last ``count`` lines of ``path``, reading backwards."""
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        chunks: List[bytes] = []
+        newlines = 0
+        # One extra newline guarantees the earliest returned line is whole.
+        while pos > 0 and newlines <= count:
+            step = min(_TAIL_BLOCK_BYTES, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+    text = b"".join(reversed(chunks)).decode("utf-8", errors="replace")
+    return text.splitlines()[-count:]
 
 
 def read_logs(
@@ -115,6 +308,11 @@ def read_logs(
     Returns:
         List of log lines (most recent last)
     """
+    flush_logs(server_name)
+
+    if lines is not None and lines > 0:
+        return _read_last_lines(server_name, lines, include_rotated)
+
     all_lines = []
 
     # Read rotated logs first (oldest to newest)
@@ -134,13 +332,30 @@ def read_logs(
         with open(log_path, "r", encoding="utf-8", errors="replace") as f:
             all_lines.extend(f.read().splitlines())
 
-    # Return requested number of lines
-    if lines is not None and lines > 0:
-        return all_lines[-lines:]
-
     return all_lines
 
 
+def _read_last_lines(server_name: str, count: int, include_rotated: bool) -> List[str]:
+    """Tail the current log, continuing into rotated logs if it is short."""
+    log_path = get_log_file_path(server_name)
+    paths = [log_path]
+    if include_rotated:
+        logs_dir = get_mcp_logs_dir()
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in server_name)
+        paths.extend(
+            logs_dir / f"{safe_name}.log.{i}" for i in range(1, MAX_ROTATED_LOGS + 1)
+        )
+
+    collected: List[str] = []
+    for path in paths:
+        needed = count - len(collected)
+        if needed <= 0:
+            break
+        if path.exists():
+            collected = _tail_lines(path, needed) + collected
+    return collected
+
+
 def clear_logs(server_name: str, include_rotated: bool = True) -> None:
     """
     Clear logs for a server.
@@ -149,6 +364,10 @@ def clear_logs(server_name: str, include_rotated: bool = True) -> None:
         server_name: Name of the MCP server
         include_rotated: Whether to also clear rotated log files
     """
+    writer = _writers.get(server_name)
+    if writer is not None:
+        writer.discard()
+
     log_path = get_log_file_path(server_name)
 
     if log_path.exists():
@@ -171,6 +390,7 @@ def list_servers_with_logs() -> List[str]:
     Returns:
         List of server names with log files
     """
+    flush_logs()
     logs_dir = get_mcp_logs_dir()
     servers = set()
 
@@ -195,6 +415,7 @@ def get_log_stats(server_name: str) -> dict:
     Returns:
         Dictionary with log statistics
     """
+    flush_logs(server_name)
     log_path = get_log_file_path(server_name)
 
     stats = {
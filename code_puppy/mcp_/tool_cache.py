@@ -0,0 +1,232 @@
+"""On-disk cache of MCP servers' tool definitions.
+
+pydantic-ai only learns a server's tools from a live ``tools/list`` call, so
+until the first turn ``/context`` counts MCP servers as free, and every
+session waits on each server's listing before its first request.
+
+Each server's last listing is persisted under
+``<cache dir>/mcp_tool_defs/<fingerprint>.json``, where the fingerprint
+hashes the server's type and raw config. Entries also record the
+server-reported version (``serverInfo.version``):
+
+- :func:`~code_puppy.mcp_.toolset_utils.iter_cached_tool_defs` falls back to
+  the stored listing, so token estimates are right before any connection;
+- :class:`CachingMCPToolset` answers ``list_tools()`` from the stored listing
+  when the connected server reports the same version, then revalidates with
+  a live listing in the background;
+- a ``notifications/tools/list_changed`` drops the entry and refreshes it
+  from the live server.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp import types as mcp_types
+from pydantic_ai import RunContext
+from pydantic_ai.mcp import MCPToolset
+from pydantic_ai.toolsets import ToolsetTool
+
+from code_puppy import turn_trace
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+# Config keys that hold live objects rather than settings.
+_UNHASHED_CONFIG_KEYS = frozenset({"http_client"})
+
+# fingerprint -> ((mtime_ns, size), server_version, tools)
+_loaded: Dict[str, Tuple[Tuple[int, int], Optional[str], List[mcp_types.Tool]]] = {}
+_loaded_lock = threading.Lock()
+
+
+def tool_cache_fingerprint(server_type: str, config: Dict[str, Any]) -> str:
+    """Stable fingerprint of everything that decides a server's tool list."""
+    material = {
+        "type": server_type.lower(),
+        "config": {k: v for k, v in config.items() if k not in _UNHASHED_CONFIG_KEYS},
+    }
+    blob = json.dumps(material, sort_keys=True, default=repr)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+def _cache_dir() -> str:
+    from code_puppy.config import CACHE_DIR
+
+    return os.path.join(CACHE_DIR, "mcp_tool_defs")
+
+
+def _entry_path(fingerprint: str) -> str:
+    return os.path.join(_cache_dir(), f"{fingerprint}.json")
+
+
+def load_tool_defs(
+    fingerprint: str,
+) -> Optional[Tuple[Optional[str], List[mcp_types.Tool]]]:
+    """Return ``(server_version, tools)`` from disk, or None if not cached."""
+    path = _entry_path(fingerprint)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    signature = (st.st_mtime_ns, st.st_size)
+    with _loaded_lock:
+        hit = _loaded.get(fingerprint)
+        if hit is not None and hit[0] == signature:
+            return hit[1], hit[2]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("format") != CACHE_FORMAT_VERSION:
+            return None
+        tools = [mcp_types.Tool.model_validate(t) for t in payload["tools"]]
+        version = payload.get("server_version")
+    except Exception as e:
+        logger.debug("Ignoring unreadable MCP tool cache %s: %s", path, e)
+        return None
+    with _loaded_lock:
+        _loaded[fingerprint] = (signature, version, tools)
+    return version, tools
+
+
+def store_tool_defs(
+    fingerprint: str,
+    server_version: Optional[str],
+    tools: List[mcp_types.Tool],
+) -> None:
+    """Persist a live listing (atomically; failures are only logged)."""
+    payload = {
+        "format": CACHE_FORMAT_VERSION,
+        "server_version": server_version,
+        "saved_at": time.time(),
+        "tools": [
+            t.model_dump(mode="json", by_alias=True, exclude_none=True) for t in tools
+        ],
+    }
+    directory = _cache_dir()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, _entry_path(fingerprint))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug("Could not write MCP tool cache for %s: %s", fingerprint, e)
+
+
+def drop_tool_defs(fingerprint: str) -> None:
+    """Forget a server's stored listing."""
+    with _loaded_lock:
+        _loaded.pop(fingerprint, None)
+    try:
+        os.unlink(_entry_path(fingerprint))
+    except OSError:
+        pass
+
+
+def clear_tool_def_memo() -> None:
+    """Drop the in-process copies of loaded entries (tests)."""
+    with _loaded_lock:
+        _loaded.clear()
+
+
+class CachingMCPToolset(MCPToolset):
+    """``MCPToolset`` whose tool listing survives across sessions on disk.
+
+    Without a ``tool_cache_key`` it behaves exactly like ``MCPToolset``.
+    """
+
+    def __init__(self, *args: Any, tool_cache_key: Optional[str] = None, **kwargs):
+        user_handler = kwargs.pop("message_handler", None)
+
+        async def message_handler(message: Any) -> None:
+            notification = getattr(message, "root", message)
+            if isinstance(notification, mcp_types.ToolListChangedNotification):
+                self._on_tool_list_changed()
+            if user_handler is not None:
+                await user_handler(message)
+
+        super().__init__(*args, message_handler=message_handler, **kwargs)
+        self.tool_cache_key = tool_cache_key
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def last_known_tools(self) -> Optional[List[mcp_types.Tool]]:
+        """Stored tool listing from a previous session (no server I/O)."""
+        if not self.tool_cache_key:
+            return None
+        stored = load_tool_defs(self.tool_cache_key)
+        return stored[1] if stored is not None else None
+
+    def _server_version(self) -> Optional[str]:
+        try:
+            return self.server_info.version
+        except AttributeError:
+            return None
+
+    async def list_tools(self) -> list[mcp_types.Tool]:
+        if not self.tool_cache_key or not self.cache_tools:
+            return await super().list_tools()
+        if self._cached_tools is not None:
+            return self._cached_tools
+        async with self:
+            version = self._server_version()
+            stored = load_tool_defs(self.tool_cache_key)
+            if stored is not None and stored[0] == version:
+                self._cached_tools = stored[1]
+                self._schedule_refresh()
+                return stored[1]
+            tools = await super().list_tools()
+            store_tool_defs(self.tool_cache_key, version, tools)
+            return tools
+
+    async def call_tool(
+        self,
+        name: str,
+        tool_args: dict[str, Any],
+        ctx: RunContext[Any],
+        tool: ToolsetTool[Any],
+    ) -> Any:
+        with turn_trace.span("mcp.call_tool", server=self.id, tool=name):
+            return await super().call_tool(name, tool_args, ctx, tool)
+
+    def _on_tool_list_changed(self) -> None:
+        # pydantic-ai has already dropped its in-memory copy.
+        if self.tool_cache_key:
+            drop_tool_defs(self.tool_cache_key)
+            self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.get_running_loop().create_task(
+            self._refresh_tool_defs()
+        )
+
+    async def _refresh_tool_defs(self) -> None:
+        """Re-list tools over the open session and update both caches.
+
+        Never opens a session itself: it may finish after the run that
+        scheduled it, and a session must be closed by the task that opened it.
+        """
+        if not self.is_running:
+            return
+        version = self._server_version()
+        try:
+            tools = await self.client.list_tools()
+        except Exception as e:
+            logger.debug("MCP tool list revalidation failed: %s", e)
+            return
+        if self.is_running and self.cache_tools:
+            self._cached_tools = tools
+        store_tool_defs(self.tool_cache_key, version, tools)
@@ -11,7 +11,9 @@ Only ``.wrapped`` (public ``WrapperToolset`` API) and ``.prefix`` (public
 in the codebase — ``MCPToolset._cached_tools`` — is quarantined here behind
 ``iter_cached_tool_defs`` with a defensive ``getattr``, because pydantic-ai
 exposes no *synchronous* tool-listing API (``list_tools()`` is async and
-performs I/O; token estimation must stay sync + side-effect-free).
+performs I/O; token estimation must stay sync + side-effect-free). Listings
+persisted by ``mcp_.tool_cache`` are read through its public
+``last_known_tools()``.
 """
 
 from typing import Any, Iterator, List, Optional, Tuple
@@ -60,12 +62,17 @@ def iter_cached_tool_defs(toolset: Any) -> Iterator[Tuple[str, str, Any]]:
     """Yield ``(full_name, description, input_schema)`` for cached MCP tools.
 
     Reads the leaf ``MCPToolset``'s tool cache (populated by pydantic-ai
-    after the first ``list_tools()`` call) without triggering I/O. Yields
-    nothing for servers that haven't been queried yet — callers should
-    treat that as "unknown, assume zero".
+    after the first ``list_tools()`` call) without triggering server I/O.
+    Before that, a ``CachingMCPToolset`` falls back to the listing persisted
+    by a previous session. Yields nothing for servers never queried — callers
+    should treat that as "unknown, assume zero".
     """
+    from code_puppy.mcp_.tool_cache import CachingMCPToolset
+
     leaf = unwrap_toolset(toolset)
     cached = getattr(leaf, "_cached_tools", None)
+    if not cached and isinstance(leaf, CachingMCPToolset):
+        cached = leaf.last_known_tools()
     if not cached:
         return
     prefix = toolset_prefix(toolset) or ""
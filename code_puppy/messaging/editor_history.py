@@ -9,20 +9,134 @@ classic prompt_toolkit path, so both prompts see one another's entries:
     <blank line between entries>
 
 We reuse ``SafeFileHistory`` (command_line — sanctioned import-only reuse)
-when available; a tiny format-compatible fallback covers exotic import
-failures.
+for writes when available; a tiny format-compatible fallback covers exotic
+import failures.
+
+Reads go through one parsed, in-memory copy of each history file shared by
+every store on it: the file is parsed once, later loads only parse what was
+appended since (a ``stat`` decides), and Ctrl+R searches a flat corpus of
+the entries instead of scanning them one by one in Python.
 """
 
 from __future__ import annotations
 
+import bisect
 import datetime
 import logging
 import os
+import tempfile
 import threading
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Separator between entries in the reverse-search corpus. A query without it
+# can never match across two entries.
+_CORPUS_SEP = "\x00"
+
+# With ``command_history_max_entries`` set, compact once the file holds this
+# many times the limit, so a capped history is rewritten every few hundred
+# submissions rather than on every one.
+_COMPACT_SLACK = 1.25
+
+
+class _SharedHistory:
+    """Parsed entries of one history file, kept in sync by ``refresh``."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.entries: List[str] = []
+        self._offset = 0  # bytes parsed so far, always at a line boundary
+        self._identity: Optional[Tuple[int, int]] = None
+        self._mtime_ns = 0
+        # '+' lines of the last entry when the file ended inside it: a later
+        # append that starts with '+' continues that entry.
+        self._open_lines: Optional[List[str]] = None
+        self._corpus = ""
+        self._starts: List[int] = []
+
+    def refresh(self, path: str) -> None:
+        """Parse whatever was appended since the last call (all of it if the
+        file was replaced, truncated or rewritten in place)."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._reset()
+            return
+        identity = (st.st_dev, st.st_ino)
+        if (
+            identity != self._identity
+            or st.st_size < self._offset
+            or (st.st_size == self._offset and st.st_mtime_ns != self._mtime_ns)
+        ):
+            self._reset()
+            self._identity = identity
+        if st.st_size > self._offset:
+            with open(path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+            end = data.rfind(b"\n") + 1  # leave a half-written line for later
+            if end:
+                self._parse(data[:end])
+                self._offset += end
+        self._mtime_ns = st.st_mtime_ns
+
+    def _parse(self, data: bytes) -> None:
+        """FileHistory-format reader (mirror of prompt_toolkit's)."""
+        lines: Optional[List[str]] = None
+        if self._open_lines is not None and data.startswith(b"+"):
+            lines = self._open_lines
+            self.entries.pop()
+            if len(self._starts) > len(self.entries):
+                self._corpus, self._starts = "", []  # rebuilt on next search
+        for line in data.decode("utf-8", errors="replace").split("\n")[:-1]:
+            if line.startswith("+"):
+                if lines is None:
+                    lines = []
+                lines.append(line[1:])
+            elif lines is not None:
+                self.entries.append("\n".join(lines))
+                lines = None
+        if lines is not None:
+            self.entries.append("\n".join(lines))
+        self._open_lines = lines
+
+    def find_older(self, query: str, before: int) -> int:
+        """Index of the newest entry below ``before`` containing ``query``."""
+        before = min(before, len(self.entries))
+        if before <= 0:
+            return -1
+        if _CORPUS_SEP in query:
+            for i in range(before - 1, -1, -1):
+                if query in self.entries[i]:
+                    return i
+            return -1
+        indexed = len(self._starts)
+        if indexed < len(self.entries):
+            new = self.entries[indexed:]
+            pos = len(self._corpus)
+            for entry in new:
+                self._starts.append(pos)
+                pos += len(entry) + 1
+            self._corpus += _CORPUS_SEP.join(new) + _CORPUS_SEP
+        end = self._starts[before - 1] + len(self.entries[before - 1])
+        hit = self._corpus.rfind(query, 0, end)
+        if hit < 0:
+            return -1
+        return bisect.bisect_right(self._starts, hit) - 1
+
+
+_shared: Dict[str, _SharedHistory] = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_history(path: str) -> _SharedHistory:
+    with _shared_lock:
+        return _shared.setdefault(os.path.abspath(path), _SharedHistory())
+
 
 class HistoryStore:
     """Read/append the shared prompt_toolkit-format history file."""
@@ -33,21 +147,30 @@ class HistoryStore:
 
             path = COMMAND_HISTORY_FILE
         self._path = path
-        self._lock = threading.Lock()
+        self._shared = _shared_history(path)
+        self._lock = self._shared.lock
 
     def load(self) -> List[str]:
         """Return entries oldest → newest. Never raises."""
         with self._lock:
             try:
-                history = self._safe_file_history()
-                if history is not None:
-                    # load_history_strings() yields newest-first.
-                    return list(reversed(list(history.load_history_strings())))
-                return self._load_fallback()
+                self._shared.refresh(self._path)
+                return list(self._shared.entries)
             except Exception:
                 logger.debug("history load failed", exc_info=True)
                 return []
 
+    def find_older(self, query: str, before: int) -> int:
+        """Index (in ``load()`` order) of the newest entry older than
+        ``before`` that contains ``query``; -1 if none. Never raises."""
+        with self._lock:
+            try:
+                self._shared.refresh(self._path)
+                return self._shared.find_older(query, before)
+            except Exception:
+                logger.debug("history search failed", exc_info=True)
+                return -1
+
     def append(self, text: str) -> None:
         """Append one submission (never raises)."""
         if not text.strip():
@@ -57,11 +180,74 @@ class HistoryStore:
                 history = self._safe_file_history()
                 if history is not None:
                     history.store_string(text)
-                    return
-                self._append_fallback(text)
+                else:
+                    self._append_fallback(text)
+                self._maybe_compact()
             except Exception:
                 logger.debug("history append failed", exc_info=True)
 
+    def compact(self, max_entries: int) -> int:
+        """Rewrite the file keeping the newest ``max_entries`` distinct entries.
+
+        Repeats collapse into their newest occurrence. Returns how many
+        entries were dropped (never raises).
+        """
+        with self._lock:
+            try:
+                return self._compact(max_entries)
+            except Exception:
+                logger.debug("history compaction failed", exc_info=True)
+                return 0
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _maybe_compact(self) -> None:
+        from code_puppy.config import get_command_history_max_entries
+
+        limit = get_command_history_max_entries()
+        if not limit:
+            return
+        self._shared.refresh(self._path)
+        if len(self._shared.entries) > limit * _COMPACT_SLACK:
+            self._compact(limit)
+
+    def _compact(self, max_entries: int) -> int:
+        self._shared.refresh(self._path)
+        entries = self._shared.entries
+        kept: List[str] = []
+        seen = set()
+        for entry in reversed(entries):
+            if len(kept) >= max_entries:
+                break
+            if entry not in seen:
+                seen.add(entry)
+                kept.append(entry)
+        dropped = len(entries) - len(kept)
+        if not dropped:
+            return 0
+        stamp = f"\n# {datetime.datetime.now()}\n"
+        body = "".join(
+            stamp + "".join(f"+{line}\n" for line in entry.split("\n"))
+            for entry in reversed(kept)
+        )
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(self._path) or ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body.encode("utf-8", errors="replace"))
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._shared.refresh(self._path)
+        return dropped
+
     # ------------------------------------------------------------------
     # Backends
     # ------------------------------------------------------------------
@@ -77,24 +263,6 @@ class HistoryStore:
         except ImportError:
             return None
 
-    def _load_fallback(self) -> List[str]:
-        """Minimal FileHistory-format reader (mirror of prompt_toolkit's)."""
-        if not os.path.exists(self._path):
-            return []
-        entries: List[str] = []
-        lines: List[str] = []
-        with open(self._path, "rb") as f:
-            for raw in f:
-                line = raw.decode("utf-8", errors="replace")
-                if line.startswith("+"):
-                    lines.append(line[1:].rstrip("\n"))
-                elif lines:
-                    entries.append("\n".join(lines))
-                    lines = []
-        if lines:
-            entries.append("\n".join(lines))
-        return entries
-
     def _append_fallback(self, text: str) -> None:
         """Minimal FileHistory-format writer (mirror of prompt_toolkit's)."""
         os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
@@ -161,6 +329,10 @@ class ReverseSearch:
     Enter accepts the match, Esc / Ctrl+C cancels, Ctrl+R again finds the
     next OLDER match. Any printable char extends the query; backspace
     shrinks it.
+
+    Typing only narrows: the newest match for ``query + ch`` can be no newer
+    than the newest match for ``query``, so each keystroke resumes from there
+    and backspace pops back to the previous answer without searching.
     """
 
     def __init__(self, store: Optional[HistoryStore] = None) -> None:
@@ -169,12 +341,14 @@ class ReverseSearch:
         self.active = False
         self.query = ""
         self._pos: int = 0  # search anchor (exclusive upper bound)
+        self._newest: List[int] = []  # newest match for each query prefix
 
     def start(self) -> None:
         self._entries = self._store.load()
         self.active = True
         self.query = ""
         self._pos = len(self._entries)
+        self._newest = []
 
     def cancel(self) -> None:
         self.active = False
@@ -184,15 +358,18 @@ class ReverseSearch:
         if not self.active:
             return
         self.query += ch
-        self._pos = len(self._entries)  # re-anchor: newest match for new query
+        # re-anchor: newest match for new query
+        self._pos = self._newest[-1] + 1 if self._newest else len(self._entries)
         self._find_older()
+        self._newest.append(self._pos)
 
     def backspace(self) -> None:
         if not self.active:
             return
         self.query = self.query[:-1]
-        self._pos = len(self._entries)
-        self._find_older()
+        if self._newest:
+            self._newest.pop()
+        self._pos = self._newest[-1] if self._newest else len(self._entries)
 
     def next_older(self) -> None:
         """Ctrl+R again: continue searching past the current match."""
@@ -212,14 +389,21 @@ class ReverseSearch:
         return f"(reverse-i-search)`{self.query}': {match}"
 
     def _find_older(self) -> None:
-        """Scan backwards from the anchor for the next entry containing query."""
+        """Find the next entry older than the anchor containing query."""
         if not self.query:
             self._pos = len(self._entries)
             return
-        for i in range(min(self._pos, len(self._entries)) - 1, -1, -1):
-            if self.query in self._entries[i]:
-                self._pos = i
-                return
+        before = min(self._pos, len(self._entries))
+        i = self._store.find_older(self.query, before)
+        if 0 <= i < len(self._entries) and self.query in self._entries[i]:
+            self._pos = i
+            return
+        if i >= 0:
+            # The file was rewritten since start(): scan our own snapshot.
+            for i in range(before - 1, -1, -1):
+                if self.query in self._entries[i]:
+                    self._pos = i
+                    return
         self._pos = -1  # no match
 
 
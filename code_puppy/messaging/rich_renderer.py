@@ -126,6 +126,11 @@ def _is_paused() -> bool:
 # Max length for low-mode peek lines.
 _PEEK_MAX_LEN = 100
 
+# Directory listings: entries shown per directory before the rest collapse
+# into one "… N more" line, and the overall line budget for one listing.
+_LISTING_MAX_CHILDREN = 200
+_LISTING_MAX_LINES = 2000
+
 
 class RichConsoleRenderer:
     """Rich console implementation of the renderer protocol.
@@ -594,6 +599,11 @@ class RichConsoleRenderer:
         - Number of files
         - Total size
         - Number of subdirectories
+
+        Subtree totals are aggregated in one post-order pass and the whole
+        listing goes to the console as a single print. Wide directories show
+        their first ``_LISTING_MAX_CHILDREN`` entries and collapse the rest
+        into one summary line; ``_LISTING_MAX_LINES`` caps the listing.
         """
         # Skip for sub-agents unless verbose mode
         if self._should_suppress_subagent_output():
@@ -603,120 +613,133 @@ class RichConsoleRenderer:
             return
 
         import os
-        from collections import defaultdict
-
-        # Header on single line
-        rec_flag = f"(recursive={msg.recursive})"
-        banner = self._format_banner("directory_listing", "DIRECTORY LISTING")
-        self._console.print(
-            f"\n{banner} [bold cyan]{msg.directory}[/bold cyan] [dim]{rec_flag}[/dim]\n"
-        )
-
-        # Build a tree structure: {parent_path: {files: [], dirs: set(), size: int}}
-        # Each key is a directory path, value contains direct children stats
-        dir_stats: dict = defaultdict(
-            lambda: {"files": [], "subdirs": set(), "total_size": 0}
-        )
 
         # Root directory is represented as ""
         root_key = ""
 
+        # Direct children per directory, and each directory's own files/size
+        subdirs: dict = {root_key: []}
+        files: dict = {root_key: []}
+        own_size: dict = {root_key: 0}
+
         for entry in msg.files:
             path = entry.path
-            parent = os.path.dirname(path) if os.path.dirname(path) else root_key
+            parent = os.path.dirname(path) or root_key
 
             if entry.type == "dir":
-                # Register this dir as a subdir of its parent
-                dir_stats[parent]["subdirs"].add(path)
-                # Ensure the dir itself exists in stats (even if empty)
-                _ = dir_stats[path]
+                subdirs.setdefault(parent, []).append(path)
+                subdirs.setdefault(path, [])
+                files.setdefault(path, [])
+                own_size.setdefault(path, 0)
             else:
-                # It's a file - add to parent's stats
-                dir_stats[parent]["files"].append(entry)
-                dir_stats[parent]["total_size"] += entry.size
-
-        def render_dir_tree(dir_path: str, depth: int = 0) -> None:
-            """Recursively render directory with compact summary."""
-            stats = dir_stats.get(
-                dir_path, {"files": [], "subdirs": set(), "total_size": 0}
-            )
-            files = stats["files"]
-            subdirs = sorted(stats["subdirs"])
-
-            # Calculate total size including subdirectories (recursive)
-            def get_recursive_size(d: str) -> int:
-                s = dir_stats.get(d, {"files": [], "subdirs": set(), "total_size": 0})
-                size = s["total_size"]
-                for sub in s["subdirs"]:
-                    size += get_recursive_size(sub)
-                return size
-
-            def get_recursive_file_count(d: str) -> int:
-                s = dir_stats.get(d, {"files": [], "subdirs": set(), "total_size": 0})
-                count = len(s["files"])
-                for sub in s["subdirs"]:
-                    count += get_recursive_file_count(sub)
-                return count
-
-            indent = "    " * depth
-
-            # For root level, just show contents
-            if dir_path == root_key:
-                # Show files at root level (depth 0)
-                for f in sorted(files, key=lambda x: x.path):
-                    icon = self._get_file_icon(f.path)
-                    name = os.path.basename(f.path)
-                    size_str = (
-                        f" [dim]({self._format_size(f.size)})[/dim]"
-                        if f.size > 0
-                        else ""
-                    )
-                    self._console.print(
-                        f"{indent}{icon} [green]{name}[/green]{size_str}"
-                    )
+                files.setdefault(parent, []).append(entry)
+                own_size[parent] = own_size.get(parent, 0) + entry.size
+
+        # Pre-order walk (sorted, as displayed), then totals in reverse order
+        order: list = []
+        seen = {root_key}
+        stack = [(root_key, -1)]
+        while stack:
+            dir_path, depth = stack.pop()
+            order.append((dir_path, depth))
+            children = sorted(set(subdirs.get(dir_path, ())) - seen)
+            subdirs[dir_path] = children
+            seen.update(children)
+            stack.extend((child, depth + 1) for child in reversed(children))
+
+        rec_files: dict = {}
+        rec_size: dict = {}
+        for dir_path, _depth in reversed(order):
+            count = len(files.get(dir_path, ()))
+            size = own_size.get(dir_path, 0)
+            for child in subdirs[dir_path]:
+                count += rec_files[child]
+                size += rec_size[child]
+            rec_files[dir_path] = count
+            rec_size[dir_path] = size
+
+        def plural(count: int, noun: str) -> str:
+            return f"{count} {noun}{'s' if count != 1 else ''}"
+
+        def more_line(indent: str, dirs: list, extra_files: int = 0) -> str:
+            parts = []
+            if dirs:
+                parts.append(plural(len(dirs), "more dir"))
+            if extra_files:
+                parts.append(plural(extra_files, "more file"))
+            nested = sum(rec_files[d] for d in dirs)
+            size = sum(rec_size[d] for d in dirs)
+            detail = []
+            if nested:
+                detail.append(f"{plural(nested, 'file')} inside")
+            if size:
+                detail.append(self._format_size(size))
+            suffix = f" ({', '.join(detail)})" if detail else ""
+            return f"{indent}[dim]… {', '.join(parts)}{suffix}[/dim]"
 
-                # Show subdirs at root level
-                for subdir in subdirs:
-                    render_dir_tree(subdir, depth)
-            else:
+        # Header on single line
+        rec_flag = f"(recursive={msg.recursive})"
+        banner = self._format_banner("directory_listing", "DIRECTORY LISTING")
+        lines = [
+            f"\n{banner} [bold cyan]{escape_rich_markup(msg.directory)}"
+            f"[/bold cyan] [dim]{rec_flag}[/dim]\n"
+        ]
+
+        # Show files at root level, then the directory tree
+        root_files = sorted(files[root_key], key=lambda x: x.path)
+        for f in root_files[:_LISTING_MAX_CHILDREN]:
+            icon = self._get_file_icon(f.path)
+            name = escape_rich_markup(os.path.basename(f.path))
+            size_str = (
+                f" [dim]({self._format_size(f.size)})[/dim]" if f.size > 0 else ""
+            )
+            lines.append(f"{icon} [green]{name}[/green]{size_str}")
+        if len(root_files) > _LISTING_MAX_CHILDREN:
+            lines.append(more_line("", [], len(root_files) - _LISTING_MAX_CHILDREN))
+
+        # Stack items are directories to show or pre-built "… more" lines
+        stack = [(root_key, -1, None)]
+        while stack:
+            dir_path, depth, line = stack.pop()
+            if line is not None:
+                lines.append(line)
+                continue
+            if len(lines) >= _LISTING_MAX_LINES:
+                lines.append(
+                    f"[dim]… listing truncated at {_LISTING_MAX_LINES} lines[/dim]"
+                )
+                break
+            children = subdirs[dir_path]
+            if dir_path != root_key:
                 # Show directory with summary
-                dir_name = os.path.basename(dir_path)
-                rec_size = get_recursive_size(dir_path)
-                rec_file_count = get_recursive_file_count(dir_path)
-                subdir_count = len(subdirs)
-
-                # Build summary parts
+                dir_name = escape_rich_markup(os.path.basename(dir_path))
                 parts = []
-                if rec_file_count > 0:
-                    parts.append(
-                        f"{rec_file_count} file{'s' if rec_file_count != 1 else ''}"
-                    )
-                if subdir_count > 0:
-                    parts.append(
-                        f"{subdir_count} subdir{'s' if subdir_count != 1 else ''}"
-                    )
-                if rec_size > 0:
-                    parts.append(self._format_size(rec_size))
-
+                if rec_files[dir_path] > 0:
+                    parts.append(plural(rec_files[dir_path], "file"))
+                if children:
+                    parts.append(plural(len(children), "subdir"))
+                if rec_size[dir_path] > 0:
+                    parts.append(self._format_size(rec_size[dir_path]))
                 summary = f" [dim]({', '.join(parts)})[/dim]" if parts else ""
-                self._console.print(
-                    f"{indent}[bold blue]{dir_name}/[/bold blue]{summary}"
+                lines.append(
+                    f"{'    ' * depth}[bold blue]{dir_name}/[/bold blue]{summary}"
                 )
-
-                # Recursively show subdirectories
-                for subdir in subdirs:
-                    render_dir_tree(subdir, depth + 1)
-
-        # Render the tree starting from root
-        render_dir_tree(root_key, 0)
+            if len(children) > _LISTING_MAX_CHILDREN:
+                collapsed = children[_LISTING_MAX_CHILDREN:]
+                stack.append(
+                    (dir_path, depth, more_line("    " * (depth + 1), collapsed))
+                )
+                children = children[:_LISTING_MAX_CHILDREN]
+            stack.extend((child, depth + 1, None) for child in reversed(children))
 
         # Summary
-        self._console.print("\n[bold cyan]Summary:[/bold cyan]")
-        self._console.print(
+        lines.append("\n[bold cyan]Summary:[/bold cyan]")
+        lines.append(
             f"[blue]{msg.dir_count} directories[/blue], "
             f"[green]{msg.file_count} files[/green] "
             f"[dim]({self._format_size(msg.total_size)} total)[/dim]"
         )
+        self._console.print("\n".join(lines))
 
     def _render_file_content(self, msg: FileContentMessage) -> None:
         """Render a file read - just show the header, not the content.
@@ -8,6 +8,7 @@ from code_puppy.tools.subagent_invocation import (
     register_invoke_agent,
     register_invoke_agent_with_model,
 )
+from code_puppy.tools.subagent_fanout import register_invoke_agents_parallel
 from code_puppy.tools.ask_user_question import register_ask_user_question
 
 from code_puppy.tools.command_runner import (
@@ -38,6 +39,7 @@ TOOL_REGISTRY = {
     "list_agents": register_list_agents,
     "invoke_agent": register_invoke_agent,
     "invoke_agent_with_model": register_invoke_agent_with_model,
+    "invoke_agents_parallel": register_invoke_agents_parallel,
     "list_available_models": register_list_available_models,
     # File Operations
     "list_files": register_list_files,
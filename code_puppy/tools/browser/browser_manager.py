@@ -84,6 +84,176 @@ _BROWSER_TIMEOUT_S = _env_float("BROWSER_CLEANUP_BROWSER_TIMEOUT_S", 5.0)
 _PW_TIMEOUT_S = _env_float("BROWSER_CLEANUP_PW_TIMEOUT_S", 5.0)
 
 
+def _kill_playwright_driver(playwright, silent: bool = False) -> None:
+    """SIGKILL a Playwright node driver subprocess (and so its browsers).
+
+    Attribute path: ``_playwright._impl_obj._connection._transport._proc``.
+    This is a private API but has been stable across Playwright releases
+    (verified against 1.61.0). If any hop in the chain moves, we no-op
+    rather than raise (best-effort).
+    """
+    impl = getattr(playwright, "_impl_obj", None)
+    connection = getattr(impl, "_connection", None)
+    transport = getattr(connection, "_transport", None)
+    proc = getattr(transport, "_proc", None)
+    if proc is None:
+        return
+    try:
+        proc.kill()
+    except Exception as e:
+        if not silent:
+            emit_warning(f"Could not kill playwright driver process: {e}")
+
+
+# --------------------------------------------------------------------------- #
+# Shared browser pool (opt-in: ``browser_shared_pool = true``)
+#
+# By default every session starts its own Playwright driver and a persistent-
+# profile Chromium, so N parallel QA sub-agents pay N browser cold starts and
+# hold N browsers' worth of memory. In pool mode one driver and one Chromium
+# serve the whole process and every non-default session gets an isolated
+# ``BrowserContext`` (own cookies, storage and cache) from a pre-warmed set,
+# with at most ``browser_pool_max_contexts`` handed out at once.
+#
+# A released context is closed, not handed to the next session: Playwright
+# cannot wipe a context's per-origin storage (localStorage, IndexedDB,
+# service workers, Cache Storage) from outside, and closing is what
+# guarantees the next session starts clean. The warm set is topped back up in
+# the background, so acquiring stays a pop while the browser is shared.
+# --------------------------------------------------------------------------- #
+_POOL_ACQUIRE_TIMEOUT_S = _env_float("BROWSER_POOL_ACQUIRE_TIMEOUT_S", 300.0)
+
+
+class SharedBrowserPool:
+    """One Chromium per process handing out isolated contexts under a cap."""
+
+    def __init__(self, headless: bool, warm: int, max_contexts: int):
+        self.headless = headless
+        self.warm = warm
+        self.max_contexts = max_contexts
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._start_lock = asyncio.Lock()
+        self._idle: list[BrowserContext] = []
+        self._opening = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._closed = False
+
+    async def _ensure_started(self) -> Browser:
+        async with self._start_lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+
+                pw = await async_playwright().start()
+                try:
+                    self._browser = await pw.chromium.launch(headless=self.headless)
+                except BaseException:
+                    await pw.stop()
+                    raise
+                self._playwright = pw
+        return self._browser
+
+    async def start(self) -> None:
+        """Launch the shared browser and open the warm contexts."""
+        await self._ensure_started()
+        self._refill()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _refill(self) -> None:
+        """Top the warm set back up in the background."""
+        while not self._closed and len(self._idle) + self._opening < self.warm:
+            self._opening += 1
+            task = asyncio.ensure_future(self._open_idle())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _open_idle(self) -> None:
+        try:
+            context = await self._browser.new_context()
+        except Exception:
+            return  # acquire() opens one on demand instead
+        finally:
+            self._opening -= 1
+        if self._closed:
+            await _close_context_quietly(context)
+        else:
+            self._idle.append(context)
+
+    async def acquire(self) -> BrowserContext:
+        """Take a fresh context, waiting while the cap is reached."""
+        try:
+            await asyncio.wait_for(
+                self._slots.acquire(), timeout=_POOL_ACQUIRE_TIMEOUT_S
+            )
+        except asyncio.TimeoutError:
+            raise RuntimeError(
+                f"All {self.max_contexts} pooled browser contexts stayed in use "
+                f"for {_POOL_ACQUIRE_TIMEOUT_S:g}s; close a browser session or "
+                "raise browser_pool_max_contexts"
+            ) from None
+        try:
+            browser = await self._ensure_started()
+            context = self._idle.pop() if self._idle else await browser.new_context()
+        except BaseException:
+            self._slots.release()
+            raise
+        self._refill()
+        return context
+
+    async def release(self, context: BrowserContext) -> None:
+        """Discard a used context (and its storage) and free its slot."""
+        try:
+            await _close_context_quietly(context)
+        finally:
+            self._slots.release()
+        self._refill()
+
+    async def close(self) -> None:
+        """Close the warm contexts, the shared browser and the driver."""
+        self._closed = True
+        for task in list(self._tasks):
+            task.cancel()
+        idle, self._idle = self._idle, []
+        for context in idle:
+            await _close_context_quietly(context)
+        if self._browser is not None:
+            try:
+                await asyncio.wait_for(self._browser.close(), _BROWSER_TIMEOUT_S)
+            except Exception:
+                pass  # the driver kill below reaps a wedged browser
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await asyncio.wait_for(self._playwright.stop(), _PW_TIMEOUT_S)
+            except Exception:
+                _kill_playwright_driver(self._playwright, silent=True)
+            self._playwright = None
+
+
+async def _close_context_quietly(context: BrowserContext) -> None:
+    try:
+        await asyncio.wait_for(context.close(), timeout=_CONTEXT_TIMEOUT_S)
+    except Exception:
+        pass  # a wedged context dies with the shared browser at exit
+
+
+_shared_pool: Optional[SharedBrowserPool] = None
+
+
+def get_shared_browser_pool(headless: bool = True) -> SharedBrowserPool:
+    """Return the process-wide browser pool, creating it on first use."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = SharedBrowserPool(
+            headless,
+            config.get_browser_pool_size(),
+            config.get_browser_pool_max_contexts(),
+        )
+    return _shared_pool
+
+
 # Context variable for browser session - properly inherits through async tasks
 # This allows parallel agent invocations to each have their own browser instance
 _browser_session_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
@@ -143,6 +313,8 @@ class BrowserManager:
     _browser: Optional[Browser] = None
     _context: Optional[BrowserContext] = None
     _initialized: bool = False
+    # Set while this session's context is borrowed from the shared pool
+    _pool: Optional[SharedBrowserPool] = None
 
     def __init__(
         self, session_id: Optional[str] = None, browser_type: Optional[str] = None
@@ -215,6 +387,17 @@ class BrowserManager:
             self._initialized = True
             return
 
+        # Opt-in: an isolated context in the process-wide shared Chromium.
+        # The default (interactive) session keeps its persistent profile.
+        if self.session_id != "default" and config.get_browser_shared_pool():
+            pool = get_shared_browser_pool(self.headless)
+            emit_info(f"Using pooled browser context (session: {self.session_id})")
+            self._context = await pool.acquire()
+            self._browser = self._context.browser
+            self._pool = pool
+            self._initialized = True
+            return
+
         # Default: use Playwright Chromium
         from playwright.async_api import async_playwright
 
@@ -286,6 +469,16 @@ class BrowserManager:
         _emit_success = (lambda _msg: None) if silent else emit_success
 
         try:
+            # A pooled context has no profile to save and shares the browser
+            # and driver with other sessions: hand it back, skip the rest.
+            if self._pool is not None:
+                if self._context:
+                    self._install_dialog_dismisser(silent=silent)
+                    await self._pool.release(self._context)
+                self._context = None
+                self._browser = None
+                self._pool = None
+
             # Save browser state before closing (cookies, localStorage, etc.).
             if self._context:
                 storage_state_path = self.profile_dir / "storage_state.json"
@@ -391,23 +584,8 @@ class BrowserManager:
         The browser process is a child of this driver, so a SIGKILL here
         transitively reaps the whole browser tree -- our only reliable escape
         hatch when CDP has gone unresponsive.
-
-        Attribute path: ``_playwright._impl_obj._connection._transport._proc``.
-        This is a private API but has been stable across Playwright releases
-        (verified against 1.61.0). If any hop in the chain moves, we no-op
-        rather than raise (best-effort).
         """
-        impl = getattr(self._playwright, "_impl_obj", None)
-        connection = getattr(impl, "_connection", None)
-        transport = getattr(connection, "_transport", None)
-        proc = getattr(transport, "_proc", None)
-        if proc is None:
-            return
-        try:
-            proc.kill()
-        except Exception as e:
-            if not silent:
-                emit_warning(f"Could not kill playwright driver process: {e}")
+        _kill_playwright_driver(self._playwright, silent=silent)
 
     async def close(self) -> None:
         """Close the browser and clean up resources."""
@@ -449,13 +627,24 @@ def get_browser_manager(
     return _active_managers[session_id]
 
 
+async def release_pooled_browser(session_id: str) -> None:
+    """Return a session's pooled context to the shared pool.
+
+    No-op for sessions running their own browser, which stay open for reuse
+    until closed explicitly or at exit.
+    """
+    manager = _active_managers.get(session_id)
+    if manager is not None and manager._pool is not None:
+        await manager._cleanup(silent=True)
+
+
 async def cleanup_all_browsers() -> None:
     """Close all active browser manager instances.
 
     This should be called before application exit to ensure all browser
     connections are properly closed and no dangling futures remain.
     """
-    global _cleanup_done
+    global _cleanup_done, _shared_pool
 
     if _cleanup_done:
         return
@@ -473,6 +662,13 @@ async def cleanup_all_browsers() -> None:
             except Exception:
                 pass  # Silently ignore all errors during exit cleanup
 
+    if _shared_pool is not None:
+        pool, _shared_pool = _shared_pool, None
+        try:
+            await pool.close()
+        except Exception:
+            pass
+
 
 def _sync_cleanup_browsers() -> None:
     """Synchronous cleanup wrapper for use with atexit.
@@ -482,7 +678,7 @@ def _sync_cleanup_browsers() -> None:
     """
     global _cleanup_done
 
-    if _cleanup_done or not _active_managers:
+    if _cleanup_done or (not _active_managers and _shared_pool is None):
         return
 
     try:
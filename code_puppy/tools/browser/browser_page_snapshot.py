@@ -10,9 +10,14 @@ Screenshots remain the right tool for *visual* assertions (layout,
 color, occlusion, visual diff) - this is for functional progression.
 """
 
-from typing import Any, Dict
+import json
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
 
 from pydantic_ai import RunContext
+from pydantic_ai.messages import ToolReturnPart
 
 from code_puppy.messaging import emit_info, emit_success
 from code_puppy.tools.common import generate_group_id
@@ -20,14 +25,72 @@ from code_puppy.tools.common import generate_group_id
 from .browser_manager import get_session_browser_manager
 
 # One JS pass = one round-trip instead of N Playwright calls. ``limit`` caps
-# each collection so huge pages don't blow up the tool output.
+# each collection so huge pages don't blow up the tool output, and each scan
+# stops as soon as ``limit`` visible nodes are found -- visibility checks
+# force style/layout reads, so they are never paid for the whole DOM.
+#
+# The first call on a document installs a MutationObserver that records which
+# categories a DOM change could affect (a mutated node inside, or containing,
+# one of the category's selectors). Later calls rescan only those categories
+# and return just them; ``inputs`` are always rescanned since typed values
+# change without any mutation. ``epoch`` identifies the observer's document:
+# passing a stale one (or a different ``limit``) rescans everything.
 _SNAPSHOT_JS = """
-(limit) => {
+(args) => {
+  const limit = args.limit;
+  const SELECTORS = {
+    headings: 'h1,h2,h3,h4,h5,h6',
+    buttons: 'button,[role="button"],input[type="submit"],input[type="button"]',
+    links: 'a[href]',
+    inputs: 'input,textarea,select',
+    landmarks: '[role],nav,main,header,footer,aside,form',
+  };
+  const ALL = ['visible_text', ...Object.keys(SELECTORS)];
+
+  let state = window.__codePuppySnapshot;
+  if (!state) {
+    state = {
+      epoch: Math.random().toString(36).slice(2),
+      limit: null,
+      dirty: new Set(ALL),
+    };
+    const touch = (node) => {
+      if (node.nodeType === 9) ALL.forEach((key) => state.dirty.add(key));
+      const el = node.nodeType === 1 ? node : node.parentElement;
+      if (!el) return;
+      for (const [key, selector] of Object.entries(SELECTORS)) {
+        if (!state.dirty.has(key) && (el.closest(selector) || el.querySelector(selector))) {
+          state.dirty.add(key);
+        }
+      }
+    };
+    state.record = (records) => {
+      if (records.length) state.dirty.add('visible_text');
+      for (const record of records) {
+        if (state.dirty.size === ALL.length) return;
+        touch(record.target);
+        record.addedNodes.forEach(touch);
+        record.removedNodes.forEach(touch);
+      }
+    };
+    state.observer = new MutationObserver(state.record);
+    state.observer.observe(document, {
+      subtree: true, childList: true, attributes: true, characterData: true,
+    });
+    window.addEventListener('resize', () => ALL.forEach((key) => state.dirty.add(key)));
+    window.__codePuppySnapshot = state;
+  }
+  state.record(state.observer.takeRecords());
+  if (state.epoch !== args.epoch || state.limit !== limit) {
+    ALL.forEach((key) => state.dirty.add(key));
+  }
+  state.limit = limit;
+  state.dirty.add('inputs');
+
   const isVisible = (el) => {
-    const style = window.getComputedStyle(el);
-    if (style.visibility === 'hidden' || style.display === 'none') return false;
     const rect = el.getBoundingClientRect();
-    return rect.width > 0 && rect.height > 0;
+    if (!(rect.width > 0 && rect.height > 0)) return false;
+    return window.getComputedStyle(el).visibility !== 'hidden';
   };
   const accName = (el) =>
     (el.getAttribute('aria-label')
@@ -35,66 +98,163 @@ _SNAPSHOT_JS = """
       || (el.textContent || '').trim()
       || el.getAttribute('value')
       || '').slice(0, 120);
-  const take = (nodes) => Array.from(nodes).filter(isVisible).slice(0, limit);
-
-  const headings = take(document.querySelectorAll('h1,h2,h3,h4,h5,h6')).map((el) => ({
-    level: el.tagName.toLowerCase(),
-    text: (el.textContent || '').trim().slice(0, 120),
-  }));
-  const buttons = take(
-    document.querySelectorAll('button,[role="button"],input[type="submit"],input[type="button"]')
-  ).map((el) => ({
-    name: accName(el),
-    disabled: el.disabled === true || el.getAttribute('aria-disabled') === 'true',
-  }));
-  const links = take(document.querySelectorAll('a[href]')).map((el) => ({
-    text: (el.textContent || '').trim().slice(0, 120),
-    href: el.getAttribute('href'),
-  }));
-  const inputs = take(
-    document.querySelectorAll('input,textarea,select')
-  ).map((el) => ({
-    tag: el.tagName.toLowerCase(),
-    type: el.getAttribute('type'),
-    name: el.getAttribute('name'),
-    placeholder: el.getAttribute('placeholder'),
-    label: el.getAttribute('aria-label'),
-    test_id: el.getAttribute('data-testid') || el.getAttribute('data-test-id'),
-    value: (el.value || '').slice(0, 120),
-    checked: el.checked === true,
-  }));
-  const landmarks = take(
-    document.querySelectorAll('[role],nav,main,header,footer,aside,form')
-  ).map((el) => ({
-    role: el.getAttribute('role') || el.tagName.toLowerCase(),
-    label: el.getAttribute('aria-label'),
-  }));
-
-  const bodyText = (document.body ? document.body.innerText : '') || '';
+  const take = (key) => {
+    const found = [];
+    for (const el of document.querySelectorAll(SELECTORS[key])) {
+      if (found.length >= limit) break;
+      if (isVisible(el)) found.push(el);
+    }
+    return found;
+  };
+
+  const scan = {
+    visible_text: () => {
+      const bodyText = (document.body ? document.body.innerText : '') || '';
+      return bodyText.replace(/\\s+/g, ' ').trim().slice(0, 2000);
+    },
+    headings: () => take('headings').map((el) => ({
+      level: el.tagName.toLowerCase(),
+      text: (el.textContent || '').trim().slice(0, 120),
+    })),
+    buttons: () => take('buttons').map((el) => ({
+      name: accName(el),
+      disabled: el.disabled === true || el.getAttribute('aria-disabled') === 'true',
+    })),
+    links: () => take('links').map((el) => ({
+      text: (el.textContent || '').trim().slice(0, 120),
+      href: el.getAttribute('href'),
+    })),
+    inputs: () => take('inputs').map((el) => ({
+      tag: el.tagName.toLowerCase(),
+      type: el.getAttribute('type'),
+      name: el.getAttribute('name'),
+      placeholder: el.getAttribute('placeholder'),
+      label: el.getAttribute('aria-label'),
+      test_id: el.getAttribute('data-testid') || el.getAttribute('data-test-id'),
+      value: (el.value || '').slice(0, 120),
+      checked: el.checked === true,
+    })),
+    landmarks: () => take('landmarks').map((el) => ({
+      role: el.getAttribute('role') || el.tagName.toLowerCase(),
+      label: el.getAttribute('aria-label'),
+    })),
+  };
+
+  const data = {};
+  for (const key of ALL) {
+    if (state.dirty.has(key)) data[key] = scan[key]();
+  }
+  state.dirty.clear();
   return {
+    epoch: state.epoch,
     url: window.location.href,
     title: document.title,
-    visible_text: bodyText.replace(/\\s+/g, ' ').trim().slice(0, 2000),
-    headings,
-    buttons,
-    links,
-    inputs,
-    landmarks,
+    data,
   };
 }
 """
 
+_TEXT_FIELDS = ("url", "title", "visible_text")
+_LIST_FIELDS = ("headings", "buttons", "links", "inputs", "landmarks")
+
+
+@dataclass
+class _PageSnapshot:
+    """The last snapshot returned for a page, and the JS state it came from."""
+
+    epoch: str
+    limit: int
+    snapshot: Dict[str, Any]
+    # The tool call that returned it; a delta is only meaningful to a
+    # conversation that still holds that result.
+    tool_call_id: Optional[str] = None
+
+
+# Keyed by Playwright ``Page`` so closed pages drop out on their own.
+_last_snapshots: "weakref.WeakKeyDictionary[Any, _PageSnapshot]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _delivered(tool_call_id: Optional[str], history: Sequence[Any]) -> bool:
+    """Whether the result of ``tool_call_id`` is still in ``history``."""
+    if not tool_call_id:
+        return False
+    for message in reversed(history):
+        for part in getattr(message, "parts", ()):
+            if isinstance(part, ToolReturnPart) and part.tool_call_id == tool_call_id:
+                return True
+    return False
+
+
+def _diff_items(before: List[Any], after: List[Any]) -> Dict[str, Any]:
+    """Multiset difference of two category lists, in page order."""
+
+    def key(item: Any) -> str:
+        return json.dumps(item, sort_keys=True)
 
-async def get_page_snapshot(limit: int = 25) -> Dict[str, Any]:
+    def pick(items: List[Any], wanted: Counter) -> List[Any]:
+        picked = []
+        for item in items:
+            if wanted[key(item)] > 0:
+                wanted[key(item)] -= 1
+                picked.append(item)
+        return picked
+
+    old_keys = Counter(key(item) for item in before)
+    new_keys = Counter(key(item) for item in after)
+    change: Dict[str, Any] = {
+        "count": len(after),
+        "added": pick(after, new_keys - old_keys),
+        "removed": pick(before, old_keys - new_keys),
+    }
+    if not change["added"] and not change["removed"]:
+        change["reordered"] = True
+    return change
+
+
+def diff_page_snapshots(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the fields of ``new`` that differ from ``old``.
+
+    Text fields carry their new value; list fields carry the new ``count``
+    plus the ``added`` / ``removed`` items.
+    """
+    changes: Dict[str, Any] = {}
+    for field in _TEXT_FIELDS:
+        if old.get(field) != new.get(field):
+            changes[field] = new.get(field)
+    for field in _LIST_FIELDS:
+        before, after = old.get(field, []), new.get(field, [])
+        if before != after:
+            changes[field] = _diff_items(before, after)
+    return changes
+
+
+async def get_page_snapshot(
+    limit: int = 25,
+    full: bool = False,
+    history: Sequence[Any] = (),
+    tool_call_id: Optional[str] = None,
+) -> Dict[str, Any]:
     """Return a compact structured snapshot of the current page state.
 
+    The first snapshot of a page is complete. A later one reports
+    ``snapshot: "unchanged"`` or a ``"delta"`` with only the changed fields
+    when the previous snapshot's tool result is still in ``history``;
+    after ``/clear``, compaction or in another agent's conversation it is
+    complete again, as it is when ``full`` is set.
+
     Args:
         limit: Max items collected per category (buttons, links, inputs...).
+        full: Return the complete snapshot even if the page was seen before.
+        history: Messages of the conversation receiving this result.
+        tool_call_id: The tool call this result answers.
 
     Returns:
-        Dict with ``success`` plus URL/title/visible_text and structured
-        lists of headings, buttons, links, inputs, and landmarks, or an
-        error dict if no page is available.
+        Dict with ``success`` and ``snapshot`` (``"full"``, ``"unchanged"``
+        or ``"delta"``) plus URL/title and either the complete state
+        (visible_text and lists of headings, buttons, links, inputs and
+        landmarks) or ``changes``, or an error dict if no page is available.
     """
     group_id = generate_group_id("browser_page_snapshot", "snapshot")
     emit_info("BROWSER PAGE SNAPSHOT  gathering DOM state", message_group=group_id)
@@ -105,17 +265,59 @@ async def get_page_snapshot(limit: int = 25) -> Dict[str, Any]:
         if not page:
             return {"success": False, "error": "No active browser page available"}
 
-        snapshot = await page.evaluate(_SNAPSHOT_JS, limit)
+        previous = None if full else _last_snapshots.get(page)
+        if previous is not None and (
+            previous.limit != limit or not _delivered(previous.tool_call_id, history)
+        ):
+            previous = None
+        result = await page.evaluate(
+            _SNAPSHOT_JS,
+            {"limit": limit, "epoch": previous.epoch if previous else None},
+        )
+        if previous is not None and result["epoch"] != previous.epoch:
+            previous = None  # new document: everything was rescanned
 
-        emit_success(
-            "Snapshot: "
-            f"{len(snapshot.get('buttons', []))} buttons, "
-            f"{len(snapshot.get('links', []))} links, "
-            f"{len(snapshot.get('inputs', []))} inputs",
-            message_group=group_id,
+        fields = {**(previous.snapshot if previous else {}), **result["data"]}
+        snapshot = {
+            "url": result["url"],
+            "title": result["title"],
+            "visible_text": fields.get("visible_text"),
+            **{field: fields.get(field, []) for field in _LIST_FIELDS},
+        }
+        _last_snapshots[page] = _PageSnapshot(
+            result["epoch"], limit, snapshot, tool_call_id
         )
 
-        return {"success": True, **snapshot}
+        if previous is None:
+            emit_success(
+                "Snapshot: "
+                f"{len(snapshot['buttons'])} buttons, "
+                f"{len(snapshot['links'])} links, "
+                f"{len(snapshot['inputs'])} inputs",
+                message_group=group_id,
+            )
+            return {"success": True, "snapshot": "full", **snapshot}
+
+        changes = diff_page_snapshots(previous.snapshot, snapshot)
+        if not changes:
+            emit_success("Snapshot: unchanged", message_group=group_id)
+            return {
+                "success": True,
+                "snapshot": "unchanged",
+                "url": snapshot["url"],
+                "title": snapshot["title"],
+            }
+
+        emit_success(
+            f"Snapshot delta: {', '.join(changes)} changed", message_group=group_id
+        )
+        return {
+            "success": True,
+            "snapshot": "delta",
+            "url": snapshot["url"],
+            "title": snapshot["title"],
+            "changes": changes,
+        }
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -128,6 +330,7 @@ def register_get_page_snapshot(agent):
     async def browser_page_snapshot(
         context: RunContext,
         limit: int = 25,
+        full: bool = False,
     ) -> Dict[str, Any]:
         """
         Get a cheap, structured snapshot of the current page's DOM state.
@@ -138,10 +341,22 @@ def register_get_page_snapshot(agent):
         accessible names, links, inputs (with values/placeholders/test-ids),
         and ARIA landmarks. Reserve screenshots for true visual assertions.
 
+        Repeat calls on the same page are incremental: ``snapshot`` is
+        "unchanged" when nothing changed since your last snapshot, or
+        "delta" with ``changes`` holding only the changed fields (lists as
+        count/added/removed). Pass full=True when you need the whole state
+        again.
+
         Args:
             limit: Max items per category (buttons/links/inputs/etc).
+            full: Return the complete snapshot instead of a delta.
 
         Returns:
-            Dict with structured page state, or an error dict.
+            Dict with structured page state or changes, or an error dict.
         """
-        return await get_page_snapshot(limit=limit)
+        return await get_page_snapshot(
+            limit=limit,
+            full=full,
+            history=context.messages,
+            tool_call_id=context.tool_call_id,
+        )
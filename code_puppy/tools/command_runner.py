@@ -1354,6 +1354,10 @@ async def _execute_shell_command(
             )
         return await _run_command_inner(command, cwd, timeout, group_id, silent=silent)
     finally:
+        # Any command may have touched the workspace; invalidate tree caches.
+        from code_puppy.tools.fs_access import note_tree_mutation
+
+        note_tree_mutation()
         _release_keyboard_context()
 
 
@@ -1637,17 +1637,22 @@ def write_project_file(
     calling ``atomic_write_text`` directly -- they are machine-local and must
     never be rerouted to an editor workspace.
     """
+    from code_puppy.tools import fs_access
     from code_puppy.tools.io_backends import get_filesystem_backend
 
-    backend = get_filesystem_backend()
-    if backend is not None:
-        if encoding.lower() not in ("utf-8", "utf8"):
-            raise ValueError(
-                f"filesystem backend writes are UTF-8 only; got encoding={encoding!r}"
-            )
-        backend.write_text_file(resolve_path(file_path), content)
-        return
-    atomic_write_text(file_path, content, encoding=encoding)
+    try:
+        backend = get_filesystem_backend()
+        if backend is not None:
+            if encoding.lower() not in ("utf-8", "utf8"):
+                raise ValueError(
+                    "filesystem backend writes are UTF-8 only; "
+                    f"got encoding={encoding!r}"
+                )
+            backend.write_text_file(resolve_path(file_path), content)
+            return
+        atomic_write_text(file_path, content, encoding=encoding)
+    finally:
+        fs_access.note_tree_mutation()
 
 
 def _find_best_window(
@@ -43,6 +43,9 @@ class ReadFileOutput(BaseModel):
     content: str | None
     num_tokens: conint(lt=10000)
     error: str | None = None
+    # Whole-file line count, reported for ranged reads of large files once
+    # the line index has seen the end of the file.
+    total_lines: int | None = None
 
 
 class MatchInfo(BaseModel):
@@ -570,6 +573,21 @@ def _read_file(
                 error_msg = "num_lines must be >= 1"
                 return ReadFileOutput(content=error_msg, num_tokens=0, error=error_msg)
             if start_line is not None and num_lines is not None:
+                # Large files: seek straight to the nearest indexed checkpoint
+                # instead of re-walking everything before start_line.
+                from code_puppy.tools.line_index import get_line_index
+
+                index = get_line_index(file_path)
+                if index is not None:
+                    content = index.read_lines(start_line, num_lines)
+                    if content is not None:
+                        return _finalize_read_output(
+                            file_path,
+                            content,
+                            start_line,
+                            num_lines,
+                            file_total_lines=index.total_lines,
+                        )
                 # Read only the specified lines efficiently using itertools.islice
                 # to avoid loading the entire file into memory
                 import itertools
@@ -600,11 +618,14 @@ def _finalize_read_output(
     content: str,
     start_line: int | None,
     num_lines: int | None,
+    file_total_lines: int | None = None,
 ) -> ReadFileOutput:
     """Sanitize/guard/emit for a just-read file body and build the output.
 
     Shared by the local (disk) and backend (host) read paths so both apply the
     identical surrogate sanitization, 10k-token guard, and UI emission.
+    ``file_total_lines`` is the whole file's line count when the caller knows
+    it cheaply; otherwise the count of lines read is shown.
     """
     # Sanitize the content to remove any surrogate characters that could cause
     # issues when the content is later serialized or displayed.
@@ -627,9 +648,11 @@ def _finalize_read_output(
             num_tokens=0,
         )
 
-    total_lines = content.count("\n") + (
-        1 if content and not content.endswith("\n") else 0
-    )
+    total_lines = file_total_lines
+    if total_lines is None:
+        total_lines = content.count("\n") + (
+            1 if content and not content.endswith("\n") else 0
+        )
     emit_start_line = start_line if start_line is not None and start_line >= 1 else None
     emit_num_lines = num_lines if num_lines is not None and num_lines >= 1 else None
     get_message_bus().emit(
@@ -642,7 +665,9 @@ def _finalize_read_output(
             num_tokens=num_tokens,
         )
     )
-    return ReadFileOutput(content=content, num_tokens=num_tokens)
+    return ReadFileOutput(
+        content=content, num_tokens=num_tokens, total_lines=file_total_lines
+    )
 
 
 def _sanitize_string(text: str) -> str:
@@ -1195,6 +1220,18 @@ def _grep(context: RunContext, search_string: str, directory: str = ".") -> Grep
     if get_filesystem_backend() is not None:
         return _grep_via_backend(directory, search_string)
 
+    # Serve a repeat of a recent search while it is provably current (see
+    # grep_cache); the UI still gets its result message.
+    from code_puppy.tools.common import DIR_IGNORE_PATTERNS
+    from code_puppy.tools.grep_cache import get_grep_cache, grep_cache_key
+
+    cache = get_grep_cache()
+    cache_key = grep_cache_key(search_string, directory, DIR_IGNORE_PATTERNS)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return _emit_grep_result(search_string, directory, cached, None)
+    generation = fs_access.tree_generation()
+
     matches: List[MatchInfo] = []
     error_message: str | None = None
 
@@ -1236,8 +1273,6 @@ def _grep(context: RunContext, search_string: str, directory: str = ".") -> Grep
             cmd.append("--type=all")
 
         # Add ignore patterns to the command via a temporary file
-        from code_puppy.tools.common import DIR_IGNORE_PATTERNS
-
         f = tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".ignore")
         ignore_file = f.name
         try:
@@ -1334,6 +1369,9 @@ def _grep(context: RunContext, search_string: str, directory: str = ".") -> Grep
         if ignore_file and os.path.exists(ignore_file):
             os.unlink(ignore_file)
 
+    if error_message is None:
+        cache.put(cache_key, matches, generation)
+
     # Build structured GrepMatch objects for the UI
     return _emit_grep_result(search_string, directory, matches, error_message)
 
@@ -1408,6 +1446,7 @@ def register_read_file(agent):
         """Read file contents with optional line-range selection and token safety.
 
         Use start_line/num_lines for large files to avoid overwhelming context.
+        Ranged reads of large files also report the file's total_lines.
         """
         return _read_file(context, file_path, start_line, num_lines)
 
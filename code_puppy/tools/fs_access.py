@@ -24,11 +24,35 @@ All paths passed in must be absolute (callers resolve via
 
 from __future__ import annotations
 
+import itertools
 import os
 from typing import Callable, Iterator, List, Optional, Tuple
 
 from code_puppy.tools.io_backends import DirEntry, get_filesystem_backend
 
+# ---------------------------------------------------------------------------
+# Tree generation
+# ---------------------------------------------------------------------------
+# Bumped after every mutation the agent's own tools make (writes, deletes,
+# mkdir, shell commands). Workspace caches -- e.g. the grep result cache --
+# record the generation they were filled at and treat any bump as "the tree
+# may have changed". Bumping *after* the mutation means a search that raced
+# the write is stored under the old generation and misses next time.
+_tree_generation_counter = itertools.count(1)
+_tree_generation = 0
+
+
+def note_tree_mutation() -> int:
+    """Record that the workspace may have changed; return the new generation."""
+    global _tree_generation
+    _tree_generation = next(_tree_generation_counter)
+    return _tree_generation
+
+
+def tree_generation() -> int:
+    """Return the current workspace generation (see :func:`note_tree_mutation`)."""
+    return _tree_generation
+
 
 # ---------------------------------------------------------------------------
 # Metadata
@@ -125,34 +149,43 @@ def write_text(path: str, content: str) -> None:
     ``common.write_project_file`` for diffing/messaging, which itself honors the
     backend; this is the raw equivalent.
     """
-    backend = get_filesystem_backend()
-    if backend is not None:
-        backend.write_text_file(path, content)
-        return
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+    try:
+        backend = get_filesystem_backend()
+        if backend is not None:
+            backend.write_text_file(path, content)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+    finally:
+        note_tree_mutation()
 
 
 # ---------------------------------------------------------------------------
 # Mutation
 # ---------------------------------------------------------------------------
 def delete_file(path: str) -> None:
-    backend = get_filesystem_backend()
-    if backend is not None:
-        backend.delete_file(path)
-        return
-    os.remove(path)
+    try:
+        backend = get_filesystem_backend()
+        if backend is not None:
+            backend.delete_file(path)
+            return
+        os.remove(path)
+    finally:
+        note_tree_mutation()
 
 
 def make_dirs(path: str) -> None:
     """Create ``path`` and parents (idempotent). No-op for the empty string."""
     if not path:
         return
-    backend = get_filesystem_backend()
-    if backend is not None:
-        backend.make_dirs(path)
-        return
-    os.makedirs(path, exist_ok=True)
+    try:
+        backend = get_filesystem_backend()
+        if backend is not None:
+            backend.make_dirs(path)
+            return
+        os.makedirs(path, exist_ok=True)
+    finally:
+        note_tree_mutation()
 
 
 # ---------------------------------------------------------------------------
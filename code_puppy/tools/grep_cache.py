@@ -0,0 +1,164 @@
+"""Validated result cache for the ``grep`` tool.
+
+Agents repeat the same searches a lot -- re-checking a symbol after reading a
+file, or re-running a pattern a sub-agent already ran. Each repeat costs a full
+ripgrep walk of the tree. This cache remembers the parsed matches of recent
+local (ripgrep) searches and serves a repeat only while it is still provably
+current:
+
+- the workspace generation (``fs_access.tree_generation``) is unchanged, i.e.
+  none of the agent's own write/delete/mkdir/shell tools ran since the search;
+- every file that matched still has the ``(mtime_ns, size)`` it had then, so
+  an edit to a matched file made outside the agent is caught;
+- the entry is younger than ``GREP_CACHE_TTL_SECONDS``, which bounds how long
+  a *new* match created outside the agent (e.g. in the user's editor) can go
+  unseen.
+
+Searches through an installed filesystem backend are never cached: the backend
+may serve unsaved editor buffers whose state has no on-disk mtime.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from code_puppy.tools import fs_access
+
+GREP_CACHE_TTL_SECONDS = 30.0
+
+GrepCacheKey = Tuple[str, str, Tuple[str, ...]]
+_FileStat = Optional[Tuple[int, int]]
+
+
+def grep_cache_key(search_string: str, directory: str, ignore_patterns) -> GrepCacheKey:
+    """Key a search on its pattern+flags string, root and ignore configuration."""
+    return (search_string, directory, tuple(ignore_patterns))
+
+
+def _file_stat(path: str) -> _FileStat:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass
+class _CachedGrep:
+    matches: List[Any]
+    generation: int
+    stored_at: float
+    file_stats: Dict[str, _FileStat] = field(default_factory=dict)
+
+    def is_current(self, now: float) -> bool:
+        if self.generation != fs_access.tree_generation():
+            return False
+        if now - self.stored_at > GREP_CACHE_TTL_SECONDS:
+            return False
+        return all(_file_stat(path) == stat for path, stat in self.file_stats.items())
+
+
+class GrepResultCache:
+    """Bounded LRU of grep results, validated on every lookup."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: "OrderedDict[GrepCacheKey, _CachedGrep]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: GrepCacheKey) -> Optional[List[Any]]:
+        """Return the cached matches for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and not entry.is_current(time.monotonic()):
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.invalidations += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return list(entry.matches)
+
+    def put(self, key: GrepCacheKey, matches: List[Any], generation: int) -> None:
+        """Store ``matches`` found by a search that started at ``generation``.
+
+        ``generation`` must be read *before* the search ran, so a concurrent
+        write lands in a newer generation and the entry is never served.
+        """
+        if self.max_size <= 0:
+            return
+        file_stats = {
+            path: _file_stat(path)
+            for path in {m.file_path for m in matches if m.file_path}
+        }
+        entry = _CachedGrep(
+            matches=list(matches),
+            generation=generation,
+            stored_at=time.monotonic(),
+            file_stats=file_stats,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+_grep_cache: Optional[GrepResultCache] = None
+_grep_cache_lock = threading.Lock()
+
+
+def get_grep_cache() -> GrepResultCache:
+    """Return the process-wide cache, resized to the ``grep_cache_size`` setting."""
+    from code_puppy.config import get_grep_cache_size
+
+    global _grep_cache
+    size = get_grep_cache_size()
+    with _grep_cache_lock:
+        if _grep_cache is None:
+            _grep_cache = GrepResultCache(size)
+        elif _grep_cache.max_size != size:
+            _grep_cache.max_size = size
+            _grep_cache.clear()
+        return _grep_cache
+
+
+def grep_cache_stats() -> dict:
+    """Hit/miss counters of the grep cache (zeros before first use)."""
+    with _grep_cache_lock:
+        cache = _grep_cache
+    if cache is None:
+        return {"size": 0, "max_size": 0, "hits": 0, "misses": 0, "invalidations": 0}
+    return cache.stats()
+
+
+def invalidate_grep_cache() -> None:
+    """Drop every cached result and reset the counters."""
+    global _grep_cache
+    with _grep_cache_lock:
+        _grep_cache = None
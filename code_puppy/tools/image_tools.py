@@ -5,16 +5,27 @@ from disk, validates it, downsizes it if it's billboard-sized, and returns it
 as a ``ToolReturn`` with ``BinaryContent`` so multimodal models can see it.
 
 Lives outside the browser package because it has nothing to do with browsers.
+
+Decoding, verifying, resizing and re-encoding happen on a small worker pool,
+never on the event loop, and prepared results are cached on disk under
+``CACHE_DIR/image_prep`` keyed by a hash of the input bytes, so loading the
+same screenshot twice is a hash and a file read.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import io
+import json
 import logging
 import mimetypes
+import os
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 from PIL import Image, UnidentifiedImageError
 from pydantic_ai import BinaryContent, RunContext, ToolReturn
@@ -28,6 +39,28 @@ logger = logging.getLogger(__name__)
 MAX_IMAGE_EDGE = 2048
 DEFAULT_MAX_HEIGHT = 768  # kept for backward-compat in tool signature
 
+# Pillow releases the GIL while decoding, resampling and compressing, so a few
+# threads keep concurrent agents' image loads off the loop and off each other.
+_IMAGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="image_prep_"
+)
+
+# Bump when _validate_and_prepare_image output changes for the same input.
+_IMAGE_CACHE_VERSION = 1
+# Oldest prepared images are pruned once the cache grows past this.
+IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Fields of a prepared image that depend only on the input bytes and max_edge.
+_CACHED_FIELDS = (
+    "media_type",
+    "actual_media_type",
+    "original_width",
+    "original_height",
+    "output_width",
+    "output_height",
+    "was_resized",
+)
+
 
 def _validate_and_prepare_image(
     image_bytes: bytes,
@@ -97,6 +130,155 @@ def _validate_and_prepare_image(
         }
 
 
+def _image_cache_dir() -> Path:
+    from code_puppy import config
+
+    return Path(config.CACHE_DIR) / "image_prep"
+
+
+def _image_cache_key(image_bytes: bytes, max_edge: Optional[int]) -> str:
+    digest = hashlib.blake2b(image_bytes, digest_size=20)
+    digest.update(f"|{max_edge}|{_IMAGE_CACHE_VERSION}".encode())
+    return digest.hexdigest()
+
+
+def _read_cached_image(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached prepared image for ``key``, or None on any miss."""
+    cache_dir = _image_cache_dir()
+    try:
+        meta = json.loads((cache_dir / f"{key}.json").read_text(encoding="utf-8"))
+        data = (cache_dir / f"{key}.bin").read_bytes()
+        os.utime(cache_dir / f"{key}.json")  # recently used: pruned last
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or any(f not in meta for f in _CACHED_FIELDS):
+        return None
+    return {**{f: meta[f] for f in _CACHED_FIELDS}, "image_bytes": data}
+
+
+def _write_cached_image(key: str, prepared: Dict[str, Any]) -> None:
+    """Store a prepared image (best effort; the data file lands first)."""
+    cache_dir = _image_cache_dir()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        meta = json.dumps({f: prepared[f] for f in _CACHED_FIELDS}).encode()
+        for name, payload in (
+            (f"{key}.bin", prepared["image_bytes"]),
+            (f"{key}.json", meta),
+        ):
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, cache_dir / name)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        _prune_image_cache(cache_dir)
+    except OSError:
+        logger.debug("Could not write image cache entry", exc_info=True)
+
+
+def _prune_image_cache(cache_dir: Path) -> None:
+    """Drop least recently used entries until the cache fits its budget."""
+    entries = []
+    total = 0
+    for meta_path in cache_dir.glob("*.json"):
+        data_path = meta_path.with_suffix(".bin")
+        try:
+            meta_stat = meta_path.stat()
+            size = data_path.stat().st_size + meta_stat.st_size
+            used = meta_stat.st_mtime
+        except OSError:
+            continue
+        entries.append((used, size, meta_path, data_path))
+        total += size
+    if total <= IMAGE_CACHE_MAX_BYTES:
+        return
+    for _used, size, meta_path, data_path in sorted(entries):
+        for path in (meta_path, data_path):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        total -= size
+        if total <= IMAGE_CACHE_MAX_BYTES:
+            break
+
+
+def _prepare_image_file(
+    image_path: str, max_edge: Optional[int] = MAX_IMAGE_EDGE
+) -> Dict[str, Any]:
+    """Read, validate and prepare an image file, reusing cached results.
+
+    Blocking: runs on ``_IMAGE_EXECUTOR`` via :func:`prepare_image_file`.
+    """
+    image_bytes = Path(image_path).read_bytes()
+    key = _image_cache_key(image_bytes, max_edge)
+    prepared = _read_cached_image(key)
+    if prepared is None:
+        prepared = _validate_and_prepare_image(
+            image_bytes, source_path=image_path, max_edge=max_edge
+        )
+        _write_cached_image(key, prepared)
+        prepared["cache_hit"] = False
+    else:
+        guessed_media_type, _ = mimetypes.guess_type(image_path)
+        prepared["guessed_media_type"] = guessed_media_type
+        prepared["mime_type_matches_extension"] = guessed_media_type in (
+            None,
+            prepared["media_type"],
+        )
+        prepared["cache_hit"] = True
+    return prepared
+
+
+async def prepare_image_file(
+    image_path: str, max_edge: Optional[int] = MAX_IMAGE_EDGE
+) -> Dict[str, Any]:
+    """Prepare an image file on the image worker pool (see ``load_image``)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _IMAGE_EXECUTOR, _prepare_image_file, image_path, max_edge
+    )
+
+
+def _make_thumbnail(image_bytes: bytes, max_edge: int) -> Dict[str, Any]:
+    """Downscale to fit ``max_edge`` and re-encode as a compact JPEG."""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        original_width, original_height = image.size
+        image.draft("RGB", (max_edge, max_edge))  # JPEG: decode at lower scale
+        thumb = image.convert("RGBA") if image.mode in ("P", "LA") else image
+        if thumb.mode == "RGBA":
+            flat = Image.new("RGB", thumb.size, (255, 255, 255))
+            flat.paste(thumb, mask=thumb.getchannel("A"))
+            thumb = flat
+        elif thumb.mode != "RGB":
+            thumb = thumb.convert("RGB")
+        thumb.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        thumb.save(output, format="JPEG", quality=70, optimize=True)
+        return {
+            "image_bytes": output.getvalue(),
+            "media_type": "image/jpeg",
+            "original_width": original_width,
+            "original_height": original_height,
+            "output_width": thumb.width,
+            "output_height": thumb.height,
+        }
+
+
+async def make_thumbnail(image_bytes: bytes, max_edge: int) -> Dict[str, Any]:
+    """Low-resolution JPEG of ``image_bytes``, built on the image worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _IMAGE_EXECUTOR, _make_thumbnail, image_bytes, max_edge
+    )
+
+
 async def load_image(
     image_path: str,
     max_height: int = DEFAULT_MAX_HEIGHT,
@@ -118,12 +300,7 @@ async def load_image(
             emit_error(error_msg, message_group=group_id)
             return {"success": False, "error": error_msg, "image_path": image_path}
 
-        image_bytes = image_file.read_bytes()
-        prepared_image = _validate_and_prepare_image(
-            image_bytes,
-            source_path=str(image_file),
-            max_edge=MAX_IMAGE_EDGE,
-        )
+        prepared_image = await prepare_image_file(str(image_file), MAX_IMAGE_EDGE)
 
         emit_success(f"Loaded image: {image_path}", message_group=group_id)
 
@@ -147,6 +324,7 @@ async def load_image(
                     "mime_type_matches_extension"
                 ],
                 "was_resized": prepared_image["was_resized"],
+                "cache_hit": prepared_image["cache_hit"],
                 "original_size": [
                     prepared_image["original_width"],
                     prepared_image["original_height"],
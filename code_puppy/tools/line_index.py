@@ -0,0 +1,191 @@
+"""Sparse line-offset index for ranged ``read_file`` calls.
+
+Paging through a large file with ``start_line``/``num_lines`` used to walk the
+file from the top on every call, so reading a multi-gigabyte log page by page
+was quadratic. A :class:`LineIndex` records the byte offset of every
+``LINE_INDEX_STRIDE``-th line start; a ranged read seeks to the nearest
+checkpoint at or before ``start_line`` and walks at most ``stride - 1`` lines.
+
+Indexes are cached per ``(path, size, mtime_ns)`` -- any change to the file
+produces a new key -- and are built *incrementally*: a read only scans as far
+as the furthest line requested so far, so the first page of a huge file stays
+cheap. Files up to ``LINE_INDEX_FULL_SCAN_BYTES`` are scanned to the end right
+away so their total line count is known immediately.
+
+Offsets count ``\\n`` bytes, which matches text-mode reading for ``\\n`` and
+``\\r\\n`` files. Files containing a bare ``\\r`` (which text mode also treats
+as a line break) are flagged and left to the plain sequential read.
+"""
+
+import itertools
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+LINE_INDEX_STRIDE = 1000
+# Below this size a sequential read is already cheap; skip the index.
+LINE_INDEX_MIN_BYTES = 1024 * 1024
+LINE_INDEX_FULL_SCAN_BYTES = 64 * 1024 * 1024
+_SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+_MAX_CACHED_INDEXES = 16
+
+
+def _kth_newline(buf: bytes, start: int, k: int, avg_line: float) -> int:
+    """Index of the ``k``-th ``\\n`` (1-based) in ``buf`` at or after ``start``.
+
+    Guesses the position from the running average line length, counts the
+    newlines up to the guess in C, then corrects with a few ``find``/``rfind``
+    steps -- so locating a checkpoint costs O(1) Python calls for files with
+    regular line lengths instead of one call per line. Returns ``-1`` when
+    ``buf`` holds fewer than ``k`` newlines after ``start``.
+    """
+    guess = min(len(buf), start + max(1, int(k * avg_line)))
+    seen = buf.count(b"\n", start, guess)
+    if seen >= k:
+        pos = guess
+        for _ in range(seen - k + 1):
+            pos = buf.rfind(b"\n", start, pos)
+        return pos
+    if guess == len(buf):
+        return -1
+    pos = guess - 1
+    for _ in range(k - seen):
+        pos = buf.find(b"\n", pos + 1)
+        if pos < 0:
+            return -1
+    return pos
+
+
+class LineIndex:
+    """Checkpoint offsets for one immutable ``(path, size, mtime_ns)`` snapshot."""
+
+    def __init__(self, path: str, size: int, mtime_ns: int, stride: int) -> None:
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.stride = stride
+        # checkpoints[i] is the byte offset where line ``i * stride`` starts.
+        self.checkpoints = array("Q", [0])
+        self.has_bare_cr = False
+        self._ends_with_newline = False
+        self._scanned_bytes = 0
+        self._scanned_lines = 0
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        return self._scanned_bytes >= self.size
+
+    @property
+    def total_lines(self) -> Optional[int]:
+        """Line count as text-mode reading sees it, once the scan reached EOF."""
+        if not self.complete:
+            return None
+        if self.size == 0:
+            return 0
+        return self._scanned_lines + (0 if self._ends_with_newline else 1)
+
+    def ensure_lines(self, count: Optional[int]) -> None:
+        """Scan until at least ``count`` whole lines are indexed (or EOF).
+
+        ``None`` scans the whole file.
+        """
+        with self._lock:
+            if self.complete or (count is not None and self._scanned_lines >= count):
+                return
+            self._scan(count)
+
+    def _scan(self, want_lines: Optional[int]) -> None:
+        stride = self.stride
+        next_line = len(self.checkpoints) * stride
+        avg_line = 64.0
+        with open(self.path, "rb") as f:
+            f.seek(self._scanned_bytes)
+            while self._scanned_bytes < self.size:
+                buf = f.read(min(_SCAN_CHUNK_BYTES, self.size - self._scanned_bytes))
+                if not buf:
+                    break
+                # Keep a CRLF pair in one chunk so bare-CR detection is exact.
+                if buf.endswith(b"\r") and self._scanned_bytes + len(buf) < self.size:
+                    buf += f.read(1)
+                if b"\r" in buf and buf.count(b"\r") != buf.count(b"\r\n"):
+                    self.has_bare_cr = True
+                base = self._scanned_bytes
+                # Jump checkpoint to checkpoint; only the tail after the last
+                # one needs a separate newline count.
+                cursor, cursor_count = -1, 0
+                while True:
+                    k = next_line - self._scanned_lines - cursor_count
+                    pos = _kth_newline(buf, cursor + 1, k, avg_line)
+                    if pos < 0:
+                        break
+                    avg_line = max(1.0, (pos - cursor) / k)
+                    cursor, cursor_count = pos, cursor_count + k
+                    self.checkpoints.append(base + pos + 1)
+                    next_line += stride
+                self._scanned_lines += cursor_count + buf.count(b"\n", cursor + 1)
+                self._scanned_bytes += len(buf)
+                self._ends_with_newline = buf.endswith(b"\n")
+                if want_lines is not None and self._scanned_lines >= want_lines:
+                    break
+        # A checkpoint exactly at EOF is not a line start.
+        if self.complete and self.size and self.checkpoints[-1] >= self.size:
+            self.checkpoints.pop()
+
+    def read_lines(self, start_line: int, num_lines: int) -> Optional[str]:
+        """Text of ``num_lines`` lines from 1-based ``start_line``.
+
+        Decoded the way ``open(..., errors="surrogateescape")`` would decode
+        it, with ``\\r\\n`` translated to ``\\n``. Returns ``None`` when the
+        scanned region holds a bare ``\\r`` and the caller must fall back to
+        a text-mode read.
+        """
+        line = start_line - 1
+        self.ensure_lines(line + num_lines)
+        if self.has_bare_cr:
+            return None
+        slot = min(line // self.stride, len(self.checkpoints) - 1)
+        skip = line - slot * self.stride
+        with open(self.path, "rb") as f:
+            f.seek(self.checkpoints[slot])
+            raw = b"".join(itertools.islice(f, skip, skip + num_lines))
+        text = raw.decode("utf-8", errors="surrogateescape")
+        return text.replace("\r\n", "\n") if "\r" in text else text
+
+
+_indexes: "OrderedDict[Tuple[str, int, int], LineIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_line_index(path: str) -> Optional[LineIndex]:
+    """Return the cached index for ``path``'s current contents.
+
+    ``None`` for files too small to benefit. Any size or mtime change misses
+    the cache and starts a fresh index.
+    """
+    st = os.stat(path)
+    if st.st_size < LINE_INDEX_MIN_BYTES:
+        return None
+    key = (path, st.st_size, st.st_mtime_ns)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+        else:
+            # Drop indexes for older versions of this file, then cap the cache.
+            for stale in [k for k in _indexes if k[0] == path]:
+                del _indexes[stale]
+            index = LineIndex(path, st.st_size, st.st_mtime_ns, LINE_INDEX_STRIDE)
+            _indexes[key] = index
+            while len(_indexes) > _MAX_CACHED_INDEXES:
+                _indexes.popitem(last=False)
+    if st.st_size <= LINE_INDEX_FULL_SCAN_BYTES:
+        index.ensure_lines(None)
+    return index
+
+
+def clear_line_indexes() -> None:
+    with _indexes_lock:
+        _indexes.clear()
@@ -0,0 +1,289 @@
+"""Parallel sub-agent fan-out tool.
+
+``invoke_agents_parallel`` runs a batch of ``(agent, prompt)`` tasks
+concurrently on top of ``_invoke_agent_impl`` instead of relying on the
+model to batch several ``invoke_agent`` calls. The batch:
+
+- caps concurrency with a semaphore (``subagent_parallel_limit``),
+- shares resolved models -- and with them the provider HTTP client -- across
+  every task (see ``shared_subagent_models``),
+- reports per-task progress as tasks start and finish,
+- enforces one wall-clock budget for the whole batch; tasks still running
+  when it expires are cancelled and come back as ``timed_out`` with the
+  text of the last turn they completed.
+"""
+
+import asyncio
+import time
+from typing import List, Literal
+
+from pydantic import BaseModel
+from pydantic_ai import RunContext
+from pydantic_ai.messages import ModelResponse, TextPart
+
+from code_puppy.config import (
+    get_subagent_parallel_limit,
+    get_subagent_parallel_timeout_seconds,
+)
+from code_puppy.messaging import emit_error, emit_info, emit_success, emit_warning
+from code_puppy.tools.common import generate_group_id
+from code_puppy.tools.subagent_invocation import (
+    SubagentRunState,
+    _interrupted_subagents,
+    _invoke_agent_impl,
+    shared_subagent_models,
+)
+
+# Hard ceilings regardless of what the model asks for.
+MAX_PARALLEL_TASKS = 32
+MAX_PARALLEL_CONCURRENCY = 16
+
+
+class ParallelAgentTask(BaseModel):
+    """One unit of work for ``invoke_agents_parallel``."""
+
+    agent_name: str
+    prompt: str
+    session_id: str | None = None
+
+
+class ParallelTaskResult(BaseModel):
+    """Outcome of one task, in the same order as the submitted tasks."""
+
+    index: int
+    agent_name: str
+    status: Literal["completed", "failed", "timed_out"]
+    response: str | None = None
+    partial_response: str | None = None
+    session_id: str | None = None
+    model_name: str | None = None
+    error: str | None = None
+    duration_ms: float | None = None
+
+
+class ParallelInvokeOutput(BaseModel):
+    results: List[ParallelTaskResult] = []
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    elapsed_ms: float = 0.0
+    error: str | None = None
+
+
+def _last_response_text(messages) -> str | None:
+    """Text of the newest model response in ``messages``, if any."""
+    for message in reversed(messages or []):
+        if isinstance(message, ModelResponse):
+            text = "".join(
+                part.content for part in message.parts if isinstance(part, TextPart)
+            )
+            if text:
+                return text
+    return None
+
+
+def _partial_response(state: SubagentRunState) -> str | None:
+    if state.agent_config is None:
+        return None
+    try:
+        history = state.agent_config.get_message_history() or []
+    except Exception:
+        return None
+    return _last_response_text(history[state.baseline_count :])
+
+
+def _forget_interrupt_breadcrumbs(session_ids: set[str]) -> None:
+    """Drop interruption breadcrumbs for tasks this batch reports itself.
+
+    A timed-out task is not a dangling tool call: the batch returns normally
+    with its status, so the parent must not also get an "interrupted" note.
+    """
+    _interrupted_subagents[:] = [
+        record
+        for record in _interrupted_subagents
+        if record.get("session_id") not in session_ids
+    ]
+
+
+def _clamp_concurrency(requested: int | None, task_count: int) -> int:
+    limit = requested if requested and requested > 0 else get_subagent_parallel_limit()
+    return max(1, min(limit, MAX_PARALLEL_CONCURRENCY, task_count))
+
+
+async def _invoke_agents_parallel_impl(
+    context: RunContext,
+    tasks: List[ParallelAgentTask],
+    max_concurrency: int | None = None,
+    timeout_seconds: float | None = None,
+) -> ParallelInvokeOutput:
+    group_id = generate_group_id("invoke_agents_parallel", str(len(tasks)))
+    if not tasks:
+        error = "tasks cannot be empty"
+        emit_error(error, message_group=group_id)
+        return ParallelInvokeOutput(error=error)
+    if len(tasks) > MAX_PARALLEL_TASKS:
+        error = f"At most {MAX_PARALLEL_TASKS} tasks per batch (got {len(tasks)})"
+        emit_error(error, message_group=group_id)
+        return ParallelInvokeOutput(error=error)
+
+    concurrency = _clamp_concurrency(max_concurrency, len(tasks))
+    budget = (
+        timeout_seconds
+        if timeout_seconds and timeout_seconds > 0
+        else get_subagent_parallel_timeout_seconds()
+    )
+    total = len(tasks)
+    emit_info(
+        f"Fanning out {total} sub-agent task(s), {concurrency} at a time "
+        f"(budget {budget:g}s)",
+        message_group=group_id,
+    )
+
+    semaphore = asyncio.Semaphore(concurrency)
+    states = [SubagentRunState() for _ in tasks]
+    started: list[float | None] = [None] * total
+    finished: list[float | None] = [None] * total
+
+    async def _run_one(index: int, task: ParallelAgentTask):
+        async with semaphore:
+            started[index] = time.perf_counter()
+            emit_info(
+                f"[{index + 1}/{total}] {task.agent_name} started",
+                message_group=group_id,
+            )
+            try:
+                out = await _invoke_agent_impl(
+                    context=context,
+                    agent_name=task.agent_name,
+                    prompt=task.prompt,
+                    session_id=task.session_id,
+                    run_state=states[index],
+                )
+            finally:
+                finished[index] = time.perf_counter()
+            status = "failed" if out.error else "done"
+            emit_info(
+                f"[{index + 1}/{total}] {task.agent_name} {status} "
+                f"({finished[index] - started[index]:.1f}s)",
+                message_group=group_id,
+            )
+            return out
+
+    batch_started = time.perf_counter()
+    with shared_subagent_models():
+        running = [
+            asyncio.create_task(_run_one(i, task)) for i, task in enumerate(tasks)
+        ]
+        try:
+            _done, pending = await asyncio.wait(running, timeout=budget)
+        except BaseException:
+            # The parent itself was cancelled: take the whole batch down.
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    output = ParallelInvokeOutput(
+        elapsed_ms=(time.perf_counter() - batch_started) * 1000.0
+    )
+    timed_out_sessions: set[str] = set()
+    for index, (task, running_task) in enumerate(zip(tasks, running)):
+        state = states[index]
+        duration_ms = (
+            ((finished[index] or time.perf_counter()) - started[index]) * 1000.0
+            if started[index] is not None
+            else None
+        )
+        result = ParallelTaskResult(
+            index=index,
+            agent_name=task.agent_name,
+            status="completed",
+            session_id=state.session_id,
+            duration_ms=duration_ms,
+        )
+        if running_task.cancelled():
+            result.status = "timed_out"
+            result.error = (
+                f"Wall-clock budget of {budget:g}s expired"
+                if started[index] is not None
+                else f"Not started before the {budget:g}s budget expired"
+            )
+            result.partial_response = _partial_response(state)
+            if state.session_id:
+                timed_out_sessions.add(state.session_id)
+            output.timed_out += 1
+        elif running_task.exception() is not None:
+            result.status = "failed"
+            result.error = str(running_task.exception())
+            output.failed += 1
+        else:
+            out = running_task.result()
+            result.response = out.response
+            result.session_id = out.session_id
+            result.model_name = out.model_name
+            result.error = out.error
+            if out.error:
+                result.status = "failed"
+                output.failed += 1
+            else:
+                output.completed += 1
+        output.results.append(result)
+
+    _forget_interrupt_breadcrumbs(timed_out_sessions)
+
+    summary = (
+        f"Fan-out finished in {output.elapsed_ms / 1000.0:.1f}s: "
+        f"{output.completed} completed, {output.failed} failed, "
+        f"{output.timed_out} timed out"
+    )
+    if output.failed or output.timed_out:
+        emit_warning(summary, message_group=group_id)
+    else:
+        emit_success(summary, message_group=group_id)
+    return output
+
+
+def register_invoke_agents_parallel(agent):
+    """Register the concurrent multi-agent fan-out tool."""
+
+    @agent.tool
+    async def invoke_agents_parallel(
+        context: RunContext,
+        tasks: List[ParallelAgentTask],
+        max_concurrency: int | None = None,
+        timeout_seconds: float | None = None,
+    ) -> ParallelInvokeOutput:
+        """Run several independent sub-agent tasks concurrently.
+
+        Use this instead of many sequential invoke_agent calls when the tasks
+        do not depend on each other. The same delegation rules as invoke_agent
+        apply: never invoke yourself or an agent already in the invocation
+        chain, and tell each child not to delegate further.
+
+        Args:
+            tasks: The tasks to run, each with agent_name, prompt and an
+                optional session_id to continue an existing session.
+            max_concurrency: How many tasks may run at once (defaults to the
+                subagent_parallel_limit setting).
+            timeout_seconds: Wall-clock budget for the whole batch (defaults to
+                the subagent_parallel_timeout_seconds setting). Tasks still
+                running when it expires are cancelled.
+
+        Returns:
+            ParallelInvokeOutput: One result per task, in submission order,
+            with status completed/failed/timed_out. Timed-out tasks carry the
+            text of their last completed turn in partial_response and a
+            session_id that can be resumed with invoke_agent.
+        """
+        return await _invoke_agents_parallel_impl(
+            context,
+            tasks,
+            max_concurrency=max_concurrency,
+            timeout_seconds=timeout_seconds,
+        )
+
+    return invoke_agents_parallel
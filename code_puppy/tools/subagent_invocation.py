@@ -5,10 +5,12 @@ import inspect
 import sys
 import time
 import traceback
-from contextlib import AsyncExitStack
+from contextlib import AsyncExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import partial
-from typing import Set
+from typing import Any, Iterator, Set
 
 from pydantic_ai import Agent, RunContext, UsageLimits
 from pydantic_ai.capabilities import ProcessHistory
@@ -53,6 +55,12 @@ from code_puppy.tools.subagent_context import (
     get_subagent_model_name,
     subagent_context,
 )
+from code_puppy.tools.subagent_pool import (
+    PooledSubagent,
+    config_fingerprint,
+    get_subagent_pool,
+    mcp_toolset_key,
+)
 from code_puppy.tools.subagent_usage_metrics import (
     _safe_usage_metrics,
     build_invoke_output,
@@ -69,6 +77,43 @@ _active_subagent_tasks: Set[asyncio.Task] = set()
 _interrupted_subagents: list[dict] = []
 
 
+# Resolved models shared by every sub-agent of one fan-out batch, so N
+# concurrent tasks reuse one provider client/connection pool instead of each
+# building its own. ``None`` outside a batch (every call resolves afresh).
+_shared_subagent_models: ContextVar[dict | None] = ContextVar(
+    "shared_subagent_models", default=None
+)
+
+
+@contextmanager
+def shared_subagent_models() -> Iterator[dict]:
+    """Share resolved sub-agent models for the duration of the block.
+
+    Tasks created inside the block inherit the context, so they all see the
+    same cache dict.
+    """
+    cache: dict = {}
+    token = _shared_subagent_models.set(cache)
+    try:
+        yield cache
+    finally:
+        _shared_subagent_models.reset(token)
+
+
+@dataclass
+class SubagentRunState:
+    """Live view of one invocation for callers that may cancel it mid-run.
+
+    ``_invoke_agent_impl`` fills the fields in as they become known, so a
+    caller that times the run out can still name the session and read the
+    turns the sub-agent completed before cancellation.
+    """
+
+    session_id: str | None = None
+    agent_config: Any = None
+    baseline_count: int = 0
+
+
 def record_interrupted_subagent(
     *, agent_name: str, session_id: str, saved_count: int | None
 ) -> None:
@@ -178,6 +223,152 @@ def _save_partial_session(
     return None
 
 
+def _subagent_pool_key(
+    agent_name: str, model_name: str | None, is_new_session: bool
+) -> tuple:
+    """Warm-pool key: everything per-call that shapes the built agent.
+
+    The nesting position feeds the identity prompt and ``is_new_session``
+    feeds prompt preparation; file-backed inputs (agent JSON, models, tool
+    and MCP config) are covered by the pool's stat fingerprint instead.
+    """
+    return (
+        agent_name,
+        model_name,
+        is_new_session,
+        get_subagent_depth(),
+        tuple(get_subagent_chain()),
+    )
+
+
+def _resolve_subagent_model(agent_config, agent_name, model_name, group_id):
+    """Resolve the sub-agent's model; returns ``(model, effective_model_name)``.
+
+    Precedence lives in the agent (runtime override -> pinned model -> global
+    default), so this must run inside ``temporary_model_name_override``.
+    """
+    # Lazy import to break circular dependency with messaging module
+    from code_puppy.model_factory import ModelFactory
+
+    requested_model_name = agent_config.get_model_name()
+    shared = _shared_subagent_models.get()
+    shared_key = (requested_model_name, bool(model_name))
+    if shared is not None and shared_key in shared:
+        return shared[shared_key]
+
+    models_config = ModelFactory.load_config()
+
+    if not requested_model_name:
+        raise ValueError("No model configured for sub-agent invocation")
+
+    # A pinned/ambient model that has vanished from config (removed entry,
+    # unsupported type, missing creds) degrades like the main agent: warn +
+    # fall back via ``load_model_with_fallback``. An EXPLICIT override is a
+    # different contract — a bad one stays a hard per-call failure.
+    from code_puppy.agents._builder import load_model_with_fallback
+
+    if model_name:
+        try:
+            model = ModelFactory.get_model(requested_model_name, models_config)
+            if model is None:
+                raise ValueError(
+                    f"Model '{requested_model_name}' is configured but "
+                    "could not be initialized. Check credentials, "
+                    "provider availability, and usage limits for that "
+                    "model."
+                )
+        except ValueError as exc:
+            available = list(models_config.keys())
+            available_str = (
+                ", ".join(sorted(available)) if available else "no configured models"
+            )
+            raise ValueError(
+                f"Explicit model override '{requested_model_name}' is "
+                f"unavailable: {exc} Available models: {available_str}."
+            ) from exc
+        resolved = (model, requested_model_name)
+    else:
+        resolved = load_model_with_fallback(
+            requested_model_name,
+            models_config,
+            group_id,
+            agent_name=agent_name,
+            # Scope warn-once dedup to the conversation's ROOT identity
+            # (ContextVar set at the top-level boundary), NOT this call's
+            # session_id or the shared message-bus context: concurrent
+            # conversations stay separate, and nested A→B→C invocations
+            # share one id so "once per conversation" holds tree-wide.
+            conversation_scope=get_conversation_root_id(),
+        )
+    if shared is not None:
+        shared[shared_key] = resolved
+    return resolved
+
+
+def _build_subagent_agent(
+    *,
+    agent_config,
+    agent_name,
+    model,
+    effective_model_name,
+    instructions,
+    mcp_servers,
+    group_id,
+):
+    """Construct, tool-register and plugin-wrap a sub-agent's pydantic-ai Agent.
+
+    Returns ``(agent, tool_names)``.
+    """
+    from code_puppy.agents._compaction import make_history_processor
+    from code_puppy.agents._model_message_transform import (
+        build_model_message_transform,
+    )
+    from code_puppy.agents._prompt_cache import build_prompt_cache_tracker
+    from code_puppy.model_factory import make_model_settings
+
+    model_settings = make_model_settings(effective_model_name)
+
+    # Build the pydantic-ai agent. MCP servers always included; plugins
+    # (e.g. DBOS) may swap them via the agent_run_context hook.
+    temp_agent = Agent(
+        model=model,
+        # Explicit name: without it pydantic-ai infers one from the
+        # caller's frame variables, so every sub-agent's observability
+        # span reads "invoke_agent temp_agent" instead of the logical
+        # agent name (e.g. "invoke_agent web-retriever").
+        name=agent_name,
+        instructions=instructions,
+        output_type=str,
+        retries=3,
+        toolsets=mcp_servers,
+        # ProcessHistory capability replaces the deprecated
+        # `history_processors=` kwarg (removed in pydantic-ai v2). Prompt-
+        # cache stats are kept per sub-agent session (see /cache).
+        capabilities=[
+            ProcessHistory(make_history_processor(agent_config)),
+            build_model_message_transform(agent_name),
+            build_prompt_cache_tracker(agent_name, per_session=True),
+        ],
+        model_settings=model_settings,
+    )
+
+    # Register the tools that the agent needs
+    from code_puppy.tools import register_tools_for_agent
+
+    agent_tools = agent_config.get_available_tools()
+    register_tools_for_agent(temp_agent, agent_tools, model_name=effective_model_name)
+
+    # Allow plugins to wrap the agent (e.g. DBOS durable-exec wrapper).
+    temp_agent = on_wrap_pydantic_agent(
+        agent_config,
+        temp_agent,
+        event_stream_handler=None,
+        message_group=group_id,
+        kind="subagent",
+    )
+    return temp_agent, agent_tools
+
+
 async def _invoke_agent_impl(
     context: RunContext,
     agent_name: str,
@@ -186,6 +377,7 @@ async def _invoke_agent_impl(
     model_name: str | None = None,
     emit_response_message: bool = True,
     include_usage_metrics: bool = False,
+    run_state: SubagentRunState | None = None,
 ) -> AgentInvokeOutput:
     """Invoke a sub-agent, optionally suppressing its standard response message.
 
@@ -194,6 +386,9 @@ async def _invoke_agent_impl(
     ``AgentInvokeOutput``) and whether any timing/usage instrumentation runs
     at all, so ``invoke_agent`` callers see zero behavioral or performance
     change from before this instrumentation existed.
+
+    ``run_state``, when given, is filled in as the session id and agent config
+    become known (see :class:`SubagentRunState`).
     """
     from code_puppy.agents.agent_manager import load_agent
 
@@ -262,6 +457,10 @@ async def _invoke_agent_impl(
         session_id = f"{safe_base}-{hash_suffix}"
     # else: continuing existing session, use session_id as-is
 
+    if run_state is not None:
+        run_state.session_id = session_id
+        run_state.baseline_count = len(message_history)
+
     # Lazy imports to avoid circular dependency
     from code_puppy.agents.subagent_stream_handler import subagent_stream_handler
 
@@ -294,72 +493,41 @@ async def _invoke_agent_impl(
     agent_config = None
     effective_model_name = model_name
 
-    try:
-        # Lazy import to break circular dependency with messaging module
-        from code_puppy.model_factory import ModelFactory, make_model_settings
+    # Warm pool: a repeat invocation under an unchanged config reuses an idle,
+    # fully built instance instead of reloading, re-resolving and rebuilding.
+    pool = get_subagent_pool()
+    pool_fingerprint = config_fingerprint()
+    pool_key = _subagent_pool_key(agent_name, model_name, is_new_session)
+    pooled = pool.acquire(pool_key, pool_fingerprint)
 
-        # Load the specified agent config
-        agent_config = load_agent(agent_name)
+    try:
+        # Load the specified agent config (a pooled entry carries its own)
+        agent_config = (
+            pooled.agent_config if pooled is not None else load_agent(agent_name)
+        )
+        if run_state is not None:
+            run_state.agent_config = agent_config
 
         with agent_config.temporary_model_name_override(model_name):
             # Seed history so make_history_processor (wired into history_processors)
             # mutates ``agent_config._message_history`` in place — letting us read
             # partial progress off the wrapper after a mid-run crash.
+            if pooled is not None:
+                # A fresh load starts with no compacted-hash memory; a reused
+                # instance must too, or a prior session's hashes drop messages.
+                agent_config.clear_message_history()
             agent_config.set_message_history(list(message_history))
 
-            # Resolve the effective model through the agent so precedence lives
-            # in one place: runtime override -> pinned model -> global default.
-            requested_model_name = agent_config.get_model_name()
-            models_config = ModelFactory.load_config()
-
-            if not requested_model_name:
-                raise ValueError("No model configured for sub-agent invocation")
-
-            # A pinned/ambient model that has vanished from config (removed entry,
-            # unsupported type, missing creds) degrades like the main agent: warn +
-            # fall back via ``load_model_with_fallback``. An EXPLICIT override is a
-            # different contract — a bad one stays a hard per-call failure.
-            from code_puppy.agents._builder import load_model_with_fallback
-
-            if model_name:
-                try:
-                    model = ModelFactory.get_model(requested_model_name, models_config)
-                    if model is None:
-                        raise ValueError(
-                            f"Model '{requested_model_name}' is configured but "
-                            "could not be initialized. Check credentials, "
-                            "provider availability, and usage limits for that "
-                            "model."
-                        )
-                except ValueError as exc:
-                    available = list(models_config.keys())
-                    available_str = (
-                        ", ".join(sorted(available))
-                        if available
-                        else "no configured models"
-                    )
-                    raise ValueError(
-                        f"Explicit model override '{requested_model_name}' is "
-                        f"unavailable: {exc} Available models: {available_str}."
-                    ) from exc
-                effective_model_name = requested_model_name
+            if pooled is not None:
+                model = pooled.model
+                effective_model_name = pooled.effective_model_name
+                base_instructions = pooled.instructions
             else:
-                model, effective_model_name = load_model_with_fallback(
-                    requested_model_name,
-                    models_config,
-                    group_id,
-                    agent_name=agent_name,
-                    # Scope warn-once dedup to the conversation's ROOT identity
-                    # (ContextVar set at the top-level boundary), NOT this call's
-                    # session_id or the shared message-bus context: concurrent
-                    # conversations stay separate, and nested A→B→C invocations
-                    # share one id so "once per conversation" holds tree-wide.
-                    conversation_scope=get_conversation_root_id(),
+                model, effective_model_name = _resolve_subagent_model(
+                    agent_config, agent_name, model_name, group_id
                 )
-
-            # Create a temporary agent instance to avoid interfering with current agent state
-            instructions = agent_config.get_full_system_prompt()
-            instructions += f"\n\n{_subagent_identity_prompt(agent_name)}"
+                base_instructions = agent_config.get_full_system_prompt()
+                base_instructions += f"\n\n{_subagent_identity_prompt(agent_name)}"
 
             # AGENTS.md deliberately NOT injected into sub-agents: those are
             # user-facing steering for the MAIN agent and would create recursion
@@ -372,15 +540,13 @@ async def _invoke_agent_impl(
             # Handle claude-code models: swap instructions, and prepend system prompt only on first message
             prepared = prepare_prompt_for_model(
                 effective_model_name,
-                instructions,
+                base_instructions,
                 prompt,
                 prepend_system_to_user=is_new_session,  # Only prepend on first message
             )
             instructions = prepared.instructions
             prompt = prepared.user_prompt
 
-            model_settings = make_model_settings(effective_model_name)
-
             # Warm up bound MCP servers with the ASYNC autostart variant: the run
             # is wrapped in create_task, and the sync variant races pydantic-ai's
             # cancel-scope entry ("Attempted to exit a cancel scope..."). Awaiting
@@ -400,49 +566,30 @@ async def _invoke_agent_impl(
                     await autostart_bound_servers_async(manager, bound_agent_name)
                 mcp_servers = manager.get_servers_for_agent(agent_name=bound_agent_name)
 
-            from code_puppy.agents._compaction import make_history_processor
-            from code_puppy.agents._model_message_transform import (
-                build_model_message_transform,
-            )
-
-            # Build the pydantic-ai agent. MCP servers always included; plugins
-            # (e.g. DBOS) may swap them via the agent_run_context hook.
-            temp_agent = Agent(
-                model=model,
-                # Explicit name: without it pydantic-ai infers one from the
-                # caller's frame variables, so every sub-agent's observability
-                # span reads "invoke_agent temp_agent" instead of the logical
-                # agent name (e.g. "invoke_agent web-retriever").
-                name=agent_name,
-                instructions=instructions,
-                output_type=str,
-                retries=3,
-                toolsets=mcp_servers,
-                # ProcessHistory capability replaces the deprecated
-                # `history_processors=` kwarg (removed in pydantic-ai v2).
-                capabilities=[
-                    ProcessHistory(make_history_processor(agent_config)),
-                    build_model_message_transform(agent_name),
-                ],
-                model_settings=model_settings,
-            )
-
-            # Register the tools that the agent needs
-            from code_puppy.tools import register_tools_for_agent
-
-            agent_tools = agent_config.get_available_tools()
-            register_tools_for_agent(
-                temp_agent, agent_tools, model_name=effective_model_name
-            )
-
-            # Allow plugins to wrap the agent (e.g. DBOS durable-exec wrapper).
-            temp_agent = on_wrap_pydantic_agent(
-                agent_config,
-                temp_agent,
-                event_stream_handler=None,
-                message_group=group_id,
-                kind="subagent",
-            )
+            # A pooled agent is only reusable with the exact MCP toolsets it was
+            # built with (a restart or rebinding swaps the server objects).
+            mcp_key = mcp_toolset_key(mcp_servers)
+            if pooled is not None and pooled.mcp_key == mcp_key:
+                temp_agent = pooled.agent
+            else:
+                temp_agent, agent_tools = _build_subagent_agent(
+                    agent_config=agent_config,
+                    agent_name=agent_name,
+                    model=model,
+                    effective_model_name=effective_model_name,
+                    instructions=instructions,
+                    mcp_servers=mcp_servers,
+                    group_id=group_id,
+                )
+                pooled = PooledSubagent(
+                    agent_config=agent_config,
+                    agent=temp_agent,
+                    model=model,
+                    effective_model_name=effective_model_name,
+                    instructions=base_instructions,
+                    tool_names=tuple(agent_tools or ()),
+                    mcp_key=mcp_key,
+                )
 
             # subagent_stream_handler silences sub-agent output (aggregated
             # dashboard); high mode streams it inline via a StreamingTextDetector,
@@ -576,6 +723,13 @@ async def _invoke_agent_impl(
                 f"✓ {agent_name} completed successfully", message_group=group_id
             )
 
+            # Only a cleanly finished run goes back to the pool; failed or
+            # cancelled instances are dropped with their half-run state. A
+            # build that fell back from a dead pinned model is not pooled
+            # either: re-resolving keeps the per-conversation fallback warning.
+            if effective_model_name == agent_config.get_model_name():
+                pool.release(pool_key, pool_fingerprint, pooled)
+
             return build_invoke_output(
                 include_usage_metrics=include_usage_metrics,
                 response=response,
@@ -672,9 +826,21 @@ async def _invoke_agent_impl(
     finally:
         # Restore the previous session context
         set_session_context(previous_session_id)
+        from code_puppy.agents._prompt_cache import forget_prompt_cache_session
+
+        forget_prompt_cache_session(agent_name, session_id)
         if browser_session_token is not None:
-            from code_puppy.tools.browser.browser_manager import _browser_session_var
+            from code_puppy.tools.browser.browser_manager import (
+                _browser_session_var,
+                release_pooled_browser,
+            )
 
+            # Free this sub-agent's slot in the shared browser pool (no-op
+            # unless browser_shared_pool is on) so later sessions can start.
+            try:
+                await release_pooled_browser(f"browser-{session_id}")
+            except Exception:
+                pass
             _browser_session_var.reset(browser_session_token)
 
 
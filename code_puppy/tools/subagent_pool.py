@@ -0,0 +1,243 @@
+"""Warm pool of constructed sub-agent instances.
+
+Building a sub-agent is not free: ``load_agent`` re-runs agent discovery, the
+model factory builds a provider client, ``register_tools_for_agent`` walks the
+tool registry and the pydantic-ai ``Agent`` is assembled from scratch. An
+orchestrator that calls the same reviewer 30 times in a session pays that 30
+times. The pool keeps idle, fully constructed instances around so a repeat
+invocation only re-seeds history and runs.
+
+Entries are checked out exclusively: the history processor is bound to the
+entry's ``agent_config`` (it mutates ``_message_history`` in place), so two
+concurrent invocations of the same agent never share an instance -- the
+second one simply builds a fresh entry and both are returned afterwards.
+
+Freshness is enforced with a cheap stat fingerprint of everything that feeds
+construction (``puppy.cfg``, the model catalogs, MCP server config and the
+user/project agent directories). Any change to those files drops the whole
+pool on the next acquire; :func:`invalidate_subagent_pool` does the same on
+demand for in-process changes that never touch disk.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Optional, Tuple
+
+from code_puppy import config as cp_config
+
+# Catalog/config files whose contents change what a sub-agent build produces.
+# Attribute names, not paths: tests (and /set) repoint them at runtime.
+_FINGERPRINT_FILE_ATTRS = (
+    "CONFIG_FILE",
+    "MODELS_FILE",
+    "EXTRA_MODELS_FILE",
+    "MCP_SERVERS_FILE",
+    "GEMINI_MODELS_FILE",
+    "CHATGPT_MODELS_FILE",
+    "CLAUDE_MODELS_FILE",
+    "COPILOT_MODELS_FILE",
+)
+
+
+@dataclass
+class PooledSubagent:
+    """One constructed sub-agent, ready to run once its history is seeded.
+
+    ``instructions`` is the raw system prompt *before*
+    ``prepare_prompt_for_model`` so each call can still derive its own user
+    prompt (claude-code models fold the system prompt into the first message).
+    ``mcp_key`` pins the MCP toolsets the agent was built with; a checkout
+    whose live server set differs must rebuild the agent.
+    """
+
+    agent_config: Any
+    agent: Any
+    model: Any
+    effective_model_name: str
+    instructions: str
+    tool_names: Tuple[str, ...] = ()
+    mcp_key: Tuple[int, ...] = ()
+    uses: int = field(default=0, compare=False)
+
+
+def mcp_toolset_key(mcp_servers) -> Tuple[int, ...]:
+    """Identity key for a list of MCP toolsets.
+
+    Servers are long-lived objects owned by the MCP manager; a restart or a
+    binding change swaps the object, so identity is the right granularity.
+    """
+    return tuple(id(server) for server in mcp_servers or ())
+
+
+def _stat_signature(path: Optional[str]) -> Tuple[Any, ...]:
+    if not path:
+        return (None,)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _dir_signature(path: Optional[str]) -> Tuple[Any, ...]:
+    """Signature of a directory's direct entries (name, mtime, size)."""
+    if not path:
+        return (None,)
+    try:
+        with os.scandir(path) as it:
+            entries = []
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return (path, None)
+    entries.sort()
+    return (path, tuple(entries))
+
+
+def config_fingerprint() -> Tuple[Any, ...]:
+    """Stat-level fingerprint of every file that feeds a sub-agent build.
+
+    A handful of ``stat`` calls plus two directory scans -- orders of
+    magnitude cheaper than rediscovering agents and rebuilding the model.
+    """
+    files = tuple(
+        _stat_signature(getattr(cp_config, attr, None))
+        for attr in _FINGERPRINT_FILE_ATTRS
+    )
+    project_agents = os.path.join(os.getcwd(), ".code_puppy", "agents")
+    return (
+        files,
+        _dir_signature(getattr(cp_config, "AGENTS_DIR", None)),
+        _dir_signature(project_agents),
+    )
+
+
+class SubagentPool:
+    """Bounded LRU pool of idle :class:`PooledSubagent` entries.
+
+    ``max_size`` bounds the total number of idle entries across all keys;
+    the least recently released entry is evicted first. ``max_size <= 0``
+    disables pooling (``acquire`` always misses, ``release`` drops).
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._idle: "OrderedDict[Hashable, list[PooledSubagent]]" = OrderedDict()
+        self._size = 0
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _clear_locked(self) -> None:
+        self._idle.clear()
+        self._size = 0
+
+    def clear(self) -> None:
+        """Drop every idle entry (in-use entries are dropped on release)."""
+        with self._lock:
+            if self._size:
+                self.invalidations += 1
+            self._clear_locked()
+            self._fingerprint = None
+
+    def _sync_fingerprint_locked(self, fingerprint: Tuple[Any, ...]) -> None:
+        if fingerprint != self._fingerprint:
+            if self._size:
+                self.invalidations += 1
+            self._clear_locked()
+            self._fingerprint = fingerprint
+
+    def acquire(
+        self, key: Hashable, fingerprint: Tuple[Any, ...]
+    ) -> Optional[PooledSubagent]:
+        """Check out an idle entry for ``key`` built under ``fingerprint``."""
+        with self._lock:
+            if self.max_size <= 0:
+                self.misses += 1
+                return None
+            self._sync_fingerprint_locked(fingerprint)
+            bucket = self._idle.get(key)
+            if not bucket:
+                self.misses += 1
+                return None
+            entry = bucket.pop()
+            self._size -= 1
+            if not bucket:
+                del self._idle[key]
+            self.hits += 1
+            entry.uses += 1
+            return entry
+
+    def release(
+        self, key: Hashable, fingerprint: Tuple[Any, ...], entry: PooledSubagent
+    ) -> None:
+        """Return ``entry`` to the pool; evicts LRU entries past ``max_size``.
+
+        Entries built under a fingerprint that is no longer current are
+        dropped instead of pooled.
+        """
+        with self._lock:
+            if self.max_size <= 0:
+                return
+            if self._fingerprint is not None and fingerprint != self._fingerprint:
+                return
+            self._fingerprint = fingerprint
+            self._idle.setdefault(key, []).append(entry)
+            self._idle.move_to_end(key)
+            self._size += 1
+            while self._size > self.max_size:
+                oldest_key, oldest = next(iter(self._idle.items()))
+                oldest.pop(0)
+                self._size -= 1
+                self.evictions += 1
+                if not oldest:
+                    del self._idle[oldest_key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self._size,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_pool: Optional[SubagentPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_subagent_pool() -> SubagentPool:
+    """Return the process-wide pool, resized to the current config value."""
+    global _pool
+    size = cp_config.get_subagent_pool_size()
+    with _pool_lock:
+        if _pool is None:
+            _pool = SubagentPool(size)
+        elif _pool.max_size != size:
+            _pool.max_size = size
+            if size <= 0:
+                _pool.clear()
+        return _pool
+
+
+def invalidate_subagent_pool() -> None:
+    """Drop all pooled sub-agents (model/agent/config changed in-process)."""
+    if _pool is not None:
+        _pool.clear()
@@ -0,0 +1,411 @@
+"""Per-turn latency tracing with local export.
+
+``AgentRunStats`` reports TTFT and generation speed, but not where the rest
+of a turn's wall time goes. When ``enable_turn_trace`` is set (or the
+``CODE_PUPPY_TURN_TRACE`` env var), the interactive loop records every
+:func:`span` opened between :func:`begin_turn` and :func:`end_turn`:
+prompt assembly, history processing and compaction, hook and callback
+phases, tool and MCP calls, stream rendering and autosave.
+
+At the end of a turn the spans are appended to ``turn_trace.jsonl`` and
+written as a Chrome trace-event file (open it in ``chrome://tracing`` or
+https://ui.perfetto.dev), both in ``traces/`` under the state directory,
+and a summary of the largest contributors is printed. Nothing is sent
+anywhere; this is independent of the opt-in Logfire wiring in
+``observability.py``.
+
+Outside a recorded turn :func:`span` returns a shared no-op context
+manager, so instrumented call sites cost one global read.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+# Chrome trace files kept in the trace directory; the JSONL log is append-only.
+MAX_CHROME_TRACES = 50
+# Contributors listed in the end-of-turn summary.
+SUMMARY_TOP = 8
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *_exc: Any) -> bool:
+        return False
+
+    def set(self, **_attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+_current_span: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "code_puppy_turn_trace_span", default=None
+)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """One timed region of a turn; use through :func:`span`."""
+
+    __slots__ = (
+        "turn",
+        "name",
+        "attrs",
+        "span_id",
+        "parent_id",
+        "track",
+        "start",
+        "end",
+        "_token",
+    )
+
+    def __init__(self, turn: "_Turn", name: str, attrs: Dict[str, Any]):
+        self.turn = turn
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(_span_ids)
+        self.parent_id: Optional[int] = None
+        self.track = 0
+        self.start = 0
+        self.end = 0
+
+    def __enter__(self) -> "Span":
+        self.parent_id = _current_span.get()
+        self._token = _current_span.set(self.span_id)
+        self.track = self.turn.track_id()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, _exc: Any, _tb: Any) -> bool:
+        self.end = time.perf_counter_ns()
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from another context (e.g. a generator resumed in a
+            # different task); fall back to restoring the parent directly.
+            _current_span.set(self.parent_id)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.turn.spans.append(self)
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes known only once the span is running."""
+        self.attrs.update(attrs)
+
+
+class _Turn:
+    def __init__(self, index: int, label: str):
+        self.index = index
+        self.label = label
+        self.wall_start = time.time()
+        self.start = time.perf_counter_ns()
+        self.end = 0
+        self.spans: List[Span] = []
+        self._tracks: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def track_id(self) -> int:
+        """Small stable id of the current task (or thread) for trace lanes.
+
+        Chrome trace ``X`` events on one lane must nest, which concurrent
+        asyncio tasks do not, so each task gets its own lane.
+        """
+        try:
+            import asyncio
+
+            key: Any = asyncio.current_task()
+        except RuntimeError:
+            key = None
+        if key is None:
+            key = threading.get_ident()
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is None:
+                track = self._tracks[key] = len(self._tracks) + 1
+            return track
+
+
+_turn: Optional[_Turn] = None
+_turn_counter = itertools.count(1)
+_trace_dir_override: Optional[str] = None
+
+
+def turn_trace_enabled() -> bool:
+    """Return whether the user opted into per-turn tracing.
+
+    The ``CODE_PUPPY_TURN_TRACE`` env var wins over the ``enable_turn_trace``
+    config key, mirroring ``observability.logfire_opted_in``.
+    """
+    env = os.environ.get("CODE_PUPPY_TURN_TRACE", "").strip().lower()
+    if env in _TRUTHY:
+        return True
+    from code_puppy.config import get_enable_turn_trace
+
+    return get_enable_turn_trace()
+
+
+def set_trace_dir(path: Optional[str]) -> None:
+    """Write traces to *path* instead of the state directory (``None`` resets)."""
+    global _trace_dir_override
+    _trace_dir_override = path
+
+
+def get_trace_dir() -> str:
+    if _trace_dir_override:
+        return _trace_dir_override
+    from code_puppy.config import STATE_DIR
+
+    return os.path.join(STATE_DIR, "traces")
+
+
+def span(name: str, **attrs: Any):
+    """Time the enclosed block as part of the current turn.
+
+    ``with span("tool", tool=name) as s: ...``; ``s.set(...)`` adds
+    attributes later. A no-op unless a turn is being recorded.
+    """
+    turn = _turn
+    if turn is None:
+        return _NOOP
+    return Span(turn, name, attrs)
+
+
+def record(name: str, started: float, **attrs: Any) -> None:
+    """Record a region that ran from *started* (``time.perf_counter()``) to now.
+
+    For call sites that already time themselves and would otherwise need
+    re-indenting under ``with span(...)``.
+    """
+    turn = _turn
+    if turn is None:
+        return
+    done = Span(turn, name, attrs)
+    done.parent_id = _current_span.get()
+    done.track = turn.track_id()
+    done.start = int(started * 1e9)
+    done.end = time.perf_counter_ns()
+    turn.spans.append(done)
+
+
+def is_recording() -> bool:
+    return _turn is not None
+
+
+def begin_turn(label: str = "", *, force: bool = False) -> bool:
+    """Start recording a turn if tracing is enabled (or *force*).
+
+    An unfinished previous turn is closed first. Returns whether recording.
+    """
+    global _turn
+    if _turn is not None:
+        end_turn(emit=False)
+    try:
+        if not (force or turn_trace_enabled()):
+            return False
+    except Exception:
+        return False
+    _turn = _Turn(next(_turn_counter), label[:200])
+    return True
+
+
+def end_turn(*, emit: bool = True) -> Optional[Dict[str, Any]]:
+    """Stop recording, export the turn and (optionally) print its summary.
+
+    Returns the summary dict, or ``None`` when no turn was being recorded.
+    """
+    global _turn
+    turn, _turn = _turn, None
+    if turn is None:
+        return None
+    turn.end = time.perf_counter_ns()
+    summary = summarize_turn(turn)
+    try:
+        summary["chrome_trace"] = _export(turn, summary)
+    except Exception as exc:
+        # Tracing is diagnostics; a full disk must not break the REPL.
+        logger.debug("Failed to export turn trace: %s", exc)
+        summary["chrome_trace"] = None
+    if emit:
+        try:
+            from code_puppy.messaging import emit_info
+
+            emit_info(format_turn_summary(summary))
+        except Exception:
+            pass
+    return summary
+
+
+def summarize_turn(turn: _Turn, top: int = SUMMARY_TOP) -> Dict[str, Any]:
+    """Aggregate a turn's spans by name.
+
+    ``self_ms`` subtracts time spent in child spans, so nested spans (a
+    callback phase inside a tool call) are not counted twice; the list is
+    ordered by it.
+    """
+    spans = list(turn.spans)
+    known = {s.span_id for s in spans}
+    child_ns: Dict[int, int] = {}
+    for s in spans:
+        if s.parent_id in known:
+            child_ns[s.parent_id] = child_ns.get(s.parent_id, 0) + (s.end - s.start)
+    stats: Dict[str, List[int]] = {}
+    for s in spans:
+        duration = s.end - s.start
+        entry = stats.setdefault(s.name, [0, 0, 0])
+        entry[0] += 1
+        entry[1] += duration
+        entry[2] += max(0, duration - child_ns.get(s.span_id, 0))
+    wall_ns = max(1, turn.end - turn.start)
+    contributors = [
+        {
+            "name": name,
+            "count": count,
+            "total_ms": total / 1e6,
+            "self_ms": own / 1e6,
+            "share": own / wall_ns,
+        }
+        for name, (count, total, own) in stats.items()
+    ]
+    contributors.sort(key=lambda c: c["self_ms"], reverse=True)
+    return {
+        "turn": turn.index,
+        "label": turn.label,
+        "started_at": turn.wall_start,
+        "wall_ms": wall_ns / 1e6,
+        "spans": len(spans),
+        "top": contributors[:top],
+    }
+
+
+def format_turn_summary(summary: Dict[str, Any]) -> str:
+    from code_puppy.i18n import t
+
+    lines = [
+        t(
+            "trace.summary.header",
+            turn=summary["turn"],
+            wall=f"{summary['wall_ms']:.0f}",
+            spans=summary["spans"],
+        )
+    ]
+    for entry in summary["top"]:
+        lines.append(
+            t(
+                "trace.summary.line",
+                name=entry["name"],
+                self_ms=f"{entry['self_ms']:.1f}",
+                total_ms=f"{entry['total_ms']:.1f}",
+                share=f"{entry['share']:.0%}",
+                count=entry["count"],
+            )
+        )
+    if summary.get("chrome_trace"):
+        lines.append(t("trace.summary.file", path=summary["chrome_trace"]))
+    return "\n".join(lines)
+
+
+def _records(turn: _Turn) -> List[Dict[str, Any]]:
+    return [
+        {
+            "turn": turn.index,
+            "name": s.name,
+            "id": s.span_id,
+            "parent": s.parent_id,
+            "track": s.track,
+            "ts_us": (s.start - turn.start) // 1000,
+            "dur_us": (s.end - s.start) // 1000,
+            "attrs": s.attrs,
+        }
+        for s in sorted(turn.spans, key=lambda s: s.start)
+    ]
+
+
+def chrome_trace_events(turn: _Turn) -> List[Dict[str, Any]]:
+    """Chrome trace-event ``X`` (complete) events, one lane per task."""
+    pid = os.getpid()
+    events: List[Dict[str, Any]] = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": pid,
+            "args": {"name": f"code-puppy turn {turn.index}"},
+        },
+        {
+            "name": "turn",
+            "cat": "turn",
+            "ph": "X",
+            "ts": 0,
+            "dur": (turn.end - turn.start) // 1000,
+            "pid": pid,
+            "tid": 0,
+            "args": {"label": turn.label},
+        },
+    ]
+    for record in _records(turn):
+        events.append(
+            {
+                "name": record["name"],
+                "cat": record["name"].split(".", 1)[0],
+                "ph": "X",
+                "ts": record["ts_us"],
+                "dur": record["dur_us"],
+                "pid": pid,
+                "tid": record["track"],
+                "args": record["attrs"],
+            }
+        )
+    return events
+
+
+def _export(turn: _Turn, summary: Dict[str, Any]) -> str:
+    trace_dir = get_trace_dir()
+    os.makedirs(trace_dir, exist_ok=True)
+    with open(os.path.join(trace_dir, "turn_trace.jsonl"), "a", encoding="utf-8") as f:
+        header = {k: v for k, v in summary.items() if k != "top"}
+        f.write(json.dumps({"name": "turn", **header}, default=str) + "\n")
+        for record in _records(turn):
+            f.write(json.dumps(record, default=str) + "\n")
+
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(turn.wall_start))
+    path = os.path.join(trace_dir, f"turn-{stamp}-{os.getpid()}-{turn.index}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"traceEvents": chrome_trace_events(turn), "displayTimeUnit": "ms"},
+            f,
+            default=str,
+        )
+    _prune(trace_dir)
+    return path
+
+
+def _prune(trace_dir: str) -> None:
+    traces = sorted(
+        (
+            entry
+            for entry in os.scandir(trace_dir)
+            if entry.name.startswith("turn-") and entry.name.endswith(".json")
+        ),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in traces[:-MAX_CHROME_TRACES]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
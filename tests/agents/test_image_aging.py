@@ -0,0 +1,127 @@
+"""Tests for the image-aging history processor (agents/_image_aging.py)."""
+
+import io
+from types import SimpleNamespace
+
+from PIL import Image
+from pydantic_ai.messages import (
+    BinaryContent,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from code_puppy.agents._image_aging import (
+    THUMBNAIL_EDGE,
+    age_history_images,
+    make_image_aging_history_processor,
+)
+
+
+def _png(width=640, height=400, shade=0):
+    buf = io.BytesIO()
+    Image.effect_noise((width, height), 30 + shade).convert("RGB").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _screenshot_session(shots):
+    """prompt, then ``shots`` screenshot tool calls, then a new user prompt."""
+    messages = [ModelRequest(parts=[UserPromptPart(content="test the page")])]
+    for i in range(shots):
+        messages.append(ModelResponse(parts=[ToolCallPart("shot", {}, f"call_{i}")]))
+        messages.append(
+            ModelRequest(
+                parts=[
+                    ToolReturnPart("shot", "captured", f"call_{i}"),
+                    UserPromptPart(
+                        content=[
+                            "Here's the screenshot:",
+                            BinaryContent(data=_png(shade=i), media_type="image/png"),
+                        ]
+                    ),
+                ]
+            )
+        )
+    messages.append(ModelResponse(parts=[TextPart("done")]))
+    messages.append(ModelRequest(parts=[UserPromptPart(content="and now?")]))
+    return messages
+
+
+def _images(message):
+    return [
+        item
+        for part in message.parts
+        if isinstance(part, UserPromptPart) and isinstance(part.content, list)
+        for item in part.content
+        if isinstance(item, BinaryContent)
+    ]
+
+
+async def test_older_images_become_thumbnails_and_pairing_is_kept():
+    messages = _screenshot_session(5)
+    originals = [m.parts[:] for m in messages]
+
+    aged = await age_history_images(messages, keep_recent=2, budget_bytes=0)
+
+    assert len(aged) == len(messages)
+    for old, new in zip(messages, aged):
+        assert [type(p) for p in old.parts] == [type(p) for p in new.parts]
+        assert [getattr(p, "tool_call_id", None) for p in old.parts] == [
+            getattr(p, "tool_call_id", None) for p in new.parts
+        ]
+    shot_requests = [2, 4, 6, 8, 10]
+    for idx in shot_requests[-2:]:
+        assert aged[idx] is messages[idx]
+    for idx in shot_requests[:3]:
+        (thumb,) = _images(aged[idx])
+        assert thumb.media_type == "image/jpeg"
+        with Image.open(io.BytesIO(thumb.data)) as image:
+            assert max(image.size) == THUMBNAIL_EDGE
+        caption = aged[idx].parts[1].content[1]
+        assert caption.startswith("[Earlier image (image/png, 640x400) shown as")
+    assert [m.parts for m in messages] == originals  # inputs untouched
+
+
+async def test_budget_stubs_oldest_and_folds_thumbnail_caption():
+    messages = _screenshot_session(4)
+    thumbed = await age_history_images(messages, keep_recent=1, budget_bytes=0)
+    newest = len(_images(thumbed[8])[0].data)
+
+    aged = await age_history_images(thumbed, keep_recent=1, budget_bytes=newest + 1)
+
+    for idx in (2, 4, 6):
+        assert _images(aged[idx]) == []
+        assert aged[idx].parts[1].content == [
+            "Here's the screenshot:",
+            "[Earlier image (image/png, 640x400) removed to save context]",
+        ]
+    assert _images(aged[8]) == _images(messages[8])
+
+
+async def test_current_request_images_are_never_aged():
+    messages = [
+        ModelRequest(
+            parts=[
+                UserPromptPart(
+                    content=["look", BinaryContent(data=_png(), media_type="image/png")]
+                )
+            ]
+        )
+    ]
+    assert await age_history_images(messages, 0, 1) is messages
+
+
+async def test_processor_mirrors_into_agent_history_and_is_idempotent():
+    messages = _screenshot_session(5)  # default keep_recent is 3
+    agent = SimpleNamespace(_message_history=list(messages))
+    processor = make_image_aging_history_processor(agent)
+
+    aged = await processor(messages)
+
+    assert aged is not messages
+    assert agent._message_history == aged
+    assert all(a is b for a, b in zip(agent._message_history, aged))
+    assert await processor(aged) is aged
@@ -0,0 +1,133 @@
+"""Tests for the AGENTS.md and system-prompt assembly caches in ``_builder``."""
+
+from unittest.mock import patch
+
+import pytest
+
+from code_puppy import model_utils
+from code_puppy.agents import _builder
+from code_puppy.agents._builder import _assemble_instructions, load_puppy_rules
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A project dir as cwd with an empty global config dir."""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    monkeypatch.chdir(project_dir)
+    monkeypatch.setattr(_builder, "CONFIG_DIR", str(config_dir))
+    return project_dir
+
+
+@pytest.fixture
+def reads():
+    with patch.object(
+        _builder, "_read_rules_text", wraps=_builder._read_rules_text
+    ) as spy:
+        yield spy
+
+
+class _Agent:
+    def __init__(self, prompt="You are a puppy.", tools=("read_file",)):
+        self.prompt = prompt
+        self.tools = list(tools)
+
+    def get_full_system_prompt(self):
+        return self.prompt
+
+    def get_identity(self):
+        return "code-puppy-abc123"
+
+    def get_model_name(self):
+        return "gpt-5"
+
+    def get_available_tools(self):
+        return self.tools
+
+
+class TestPuppyRulesCache:
+    def test_unchanged_files_are_read_once(self, project, reads):
+        (project / "AGENTS.md").write_text("be nice")
+        assert load_puppy_rules() == "be nice"
+        assert load_puppy_rules() == "be nice"
+        assert reads.call_count == 1
+
+    def test_edit_create_and_delete_are_noticed(self, project, reads):
+        rules = project / "AGENTS.md"
+        rules.write_text("v1")
+        assert load_puppy_rules() == "v1"
+
+        rules.write_text("version two")
+        assert load_puppy_rules() == "version two"
+
+        (project / ".code_puppy").mkdir()
+        (project / ".code_puppy" / "AGENTS.md").write_text("preferred")
+        assert load_puppy_rules() == "preferred"
+
+        (project / ".code_puppy" / "AGENTS.md").unlink()
+        rules.unlink()
+        assert load_puppy_rules() is None
+        assert reads.call_count == 3
+
+    def test_cap_change_retruncates(self, project):
+        (project / "AGENTS.md").write_text("x" * 50)
+        with patch.object(_builder, "get_agents_md_max_chars", return_value=100):
+            assert load_puppy_rules() == "x" * 50
+        with patch.object(_builder, "get_agents_md_max_chars", return_value=10):
+            assert "AGENTS.md truncated" in load_puppy_rules()
+
+    def test_changing_directory_switches_projects(self, project, monkeypatch):
+        (project / "AGENTS.md").write_text("first")
+        other = project.parent / "other"
+        other.mkdir()
+        (other / "AGENTS.md").write_text("second")
+        assert load_puppy_rules() == "first"
+        monkeypatch.chdir(other)
+        assert load_puppy_rules() == "second"
+
+
+class TestAssembleInstructionsCache:
+    @pytest.fixture(autouse=True)
+    def _prepare(self):
+        with patch.object(
+            model_utils,
+            "prepare_prompt_for_model",
+            wraps=model_utils.prepare_prompt_for_model,
+        ) as spy:
+            self.prepare = spy
+            yield
+
+    def test_repeated_builds_return_identical_string(self, project, reads):
+        (project / "AGENTS.md").write_text("house rules")
+        agent = _Agent()
+        first = _assemble_instructions(agent, "gpt-5")
+        second = _assemble_instructions(agent, "gpt-5")
+        assert first is second
+        assert first.startswith("You are a puppy.\nhouse rules")
+        assert self.prepare.call_count == 1
+        assert reads.call_count == 1
+
+    def test_inputs_that_change_the_prompt_miss(self, project):
+        rules = project / "AGENTS.md"
+        rules.write_text("house rules")
+        agent = _Agent()
+        _assemble_instructions(agent, "gpt-5")
+
+        agent.prompt = "You are a puppy. It is now later."
+        assert "later" in _assemble_instructions(agent, "gpt-5")
+
+        rules.write_text("stricter house rules")
+        assert "stricter" in _assemble_instructions(agent, "gpt-5")
+
+        agent.tools = ["read_file", "agent_run_shell_command"]
+        _assemble_instructions(agent, "gpt-5")
+        assert "Shell Safety" in _assemble_instructions(agent, "gpt-5.6")
+        assert self.prepare.call_count == 5
+
+    def test_cache_is_bounded(self, project, monkeypatch):
+        monkeypatch.setattr(_builder, "PROMPT_CACHE_MAX_ENTRIES", 3)
+        for i in range(5):
+            _assemble_instructions(_Agent(prompt=f"prompt {i}"), "gpt-5")
+        assert len(_builder._prompt_cache) == 3
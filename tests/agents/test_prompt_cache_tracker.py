@@ -0,0 +1,222 @@
+"""Tests for the prompt-cache tracker and prefix-stability detector."""
+
+import pytest
+from pydantic_ai import Agent as PydanticAgent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from pydantic_ai.usage import RequestUsage
+
+from code_puppy.agents import _prompt_cache
+from code_puppy.agents._prompt_cache import (
+    PrefixFingerprint,
+    build_prompt_cache_tracker,
+    format_prompt_cache_report,
+    get_prompt_cache_tracker,
+    prefix_changes,
+)
+
+BASE = PrefixFingerprint(
+    model="m",
+    system_prompt="sp",
+    tools=(("read", "r1"), ("write", "w1")),
+    messages=("a", "b"),
+)
+
+
+def _with(**changes) -> PrefixFingerprint:
+    fields = dict(
+        model=BASE.model,
+        system_prompt=BASE.system_prompt,
+        tools=BASE.tools,
+        messages=BASE.messages,
+    )
+    fields.update(changes)
+    return PrefixFingerprint(**fields)
+
+
+def test_appending_messages_is_not_a_break():
+    assert prefix_changes(BASE, _with(messages=("a", "b", "c", "d"))) == []
+
+
+@pytest.mark.parametrize(
+    "current, expected",
+    [
+        (_with(model="other"), "model: m -> other"),
+        (_with(system_prompt="sp2"), "system_prompt:"),
+        (_with(tools=(("write", "w1"), ("read", "r1"))), "tool_order:"),
+        (_with(tools=(("read", "r1"), ("grep", "g1"))), "tool_set: +grep, -write"),
+        (_with(tools=(("read", "r1"), ("write", "w2"))), "tool_definitions: write"),
+        (_with(messages=("b",)), "history_compacted: message 0 of 2"),
+        (_with(messages=("a", "x", "c")), "history_rewritten: message 1 of 2"),
+    ],
+)
+def test_each_segment_is_named(current, expected):
+    changes = prefix_changes(BASE, current)
+    assert len(changes) == 1
+    assert changes[0].startswith(expected)
+
+
+def _agent(usages, tools=("alpha",), instructions="be nice", per_session=False):
+    calls = iter(usages)
+
+    def model_func(messages, info):
+        read, write = next(calls)
+        return ModelResponse(
+            parts=[TextPart("ok")],
+            usage=RequestUsage(
+                input_tokens=1000, cache_read_tokens=read, cache_write_tokens=write
+            ),
+        )
+
+    agent = PydanticAgent(
+        model=FunctionModel(model_func),
+        instructions=instructions,
+        capabilities=[build_prompt_cache_tracker("pup", per_session=per_session)],
+    )
+    for name in tools:
+
+        def tool() -> str:
+            return "x"
+
+        tool.__name__ = name
+        agent.tool_plain(tool)
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_records_usage_and_stable_prefix():
+    agent = _agent([(0, 900), (900, 50)])
+    first = await agent.run("hello")
+    await agent.run("again", message_history=first.all_messages())
+
+    tracker = get_prompt_cache_tracker()
+    assert [r.changes for r in tracker.records] == [[], []]
+    stats = tracker.report()["agents"]["pup"]
+    assert stats["requests"] == 2
+    assert stats["cache_read_tokens"] == 900
+    assert stats["cache_write_tokens"] == 950
+    assert stats["hit_ratio"] == pytest.approx(0.45)
+    assert stats["prefix_breaks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tool_change_between_runs_is_reported():
+    first = await _agent([(0, 900)], tools=("alpha", "beta")).run("hello")
+    await _agent([(0, 900)], tools=("beta", "alpha")).run(
+        "again", message_history=first.all_messages()
+    )
+
+    breaks = get_prompt_cache_tracker().report()["breaks"]
+    assert len(breaks) == 1
+    assert breaks[0]["changes"][0].startswith("tool_order:")
+
+
+@pytest.mark.asyncio
+async def test_warm_prefix_without_reads_is_expired():
+    agent = _agent([(0, 900), (0, 900)])
+    first = await agent.run("hello")
+    await agent.run("again", message_history=first.all_messages())
+
+    changes = get_prompt_cache_tracker().records[-1].changes
+    assert changes == ["cache_expired: prefix unchanged but nothing was read"]
+
+
+@pytest.mark.asyncio
+async def test_report_text_and_reset():
+    assert "No model requests" in format_prompt_cache_report()
+    await _agent([(0, 0)]).run("hello")
+    assert "pup: 1 requests" in format_prompt_cache_report()
+
+    _prompt_cache.reset_prompt_cache_tracker()
+    assert get_prompt_cache_tracker().report() == {"agents": {}, "breaks": []}
+
+
+@pytest.mark.asyncio
+async def test_sub_agent_sessions_keep_separate_prefix_chains():
+    from code_puppy.messaging.bus import set_session_context
+
+    agent = _agent([(0, 900)] * 2 + [(900, 0)] * 2, per_session=True)
+    histories = {}
+    try:
+        for session, prompt in (("s1", "one"), ("s2", "two")):
+            set_session_context(session)
+            histories[session] = (await agent.run(prompt)).all_messages()
+        for session in ("s1", "s2"):
+            set_session_context(session)
+            await agent.run("more", message_history=histories[session])
+    finally:
+        set_session_context(None)
+
+    stats = get_prompt_cache_tracker().report()["agents"]["pup"]
+    assert stats["requests"] == 4
+    assert stats["prefix_breaks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sub_agents_are_tracked():
+    from unittest.mock import MagicMock, patch
+
+    from pydantic_ai.models.function import AgentInfo
+
+    from code_puppy.tools.subagent_invocation import _build_subagent_agent
+
+    def model_func(messages, info: AgentInfo):
+        return ModelResponse(
+            parts=[TextPart("ok")],
+            usage=RequestUsage(input_tokens=1000, cache_write_tokens=900),
+        )
+
+    async def passthrough(messages):
+        return messages
+
+    agent_config = MagicMock()
+    agent_config.get_available_tools.return_value = []
+    with (
+        patch(
+            "code_puppy.agents._compaction.make_history_processor",
+            return_value=passthrough,
+        ),
+        patch(
+            "code_puppy.tools.subagent_invocation.on_wrap_pydantic_agent",
+            side_effect=lambda _config, agent, **_kw: agent,
+        ),
+    ):
+        agent, _tools = _build_subagent_agent(
+            agent_config=agent_config,
+            agent_name="reviewer",
+            model=FunctionModel(model_func),
+            effective_model_name="model-a",
+            instructions="review",
+            mcp_servers=[],
+            group_id="g",
+        )
+        await agent.run("look")
+
+    assert get_prompt_cache_tracker().report()["agents"]["reviewer"]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_chains_are_bounded_weak_and_forgotten(monkeypatch):
+    import gc
+    import weakref
+
+    from code_puppy.messaging.bus import set_session_context
+
+    tracker = get_prompt_cache_tracker()
+    monkeypatch.setattr(tracker, "max_chains", 2)
+    agent = _agent([(0, 900)] * 3, per_session=True)
+    try:
+        for session in ("s1", "s2", "s3"):
+            set_session_context(session)
+            history = (await agent.run(session)).all_messages()
+    finally:
+        set_session_context(None)
+
+    assert list(tracker._last) == ["pup@s2", "pup@s3"]
+    probe = weakref.ref(history[0])
+    del history
+    gc.collect()
+    assert probe() is None
+
+    _prompt_cache.forget_prompt_cache_session("pup", "s3")
+    assert list(tracker._last) == ["pup@s2"]
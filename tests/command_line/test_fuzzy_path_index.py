@@ -0,0 +1,111 @@
+"""Tests for the precomputed fuzzy @-completion index (fuzzy_path_index.py)."""
+
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+
+from code_puppy.command_line import file_index
+from code_puppy.command_line.file_path_completion import (
+    _fuzzy_completions,
+    _score,
+)
+from code_puppy.command_line.fuzzy_path_index import FuzzyPathIndex
+
+PATHS = [
+    "src/app/main.py",
+    "src/app/Main.py",
+    "src/app/helpers/main_utils.py",
+    "src/mainframe/config.yaml",
+    "docs/MAIN.md",
+    "tests/test_main.py",
+    "tests/unit/test_domain.py",
+    "README.md",
+    "src/app/__init__.py",
+    "tools/ab/abc/abcd.txt",
+    "tools/xyz.txt",
+]
+
+
+def _build(paths):
+    lowered = tuple(p.lower() for p in paths)
+    basenames = tuple(os.path.basename(p).lower() for p in paths)
+    return FuzzyPathIndex(tuple(paths), lowered, basenames), lowered, basenames
+
+
+def _reference(paths, lowered, basenames, query, limit):
+    scored = []
+    for i, path in enumerate(paths):
+        s = _score(basenames[i], lowered[i], query)
+        if s > 0:
+            scored.append((-s, path))
+    scored.sort()
+    return [(-neg, path) for neg, path in scored[:limit]]
+
+
+def _named(paths, results):
+    return [(score, paths[i]) for score, i in results]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "m", "ma", "main", "main.py", "app", "test_", "abc", "abcd", "/", ".md", "zz"],
+)
+@pytest.mark.parametrize("limit", [1, 3, 20])
+def test_matches_linear_scan(query, limit):
+    index, lowered, basenames = _build(PATHS)
+    assert _named(PATHS, index.search(query, limit)) == _reference(
+        PATHS, lowered, basenames, query, limit
+    )
+
+
+def test_matches_linear_scan_on_random_tree():
+    rng = random.Random(7)
+    words = ["core", "util", "test", "main", "io", "net", "db", "api", "ui", "x"]
+    paths = sorted(
+        {
+            "/".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+            + rng.choice(["", "_", "-"])
+            + rng.choice(words)
+            + rng.choice([".py", ".md", ".ts", ""])
+            for _ in range(3000)
+        }
+    )
+    rng.shuffle(paths)
+    index, lowered, basenames = _build(paths)
+    for query in ["c", "co", "cor", "core", "core_u", "i/", "test.py", "api-", "q"]:
+        assert _named(paths, index.search(query, 20)) == _reference(
+            paths, lowered, basenames, query, 20
+        ), query
+
+
+def test_incremental_typing_narrows_exhaustive_results():
+    index, lowered, basenames = _build(PATHS)
+    first = index.search("ab", 20)
+    assert len(first) < 20  # exhaustive, so "abc" can narrow it
+
+    index._rank_query = None  # any real index work would now blow up
+    assert _named(PATHS, index.search("abc", 20)) == _reference(
+        PATHS, lowered, basenames, "abc", 20
+    )
+    assert _named(PATHS, index.search("abcd", 20)) == _reference(
+        PATHS, lowered, basenames, "abcd", 20
+    )
+
+
+def test_newline_in_query_matches_nothing():
+    index, _lowered, _basenames = _build(PATHS)
+    assert index.search("main\nsrc", 20) == []
+
+
+def test_published_index_carries_search_structures(tmp_path):
+    snap = file_index._make_index(str(tmp_path), PATHS)
+    assert snap.search is not None
+    with (
+        patch.object(file_index, "get_index", return_value=snap),
+        patch("code_puppy.command_line.file_path_completion._ensure_index_for_cwd"),
+    ):
+        completions = _fuzzy_completions("main", 0)
+    expected = _reference(PATHS, snap.lowered, snap.basenames_lower, "main", 20)
+    assert [c.text for c in completions] == [path for _score, path in expected]
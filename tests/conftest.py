@@ -30,7 +30,13 @@ for _xdg_name in _XDG_ENV_VARS:
 
 from code_puppy import config as cp_config  # noqa: E402
 from code_puppy import callbacks as cp_callbacks  # noqa: E402
+from code_puppy.agents import _builder as cp_builder  # noqa: E402
+from code_puppy.agents import _prompt_cache as cp_prompt_cache  # noqa: E402
+from code_puppy.mcp_ import http_pool as cp_mcp_http_pool  # noqa: E402
+from code_puppy.mcp_ import mcp_logs as cp_mcp_logs  # noqa: E402
 from code_puppy.messaging import bottom_bar as cp_bottom_bar  # noqa: E402
+from code_puppy.tools import grep_cache as cp_grep_cache  # noqa: E402
+from code_puppy.tools import subagent_pool as cp_subagent_pool  # noqa: E402
 
 
 def pytest_unconfigure(config):
@@ -130,6 +136,7 @@ def isolate_global_state_between_tests(tmp_path_factory):
     # beside the registry; restoring one without the other would hand the
     # next test callbacks whose security policy silently went missing.
     original_fail_closed = set(cp_callbacks._fail_closed_callbacks)
+    original_concurrent = set(cp_callbacks._concurrent_callbacks)
 
     # Create a completely separate temp directory for config isolation
     # (not using tmp_path which tests may use for their own purposes).
@@ -152,6 +159,14 @@ def isolate_global_state_between_tests(tmp_path_factory):
     cp_config.clear_model_cache()
     # Clear session-local model cache (required for /model session sticky behavior).
     cp_config.reset_session_model()
+    # Warm sub-agent instances must never leak mocks across tests.
+    cp_subagent_pool.invalidate_subagent_pool()
+    cp_grep_cache.invalidate_grep_cache()
+    cp_builder.invalidate_prompt_cache()
+    cp_prompt_cache.reset_prompt_cache_tracker()
+    cp_mcp_http_pool.reset_mcp_http_pool()
+    # Buffered MCP log writers hold the previous test's log paths.
+    cp_mcp_logs.close_log_writers()
 
     yield
 
@@ -166,6 +181,10 @@ def isolate_global_state_between_tests(tmp_path_factory):
     cp_callbacks._callbacks.update(original_callbacks)
     cp_callbacks._fail_closed_callbacks.clear()
     cp_callbacks._fail_closed_callbacks.update(original_fail_closed)
+    cp_callbacks._concurrent_callbacks.clear()
+    cp_callbacks._concurrent_callbacks.update(original_concurrent)
+    cp_callbacks._phase_timeouts.clear()
+    cp_callbacks.reset_callback_timings()
     _ensure_builtin_plugin_callback_registrations()
 
     # Clear cache again after test.
@@ -7,10 +7,11 @@ and timeout/error scenarios for the MCPToolset-based stdio server.
 
 import asyncio
 import os
-import tempfile
+import subprocess
+import sys
+import threading
 import uuid
-from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, call, patch
 
 import pytest
 from pydantic_ai.mcp import MCPToolset
@@ -18,16 +19,33 @@ from pydantic_ai.mcp import MCPToolset
 from code_puppy.mcp_.blocking_startup import (
     BlockingStdioToolset,
     StartupMonitor,
-    StderrFileCapture,
+    StderrPipeCapture,
 )
 
+LOG_PATCHES = (
+    "code_puppy.mcp_.blocking_startup.rotate_log_if_needed",
+    "code_puppy.mcp_.blocking_startup.get_log_file_path",
+    "code_puppy.mcp_.blocking_startup.write_log",
+)
+
+
+@pytest.fixture
+def log_calls():
+    """Patch the log helpers; yields the mocked ``write_log``."""
+    with (
+        patch(LOG_PATCHES[0]),
+        patch(LOG_PATCHES[1], return_value="/tmp/test-server.log"),
+        patch(LOG_PATCHES[2]) as mock_write_log,
+    ):
+        yield mock_write_log
 
-class TestStderrFileCapture:
-    """Test StderrFileCapture for logging server stderr."""
+
+class TestStderrPipeCapture:
+    """Test StderrPipeCapture for logging server stderr."""
 
     def test_initialization(self):
-        """Test StderrFileCapture initialization."""
-        capture = StderrFileCapture("test-server")
+        """Test StderrPipeCapture initialization."""
+        capture = StderrPipeCapture("test-server")
         assert capture.server_name == "test-server"
         assert capture.emit_to_user is False
         assert capture.message_group is not None
@@ -37,7 +55,7 @@ class TestStderrFileCapture:
     def test_initialization_with_custom_params(self):
         """Test initialization with custom parameters."""
         msg_group = uuid.uuid4()
-        capture = StderrFileCapture(
+        capture = StderrPipeCapture(
             "my-server",
             emit_to_user=True,
             message_group=msg_group,
@@ -48,12 +66,12 @@ class TestStderrFileCapture:
 
     def test_get_captured_lines_empty(self):
         """Test getting captured lines when none exist."""
-        capture = StderrFileCapture("test-server")
+        capture = StderrPipeCapture("test-server")
         assert capture.get_captured_lines() == []
 
     def test_get_captured_lines_returns_copy(self):
         """Test that get_captured_lines returns a copy."""
-        capture = StderrFileCapture("test-server")
+        capture = StderrPipeCapture("test-server")
         capture.captured_lines.extend(["line1", "line2"])
         lines = capture.get_captured_lines()
         assert lines == ["line1", "line2"]
@@ -62,107 +80,93 @@ class TestStderrFileCapture:
 
     def test_stop_without_start(self):
         """Test stopping without starting doesn't error."""
-        capture = StderrFileCapture("test-server")
+        capture = StderrPipeCapture("test-server")
         capture.stop()  # Should not raise
         assert capture.log_path is None
 
-    @patch("code_puppy.mcp_.blocking_startup.rotate_log_if_needed")
-    @patch("code_puppy.mcp_.blocking_startup.get_log_file_path")
-    @patch("code_puppy.mcp_.blocking_startup.write_log")
-    def test_start_returns_log_path(self, mock_write_log, mock_get_path, mock_rotate):
-        """Test that start rotates the log and returns its path."""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            temp_path = tmp.name
-
+    def test_start_returns_pipe_writer(self, log_calls):
+        """start() rotates the log and hands back a writable pipe end."""
+        capture = StderrPipeCapture("test-server")
+        writer = capture.start()
         try:
-            mock_get_path.return_value = temp_path
-            capture = StderrFileCapture("test-server")
-            log_path = capture.start()
-
-            assert log_path == Path(temp_path)
-            assert capture.log_path == temp_path
-            mock_rotate.assert_called_once_with("test-server")
-
-            capture.stop()
+            assert capture.log_path == "/tmp/test-server.log"
+            assert writer.fileno() >= 0
+            log_calls.assert_called_once_with(
+                "test-server", "--- Server starting ---", "INFO"
+            )
         finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-
-    @patch("code_puppy.mcp_.blocking_startup.rotate_log_if_needed")
-    @patch("code_puppy.mcp_.blocking_startup.get_log_file_path")
-    @patch("code_puppy.mcp_.blocking_startup.write_log")
-    def test_start_and_stop_cycle(self, mock_write_log, mock_get_path, mock_rotate):
-        """Test complete start and stop cycle writes both markers."""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            temp_path = tmp.name
-
-        try:
-            mock_get_path.return_value = temp_path
-            capture = StderrFileCapture("test-server")
-            capture.start()
+            capture.stop()
+        assert writer.closed
+        assert log_calls.call_args[0][1] == "--- Server stopped ---"
+
+    def test_lines_reach_buffer_and_log(self, log_calls):
+        """Written lines are split, logged as STDERR and buffered."""
+        capture = StderrPipeCapture("test-server")
+        writer = capture.start()
+        writer.write("boom from server\nsecond ")
+        writer.flush()
+        writer.write("half\r\n\nno newline at exit")
+        capture.stop()
+
+        assert capture.get_captured_lines() == [
+            "boom from server",
+            "second half",
+            "no newline at exit",
+        ]
+        assert call("test-server", "second half", "STDERR") in log_calls.call_args_list
+
+    def test_repeated_lines_are_kept_and_echoed(self, log_calls):
+        """A server repeating an error shows it every time it is written."""
+        capture = StderrPipeCapture("test-server", emit_to_user=True)
+        with patch("code_puppy.mcp_.blocking_startup.emit_info") as mock_emit:
+            writer = capture.start()
+            writer.write("retrying\nother\nretrying\n")
             capture.stop()
 
-            assert mock_write_log.call_count >= 2  # Start and stop markers
-        finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-
-    @patch("code_puppy.mcp_.blocking_startup.rotate_log_if_needed")
-    @patch("code_puppy.mcp_.blocking_startup.get_log_file_path")
-    @patch("code_puppy.mcp_.blocking_startup.write_log")
-    def test_monitor_thread_stops_cleanly(
-        self, mock_write_log, mock_get_path, mock_rotate
-    ):
-        """Test that monitor thread stops cleanly on stop()."""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            temp_path = tmp.name
-
-        try:
-            mock_get_path.return_value = temp_path
-            capture = StderrFileCapture("test-server")
+        assert capture.get_captured_lines() == ["retrying", "other", "retrying"]
+        assert mock_emit.call_count == 3
+        stderr_lines = [
+            c[0][1] for c in log_calls.call_args_list if c[0][2] == "STDERR"
+        ]
+        assert stderr_lines.count("retrying") == 2
+
+    def test_subprocess_stderr_is_captured(self, log_calls):
+        """A real child writing to the pipe is captured until it exits."""
+        capture = StderrPipeCapture("test-server")
+        writer = capture.start()
+        proc = subprocess.Popen(
+            [sys.executable, "-c", "import sys; sys.stderr.write('child says hi\\n')"],
+            stderr=writer,
+        )
+        capture.release_writer()
+        proc.wait(timeout=10)
+        assert capture._finished.wait(2)  # EOF once the child exits
+        capture.stop()
+        assert capture.get_captured_lines() == ["child says hi"]
+
+    def test_captures_share_one_pump_thread(self, log_calls):
+        """Every server's pipe is read by the same selector thread."""
+        before = {t.name for t in threading.enumerate()}
+        captures = [StderrPipeCapture(f"server-{i}") for i in range(3)]
+        for capture in captures:
             capture.start()
-
-            monitor_thread = capture.monitor_thread
-            assert monitor_thread is not None
-            assert monitor_thread.is_alive()
-
+        pumps = [t for t in threading.enumerate() if t.name == "mcp-stderr-pump"]
+        assert len(pumps) == 1
+        assert len({t.name for t in threading.enumerate()} - before) <= 1
+        for capture in captures:
             capture.stop()
 
-            monitor_thread.join(timeout=2)
-            assert not monitor_thread.is_alive()
-        finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-
-    @patch("code_puppy.mcp_.blocking_startup.rotate_log_if_needed")
-    @patch("code_puppy.mcp_.blocking_startup.get_log_file_path")
-    @patch("code_puppy.mcp_.blocking_startup.write_log")
-    def test_tail_picks_up_new_lines(self, mock_write_log, mock_get_path, mock_rotate):
-        """Lines appended after start() land in captured_lines."""
-        with tempfile.NamedTemporaryFile(delete=False, mode="w", suffix=".log") as tmp:
-            temp_path = tmp.name
-
+    def test_stop_detaches_pipe_still_held_open(self, log_calls):
+        """A write end kept open elsewhere cannot hang stop()."""
+        capture = StderrPipeCapture("test-server")
+        writer = capture.start()
+        held = os.dup(writer.fileno())
         try:
-            mock_get_path.return_value = temp_path
-            capture = StderrFileCapture("test-server")
-            capture.start()
-
-            with open(temp_path, "a", encoding="utf-8") as f:
-                f.write("boom from server\n")
-
-            deadline = 2.0
-            import time
-
-            waited = 0.0
-            while waited < deadline and not capture.captured_lines:
-                time.sleep(0.05)
-                waited += 0.05
-
-            capture.stop()
-            assert "boom from server" in capture.get_captured_lines()
+            with patch("code_puppy.mcp_.blocking_startup.STOP_DRAIN_SECONDS", 0.1):
+                capture.stop()
+            assert capture._finished.is_set()
         finally:
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+            os.close(held)
 
 
 def _toolset(command="echo", **kwargs) -> BlockingStdioToolset:
@@ -264,14 +268,17 @@ class TestBlockingStdioToolset:
             patch.object(
                 BlockingStdioToolset, "is_running", new=property(lambda self: False)
             ),
-            patch("code_puppy.mcp_.blocking_startup.StderrFileCapture") as cap_cls,
+            patch("code_puppy.mcp_.blocking_startup.StderrPipeCapture") as cap_cls,
         ):
             mock.return_value = server
             result = await server.__aenter__()
 
             assert result is server
             assert server.is_ready()
-            cap_cls.return_value.start.assert_called_once()
+            capture = cap_cls.return_value
+            capture.start.assert_called_once()
+            assert server._transport.log_file is capture.start.return_value
+            capture.release_writer.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_aenter_with_exception(self):
@@ -284,7 +291,7 @@ class TestBlockingStdioToolset:
             patch.object(
                 BlockingStdioToolset, "is_running", new=property(lambda self: False)
             ),
-            patch("code_puppy.mcp_.blocking_startup.StderrFileCapture"),
+            patch("code_puppy.mcp_.blocking_startup.StderrPipeCapture"),
             patch("code_puppy.mcp_.blocking_startup.emit_info") as mock_emit,
         ):
             mock.side_effect = test_error
@@ -310,7 +317,7 @@ class TestBlockingStdioToolset:
             patch.object(
                 BlockingStdioToolset, "is_running", new=property(lambda self: False)
             ),
-            patch("code_puppy.mcp_.blocking_startup.StderrFileCapture"),
+            patch("code_puppy.mcp_.blocking_startup.StderrPipeCapture"),
             patch("code_puppy.mcp_.blocking_startup.emit_info"),
         ):
             mock.side_effect = group
@@ -12,7 +12,7 @@ Tests health monitoring system including:
 
 import asyncio
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
@@ -22,7 +22,9 @@ from code_puppy.mcp_.health_monitor import (
     HealthMonitor,
     HealthStatus,
 )
-from code_puppy.mcp_.managed_server import ManagedMCPServer
+from code_puppy.mcp_.managed_server import ManagedMCPServer, ToolCallSignal
+
+PROBE_CLIENT = "code_puppy.mcp_.health_monitor.httpx.AsyncClient"
 
 
 @pytest.fixture
@@ -41,6 +43,9 @@ def mock_server():
     server.disable = Mock()
     server.quarantine = Mock()
     server.get_pydantic_server = Mock()
+    # No open session and no tool calls unless a test says otherwise.
+    server.ping = AsyncMock(return_value=None)
+    server.last_tool_call.return_value = None
     return server
 
 
@@ -443,10 +448,8 @@ class TestHealthMonitor:
         mock_response = Mock()
         mock_response.status_code = 200
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.return_value = (
-                mock_response
-            )
+        with patch(PROBE_CLIENT) as mock_client:
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             result = await health_monitor._check_sse_health(sse_server)
 
@@ -459,10 +462,8 @@ class TestHealthMonitor:
         mock_response.status_code = 500
         mock_response.reason_phrase = "Internal Server Error"
 
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.return_value = (
-                mock_response
-            )
+        with patch(PROBE_CLIENT) as mock_client:
+            mock_client.return_value.get = AsyncMock(return_value=mock_response)
 
             result = await health_monitor._check_sse_health(sse_server)
 
@@ -480,9 +481,9 @@ class TestHealthMonitor:
 
     async def test_sse_health_check_exception(self, health_monitor, sse_server):
         """Test SSE health check with exception."""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = (
-                httpx.RequestError("Connection error")
+        with patch(PROBE_CLIENT) as mock_client:
+            mock_client.return_value.get = AsyncMock(
+                side_effect=httpx.RequestError("Connection error")
             )
 
             result = await health_monitor._check_sse_health(sse_server)
@@ -502,9 +503,11 @@ class TestHealthMonitor:
         mock_base_response = Mock()
         mock_base_response.status_code = 200
 
-        with patch("httpx.AsyncClient") as mock_client:
-            client_instance = mock_client.return_value.__aenter__.return_value
-            client_instance.get.side_effect = [mock_health_response, mock_base_response]
+        with patch(PROBE_CLIENT) as mock_client:
+            client_instance = mock_client.return_value
+            client_instance.get = AsyncMock(
+                side_effect=[mock_health_response, mock_base_response]
+            )
 
             result = await health_monitor._check_sse_health(sse_server)
 
@@ -685,6 +688,106 @@ class TestHealthMonitor:
         assert server_id not in health_monitor.monitoring_tasks
 
 
+class TestSessionPingAndAdaptiveIntervals:
+    """MCP ping probes, passive tool-call signals and interval adaptation."""
+
+    async def test_stdio_ping_reports_round_trip(self, health_monitor, stdio_server):
+        stdio_server.ping.return_value = 12.5
+
+        with patch("shutil.which") as mock_which:
+            result = await health_monitor.perform_health_check(stdio_server)
+
+        assert result.success is True
+        assert result.latency_ms == 12.5
+        stdio_server.ping.assert_awaited_once_with(health_monitor.ping_timeout)
+        mock_which.assert_not_called()
+
+    async def test_hung_stdio_server_fails_ping(self, health_monitor, stdio_server):
+        stdio_server.ping.side_effect = asyncio.TimeoutError()
+
+        result = await health_monitor._check_stdio_health(stdio_server)
+
+        assert result.success is False
+        assert "timed out" in result.error
+
+    async def test_sse_ping_skips_http_probe(self, health_monitor, sse_server):
+        sse_server.ping.return_value = 3.0
+
+        with patch(PROBE_CLIENT) as mock_client:
+            result = await health_monitor._check_sse_health(sse_server)
+
+        assert result.success is True
+        mock_client.assert_not_called()
+
+    async def test_probe_client_is_reused(self, health_monitor, sse_server):
+        response = Mock(status_code=200)
+        with patch(PROBE_CLIENT) as mock_client:
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.get = AsyncMock(return_value=response)
+            mock_client.return_value.aclose = AsyncMock()
+            await health_monitor._check_sse_health(sse_server)
+            await health_monitor._check_sse_health(sse_server)
+            await health_monitor.shutdown()
+
+        mock_client.assert_called_once_with(timeout=health_monitor.ping_timeout)
+        mock_client.return_value.aclose.assert_awaited_once()
+
+    def test_successful_tool_call_replaces_probe_once(
+        self, health_monitor, mock_server
+    ):
+        mock_server.last_tool_call.return_value = ToolCallSignal(
+            at=100.0, success=True, latency_ms=40.0
+        )
+
+        status = health_monitor._passive_health_status("s", mock_server)
+        assert status.is_healthy is True
+        assert status.check_type == "passive"
+        assert status.latency_ms == 40.0
+        # Already consumed: the next check must probe.
+        assert health_monitor._passive_health_status("s", mock_server) is None
+
+    def test_failed_tool_call_forces_probe(self, health_monitor, mock_server):
+        mock_server.last_tool_call.return_value = ToolCallSignal(
+            at=100.0, success=False, latency_ms=40.0, error="closed"
+        )
+        assert health_monitor._passive_health_status("s", mock_server) is None
+
+    def test_interval_backs_off_while_idle_and_tightens_on_failure(self):
+        monitor = HealthMonitor(check_interval=30)
+
+        for expected in (60, 120, 240, 240):
+            monitor._adapt_check_interval("s", healthy=True, active=False)
+            assert monitor.get_check_interval("s") == expected
+
+        monitor._adapt_check_interval("s", healthy=True, active=True)
+        assert monitor.get_check_interval("s") == 30
+
+        for failures, expected in ((1, 15), (2, 7.5), (3, 5.0)):
+            monitor.consecutive_failures["s"] = failures
+            monitor._adapt_check_interval("s", healthy=False, active=False)
+            assert monitor.get_check_interval("s") == expected
+
+    async def test_loop_uses_passive_signal_instead_of_probe(
+        self, health_monitor, mock_server
+    ):
+        mock_server.last_tool_call.return_value = ToolCallSignal(
+            at=1.0, success=True, latency_ms=8.0
+        )
+        health_monitor.check_interval = 0.1
+        health_monitor.perform_health_check = AsyncMock(
+            return_value=HealthCheckResult(success=True, latency_ms=1.0, error=None)
+        )
+
+        task = asyncio.create_task(health_monitor._monitoring_loop("s", mock_server))
+        await asyncio.sleep(0.15)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        history = health_monitor.health_history["s"]
+        assert [status.check_type for status in history] == ["passive"]
+        health_monitor.perform_health_check.assert_not_called()
+
+
 class TestHealthStatus:
     """Test the HealthStatus dataclass."""
 
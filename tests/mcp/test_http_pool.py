@@ -0,0 +1,193 @@
+"""Tests for the shared MCP HTTP connection pool (http_pool.py)."""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from code_puppy.mcp_ import http_pool
+from code_puppy.mcp_.http_pool import MCPHttpPool, get_mcp_http_pool
+
+POOL_SIZE = "code_puppy.config.get_mcp_http_pool_max_connections"
+
+
+async def _keepalive_server():
+    """Tiny HTTP/1.1 server echoing the Authorization header; counts sockets."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                auth = b""
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"authorization:"):
+                        auth = line.split(b":", 1)[1].strip()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s"
+                    % (len(auth), auth)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}/mcp", connections
+
+
+@pytest.mark.asyncio
+async def test_sessions_reuse_connections_with_their_own_headers():
+    server, url, connections = await _keepalive_server()
+    pool = MCPHttpPool(max_connections=4)
+    try:
+        for token in ("alpha", "beta", "alpha"):
+            factory = pool.client_factory(url, headers={"Authorization": token})
+            # fastmcp / mcp close the client when a session ends.
+            async with factory() as client:
+                response = await client.get(url)
+                assert response.text == token
+        assert len(connections) == 1
+        assert pool.stats()["transports"] == 1
+        assert pool.stats()["reused"] == 2
+    finally:
+        await pool.aclose()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_connect_time_headers_override_server_headers():
+    server, url, _connections = await _keepalive_server()
+    pool = MCPHttpPool(max_connections=4)
+    try:
+        factory = pool.client_factory(url, headers={"Authorization": "config"})
+        async with factory(headers={"Authorization": "session"}) as client:
+            assert (await client.get(url)).text == "session"
+    finally:
+        await pool.aclose()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_transports_keyed_by_origin():
+    pool = MCPHttpPool(max_connections=4)
+    a = pool.new_client("http://a.example/mcp")
+    b = pool.new_client("http://a.example:80/other")
+    c = pool.new_client("https://a.example/mcp")
+    assert a._transport._shared is b._transport._shared
+    assert a._transport._shared is not c._transport._shared
+    assert pool.stats() == {
+        "transports": 2,
+        "borrowed": 3,
+        "created": 2,
+        "reused": 1,
+        "evicted": 0,
+    }
+    for client in (a, b, c):
+        await client.aclose()
+    assert pool.stats()["borrowed"] == 0
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_closed_client_cannot_use_returned_transport():
+    pool = MCPHttpPool(max_connections=4)
+    client = pool.new_client("http://a.example/mcp")
+    transport = client._transport
+    await client.aclose()
+    await transport.aclose()  # idempotent: released exactly once
+    assert pool.stats()["borrowed"] == 0
+    with pytest.raises(RuntimeError):
+        await transport.handle_async_request(None)
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_transports_are_evicted():
+    pool = MCPHttpPool(max_connections=4)
+    client = pool.new_client("http://a.example/mcp")
+    shared = client._transport._shared
+    await client.aclose()
+
+    with patch.object(http_pool, "POOL_IDLE_SECONDS", 0.0):
+        pool.new_client("http://b.example/mcp")
+        await asyncio.sleep(0)  # let the scheduled aclose run
+
+    assert pool.stats()["evicted"] == 1
+    assert pool.stats()["transports"] == 1
+    assert shared.transport._pool.connections == []
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_borrowed_transports_are_never_evicted():
+    pool = MCPHttpPool(max_connections=4)
+    client = pool.new_client("http://a.example/mcp")
+    with patch.object(http_pool, "POOL_IDLE_SECONDS", 0.0):
+        pool.new_client("http://b.example/mcp")
+    assert pool.stats()["evicted"] == 0
+    await client.aclose()
+    await pool.aclose()
+
+
+def test_transports_are_not_shared_across_event_loops():
+    pool = MCPHttpPool(max_connections=4)
+
+    async def borrow():
+        return pool.new_client("http://a.example/mcp")._transport._shared
+
+    first = asyncio.run(borrow())
+    second = asyncio.run(borrow())
+    assert first is not second
+    assert pool.stats()["transports"] == 1  # the dead loop's entry was dropped
+
+
+@pytest.mark.asyncio
+async def test_idle_transport_of_another_live_loop_is_closed_on_that_loop():
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    pool = MCPHttpPool(max_connections=4)
+    closed_on = []
+
+    async def borrow_and_release():
+        client = pool.new_client("http://a.example/mcp")
+        await client.aclose()
+        return client._transport._shared
+
+    try:
+        shared = asyncio.run_coroutine_threadsafe(borrow_and_release(), other).result()
+
+        async def record_close():
+            closed_on.append(asyncio.get_running_loop())
+
+        shared.transport.aclose = record_close
+        with patch.object(http_pool, "POOL_IDLE_SECONDS", 0.0):
+            pool.new_client("http://b.example/mcp")
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), other).result()
+
+        assert closed_on == [other]
+        assert pool.stats()["evicted"] == 1
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join()
+        other.close()
+        await pool.aclose()
+
+
+def test_limits_follow_config():
+    with patch(POOL_SIZE, return_value=7):
+        pool = get_mcp_http_pool()
+    client = pool.new_client("http://a.example/mcp")
+    assert client._transport._shared.transport._pool._max_connections == 7
+
+
+def test_zero_disables_pool():
+    with patch(POOL_SIZE, return_value=0):
+        assert get_mcp_http_pool() is None
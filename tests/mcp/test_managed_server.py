@@ -2,11 +2,13 @@
 Tests for ManagedMCPServer.
 """
 
+import asyncio
 import os
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
+from pydantic_ai import ModelRetry
 
 from code_puppy.mcp_.managed_server import (
     ManagedMCPServer,
@@ -16,10 +18,11 @@ from code_puppy.mcp_.managed_server import (
     process_tool_call,
 )
 
-TOOLSET = "code_puppy.mcp_.managed_server.MCPToolset"
+TOOLSET = "code_puppy.mcp_.managed_server.CachingMCPToolset"
 SSE_TRANSPORT = "code_puppy.mcp_.managed_server.SSETransport"
 HTTP_TRANSPORT = "code_puppy.mcp_.managed_server.StreamableHttpTransport"
 STDIO = "code_puppy.mcp_.managed_server.BlockingStdioToolset"
+POOL_SIZE = "code_puppy.config.get_mcp_http_pool_max_connections"
 
 
 def _sse(inner=None, enabled=True):
@@ -299,6 +302,72 @@ class TestProcessToolCall:
         assert result == {"flag": True}
 
 
+# --- passive health signals + session ping ---
+
+
+class TestHealthSignals:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "outcome,success",
+        [("ok", True), (ModelRetry("bad args"), True), (ConnectionError(), False)],
+    )
+    async def test_tool_call_outcome_recorded(self, outcome, success):
+        server, _, _ = _sse()
+        assert server.last_tool_call() is None
+        call_tool = AsyncMock(
+            side_effect=outcome if isinstance(outcome, Exception) else None,
+            return_value=outcome,
+        )
+
+        with patch("rich.console.Console"):
+            if isinstance(outcome, Exception):
+                with pytest.raises(type(outcome)):
+                    await server._observed_tool_call(Mock(), call_tool, "t", {})
+            else:
+                await server._observed_tool_call(Mock(), call_tool, "t", {})
+
+        signal = server.last_tool_call()
+        assert signal.success is success
+        assert signal.latency_ms >= 0
+        assert (signal.error is None) is success
+
+    @pytest.mark.asyncio
+    async def test_ping_without_open_session_returns_none(self):
+        server, _, _ = _stdio()
+        server._toolset.is_running = False
+        server._toolset.client = Mock()
+        assert await server.ping(1.0) is None
+        server._toolset.client.ping.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ping_over_open_session_measures_rtt(self):
+        server, _, _ = _stdio()
+        server._toolset.is_running = True
+        server._toolset.client = Mock()
+        server._toolset.client.is_connected.return_value = True
+        server._toolset.client.ping = AsyncMock(return_value=True)
+
+        rtt = await server.ping(1.0)
+
+        assert rtt is not None and rtt >= 0
+        server._toolset.client.ping.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_hung_session_ping_times_out(self):
+        server, _, _ = _stdio()
+        server._toolset.is_running = True
+        server._toolset.client = Mock()
+        server._toolset.client.is_connected.return_value = True
+
+        async def never_answers():
+            await asyncio.sleep(10)
+
+        server._toolset.client.ping = never_answers
+
+        with pytest.raises(asyncio.TimeoutError):
+            await server.ping(0.01)
+
+
 # --- init / get_pydantic_server ---
 
 
@@ -374,8 +443,17 @@ class TestCreateServerSSE:
         assert "read_timeout" not in mock_toolset.call_args.kwargs
 
     def test_process_tool_call_wired(self):
-        _, mock_toolset, _ = _sse()
-        assert mock_toolset.call_args.kwargs["process_tool_call"] is process_tool_call
+        server, mock_toolset, _ = _sse()
+        wired = mock_toolset.call_args.kwargs["process_tool_call"]
+        assert wired == server._observed_tool_call
+
+    def test_tool_cache_key_is_config_fingerprint(self):
+        from code_puppy.mcp_.tool_cache import tool_cache_fingerprint
+
+        _, mock_toolset, _ = _sse({"url": "http://x"})
+        assert mock_toolset.call_args.kwargs[
+            "tool_cache_key"
+        ] == tool_cache_fingerprint("sse", {"url": "http://x"})
 
     def test_explicit_http_client_becomes_factory(self):
         mock_client = MagicMock()
@@ -384,9 +462,10 @@ class TestCreateServerSSE:
         assert factory is not None
         assert factory() is mock_client
 
-    def test_headers_create_http_client(self):
+    def test_headers_create_http_client_when_pool_disabled(self):
         mock_http_client = MagicMock()
         with (
+            patch(POOL_SIZE, return_value=0),
             patch(TOOLSET) as mock_toolset,
             patch(SSE_TRANSPORT) as mock_transport,
             patch(
@@ -409,10 +488,23 @@ class TestCreateServerSSE:
         factory = mock_transport.call_args.kwargs["httpx_client_factory"]
         assert factory() is mock_http_client
 
-    def test_no_headers_no_factory(self):
-        _, _, mock_transport = _sse({"url": "http://x"})
+    def test_no_headers_no_factory_when_pool_disabled(self):
+        with patch(POOL_SIZE, return_value=0):
+            _, _, mock_transport = _sse({"url": "http://x"})
         assert mock_transport.call_args.kwargs["httpx_client_factory"] is None
 
+    @pytest.mark.parametrize("build", [_sse, _http])
+    def test_pooled_factory_builds_fresh_client_per_session(self, build):
+        _, _, mock_transport = build(
+            {"url": "http://x:8000/mcp", "headers": {"Authorization": "Bearer t"}}
+        )
+        factory = mock_transport.call_args.kwargs["httpx_client_factory"]
+        first, second = factory(), factory(headers={"X-Extra": "1"})
+        assert first is not second
+        assert first.headers["Authorization"] == "Bearer t"
+        assert second.headers["X-Extra"] == "1"
+        assert first._transport._shared is second._transport._shared
+
 
 class TestCreateServerStdio:
     def test_requires_command(self):
@@ -451,8 +543,9 @@ class TestCreateServerStdio:
         assert mock_cls.call_args.kwargs[key] == expected
 
     def test_process_tool_call_wired(self):
-        _, _, mock_cls = _stdio()
-        assert mock_cls.call_args.kwargs["process_tool_call"] is process_tool_call
+        server, _, mock_cls = _stdio()
+        wired = mock_cls.call_args.kwargs["process_tool_call"]
+        assert wired == server._observed_tool_call
 
     @staticmethod
     def _stdio_env(ca_bundle, inner_config):
@@ -511,8 +604,9 @@ class TestCreateServerHTTP:
         assert mock_toolset.call_args.kwargs["read_timeout"] == 200
 
     def test_process_tool_call_wired(self):
-        _, mock_toolset, _ = _http()
-        assert mock_toolset.call_args.kwargs["process_tool_call"] is process_tool_call
+        server, mock_toolset, _ = _http()
+        wired = mock_toolset.call_args.kwargs["process_tool_call"]
+        assert wired == server._observed_tool_call
 
 
 class TestCreateServerUnsupported:
@@ -2,6 +2,7 @@
 Tests for MCP server log management.
 """
 
+import time
 from pathlib import Path
 from unittest.mock import patch
 
@@ -10,6 +11,7 @@ import pytest
 from code_puppy.mcp_.mcp_logs import (
     MAX_LOG_SIZE,
     clear_logs,
+    flush_logs,
     get_log_stats,
     get_mcp_logs_dir,
     list_servers_with_logs,
@@ -183,3 +185,115 @@ class TestMCPLogs:
         # Original file should be gone, rotated file should exist
         assert not log_path.exists()
         assert (temp_logs_dir / f"{server_name}.log.1").exists()
+
+
+class TestBufferedWriter:
+    """The per-server buffered writer behind write_log."""
+
+    def test_lines_are_buffered_until_flushed(self, temp_logs_dir):
+        write_log("buffered", "hello")
+        log_path = temp_logs_dir / "buffered.log"
+        assert not log_path.exists()
+
+        flush_logs("buffered")
+        assert "hello" in log_path.read_text()
+
+    def test_background_flusher_writes_pending_lines(self, temp_logs_dir):
+        with patch("code_puppy.mcp_.mcp_logs.FLUSH_INTERVAL_SECONDS", 0.01):
+            write_log("timer", "tick")
+            log_path = temp_logs_dir / "timer.log"
+            deadline = time.monotonic() + 5
+            while not log_path.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert "tick" in log_path.read_text()
+
+    def test_size_threshold_flushes_immediately(self, temp_logs_dir):
+        with patch("code_puppy.mcp_.mcp_logs.FLUSH_THRESHOLD_BYTES", 100):
+            write_log("chatty", "x" * 200)
+        assert (temp_logs_dir / "chatty.log").exists()
+
+    def test_one_handle_for_many_flushes(self, temp_logs_dir):
+        real_open = open
+        with patch("builtins.open", side_effect=real_open) as mock_open:
+            for i in range(50):
+                write_log("steady", f"line {i}")
+                flush_logs("steady")
+        opened = [c for c in mock_open.call_args_list if "steady.log" in str(c.args[0])]
+        assert len(opened) == 1
+        assert len(read_logs("steady")) == 50
+
+    def test_rotates_when_tracked_size_crosses_limit(self, temp_logs_dir):
+        with patch("code_puppy.mcp_.mcp_logs.MAX_LOG_SIZE", 1000):
+            for i in range(40):
+                write_log("rotating", f"message {i:03d} " + "y" * 40)
+                flush_logs("rotating")
+            write_log("rotating", "after rotation")
+
+        assert (temp_logs_dir / "rotating.log.1").exists()
+        assert read_logs("rotating", lines=1)[0].endswith("after rotation")
+        everything = read_logs("rotating", include_rotated=True)
+        assert "message 039" in everything[-2]
+
+    def test_clear_logs_drops_pending_lines(self, temp_logs_dir):
+        write_log("cleared", "never written")
+        clear_logs("cleared")
+        assert read_logs("cleared") == []
+
+
+class TestTailRead:
+    """read_logs(lines=N) seeks backwards instead of reading whole files."""
+
+    def _write_lines(self, path, start, stop):
+        path.write_text("".join(f"line {i}\n" for i in range(start, stop)))
+
+    @pytest.mark.parametrize("count", [1, 7, 99, 100, 150])
+    def test_tail_matches_full_read(self, temp_logs_dir, count):
+        self._write_lines(temp_logs_dir / "tail.log", 0, 100)
+        with patch("code_puppy.mcp_.mcp_logs._TAIL_BLOCK_BYTES", 16):
+            tail = read_logs("tail", lines=count)
+        assert tail == read_logs("tail")[-count:]
+
+    def test_tail_without_trailing_newline(self, temp_logs_dir):
+        (temp_logs_dir / "partial.log").write_text("a\nb\nc")
+        assert read_logs("partial", lines=2) == ["b", "c"]
+
+    def test_tail_continues_into_rotated_logs(self, temp_logs_dir):
+        self._write_lines(temp_logs_dir / "multi.log.2", 0, 10)
+        self._write_lines(temp_logs_dir / "multi.log.1", 10, 20)
+        self._write_lines(temp_logs_dir / "multi.log", 20, 23)
+
+        tail = read_logs("multi", lines=15, include_rotated=True)
+        assert tail == [f"line {i}" for i in range(8, 23)]
+        assert read_logs("multi", lines=15) == [f"line {i}" for i in range(20, 23)]
+
+    def test_tail_reads_only_the_end_of_a_large_file(self, temp_logs_dir):
+        self._write_lines(temp_logs_dir / "big.log", 0, 200_000)
+        real_open = open
+        bytes_read = []
+
+        class CountingFile:
+            def __init__(self, handle):
+                self._handle = handle
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self._handle.close()
+
+            def seek(self, *args):
+                return self._handle.seek(*args)
+
+            def read(self, size=-1):
+                data = self._handle.read(size)
+                bytes_read.append(len(data))
+                return data
+
+        with patch(
+            "builtins.open",
+            side_effect=lambda *a, **k: CountingFile(real_open(*a, **k)),
+        ):
+            tail = read_logs("big", lines=3)
+
+        assert tail == ["line 199997", "line 199998", "line 199999"]
+        assert sum(bytes_read) <= 64 * 1024
@@ -0,0 +1,144 @@
+"""Tests for the persistent MCP tool-definition cache (tool_cache.py)."""
+
+import os
+
+import pytest
+from mcp import types as mcp_types
+from mcp.server.fastmcp import Context, FastMCP
+
+from code_puppy.mcp_ import tool_cache
+from code_puppy.mcp_.tool_cache import (
+    CachingMCPToolset,
+    load_tool_defs,
+    store_tool_defs,
+    tool_cache_fingerprint,
+)
+from code_puppy.mcp_.toolset_utils import iter_cached_tool_defs
+
+KEY = "test-fingerprint"
+
+
+def _stale_tool(name="stale"):
+    return mcp_types.Tool(name=name, description="old", inputSchema={"type": "object"})
+
+
+@pytest.fixture
+def server():
+    mcp = FastMCP("demo")
+    mcp._mcp_server.version = "1.0"
+
+    @mcp.tool()
+    def add(a: int, b: int) -> int:
+        """Add two numbers."""
+        return a + b
+
+    @mcp.tool()
+    async def reload(ctx: Context) -> str:
+        """Announce that the tool list changed."""
+        await ctx.session.send_tool_list_changed()
+        return "ok"
+
+    return mcp
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memo():
+    tool_cache.clear_tool_def_memo()
+    tool_cache.drop_tool_defs(KEY)
+    yield
+    tool_cache.drop_tool_defs(KEY)
+
+
+def _names(tools):
+    return sorted(t.name for t in tools)
+
+
+@pytest.mark.asyncio
+async def test_live_listing_is_persisted(server):
+    toolset = CachingMCPToolset(server, tool_cache_key=KEY)
+    async with toolset:
+        assert _names(await toolset.list_tools()) == ["add", "reload"]
+
+    version, tools = load_tool_defs(KEY)
+    assert version == "1.0"
+    assert _names(tools) == ["add", "reload"]
+    assert tools[0].inputSchema["type"] == "object"
+
+
+@pytest.mark.asyncio
+async def test_new_session_sees_last_known_tools_before_connecting(server):
+    async with CachingMCPToolset(server, tool_cache_key=KEY) as first:
+        await first.list_tools()
+
+    fresh = CachingMCPToolset(server, tool_cache_key=KEY)
+    assert not fresh.is_running
+    names = [
+        name for name, _desc, _schema in iter_cached_tool_defs(fresh.prefixed("demo"))
+    ]
+    assert sorted(names) == ["demo_add", "demo_reload"]
+
+
+@pytest.mark.asyncio
+async def test_same_version_served_from_disk_then_revalidated(server):
+    store_tool_defs(KEY, "1.0", [_stale_tool()])
+    toolset = CachingMCPToolset(server, tool_cache_key=KEY)
+
+    async with toolset:
+        assert _names(await toolset.list_tools()) == ["stale"]
+        await toolset._refresh_task
+        assert _names(await toolset.list_tools()) == ["add", "reload"]
+
+    assert _names(load_tool_defs(KEY)[1]) == ["add", "reload"]
+
+
+@pytest.mark.asyncio
+async def test_version_change_lists_live(server):
+    store_tool_defs(KEY, "0.9", [_stale_tool()])
+    toolset = CachingMCPToolset(server, tool_cache_key=KEY)
+
+    async with toolset:
+        assert _names(await toolset.list_tools()) == ["add", "reload"]
+        assert toolset._refresh_task is None
+
+    assert load_tool_defs(KEY)[0] == "1.0"
+
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_refreshes_cache(server):
+    toolset = CachingMCPToolset(server, tool_cache_key=KEY)
+    async with toolset:
+        await toolset.list_tools()
+        store_tool_defs(KEY, "1.0", [_stale_tool()])
+
+        await toolset.direct_call_tool("reload", {})
+        assert toolset._refresh_task is not None
+        await toolset._refresh_task
+
+        assert _names(load_tool_defs(KEY)[1]) == ["add", "reload"]
+        assert _names(toolset._cached_tools) == ["add", "reload"]
+
+
+@pytest.mark.asyncio
+async def test_without_key_nothing_is_written(server):
+    toolset = CachingMCPToolset(server)
+    async with toolset:
+        await toolset.list_tools()
+    assert toolset.last_known_tools() is None
+    assert not os.path.exists(tool_cache._entry_path(KEY))
+
+
+def test_unreadable_entry_is_ignored():
+    os.makedirs(tool_cache._cache_dir(), exist_ok=True)
+    with open(tool_cache._entry_path(KEY), "w") as f:
+        f.write("{not json")
+    assert load_tool_defs(KEY) is None
+
+
+def test_fingerprint_tracks_config_not_live_objects():
+    base = tool_cache_fingerprint("sse", {"url": "http://a", "timeout": 5})
+    assert base == tool_cache_fingerprint("SSE", {"timeout": 5, "url": "http://a"})
+    assert base == tool_cache_fingerprint(
+        "sse", {"url": "http://a", "timeout": 5, "http_client": object()}
+    )
+    assert base != tool_cache_fingerprint("sse", {"url": "http://b", "timeout": 5})
+    assert base != tool_cache_fingerprint("http", {"url": "http://a", "timeout": 5})
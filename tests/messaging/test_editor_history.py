@@ -68,6 +68,73 @@ def test_store_load_missing_file_is_empty(tmp_path):
     assert HistoryStore(str(tmp_path / "nope.txt")).load() == []
 
 
+def test_store_parses_only_appended_bytes(store, tmp_path, monkeypatch):
+    store.append("one")
+    assert store.load() == ["one"]
+    other = HistoryStore(str(tmp_path / "history.txt"))
+    assert other._shared is store._shared  # one parsed copy per file
+
+    parsed = []
+    original = type(store._shared)._parse
+    monkeypatch.setattr(
+        type(store._shared),
+        "_parse",
+        lambda self, data: (parsed.append(data), original(self, data))[1],
+    )
+    store.load()
+    assert parsed == []  # unchanged file: nothing re-read
+    other.append("two\nlines")
+    assert store.load() == ["one", "two\nlines"]
+    assert b"one" not in b"".join(parsed)
+
+
+def test_store_picks_up_rewritten_file_and_partial_lines(store, tmp_path):
+    path = tmp_path / "history.txt"
+    store.append("first")
+    store.load()
+    path.write_bytes(b"\n# t\n+replaced\n")
+    assert store.load() == ["replaced"]
+
+    with open(path, "ab") as f:
+        f.write(b"+continued")  # writer caught mid-line
+    assert store.load() == ["replaced"]
+    with open(path, "ab") as f:
+        f.write(b"\n\n# t\n+next\n")
+    assert store.load() == ["replaced\ncontinued", "next"]
+
+
+def test_store_find_older_matches_linear_scan(store):
+    entries = ["git status", "ls\ngit log", "make", "git push", "x\x00git"]
+    for entry in entries:
+        store.append(entry)
+    store.load()
+    for query in ("git", "ls\ngit", "g", "nope", "\x00git", "make"):
+        for before in range(len(entries) + 1):
+            expected = next(
+                (i for i in range(before - 1, -1, -1) if query in entries[i]), -1
+            )
+            assert store.find_older(query, before) == expected, (query, before)
+
+
+def test_store_compact_dedups_and_keeps_newest(store):
+    for entry in ("a", "b", "a", "c", "b", "d"):
+        store.append(entry)
+    assert store.compact(3) == 3
+    assert store.load() == ["c", "b", "d"]
+    assert store.compact(3) == 0
+
+
+def test_store_compacts_on_append_past_configured_limit(store, monkeypatch):
+    from code_puppy import config
+
+    monkeypatch.setattr(config, "get_command_history_max_entries", lambda: 4)
+    for i in range(5):
+        store.append(f"cmd {i}")
+    assert store.load() == [f"cmd {i}" for i in range(5)]  # within the slack
+    store.append("cmd 5")
+    assert store.load() == ["cmd 2", "cmd 3", "cmd 4", "cmd 5"]
+
+
 # =========================================================================
 # Navigator: up/down + working entry
 # =========================================================================
@@ -156,6 +223,40 @@ def test_reverse_search_finds_and_walks_older(store):
     assert rs.current_match() == "git status"
 
 
+def test_reverse_search_narrowing_matches_full_rescan(store):
+    entries = ["git push", "grep foo", "git pull", "go test", "git status"]
+    for entry in entries:
+        store.append(entry)
+
+    def newest(query, before=len(entries)):
+        hits = [i for i in range(before) if query in entries[i]]
+        return entries[hits[-1]] if hits else None
+
+    rs = ReverseSearch(store)
+    rs.start()
+    rs.feed_char("g")
+    assert rs.current_match() == "git status"
+    rs.next_older()
+    rs.next_older()
+    assert rs.current_match() == "git pull"
+    rs.feed_char("i")  # newest "gi", not older than the Ctrl+R position
+    assert rs.current_match() == newest("gi") == "git status"
+    for ch in "t pu":
+        rs.feed_char(ch)
+    assert rs.current_match() == newest("git pu") == "git pull"
+    rs.feed_char("x")
+    assert rs.current_match() is None
+    rs.backspace()
+    rs.backspace()
+    assert rs.query == "git p"
+    assert rs.current_match() == newest("git p")
+    for _ in range(5):
+        rs.backspace()
+    assert rs.query == "" and rs.current_match() is None
+    rs.feed_char("o")
+    assert rs.current_match() == "go test"
+
+
 def test_reverse_search_prompt_text(store):
     store.append("make tests")
     rs = ReverseSearch(store)
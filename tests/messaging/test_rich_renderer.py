@@ -180,6 +180,70 @@ def test_render_file_listing(mock_suppress, mock_sub, renderer, console):
     assert "file.py" in out or "DIRECTORY" in out
 
 
+@patch("code_puppy.messaging.rich_renderer.is_subagent", return_value=False)
+@patch(
+    "code_puppy.messaging.rich_renderer.get_suppress_directory_listing",
+    return_value=False,
+)
+def test_render_file_listing_aggregates_in_one_print(mock_suppress, mock_sub, bus):
+    console = MagicMock()
+    renderer = RichConsoleRenderer(bus, console=console)
+    msg = FileListingMessage(
+        directory="/project",
+        files=[
+            FileEntry(path="a", type="dir", size=0, depth=0),
+            FileEntry(path="a/b", type="dir", size=0, depth=1),
+            FileEntry(path="a/b/c", type="dir", size=0, depth=2),
+            FileEntry(path="a/b/c/deep.py", type="file", size=2048, depth=3),
+            FileEntry(path="a/top.py", type="file", size=1024, depth=1),
+            FileEntry(path="[odd]", type="dir", size=0, depth=0),
+        ],
+        recursive=True,
+        file_count=2,
+        dir_count=4,
+        total_size=3072,
+    )
+    renderer._render_file_listing(msg)
+
+    console.print.assert_called_once()
+    lines = console.print.call_args.args[0].splitlines()
+    assert "a/[/bold blue] [dim](2 files, 1 subdir, 3.0 KB)[/dim]" in lines[4]
+    assert "    [bold blue]b/[/bold blue] [dim](1 file, 1 subdir, 2.0 KB)" in lines[5]
+    assert "\\[odd]/" in lines[3]
+
+
+@patch("code_puppy.messaging.rich_renderer.is_subagent", return_value=False)
+@patch(
+    "code_puppy.messaging.rich_renderer.get_suppress_directory_listing",
+    return_value=False,
+)
+@patch("code_puppy.messaging.rich_renderer._LISTING_MAX_CHILDREN", 2)
+def test_render_file_listing_collapses_wide_dirs(
+    mock_suppress, mock_sub, renderer, console
+):
+    files = [FileEntry(path="pkg", type="dir", size=0, depth=0)]
+    for i in range(5):
+        files.append(FileEntry(path=f"pkg/m{i}", type="dir", size=0, depth=1))
+        files.append(FileEntry(path=f"pkg/m{i}/x.py", type="file", size=10, depth=2))
+    files += [
+        FileEntry(path=f"r{i}.py", type="file", size=1, depth=0) for i in range(3)
+    ]
+    msg = FileListingMessage(
+        directory="/project",
+        files=files,
+        recursive=True,
+        file_count=8,
+        dir_count=6,
+        total_size=53,
+    )
+    renderer._render_file_listing(msg)
+    out = output(console)
+    assert "m1/" in out and "m2/" not in out
+    assert "… 3 more dirs (3 files inside, 30 B)" in out
+    assert "r1.py" in out and "r2.py" not in out
+    assert "… 1 more file" in out
+
+
 @patch("code_puppy.messaging.rich_renderer.is_subagent", return_value=True)
 @patch("code_puppy.messaging.rich_renderer.get_subagent_verbose", return_value=False)
 def test_render_file_listing_suppressed(mock_v, mock_sub, renderer, console):
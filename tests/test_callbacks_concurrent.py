@@ -0,0 +1,164 @@
+"""Concurrent callback dispatch, phase timeouts and per-callback timings.
+
+Callbacks registered with ``concurrent=True`` run alongside the rest of the
+phase instead of queueing behind it; everything else keeps the sequential,
+registration-ordered behavior plugins were written against.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from code_puppy import callbacks
+from code_puppy.command_line.core_commands import handle_plugin_timings_command
+
+PHASE = "post_tool_call"
+
+
+@pytest.fixture(autouse=True)
+def _isolate_phase():
+    callbacks.clear_callbacks(PHASE)
+    callbacks.reset_callback_timings()
+    yield
+    callbacks.clear_callbacks(PHASE)
+
+
+def _sleeper(name, seconds, log):
+    async def callback(*_args, **_kwargs):
+        log.append(f"{name}:start")
+        await asyncio.sleep(seconds)
+        log.append(f"{name}:end")
+        return name
+
+    callback.__name__ = callback.__qualname__ = name
+    return callback
+
+
+async def test_sequential_callbacks_keep_order():
+    log = []
+    callbacks.register_callback(PHASE, _sleeper("a", 0.01, log))
+    callbacks.register_callback(PHASE, _sleeper("b", 0, log))
+
+    assert await callbacks._trigger_callbacks(PHASE) == ["a", "b"]
+    assert log == ["a:start", "a:end", "b:start", "b:end"]
+
+
+async def test_concurrent_callbacks_overlap_and_keep_result_order():
+    log = []
+    for name in ("a", "b", "c"):
+        callbacks.register_callback(PHASE, _sleeper(name, 0.1, log), concurrent=True)
+
+    started = time.perf_counter()
+    results = await callbacks._trigger_callbacks(PHASE)
+
+    assert results == ["a", "b", "c"]
+    assert time.perf_counter() - started < 0.25
+    assert log[:3] == ["a:start", "b:start", "c:start"]
+
+
+async def test_sequential_callbacks_do_not_wait_for_concurrent_ones():
+    log = []
+    callbacks.register_callback(PHASE, _sleeper("slow", 0.05, log), concurrent=True)
+    callbacks.register_callback(PHASE, _sleeper("first", 0, log))
+    callbacks.register_callback(PHASE, _sleeper("second", 0, log))
+
+    assert await callbacks._trigger_callbacks(PHASE) == ["slow", "first", "second"]
+    assert log.index("second:end") < log.index("slow:end")
+    assert log.index("first:end") < log.index("second:start")
+
+
+async def test_timed_out_callback_is_cancelled_and_reported():
+    log = []
+    hang = _sleeper("hang", 10, log)
+    callbacks.register_callback(PHASE, hang, concurrent=True)
+    callbacks.register_callback(PHASE, _sleeper("quick", 0, log), concurrent=True)
+    callbacks.set_phase_timeout(PHASE, 0.05)
+
+    started = time.perf_counter()
+    results = await callbacks._trigger_callbacks(PHASE)
+
+    assert results == [None, "quick"]
+    assert time.perf_counter() - started < 1
+    (entry,) = [
+        e for e in callbacks.get_slowest_callbacks(PHASE) if e["callback"] == "hang"
+    ]
+    assert entry["timeouts"] == 1
+    assert entry["concurrent"] is True
+
+
+async def test_timed_out_fail_closed_callback_blocks():
+    phase = "pre_tool_call"
+    callbacks.clear_callbacks(phase)
+    try:
+        callbacks.register_callback(
+            phase, _sleeper("guard", 10, []), fail_closed=True, concurrent=True
+        )
+        callbacks.set_phase_timeout(phase, 0.02)
+
+        (result,) = await callbacks.on_pre_tool_call("tool", {})
+
+        assert result["blocked"] is True
+    finally:
+        callbacks.clear_callbacks(phase)
+
+
+async def test_crash_in_concurrent_callback_is_isolated():
+    def boom(*_args, **_kwargs):
+        raise RuntimeError("nope")
+
+    callbacks.register_callback(PHASE, boom, concurrent=True)
+    callbacks.register_callback(PHASE, _sleeper("ok", 0, []))
+
+    assert await callbacks._trigger_callbacks(PHASE) == [None, "ok"]
+
+
+async def test_slowest_callbacks_are_ranked_per_phase():
+    log = []
+    callbacks.register_callback(PHASE, _sleeper("fast", 0, log))
+    callbacks.register_callback(PHASE, _sleeper("slow", 0.03, log))
+    await callbacks._trigger_callbacks(PHASE)
+    await callbacks._trigger_callbacks(PHASE)
+
+    entries = callbacks.get_slowest_callbacks(PHASE)
+    assert [e["callback"] for e in entries] == ["slow", "fast"]
+    assert entries[0]["calls"] == 2
+    assert entries[0]["max_ms"] >= 30
+    assert callbacks.get_slowest_callbacks(PHASE, limit=1)[0]["callback"] == "slow"
+
+
+def test_sync_trigger_records_timings():
+    callbacks.register_callback("load_prompt", lambda: "x")
+    try:
+        callbacks._trigger_callbacks_sync("load_prompt")
+        assert callbacks.get_slowest_callbacks("load_prompt")[0]["calls"] == 1
+    finally:
+        callbacks.clear_callbacks("load_prompt")
+
+
+def test_phase_timeout_validation():
+    with pytest.raises(ValueError):
+        callbacks.set_phase_timeout(PHASE, 0)
+    callbacks.set_phase_timeout(PHASE, 2)
+    assert callbacks.get_phase_timeout(PHASE) == 2
+    callbacks.set_phase_timeout(PHASE, None)
+    assert callbacks.get_phase_timeout(PHASE) == callbacks.DEFAULT_CONCURRENT_TIMEOUT
+
+
+def test_unregister_drops_concurrent_flag():
+    cb = _sleeper("x", 0, [])
+    callbacks.register_callback(PHASE, cb, concurrent=True)
+    assert callbacks.unregister_callback(PHASE, cb)
+    assert (PHASE, cb) not in callbacks._concurrent_callbacks
+
+
+async def test_plugin_timings_command(monkeypatch):
+    shown = []
+    monkeypatch.setattr("code_puppy.command_line.core_commands.emit_info", shown.append)
+    callbacks.register_callback(PHASE, _sleeper("probe", 0, []))
+    await callbacks._trigger_callbacks(PHASE)
+
+    assert handle_plugin_timings_command(f"/plugin_timings {PHASE}")
+    assert "probe [core]: 1 calls" in shown[-1]
+    assert handle_plugin_timings_command("/plugin_timings reset")
+    assert callbacks.get_slowest_callbacks() == []
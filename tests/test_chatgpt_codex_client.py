@@ -11,8 +11,10 @@ from unittest.mock import AsyncMock, Mock, patch
 import httpx
 import pytest
 
+from code_puppy import chatgpt_codex_client
 from code_puppy.chatgpt_codex_client import (
     ChatGPTCodexAsyncClient,
+    CodexStreamAssembler,
     _is_reasoning_model,
     create_codex_async_client,
 )
@@ -479,6 +481,10 @@ class TestConvertStreamToResponse:
         assert body["output"][1]["type"] == "function_call"
 
 
+async def _done_lines():
+    yield "data: [DONE]"
+
+
 class TestSendMethod:
     """Test the send method of ChatGPTCodexAsyncClient."""
 
@@ -488,6 +494,7 @@ class TestSendMethod:
         success_response = Mock(spec=httpx.Response)
         success_response.status_code = 200
         success_response.headers = {"content-type": "application/json"}
+        success_response.aiter_lines = _done_lines
 
         with patch.object(
             httpx.AsyncClient,
@@ -519,6 +526,7 @@ class TestSendMethod:
         success_response = Mock(spec=httpx.Response)
         success_response.status_code = 200
         success_response.headers = {"content-type": "application/json"}
+        success_response.aiter_lines = _done_lines
 
         with patch.object(
             httpx.AsyncClient,
@@ -691,7 +699,7 @@ class TestSendMethod:
 
     @pytest.mark.asyncio
     async def test_stream_conversion_failure_logs_warning(self):
-        """Test that stream conversion failure logs warning and returns original."""
+        """Test that stream conversion failure raises a decoding error."""
 
         # Create a streaming response that fails during conversion
         async def failing_aiter_lines():
@@ -717,9 +725,57 @@ class TestSendMethod:
                 content=json.dumps({"model": "gpt-4", "stream": False}).encode(),
             )
 
-            # Should return original response on conversion failure
-            result = await client.send(request)
-            assert result is stream_response
+            with pytest.raises(httpx.DecodingError, match="Stream read error"):
+                await client.send(request)
+
+
+class _FailingSSEStream(httpx.AsyncByteStream):
+    """Yields one SSE event, then fails like a dropped connection."""
+
+    async def __aiter__(self):
+        yield b'data: {"type": "response.output_text.delta", "delta": "Hi"}\n\n'
+        raise httpx.ReadTimeout("stalled")
+
+
+class TestForcedStreamFailures:
+    """Failures while a forced stream is read through a real transport."""
+
+    @staticmethod
+    def _client(stream):
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, stream=stream
+            )
+        )
+        return ChatGPTCodexAsyncClient(transport=transport)
+
+    @staticmethod
+    def _request():
+        return httpx.Request(
+            "POST",
+            "https://chatgpt.com/backend-api/codex/responses",
+            content=json.dumps({"model": "gpt-4", "stream": False}).encode(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_network_error_propagates(self):
+        async with self._client(_FailingSSEStream()) as client:
+            with pytest.raises(httpx.ReadTimeout):
+                await client.send(self._request())
+
+    @pytest.mark.asyncio
+    async def test_assembly_failure_raises_decoding_error(self):
+        stream = httpx.ByteStream(b"data: [DONE]\n\n")
+        with patch.object(
+            chatgpt_codex_client.CodexStreamAssembler,
+            "build",
+            side_effect=ValueError("bad output"),
+        ):
+            async with self._client(stream) as client:
+                with pytest.raises(httpx.DecodingError) as excinfo:
+                    await client.send(self._request())
+
+        assert isinstance(excinfo.value.__cause__, ValueError)
 
 
 class TestCreateCodexAsyncClient:
@@ -838,3 +894,94 @@ class TestEdgeCases:
         body = json.loads(result.content)
         # Only "Hello" should be collected (empty strings are falsy)
         assert body["output"][0]["content"][0]["text"] == "Hello"
+
+
+def _event(event_type, **fields):
+    return "data: " + json.dumps({"type": event_type, **fields})
+
+
+class TestCodexStreamAssembler:
+    """Incremental assembly, bounded delta buffering and progress."""
+
+    def test_deltas_are_dropped_once_an_item_completes(self):
+        assembler = CodexStreamAssembler()
+        assembler.feed_line(_event("response.output_text.delta", delta="Hel"))
+        assert assembler._text.getvalue() == "Hel"
+
+        item = {"type": "message", "content": [{"text": "Hello"}]}
+        assembler.feed_line(_event("response.output_item.done", item=item))
+        assembler.feed_line(_event("response.output_text.delta", delta="more"))
+
+        assert assembler._text.getvalue() == ""
+        assert assembler.build()["output"] == [item]
+        assert assembler.progress["text_chars"] == 7
+
+    def test_fallback_buffer_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(chatgpt_codex_client, "MAX_BUFFERED_DELTA_CHARS", 5)
+        assembler = CodexStreamAssembler()
+        for delta in ("abc", "de", "fgh"):
+            assembler.feed_line(_event("response.output_text.delta", delta=delta))
+
+        assert assembler.build()["output"][0]["content"][0]["text"] == "abcde"
+        assert assembler.progress["text_truncated"] is True
+
+    def test_truncation_is_not_flagged_once_an_item_completes(self, monkeypatch):
+        monkeypatch.setattr(chatgpt_codex_client, "MAX_BUFFERED_DELTA_CHARS", 2)
+        assembler = CodexStreamAssembler()
+        assembler.feed_line(_event("response.output_text.delta", delta="abc"))
+        item = {"type": "message", "content": [{"text": "abc"}]}
+        assembler.feed_line(_event("response.output_item.done", item=item))
+
+        assert assembler.build()["output"] == [item]
+        assert assembler.progress["text_truncated"] is False
+
+    def test_unhandled_events_are_not_parsed(self):
+        assembler = CodexStreamAssembler()
+        with patch.object(chatgpt_codex_client.json, "loads") as loads:
+            assembler.feed_line('data: {"type":"response.reasoning.delta","x":1}')
+        loads.assert_not_called()
+        assert assembler.progress["events"] == 1
+
+    def test_done_stops_and_progress_reports_timing(self):
+        assembler = CodexStreamAssembler()
+        assert assembler.feed_line(": keep-alive")
+        assert assembler.feed_line("data: [DONE]") is False
+
+        progress = assembler.finish()
+        assert progress["done"] is True
+        assert 0 <= progress["first_byte_s"] <= progress["elapsed_s"]
+
+    @pytest.mark.asyncio
+    async def test_forced_stream_is_read_incrementally(self):
+        """The upstream body is streamed, converted, then closed."""
+        item = {"type": "message", "content": [{"text": "Hi"}]}
+
+        async def mock_aiter_lines():
+            yield _event("response.output_item.done", item=item)
+            yield "data: [DONE]"
+
+        stream_response = Mock(spec=httpx.Response)
+        stream_response.status_code = 200
+        stream_response.headers = {}
+        stream_response.aiter_lines = mock_aiter_lines
+        stream_response.request = Mock()
+
+        with patch.object(
+            httpx.AsyncClient,
+            "send",
+            new_callable=AsyncMock,
+            return_value=stream_response,
+        ) as mock_send:
+            client = ChatGPTCodexAsyncClient()
+            request = httpx.Request(
+                "POST",
+                "https://chatgpt.com/backend-api/codex/responses",
+                content=json.dumps({"model": "gpt-4", "stream": False}).encode(),
+            )
+            result = await client.send(request, stream=False)
+
+        assert mock_send.call_args.kwargs["stream"] is True
+        stream_response.aclose.assert_awaited_once()
+        assert json.loads(result.content)["output"] == [item]
+        assert result.extensions["codex_stream"]["output_items"] == 1
+        assert client.stream_progress["done"] is True
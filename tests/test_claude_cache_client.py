@@ -257,6 +257,58 @@ class TestToolPrefixing:
         assert client._apply_claude_code_prefix is True
 
 
+class TestSinglePassBodyRewrite:
+    """All body rewriters share one parse/serialize, skipped when none apply."""
+
+    @staticmethod
+    def _body(model, thinking=True, tools=True):
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "assistant",
+                    "content": [
+                        {"type": "thinking", "thinking": "hmm", "signature": "s"},
+                        {"type": "text", "text": 'said "tools" and "model": "x"'},
+                    ],
+                }
+            ],
+        }
+        if tools:
+            payload["tools"] = [{"name": "read_file", "description": "read"}]
+        if thinking:
+            payload["thinking"] = {"type": "adaptive"}
+        return json.dumps(payload).encode()
+
+    def test_prefix_and_summary_share_one_parse(self):
+        client = ClaudeCacheAsyncClient(apply_claude_code_prefix=True)
+        with patch.object(json, "loads", wraps=json.loads) as loads:
+            result = client._rewrite_body(self._body("claude-opus-4-7"))
+        assert loads.call_count == 1
+        data = json.loads(result)
+        assert data["tools"][0]["name"] == f"{TOOL_PREFIX}read_file"
+        assert data["thinking"] == {"type": "adaptive", "display": "summarized"}
+
+    def test_body_not_parsed_when_no_rewriter_applies(self):
+        client = ClaudeCacheAsyncClient()
+        with patch.object(json, "loads", wraps=json.loads) as loads:
+            # Thinking blocks in history and quoted keys in text don't count.
+            assert client._rewrite_body(self._body("claude-sonnet-4-5")) is None
+            assert client._rewrite_body(self._body("claude-opus-4-7", False)) is None
+        assert loads.call_count == 0
+
+    def test_prefix_flag_off_only_summarizes(self):
+        client = ClaudeCacheAsyncClient()
+        data = json.loads(client._rewrite_body(self._body("claude-opus-4-7")))
+        assert data["tools"][0]["name"] == "read_file"
+        assert data["thinking"]["display"] == "summarized"
+
+    def test_already_rewritten_body_is_left_alone(self):
+        client = ClaudeCacheAsyncClient(apply_claude_code_prefix=True)
+        once = client._rewrite_body(self._body("claude-opus-4-7"))
+        assert client._rewrite_body(once) is None
+
+
 class TestHeaderTransformation:
     """Test header transformation for Claude Code OAuth compatibility."""
 
@@ -234,6 +234,48 @@ class TestNumericGetters:
         cp_config.set_config_value("max_saved_sessions", "bad")
         assert cp_config.get_max_saved_sessions() == 20
 
+    @pytest.mark.parametrize(
+        "value,expected", [(None, 0), ("5000", 5000), ("-3", 0), ("bad", 0)]
+    )
+    def test_get_command_history_max_entries(self, value, expected):
+        if value is not None:
+            cp_config.set_config_value("command_history_max_entries", value)
+        assert cp_config.get_command_history_max_entries() == expected
+
+    @pytest.mark.parametrize(
+        "key,getter,value,expected",
+        [
+            ("image_history_keep_recent", "get_image_history_keep_recent", None, 3),
+            ("image_history_keep_recent", "get_image_history_keep_recent", "0", 0),
+            ("image_history_keep_recent", "get_image_history_keep_recent", "-1", 3),
+            ("image_history_budget_kb", "get_image_history_budget_kb", None, 8192),
+            ("image_history_budget_kb", "get_image_history_budget_kb", "0", 0),
+            ("image_history_budget_kb", "get_image_history_budget_kb", "x", 8192),
+        ],
+    )
+    def test_image_history_settings(self, key, getter, value, expected):
+        if value is not None:
+            cp_config.set_config_value(key, value)
+        assert getattr(cp_config, getter)() == expected
+
+    @pytest.mark.parametrize(
+        "key,getter,value,expected",
+        [
+            ("browser_shared_pool", "get_browser_shared_pool", None, False),
+            ("browser_shared_pool", "get_browser_shared_pool", "true", True),
+            ("browser_pool_size", "get_browser_pool_size", None, 2),
+            ("browser_pool_size", "get_browser_pool_size", "0", 0),
+            ("browser_pool_size", "get_browser_pool_size", "-1", 2),
+            ("browser_pool_max_contexts", "get_browser_pool_max_contexts", None, 8),
+            ("browser_pool_max_contexts", "get_browser_pool_max_contexts", "3", 3),
+            ("browser_pool_max_contexts", "get_browser_pool_max_contexts", "0", 8),
+        ],
+    )
+    def test_browser_pool_settings(self, key, getter, value, expected):
+        if value is not None:
+            cp_config.set_config_value(key, value)
+        assert getattr(cp_config, getter)() == expected
+
     def test_get_frontend_emitter_max_recent_events_default(self):
         assert cp_config.get_frontend_emitter_max_recent_events() == 100
 
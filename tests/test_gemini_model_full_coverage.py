@@ -1,5 +1,7 @@
 """Full coverage tests for code_puppy/gemini_model.py."""
 
+import base64
+import json
 import uuid
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -7,6 +9,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 import pytest
 from pydantic_ai.messages import (
+    BinaryContent,
     ModelRequest,
     ModelResponse,
     RetryPromptPart,
@@ -24,8 +27,10 @@ from code_puppy.gemini_model import (
     BYPASS_THOUGHT_SIGNATURE,
     GeminiModel,
     GeminiStreamingResponse,
+    _cached_sanitized_schema,
     _flatten_union_to_object_gemini,
     _sanitize_schema_for_gemini,
+    clear_schema_cache,
     generate_tool_call_id,
 )
 
@@ -460,6 +465,46 @@ class TestMapMessages:
             si, _ = await model._map_messages(msgs, default_params)
             assert si["parts"][0]["text"] == "INJECTED"
 
+    @pytest.mark.anyio
+    async def test_only_appended_messages_are_mapped(self, model, default_params):
+        history = [
+            ModelRequest(parts=[UserPromptPart(content="a")]),
+            ModelRequest(parts=[UserPromptPart(content="b")]),
+            ModelResponse(parts=[TextPart(content="c")], model_name="m"),
+        ]
+        first_si, first = await model._map_messages(history, default_params)
+
+        history.append(ModelRequest(parts=[UserPromptPart(content="d")]))
+        with patch.object(
+            model, "_map_user_prompt", wraps=model._map_user_prompt
+        ) as mapped:
+            _, second = await model._map_messages(history, default_params)
+
+        assert mapped.call_count == 1
+        # Merging consecutive user messages must not leak into the cache.
+        assert second[:2] == first
+        assert len(second[0]["parts"]) == 2
+        assert (await model._map_messages(history, default_params))[1] == second
+
+    @pytest.mark.anyio
+    async def test_attachments_are_encoded_once(self, model, default_params):
+        image = BinaryContent(data=b"\x89PNG" * 1000, media_type="image/png")
+        history = [ModelRequest(parts=[UserPromptPart(content=["look", image])])]
+
+        with patch(
+            "code_puppy.gemini_model.base64.b64encode", wraps=base64.b64encode
+        ) as encode:
+            await model._map_messages(history, default_params)
+            # A rebuilt message still reuses the payload of the same attachment.
+            rebuilt = [ModelRequest(parts=[UserPromptPart(content=[image])])]
+            _, contents = await GeminiModel("g", "k")._map_messages(
+                rebuilt, default_params
+            )
+
+        assert encode.call_count == 1
+        inline = contents[0]["parts"][0]["inline_data"]
+        assert base64.b64decode(inline["data"]) == image.data
+
 
 class TestMapModelResponse:
     def test_empty_parts(self, model):
@@ -545,6 +590,57 @@ class TestBuildTools:
         assert "parameters" in decls[0]
         assert "parameters" not in decls[1]
 
+    def test_sanitized_schemas_are_memoized_and_frozen(self, model):
+        clear_schema_cache()
+        schema = {
+            "type": "object",
+            "properties": {"path": {"type": "string", "default": "."}},
+            "required": ["path"],
+            "additionalProperties": False,
+        }
+        tools = [ToolDefinition(name="fn", parameters_json_schema=schema)]
+
+        first = model._build_tools(tools)[0]["functionDeclarations"][0]
+        # An equal schema in a fresh dict hits the cache.
+        again = json.loads(json.dumps(schema))
+        second = model._build_tools(
+            [ToolDefinition(name="fn", parameters_json_schema=again)]
+        )[0]["functionDeclarations"][0]
+
+        assert second["parameters"] is first["parameters"]
+        assert first["parameters"] == _sanitize_schema_for_gemini(schema)
+        with pytest.raises(TypeError):
+            first["parameters"]["properties"]["path"]["type"] = "integer"
+        with pytest.raises(TypeError):
+            first["parameters"]["required"].append("x")
+        assert json.loads(json.dumps(first)) == {
+            "name": "fn",
+            "description": "",
+            "parameters": {
+                "type": "object",
+                "properties": {"path": {"type": "string"}},
+                "required": ["path"],
+            },
+        }
+
+    def test_changed_schema_is_resanitized(self):
+        clear_schema_cache()
+        base = {"type": "object", "properties": {"a": {"type": "string"}}}
+        changed = {"type": "object", "properties": {"a": {"type": "integer"}}}
+
+        assert _cached_sanitized_schema(base)["properties"]["a"]["type"] == "string"
+        assert _cached_sanitized_schema(changed)["properties"]["a"]["type"] == (
+            "integer"
+        )
+
+    def test_deepcopy_of_cached_schema_is_mutable(self):
+        import copy
+
+        clear_schema_cache()
+        copied = copy.deepcopy(_cached_sanitized_schema({"type": "object"}))
+        copied["type"] = "string"
+        assert type(copied) is dict
+
 
 # --- Build generation config ---
 
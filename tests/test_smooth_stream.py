@@ -254,3 +254,14 @@ def test_make_smooth_termflow_writer_respects_disabled(monkeypatch):
 def test_make_smooth_termflow_writer_enabled_by_default(monkeypatch):
     monkeypatch.setattr("code_puppy.config.get_smooth_response_stream", lambda: True)
     assert isinstance(make_smooth_termflow_writer(io.StringIO()), SmoothTermflowWriter)
+
+
+@pytest.mark.parametrize(
+    "value, expected", [(None, True), ("false", False), ("off", False), ("on", True)]
+)
+def test_smooth_response_stream_config_toggle(monkeypatch, value, expected):
+    from code_puppy import config
+
+    monkeypatch.setattr(config, "get_value", lambda key: value)
+    assert config.get_smooth_response_stream() is expected
+    assert config.get_smooth_thinking_stream() is expected
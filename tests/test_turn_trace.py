@@ -0,0 +1,154 @@
+"""Tests for per-turn latency tracing (code_puppy/turn_trace.py)."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from code_puppy import callbacks, turn_trace
+
+
+@pytest.fixture(autouse=True)
+def _trace_dir(tmp_path, monkeypatch):
+    monkeypatch.delenv("CODE_PUPPY_TURN_TRACE", raising=False)
+    turn_trace.set_trace_dir(str(tmp_path))
+    yield tmp_path
+    turn_trace.end_turn(emit=False)
+    turn_trace.set_trace_dir(None)
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_disabled_by_default_and_spans_are_noops():
+    assert turn_trace.begin_turn("hello") is False
+    assert not turn_trace.is_recording()
+    with turn_trace.span("anything") as s:
+        s.set(ignored=True)
+    assert turn_trace.end_turn() is None
+
+
+def test_env_var_opts_in(monkeypatch):
+    monkeypatch.setenv("CODE_PUPPY_TURN_TRACE", "1")
+    assert turn_trace.begin_turn("hello") is True
+    assert turn_trace.is_recording()
+
+
+def test_config_key_opts_in():
+    from code_puppy.config import set_config_value
+
+    set_config_value("enable_turn_trace", "true")
+    assert turn_trace.turn_trace_enabled() is True
+
+
+def test_summary_uses_self_time(_trace_dir):
+    turn_trace.begin_turn("prompt", force=True)
+    with turn_trace.span("outer"):
+        _busy(0.02)
+        with turn_trace.span("inner", detail=1):
+            _busy(0.03)
+    summary = turn_trace.end_turn(emit=False)
+
+    top = {entry["name"]: entry for entry in summary["top"]}
+    assert summary["spans"] == 2
+    assert top["outer"]["total_ms"] >= 50
+    assert 15 <= top["outer"]["self_ms"] < top["outer"]["total_ms"]
+    assert top["inner"]["self_ms"] >= 30
+    assert summary["wall_ms"] >= top["outer"]["total_ms"]
+
+
+def test_exports_jsonl_and_chrome_trace(_trace_dir):
+    turn_trace.begin_turn("prompt", force=True)
+    with turn_trace.span("tool.read_file", path="a.py"):
+        pass
+    summary = turn_trace.end_turn(emit=False)
+
+    lines = (_trace_dir / "turn_trace.jsonl").read_text().splitlines()
+    header, record = (json.loads(line) for line in lines)
+    assert header["name"] == "turn" and header["label"] == "prompt"
+    assert record["name"] == "tool.read_file"
+    assert record["attrs"] == {"path": "a.py"}
+
+    trace = json.loads(open(summary["chrome_trace"]).read())
+    complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["turn", "tool.read_file"]
+    assert complete[1]["cat"] == "tool"
+    assert complete[1]["args"] == {"path": "a.py"}
+
+
+async def test_concurrent_tasks_get_their_own_lanes():
+    turn_trace.begin_turn("fan-out", force=True)
+
+    async def work(name):
+        with turn_trace.span(name):
+            await asyncio.sleep(0.01)
+
+    with turn_trace.span("parent"):
+        await asyncio.gather(work("a"), work("b"))
+    turn = turn_trace._turn
+    turn_trace.end_turn(emit=False)
+
+    spans = {s.name: s for s in turn.spans}
+    assert spans["a"].parent_id == spans["parent"].span_id
+    assert spans["b"].parent_id == spans["parent"].span_id
+    assert len({spans["a"].track, spans["b"].track, spans["parent"].track}) == 3
+
+
+async def test_callback_phases_are_traced():
+    callbacks.clear_callbacks("post_tool_call")
+
+    async def slow_plugin(*_args):
+        await asyncio.sleep(0.01)
+
+    callbacks.register_callback("post_tool_call", slow_plugin)
+    callbacks.register_callback("load_prompt", lambda: "x")
+    try:
+        turn_trace.begin_turn("tools", force=True)
+        await callbacks.on_post_tool_call("read_file", {}, "ok", 1.0)
+        callbacks._trigger_callbacks_sync("load_prompt")
+        summary = turn_trace.end_turn(emit=False)
+    finally:
+        callbacks.clear_callbacks("post_tool_call")
+        callbacks.clear_callbacks("load_prompt")
+
+    names = {entry["name"] for entry in summary["top"]}
+    assert {"callback.post_tool_call", "callback.load_prompt"} <= names
+
+
+def test_record_attaches_to_current_span():
+    turn_trace.begin_turn("r", force=True)
+    with turn_trace.span("outer"):
+        started = time.perf_counter()
+        turn_trace.record("measured", started, size=3)
+    turn = turn_trace._turn
+    turn_trace.end_turn(emit=False)
+
+    measured, outer = turn.spans
+    assert measured.parent_id == outer.span_id
+    assert measured.attrs == {"size": 3}
+
+
+def test_end_turn_prints_summary(monkeypatch):
+    shown = []
+    monkeypatch.setattr("code_puppy.messaging.emit_info", shown.append)
+    turn_trace.begin_turn("p", force=True)
+    with turn_trace.span("session.autosave"):
+        pass
+    turn_trace.end_turn()
+
+    assert "session.autosave" in shown[0]
+    assert "chrome://tracing" in shown[0]
+
+
+def test_old_chrome_traces_are_pruned(monkeypatch, _trace_dir):
+    monkeypatch.setattr(turn_trace, "MAX_CHROME_TRACES", 2)
+    for _ in range(4):
+        turn_trace.begin_turn("p", force=True)
+        turn_trace.end_turn(emit=False)
+
+    assert len(list(_trace_dir.glob("turn-*.json"))) == 2
+    assert len((_trace_dir / "turn_trace.jsonl").read_text().splitlines()) == 4
@@ -1,5 +1,6 @@
 """Full coverage tests for browser_manager.py."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -187,6 +188,140 @@ class TestCleanupSilent:
             assert mgr._initialized is False
 
 
+class TestSharedBrowserPool:
+    @pytest.fixture(autouse=True)
+    def _fresh_pool(self, monkeypatch):
+        from code_puppy.tools.browser import browser_manager as bm
+
+        monkeypatch.setattr(bm, "_shared_pool", None)
+        monkeypatch.setattr(bm, "_cleanup_done", False)
+        monkeypatch.setattr(bm.config, "get_browser_shared_pool", lambda: True)
+        monkeypatch.setattr(bm.config, "get_browser_pool_size", lambda: 1)
+        monkeypatch.setattr(bm.config, "get_browser_pool_max_contexts", lambda: 2)
+
+    @staticmethod
+    def _playwright():
+        browser = MagicMock()
+        browser.close = AsyncMock()
+
+        async def new_context():
+            context = MagicMock(pages=[])
+            context.browser = browser
+            context.close = AsyncMock()
+            return context
+
+        browser.new_context = AsyncMock(side_effect=new_context)
+        pw = MagicMock()
+        pw.chromium.launch = AsyncMock(return_value=browser)
+        pw.chromium.launch_persistent_context = AsyncMock()
+        pw.stop = AsyncMock()
+        starter = MagicMock()
+        starter.start = AsyncMock(return_value=pw)
+        return pw, browser, starter
+
+    async def test_sessions_share_one_browser_with_isolated_contexts(self):
+        from code_puppy.tools.browser import browser_manager as bm
+
+        pw, browser, starter = self._playwright()
+        managers = [bm.BrowserManager(f"pool-{i}") for i in range(2)]
+        with (
+            patch("code_puppy.tools.browser.browser_manager.emit_info"),
+            patch("playwright.async_api.async_playwright", return_value=starter),
+        ):
+            await asyncio.gather(*(m._initialize_browser() for m in managers))
+
+        pw.chromium.launch.assert_awaited_once_with(headless=managers[0].headless)
+        pw.chromium.launch_persistent_context.assert_not_called()
+        assert managers[0]._context is not managers[1]._context
+        assert all(m._browser is browser for m in managers)
+
+    async def test_default_session_keeps_persistent_profile(self):
+        from code_puppy.tools.browser import browser_manager as bm
+
+        pw, _, starter = self._playwright()
+        mgr = bm.BrowserManager("default")
+        with (
+            patch("code_puppy.tools.browser.browser_manager.emit_info"),
+            patch("playwright.async_api.async_playwright", return_value=starter),
+        ):
+            await mgr._initialize_browser()
+
+        pw.chromium.launch_persistent_context.assert_awaited_once()
+        assert mgr._pool is None
+
+    async def test_cap_waits_for_release_and_contexts_are_discarded(self):
+        from code_puppy.tools.browser import browser_manager as bm
+
+        pw, browser, starter = self._playwright()
+        pool = bm.SharedBrowserPool(headless=True, warm=1, max_contexts=1)
+        with patch("playwright.async_api.async_playwright", return_value=starter):
+            await pool.start()
+            first = await pool.acquire()
+            waiter = asyncio.ensure_future(pool.acquire())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+
+            await pool.release(first)
+            second = await asyncio.wait_for(waiter, 1)
+
+        first.close.assert_awaited_once()
+        assert second is not first
+        pw.chromium.launch.assert_awaited_once()
+
+    async def test_released_session_and_exit_cleanup(self):
+        from code_puppy.tools.browser import browser_manager as bm
+
+        pw, browser, starter = self._playwright()
+        mgr = bm.get_browser_manager("pool-release")
+        with (
+            patch("code_puppy.tools.browser.browser_manager.emit_info"),
+            patch("playwright.async_api.async_playwright", return_value=starter),
+        ):
+            await mgr.async_initialize()
+            context = mgr._context
+            await bm.release_pooled_browser("pool-release")
+
+            context.close.assert_awaited_once()
+            assert "pool-release" not in bm._active_managers
+            context.storage_state.assert_not_called()
+
+            await bm.cleanup_all_browsers()
+
+        browser.close.assert_awaited_once()
+        pw.stop.assert_awaited_once()
+        assert bm._shared_pool is None
+
+    async def test_real_chromium_contexts_are_isolated_and_fresh(self, tmp_path):
+        """Runs against a real Chromium; skipped when none can be launched."""
+        pytest.importorskip("playwright.async_api")
+        from code_puppy.tools.browser import browser_manager as bm
+
+        pool = bm.SharedBrowserPool(headless=True, warm=1, max_contexts=2)
+        try:
+            try:
+                await pool.start()
+            except Exception as exc:  # browser not installed or not runnable
+                pytest.skip(f"Chromium unavailable: {exc.__class__.__name__}")
+
+            html = tmp_path / "page.html"
+            html.write_text("<h1>pool</h1>")
+            cookie = {"name": "sid", "value": "1", "url": "http://localhost/"}
+            first, second = await asyncio.gather(pool.acquire(), pool.acquire())
+            await first.add_cookies([cookie])
+            page = await second.new_page()
+            await page.goto(html.as_uri())
+
+            assert first.browser is second.browser
+            assert await second.cookies() == []
+            assert await page.text_content("h1") == "pool"
+
+            await pool.release(first)
+            reused = await pool.acquire()
+            assert await reused.cookies() == []
+        finally:
+            await pool.close()
+
+
 class TestSyncCleanup:
     def test_sync_cleanup_with_active_managers(self):
         from code_puppy.tools.browser import browser_manager as bm
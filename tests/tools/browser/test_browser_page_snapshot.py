@@ -0,0 +1,212 @@
+"""Tests for incremental page snapshots (browser_page_snapshot.py).
+
+The page's JS engine is stubbed: each ``evaluate`` returns what the in-page
+script would (the epoch plus only the rescanned categories), so these cover
+the Python side -- merging, unchanged / delta / full responses, when a full
+rescan is requested and which conversation a delta is meant for. ``test_real_chromium_full_unchanged_delta`` runs
+the in-page script itself and is skipped when Chromium cannot be launched.
+"""
+
+import itertools
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ToolReturnPart
+
+from code_puppy.tools.browser import browser_page_snapshot as snap
+
+MOD = "code_puppy.tools.browser.browser_page_snapshot"
+
+FULL_DATA = {
+    "visible_text": "Checkout",
+    "headings": [{"level": "h1", "text": "Checkout"}],
+    "buttons": [{"name": "Pay", "disabled": True}],
+    "links": [{"text": "Home", "href": "/"}],
+    "inputs": [],
+    "landmarks": [{"role": "main", "label": None}],
+}
+
+
+class _Page:
+    """Weak-referenceable stand-in for a Playwright page."""
+
+    def __init__(self, *results):
+        self.evaluate = AsyncMock(
+            side_effect=[
+                {"epoch": epoch, "url": "file:///shop.html", "title": "Shop", "data": d}
+                for epoch, d in results
+            ]
+        )
+
+
+@contextmanager
+def _page(page):
+    manager = MagicMock()
+    manager.get_current_page = AsyncMock(return_value=page)
+    with (
+        patch(f"{MOD}.get_session_browser_manager", return_value=manager),
+        patch(f"{MOD}.emit_info"),
+        patch(f"{MOD}.emit_success"),
+    ):
+        yield
+
+
+class _Conversation:
+    """Calls the snapshot the way the tool does, keeping each result."""
+
+    _ids = itertools.count()
+
+    def __init__(self):
+        self.messages = []
+
+    async def snapshot(self, **kwargs):
+        call_id = f"call-{next(self._ids)}"
+        result = await snap.get_page_snapshot(
+            history=list(self.messages), tool_call_id=call_id, **kwargs
+        )
+        self.messages.append(
+            ModelRequest(
+                parts=[ToolReturnPart("browser_page_snapshot", result, call_id)]
+            )
+        )
+        return result
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(snap, "_last_snapshots", snap.weakref.WeakKeyDictionary())
+
+
+async def test_first_full_then_unchanged_then_delta():
+    page = _Page(
+        ("e1", FULL_DATA),
+        ("e1", {"inputs": []}),
+        (
+            "e1",
+            {
+                "buttons": [{"name": "Pay", "disabled": False}],
+                "inputs": [],
+            },
+        ),
+    )
+    chat = _Conversation()
+    with _page(page):
+        first = await chat.snapshot(limit=10)
+        second = await chat.snapshot(limit=10)
+        third = await chat.snapshot(limit=10)
+
+    assert first["snapshot"] == "full"
+    assert first["headings"] == FULL_DATA["headings"]
+    assert page.evaluate.await_args_list[0].args[1] == {"limit": 10, "epoch": None}
+    assert page.evaluate.await_args_list[1].args[1] == {"limit": 10, "epoch": "e1"}
+
+    assert second == {
+        "success": True,
+        "snapshot": "unchanged",
+        "url": "file:///shop.html",
+        "title": "Shop",
+    }
+    assert third["snapshot"] == "delta"
+    assert third["changes"] == {
+        "buttons": {
+            "count": 1,
+            "added": [{"name": "Pay", "disabled": False}],
+            "removed": [{"name": "Pay", "disabled": True}],
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    "second_call,expected_epoch",
+    [({"limit": 10, "full": True}, None), ({"limit": 5}, None)],
+)
+async def test_full_or_new_limit_requests_a_rescan(second_call, expected_epoch):
+    page = _Page(("e1", FULL_DATA), ("e1", FULL_DATA))
+    chat = _Conversation()
+    with _page(page):
+        await chat.snapshot(limit=10)
+        result = await chat.snapshot(**second_call)
+
+    assert page.evaluate.await_args_list[1].args[1]["epoch"] is expected_epoch
+    assert result["snapshot"] == "full"
+
+
+async def test_new_document_returns_full_snapshot():
+    page = _Page(("e1", FULL_DATA), ("e2", {**FULL_DATA, "links": []}))
+    chat = _Conversation()
+    with _page(page):
+        await chat.snapshot()
+        result = await chat.snapshot()
+
+    assert result["snapshot"] == "full"
+    assert result["links"] == []
+
+
+@pytest.mark.parametrize("forget", ["new_conversation", "compacted"])
+async def test_conversation_without_the_last_result_gets_full(forget):
+    page = _Page(("e1", FULL_DATA), ("e1", FULL_DATA))
+    chat = _Conversation()
+    with _page(page):
+        await chat.snapshot()
+        if forget == "new_conversation":
+            chat = _Conversation()  # /clear, agent switch or another agent
+        else:
+            chat.messages = chat.messages[1:]  # summarised away
+        result = await chat.snapshot()
+
+    assert page.evaluate.await_args_list[1].args[1]["epoch"] is None
+    assert result["snapshot"] == "full"
+    assert result["headings"] == FULL_DATA["headings"]
+
+
+def test_diff_reports_multiset_changes_and_reorders():
+    old = {"links": [{"href": "/a"}, {"href": "/b"}, {"href": "/b"}], "title": "x"}
+    new = {"links": [{"href": "/b"}, {"href": "/c"}, {"href": "/a"}], "title": "x"}
+
+    assert snap.diff_page_snapshots(old, new) == {
+        "links": {"count": 3, "added": [{"href": "/c"}], "removed": [{"href": "/b"}]}
+    }
+    swapped = {"links": list(reversed(old["links"])), "title": "x"}
+    assert snap.diff_page_snapshots(old, swapped)["links"]["reordered"] is True
+
+
+@pytest.fixture
+async def chromium_page():
+    async_api = pytest.importorskip("playwright.async_api")
+    async with async_api.async_playwright() as pw:
+        try:
+            browser = await pw.chromium.launch(headless=True)
+        except Exception as exc:  # browser not installed or not runnable here
+            pytest.skip(f"Chromium unavailable: {exc.__class__.__name__}")
+        try:
+            yield await browser.new_page()
+        finally:
+            await browser.close()
+
+
+async def test_real_chromium_full_unchanged_delta(chromium_page, tmp_path):
+    html = tmp_path / "shop.html"
+    html.write_text(
+        "<html><head><title>Shop</title></head><body><main>"
+        "<h1>Checkout</h1><a href='/'>Home</a><button disabled>Pay</button>"
+        "</main></body></html>"
+    )
+    await chromium_page.goto(html.as_uri())
+
+    chat = _Conversation()
+    with _page(chromium_page):
+        first = await chat.snapshot(limit=10)
+        second = await chat.snapshot(limit=10)
+        await chromium_page.evaluate(
+            "() => { document.querySelector('button').disabled = false; }"
+        )
+        third = await chat.snapshot(limit=10)
+
+    assert first["snapshot"] == "full"
+    assert first["title"] == "Shop"
+    assert {"level": "h1", "text": "Checkout"} in first["headings"]
+    assert second["snapshot"] == "unchanged"
+    assert third["snapshot"] == "delta"
+    assert set(third["changes"]) == {"buttons"}
+    assert third["changes"]["buttons"]["added"][0]["disabled"] is False
@@ -0,0 +1,195 @@
+"""Tests for the validated grep result cache (grep_cache.py)."""
+
+import json
+import os
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from code_puppy.tools import fs_access, grep_cache
+from code_puppy.tools.common import write_project_file
+from code_puppy.tools.file_operations import MatchInfo, _grep
+from code_puppy.tools.grep_cache import (
+    GrepResultCache,
+    get_grep_cache,
+    grep_cache_key,
+    grep_cache_stats,
+)
+
+
+def _match(path, line=1, text="hit"):
+    return MatchInfo(file_path=str(path), line_number=line, line_content=text)
+
+
+def _touch_later(path, text):
+    """Rewrite ``path`` so its (mtime_ns, size) differs from before."""
+    st = os.stat(path)
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_hit_after_put_and_counters(tmp_path):
+    f = tmp_path / "a.py"
+    f.write_text("hit\n")
+    cache = GrepResultCache(4)
+    key = grep_cache_key("hit", str(tmp_path), ["node_modules"])
+
+    assert cache.get(key) is None
+    cache.put(key, [_match(f)], fs_access.tree_generation())
+    assert [m.file_path for m in cache.get(key)] == [str(f)]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_tree_generation_bump_invalidates(tmp_path):
+    cache = GrepResultCache(4)
+    key = grep_cache_key("x", str(tmp_path), [])
+    cache.put(key, [], fs_access.tree_generation())
+
+    fs_access.note_tree_mutation()
+
+    assert cache.get(key) is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_matched_file_change_invalidates(tmp_path):
+    f = tmp_path / "a.py"
+    f.write_text("hit\n")
+    cache = GrepResultCache(4)
+    key = grep_cache_key("hit", str(tmp_path), [])
+    cache.put(key, [_match(f)], fs_access.tree_generation())
+
+    _touch_later(f, "changed outside the agent\n")
+
+    assert cache.get(key) is None
+
+
+def test_matched_file_deleted_invalidates(tmp_path):
+    f = tmp_path / "a.py"
+    f.write_text("hit\n")
+    cache = GrepResultCache(4)
+    key = grep_cache_key("hit", str(tmp_path), [])
+    cache.put(key, [_match(f)], fs_access.tree_generation())
+
+    os.remove(f)
+
+    assert cache.get(key) is None
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache = GrepResultCache(4)
+    key = grep_cache_key("x", str(tmp_path), [])
+    cache.put(key, [], fs_access.tree_generation())
+    monkeypatch.setattr(grep_cache, "GREP_CACHE_TTL_SECONDS", -1.0)
+
+    assert cache.get(key) is None
+
+
+def test_put_with_stale_generation_is_never_served(tmp_path):
+    cache = GrepResultCache(4)
+    key = grep_cache_key("x", str(tmp_path), [])
+    started_at = fs_access.tree_generation()
+    fs_access.note_tree_mutation()  # a write landed while the search ran
+
+    cache.put(key, [], started_at)
+
+    assert cache.get(key) is None
+
+
+def test_lru_eviction_and_disabled_cache(tmp_path):
+    cache = GrepResultCache(2)
+    gen = fs_access.tree_generation()
+    keys = [grep_cache_key(p, str(tmp_path), []) for p in ("a", "b", "c")]
+    cache.put(keys[0], [], gen)
+    cache.put(keys[1], [], gen)
+    cache.get(keys[0])
+    cache.put(keys[2], [], gen)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == []
+
+    disabled = GrepResultCache(0)
+    disabled.put(keys[0], [], gen)
+    assert disabled.stats()["size"] == 0
+
+
+def test_key_includes_ignore_configuration(tmp_path):
+    assert grep_cache_key("x", "/d", ["a"]) != grep_cache_key("x", "/d", ["a", "b"])
+
+
+def test_cache_resizes_from_config():
+    with patch("code_puppy.config.get_grep_cache_size", return_value=3):
+        assert get_grep_cache().max_size == 3
+    with patch("code_puppy.config.get_grep_cache_size", return_value=0):
+        assert get_grep_cache().max_size == 0
+
+
+@pytest.fixture
+def fake_rg(tmp_path):
+    """Patch ripgrep with a fake reporting one match per call in a.py."""
+    target = tmp_path / "a.py"
+    target.write_text("needle\n")
+    event = {
+        "type": "match",
+        "data": {
+            "path": {"text": str(target)},
+            "lines": {"text": "needle\n"},
+            "line_number": 1,
+        },
+    }
+    completed = subprocess.CompletedProcess(
+        args=[], returncode=0, stdout=json.dumps(event) + "\n", stderr=""
+    )
+    with (
+        patch("shutil.which", return_value="/usr/bin/rg"),
+        patch("subprocess.run", return_value=completed) as run,
+        patch("code_puppy.tools.file_operations.get_message_bus"),
+    ):
+        yield run, target
+
+
+def test_repeat_grep_skips_ripgrep(fake_rg, tmp_path):
+    run, target = fake_rg
+
+    first = _grep(None, "needle", str(tmp_path))
+    second = _grep(None, "needle", str(tmp_path))
+
+    assert run.call_count == 1
+    assert [m.file_path for m in second.matches] == [str(target)]
+    assert first.matches == second.matches
+    assert grep_cache_stats()["hits"] == 1
+
+
+def test_agent_write_forces_fresh_search(fake_rg, tmp_path):
+    run, _target = fake_rg
+    _grep(None, "needle", str(tmp_path))
+
+    write_project_file(str(tmp_path / "new.py"), "needle\n")
+    _grep(None, "needle", str(tmp_path))
+
+    assert run.call_count == 2
+
+
+def test_different_flags_are_separate_entries(fake_rg, tmp_path):
+    run, _target = fake_rg
+    _grep(None, "needle", str(tmp_path))
+    _grep(None, "-i needle", str(tmp_path))
+
+    assert run.call_count == 2
+
+
+def test_errors_are_not_cached(tmp_path):
+    failed = subprocess.CompletedProcess(
+        args=[], returncode=2, stdout="", stderr="regex parse error"
+    )
+    with (
+        patch("shutil.which", return_value="/usr/bin/rg"),
+        patch("subprocess.run", return_value=failed) as run,
+        patch("code_puppy.tools.file_operations.get_message_bus"),
+    ):
+        assert _grep(None, "(", str(tmp_path)).error
+        assert _grep(None, "(", str(tmp_path)).error
+
+    assert run.call_count == 2
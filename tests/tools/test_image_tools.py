@@ -0,0 +1,89 @@
+"""Tests for image preparation and its on-disk cache (tools/image_tools.py)."""
+
+import io
+import os
+import threading
+
+import pytest
+from PIL import Image
+
+from code_puppy import config
+from code_puppy.tools import image_tools
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache" / "image_prep"
+
+
+def _write_image(path, size, fmt="PNG", color=(200, 40, 40)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, format=fmt)
+    path.write_bytes(buf.getvalue())
+    return path
+
+
+async def test_large_image_is_resized_once_then_served_from_cache(
+    tmp_path, monkeypatch
+):
+    path = _write_image(tmp_path / "big.png", (4096, 1024))
+    calls = []
+    original = image_tools._validate_and_prepare_image
+
+    def tracking(*args, **kwargs):
+        calls.append(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(image_tools, "_validate_and_prepare_image", tracking)
+
+    first = await image_tools.load_image(str(path))
+    second = await image_tools.load_image(str(path))
+
+    assert len(calls) == 1 and calls[0].startswith("image_prep_")
+    assert first.metadata["cache_hit"] is False
+    assert second.metadata["cache_hit"] is True
+    assert second.metadata["output_size"] == [2048, 512]
+    assert second.metadata["was_resized"] is True
+    assert first.content[1].data == second.content[1].data
+    assert second.content[1].media_type == "image/png"
+
+
+async def test_cache_is_keyed_by_content_not_path(tmp_path):
+    png = _write_image(tmp_path / "shot.png", (64, 64))
+    copy = tmp_path / "shot-copy.jpg"
+    copy.write_bytes(png.read_bytes())
+
+    await image_tools.prepare_image_file(str(png))
+    prepared = await image_tools.prepare_image_file(str(copy))
+
+    assert prepared["cache_hit"] is True
+    assert prepared["guessed_media_type"] == "image/jpeg"
+    assert prepared["mime_type_matches_extension"] is False
+
+
+async def test_invalid_image_is_reported_and_not_cached(tmp_path, _cache_dir):
+    path = tmp_path / "fake.png"
+    path.write_bytes(b"not an image")
+
+    result = await image_tools.load_image(str(path))
+
+    assert result["success"] is False
+    assert "not a valid image" in result["error"]
+    assert not list(_cache_dir.glob("*.json"))
+
+
+async def test_least_recently_used_entries_are_pruned(
+    tmp_path, monkeypatch, _cache_dir
+):
+    old = _write_image(tmp_path / "old.jpg", (32, 32), "JPEG", (1, 2, 3))
+    new = _write_image(tmp_path / "new.jpg", (32, 32), "JPEG", (9, 8, 7))
+    await image_tools.prepare_image_file(str(old))
+    (entry,) = _cache_dir.glob("*.json")
+    entry_bytes = entry.stat().st_size + entry.with_suffix(".bin").stat().st_size
+    monkeypatch.setattr(image_tools, "IMAGE_CACHE_MAX_BYTES", entry_bytes * 3 // 2)
+    os.utime(entry, (1, 1))
+    await image_tools.prepare_image_file(str(new))
+
+    assert (await image_tools.prepare_image_file(str(new)))["cache_hit"] is True
+    assert (await image_tools.prepare_image_file(str(old)))["cache_hit"] is False
@@ -0,0 +1,127 @@
+"""Tests for the sparse line-offset index behind ranged read_file calls."""
+
+import itertools
+import os
+from unittest.mock import patch
+
+import pytest
+
+from code_puppy.tools import line_index
+from code_puppy.tools.file_operations import _read_file
+from code_puppy.tools.line_index import LineIndex, clear_line_indexes, get_line_index
+
+
+@pytest.fixture(autouse=True)
+def _small_index(monkeypatch):
+    """Index every file, with a tiny stride and chunk so edges get exercised."""
+    monkeypatch.setattr(line_index, "LINE_INDEX_MIN_BYTES", 0)
+    monkeypatch.setattr(line_index, "LINE_INDEX_STRIDE", 3)
+    monkeypatch.setattr(line_index, "_SCAN_CHUNK_BYTES", 7)
+    clear_line_indexes()
+    with patch("code_puppy.tools.file_operations.get_message_bus"):
+        yield
+    clear_line_indexes()
+
+
+def _text_mode_slice(path, start_line, num_lines):
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        start = start_line - 1
+        return "".join(itertools.islice(f, start, start + num_lines))
+
+
+def _index(path, stride=3):
+    st = os.stat(path)
+    return LineIndex(str(path), st.st_size, st.st_mtime_ns, stride)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"".join(b"line %d\n" % i for i in range(1, 26)),
+        b"".join(b"row %d\r\n" % i for i in range(1, 20)) + b"tail",
+        b"\n\n\nx\n\n" + b"a" * 40 + b"\n\xff\xfe bad utf8\n",
+        b"only one line",
+        b"",
+    ],
+)
+def test_ranged_reads_match_text_mode(tmp_path, raw):
+    path = tmp_path / "f.txt"
+    path.write_bytes(raw)
+    index = _index(path)
+
+    for start in range(1, 28):
+        for count in (1, 2, 5):
+            assert index.read_lines(start, count) == _text_mode_slice(
+                path, start, count
+            ), (start, count)
+
+
+def test_total_lines_matches_text_mode(tmp_path):
+    path = tmp_path / "f.txt"
+    for raw in (b"a\nb\n", b"a\nb", b"", b"\r\n\r\n", b"x" * 20):
+        path.write_bytes(raw)
+        index = _index(path)
+        index.ensure_lines(None)
+        with open(path, encoding="utf-8") as f:
+            assert index.total_lines == sum(1 for _ in f), raw
+
+
+def test_scan_is_incremental(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"".join(b"%04d\n" % i for i in range(200)))
+    index = _index(path)
+
+    assert index.read_lines(2, 2) == "0001\n0002\n"
+    assert not index.complete
+    assert index.total_lines is None
+
+    assert index.read_lines(199, 5) == "0198\n0199\n"
+    assert index.total_lines == 200
+
+
+def test_bare_carriage_return_falls_back(tmp_path):
+    path = tmp_path / "mac.txt"
+    path.write_bytes(b"one\rtwo\rthree\n")
+    index = _index(path)
+
+    assert index.read_lines(1, 1) is None
+    assert index.has_bare_cr
+
+
+def test_cache_is_keyed_on_size_and_mtime(tmp_path):
+    path = tmp_path / "f.txt"
+    path.write_text("a\nb\n")
+    first = get_line_index(str(path))
+    assert get_line_index(str(path)) is first
+
+    path.write_text("a\nb\nc\n")
+
+    assert get_line_index(str(path)) is not first
+
+
+def test_small_files_skip_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(line_index, "LINE_INDEX_MIN_BYTES", 1024)
+    path = tmp_path / "f.txt"
+    path.write_text("a\n")
+    assert get_line_index(str(path)) is None
+
+
+def test_read_file_uses_index_and_reports_total_lines(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text("".join(f"entry {i}\n" for i in range(1, 101)))
+
+    out = _read_file(None, str(path), start_line=51, num_lines=3)
+
+    assert out.error is None
+    assert out.content == "entry 51\nentry 52\nentry 53\n"
+    assert out.total_lines == 100
+
+
+def test_read_file_bare_cr_still_reads_correctly(tmp_path):
+    path = tmp_path / "mac.txt"
+    path.write_bytes(b"one\rtwo\rthree\n")
+
+    out = _read_file(None, str(path), start_line=2, num_lines=1)
+
+    assert out.content == "two\n"
+    assert out.total_lines is None
@@ -0,0 +1,183 @@
+"""Tests for the parallel sub-agent fan-out tool (subagent_fanout.py)."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+from code_puppy.tools import subagent_invocation
+from code_puppy.tools.agent_tools import AgentInvokeOutput
+from code_puppy.tools.subagent_fanout import (
+    MAX_PARALLEL_TASKS,
+    ParallelAgentTask,
+    _invoke_agents_parallel_impl,
+)
+from code_puppy.tools.subagent_invocation import (
+    _resolve_subagent_model,
+    shared_subagent_models,
+)
+
+
+@pytest.fixture(autouse=True)
+def _quiet():
+    with (
+        patch("code_puppy.tools.subagent_fanout.emit_info"),
+        patch("code_puppy.tools.subagent_fanout.emit_success"),
+        patch("code_puppy.tools.subagent_fanout.emit_warning"),
+        patch("code_puppy.tools.subagent_fanout.emit_error"),
+    ):
+        yield
+    subagent_invocation._interrupted_subagents.clear()
+
+
+def _tasks(*names):
+    return [ParallelAgentTask(agent_name=n, prompt=f"do {n}") for n in names]
+
+
+def _fake_impl(delays, *, failures=(), on_start=None):
+    """Fake ``_invoke_agent_impl`` sleeping ``delays[agent_name]`` seconds."""
+    active = {"now": 0, "peak": 0}
+
+    async def fake(context, agent_name, prompt, session_id=None, run_state=None):
+        run_state.session_id = f"{agent_name}-session-x"
+        config = MagicMock()
+        config.get_message_history.return_value = [
+            ModelRequest(parts=[UserPromptPart(prompt)]),
+            ModelResponse(parts=[TextPart(f"{agent_name} halfway")]),
+        ]
+        run_state.agent_config = config
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        try:
+            if on_start:
+                on_start(agent_name)
+            await asyncio.sleep(delays[agent_name])
+        except asyncio.CancelledError:
+            subagent_invocation.record_interrupted_subagent(
+                agent_name=agent_name,
+                session_id=run_state.session_id,
+                saved_count=2,
+            )
+            raise
+        finally:
+            active["now"] -= 1
+        error = "boom" if agent_name in failures else None
+        return AgentInvokeOutput(
+            response=None if error else f"{agent_name} done",
+            agent_name=agent_name,
+            session_id=run_state.session_id,
+            model_name="m",
+            error=error,
+        )
+
+    return fake, active
+
+
+@pytest.mark.asyncio
+async def test_results_keep_submission_order_and_respect_concurrency():
+    fake, active = _fake_impl({"a": 0.03, "b": 0.01, "c": 0.02, "d": 0.0})
+    with patch("code_puppy.tools.subagent_fanout._invoke_agent_impl", fake):
+        out = await _invoke_agents_parallel_impl(
+            MagicMock(), _tasks("a", "b", "c", "d"), max_concurrency=2
+        )
+    assert [r.agent_name for r in out.results] == ["a", "b", "c", "d"]
+    assert all(r.status == "completed" for r in out.results)
+    assert out.completed == 4
+    assert active["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_are_reported_per_task():
+    fake, _ = _fake_impl({"a": 0.0, "b": 0.0}, failures={"b"})
+    with patch("code_puppy.tools.subagent_fanout._invoke_agent_impl", fake):
+        out = await _invoke_agents_parallel_impl(MagicMock(), _tasks("a", "b"))
+    assert [r.status for r in out.results] == ["completed", "failed"]
+    assert out.results[1].error == "boom"
+    assert (out.completed, out.failed) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_partial_results():
+    fake, _ = _fake_impl({"fast": 0.0, "slow": 5.0, "queued": 0.0})
+    with patch("code_puppy.tools.subagent_fanout._invoke_agent_impl", fake):
+        out = await _invoke_agents_parallel_impl(
+            MagicMock(),
+            _tasks("fast", "slow", "queued"),
+            max_concurrency=2,
+            timeout_seconds=0.1,
+        )
+    fast, slow, queued = out.results
+    assert fast.status == "completed"
+    assert slow.status == "timed_out"
+    assert slow.partial_response == "slow halfway"
+    assert slow.session_id == "slow-session-x"
+    # "queued" got the free slot once "fast" finished, so it ran too.
+    assert queued.status == "completed"
+    assert out.timed_out == 1
+    # The batch reports the timeout itself: no dangling-call breadcrumb.
+    assert subagent_invocation.drain_interrupted_subagents() == []
+
+
+@pytest.mark.asyncio
+async def test_tasks_never_started_are_timed_out():
+    fake, _ = _fake_impl({"slow": 5.0, "waiting": 0.0})
+    with patch("code_puppy.tools.subagent_fanout._invoke_agent_impl", fake):
+        out = await _invoke_agents_parallel_impl(
+            MagicMock(),
+            _tasks("slow", "waiting"),
+            max_concurrency=1,
+            timeout_seconds=0.05,
+        )
+    waiting = out.results[1]
+    assert waiting.status == "timed_out"
+    assert waiting.duration_ms is None
+    assert "Not started" in waiting.error
+
+
+@pytest.mark.asyncio
+async def test_rejects_empty_and_oversized_batches():
+    out = await _invoke_agents_parallel_impl(MagicMock(), [])
+    assert out.error
+    too_many = _tasks(*[f"a{i}" for i in range(MAX_PARALLEL_TASKS + 1)])
+    out = await _invoke_agents_parallel_impl(MagicMock(), too_many)
+    assert out.error and not out.results
+
+
+@pytest.mark.asyncio
+async def test_parent_cancellation_cancels_every_task():
+    started = asyncio.Event()
+    fake, active = _fake_impl(
+        {"a": 5.0, "b": 5.0}, on_start=lambda _name: started.set()
+    )
+    with patch("code_puppy.tools.subagent_fanout._invoke_agent_impl", fake):
+        batch = asyncio.create_task(
+            _invoke_agents_parallel_impl(MagicMock(), _tasks("a", "b"))
+        )
+        await started.wait()
+        batch.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await batch
+    assert active["now"] == 0
+
+
+def test_shared_models_resolve_once_per_batch():
+    agent_config = MagicMock()
+    agent_config.get_model_name.return_value = "model-a"
+    model = MagicMock()
+    with (
+        patch(
+            "code_puppy.model_factory.ModelFactory.load_config",
+            return_value={"model-a": {}},
+        ),
+        patch(
+            "code_puppy.agents._builder.load_model_with_fallback",
+            return_value=(model, "model-a"),
+        ) as resolve,
+    ):
+        with shared_subagent_models():
+            first = _resolve_subagent_model(agent_config, "a", None, "g")
+            second = _resolve_subagent_model(agent_config, "b", None, "g")
+        _resolve_subagent_model(agent_config, "c", None, "g")
+    assert first == second == (model, "model-a")
+    assert resolve.call_count == 2
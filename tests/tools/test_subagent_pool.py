@@ -0,0 +1,279 @@
+"""Tests for the warm sub-agent pool (code_puppy/tools/subagent_pool.py).
+
+Covers the pool's LRU/exclusive-checkout contract, stat-fingerprint
+invalidation, and the ``_invoke_agent_impl`` integration: a repeat
+invocation of the same agent reuses the built instance, while a config
+change, an MCP toolset change or a failed run forces a rebuild.
+"""
+
+from contextlib import ExitStack, contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from code_puppy import config as cp_config
+from code_puppy.tools import subagent_pool
+from code_puppy.tools.subagent_invocation import _invoke_agent_impl
+from code_puppy.tools.subagent_pool import (
+    PooledSubagent,
+    SubagentPool,
+    config_fingerprint,
+    get_subagent_pool,
+    invalidate_subagent_pool,
+)
+
+
+def _entry(name="a"):
+    return PooledSubagent(
+        agent_config=MagicMock(name=f"config-{name}"),
+        agent=MagicMock(name=f"agent-{name}"),
+        model=MagicMock(),
+        effective_model_name="m",
+        instructions="i",
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    invalidate_subagent_pool()
+    yield
+    invalidate_subagent_pool()
+
+
+class TestSubagentPool:
+    def test_acquire_miss_then_hit_after_release(self):
+        pool = SubagentPool(4)
+        fp = ("fp",)
+        assert pool.acquire("k", fp) is None
+        entry = _entry()
+        pool.release("k", fp, entry)
+        assert pool.acquire("k", fp) is entry
+        assert pool.stats()["hits"] == 1
+        assert pool.stats()["misses"] == 1
+
+    def test_checkout_is_exclusive(self):
+        pool = SubagentPool(4)
+        fp = ("fp",)
+        pool.release("k", fp, _entry())
+        assert pool.acquire("k", fp) is not None
+        # The only idle entry is checked out; a concurrent caller must build.
+        assert pool.acquire("k", fp) is None
+
+    def test_lru_eviction_bounds_total_size(self):
+        pool = SubagentPool(2)
+        fp = ("fp",)
+        pool.release("a", fp, _entry("a"))
+        pool.release("b", fp, _entry("b"))
+        pool.release("c", fp, _entry("c"))
+        assert len(pool) == 2
+        assert pool.stats()["evictions"] == 1
+        assert pool.acquire("a", fp) is None
+        assert pool.acquire("c", fp) is not None
+
+    def test_fingerprint_change_drops_everything(self):
+        pool = SubagentPool(4)
+        pool.release("k", ("old",), _entry())
+        assert pool.acquire("k", ("new",)) is None
+        assert len(pool) == 0
+        assert pool.stats()["invalidations"] == 1
+
+    def test_stale_release_is_dropped(self):
+        pool = SubagentPool(4)
+        pool.acquire("k", ("new",))
+        pool.release("k", ("old",), _entry())
+        assert len(pool) == 0
+
+    def test_zero_size_disables_pooling(self):
+        pool = SubagentPool(0)
+        pool.release("k", ("fp",), _entry())
+        assert pool.acquire("k", ("fp",)) is None
+
+    def test_pool_size_follows_config(self):
+        cp_config.set_config_value("subagent_pool_size", "3")
+        assert get_subagent_pool().max_size == 3
+        cp_config.set_config_value("subagent_pool_size", "bogus")
+        assert get_subagent_pool().max_size == cp_config.DEFAULT_SUBAGENT_POOL_SIZE
+
+
+class TestConfigFingerprint:
+    def test_agent_file_edit_changes_fingerprint(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cp_config, "AGENTS_DIR", str(tmp_path))
+        before = config_fingerprint()
+        (tmp_path / "reviewer.json").write_text("{}")
+        assert config_fingerprint() != before
+
+    def test_config_write_changes_fingerprint(self):
+        before = config_fingerprint()
+        cp_config.set_config_value("temperature", "0.3")
+        assert config_fingerprint() != before
+
+    def test_stable_when_nothing_changes(self):
+        assert config_fingerprint() == config_fingerprint()
+
+
+def _agent_config():
+    config = MagicMock()
+    config.name = "reviewer"
+
+    @contextmanager
+    def temporary_override(_model_name):
+        yield
+
+    config.temporary_model_name_override.side_effect = temporary_override
+    config.get_model_name.return_value = "model-a"
+    config.get_full_system_prompt.return_value = "Test instructions"
+    config.get_message_history.return_value = []
+    return config
+
+
+def _passthrough_retry(*_args, **_kwargs):
+    def _decorator(func):
+        return func
+
+    return _decorator
+
+
+async def _invoke_n(n, *, servers=None, run_side_effect=None, between=None):
+    """Invoke ``reviewer`` ``n`` times; return (load_agent, build) mocks."""
+    result = MagicMock()
+    result.output = "ok"
+    result.all_messages.return_value = []
+    temp_agent = MagicMock()
+    temp_agent.run = AsyncMock(return_value=result, side_effect=run_side_effect)
+    manager = MagicMock()
+    manager.get_servers_for_agent.side_effect = lambda agent_name=None: list(
+        servers() if servers else []
+    )
+
+    with ExitStack() as stack:
+        p = stack.enter_context
+        prefix = "code_puppy.tools.subagent_invocation"
+        for name in (
+            "get_message_bus",
+            "set_session_context",
+            "emit_info",
+            "emit_error",
+            "emit_success",
+            "emit_warning",
+            "_save_session_history",
+        ):
+            p(patch(f"{prefix}.{name}"))
+        p(patch(f"{prefix}.get_session_context", return_value="parent"))
+        p(patch(f"{prefix}.on_agent_run_context", return_value=[]))
+        load_agent = p(
+            patch(
+                "code_puppy.agents.agent_manager.load_agent",
+                side_effect=lambda _name: _agent_config(),
+            )
+        )
+        p(
+            patch(
+                f"{prefix}._resolve_subagent_model",
+                return_value=(MagicMock(), "model-a"),
+            )
+        )
+        build = p(
+            patch(
+                f"{prefix}._build_subagent_agent",
+                return_value=(temp_agent, ["list_files"]),
+            )
+        )
+        p(
+            patch(
+                "code_puppy.model_utils.prepare_prompt_for_model",
+                side_effect=lambda _m, system, user, **_kw: MagicMock(
+                    instructions=system, user_prompt=user
+                ),
+            )
+        )
+        p(patch("code_puppy.mcp_.get_mcp_manager", return_value=manager))
+        p(
+            patch(
+                "code_puppy.agents._builder.autostart_bound_servers_async",
+                new=AsyncMock(),
+            )
+        )
+        p(
+            patch(
+                "code_puppy.agents.retry_profiles.make_streaming_retry",
+                new=_passthrough_retry,
+            )
+        )
+        p(patch("code_puppy.config.get_output_level", return_value="medium"))
+
+        for i in range(n):
+            if between and i:
+                between()
+            try:
+                await _invoke_agent_impl(MagicMock(), "reviewer", f"task {i}")
+            except BaseException:
+                pass
+    return load_agent, build
+
+
+class TestInvokeAgentPooling:
+    @pytest.mark.asyncio
+    async def test_repeat_invocation_reuses_built_agent(self):
+        load_agent, build = await _invoke_n(3)
+        assert load_agent.call_count == 1
+        assert build.call_count == 1
+        assert subagent_pool._pool.stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_rebuilds_every_time(self):
+        cp_config.set_config_value("subagent_pool_size", "0")
+        load_agent, build = await _invoke_n(3)
+        assert load_agent.call_count == 3
+        assert build.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_config_change_invalidates(self):
+        counter = iter(range(100))
+        load_agent, build = await _invoke_n(
+            2,
+            between=lambda: cp_config.set_config_value(
+                "temperature", str(next(counter))
+            ),
+        )
+        assert build.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_mcp_toolset_change_rebuilds_agent_only(self):
+        servers = [[object()], [object()]]
+        calls = iter(servers)
+        load_agent, build = await _invoke_n(2, servers=lambda: next(calls))
+        assert load_agent.call_count == 1
+        assert build.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_run_is_not_returned_to_pool(self):
+        load_agent, build = await _invoke_n(2, run_side_effect=RuntimeError("boom"))
+        assert build.call_count == 2
+        assert len(subagent_pool._pool) == 0
+
+    @pytest.mark.asyncio
+    async def test_reuse_clears_previous_session_history(self):
+        load_agent, build = await _invoke_n(2)
+        config = build.call_args.kwargs["agent_config"]
+        history_calls = [
+            name
+            for name, _args, _kwargs in config.mock_calls
+            if name in ("clear_message_history", "set_message_history")
+        ]
+        # Cleared before the reused instance is seeded, so no compacted
+        # hashes from the previous session survive into the next one.
+        assert history_calls == [
+            "set_message_history",
+            "clear_message_history",
+            "set_message_history",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_finished_session_releases_its_prompt_cache_chain(self):
+        with patch(
+            "code_puppy.agents._prompt_cache.forget_prompt_cache_session"
+        ) as forget:
+            await _invoke_n(1)
+
+        forget.assert_called_once()
+        assert forget.call_args.args[0] == "reviewer"